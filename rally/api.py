@@ -31,6 +31,7 @@ from rally.deployment import engine as deploy_engine
 from rally import exceptions
 from rally import osclients
 from rally.task import engine
+from rally.task import progress
 from rally.verification.tempest import tempest
 
 LOG = logging.getLogger(__name__)
@@ -193,6 +194,7 @@ class Task(object):
 
         :param deployment: UUID or name of the deployment
         :param config: a dict with a task configuration
+        :returns: list of timings of validators, see ValidationRun.profile()
         """
         deployment = objects.Deployment.get(deployment)
         task = task_instance or objects.Task(
@@ -200,10 +202,11 @@ class Task(object):
         benchmark_engine = engine.BenchmarkEngine(
             config, task, admin=deployment["admin"], users=deployment["users"])
 
-        benchmark_engine.validate()
+        return benchmark_engine.validate()
 
     @classmethod
-    def start(cls, deployment, config, task=None, abort_on_sla_failure=False):
+    def start(cls, deployment, config, task=None, abort_on_sla_failure=False,
+              distributed=False):
         """Start a task.
 
         Task is a list of benchmarks that will be called one by one, results of
@@ -215,6 +218,8 @@ class Task(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param distributed: if True, the load of every scenario is split
+                            between registered worker agents
         """
         deployment = objects.Deployment.get(deployment)
         task = task or objects.Task(deployment_uuid=deployment["uuid"])
@@ -227,7 +232,8 @@ class Task(object):
                                                          deployment["uuid"]))
         benchmark_engine = engine.BenchmarkEngine(
             config, task, admin=deployment["admin"], users=deployment["users"],
-            abort_on_sla_failure=abort_on_sla_failure)
+            abort_on_sla_failure=abort_on_sla_failure,
+            distributed=distributed)
 
         try:
             benchmark_engine.run()
@@ -261,6 +267,7 @@ class Task(object):
                     current_status = objects.Task.get_status(task_uuid)
 
         objects.Task.get(task_uuid).abort(soft=soft)
+        progress.notify_abort(task_uuid)
 
         if not async:
             LOG.info(_LI("Waiting until the task stops."))
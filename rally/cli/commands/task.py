@@ -19,6 +19,7 @@ from __future__ import print_function
 import json
 import os
 import sys
+import time
 import webbrowser
 
 import jsonschema
@@ -40,13 +41,50 @@ from rally import consts
 from rally import exceptions
 from rally import plugins
 from rally.task.processing import plot
-from rally.task.processing import utils
+from rally.task.processing import results_file
+from rally.task import progress
+
+
+# NOTE: Number of rows of a table printed by "task detailed
+#       --iterations-data", iterations are printed page by page to keep
+#       memory usage flat
+ITERATIONS_PAGE_SIZE = 1000
 
 
 class FailedToLoadTask(exceptions.RallyException):
     msg_fmt = _("Failed to load task")
 
 
+class _StreamedList(list):
+    """List that is filled from an iterable on demand.
+
+    json encoder accepts only lists, this one lets it encode iterations
+    that are streamed from DB without keeping all of them in memory.
+    """
+
+    def __init__(self, iterable):
+        super(_StreamedList, self).__init__()
+        self.iterable = iterable
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def __len__(self):
+        return len(self.iterable)
+
+
+def _get_task_result(task_result, raw):
+    """Convert TaskResult to the TASK_RESULT_SCHEMA format."""
+    result = {"key": task_result["key"], "result": raw,
+              "sla": task_result["data"]["sla"],
+              "load_duration": task_result["data"]["load_duration"],
+              "full_duration": task_result["data"]["full_duration"]}
+    info = task_result["data"].get("info") or {}
+    if "tstamp_base" in info:
+        result["tstamp_base"] = info["tstamp_base"]
+    return result
+
+
 class TaskCommands(object):
     """Task management.
 
@@ -130,16 +168,33 @@ class TaskCommands(object):
             return parsed_task
 
     def _load_and_validate_task(self, task, task_args, task_args_file,
-                                deployment, task_instance=None):
+                                deployment, task_instance=None,
+                                profile=False):
         if not os.path.exists(task) or os.path.isdir(task):
             if task_instance:
                 task_instance.set_failed(log="No such file '%s'" % task)
             raise IOError("File '%s' is not found." % task)
         input_task = self._load_task(task, task_args, task_args_file)
-        api.Task.validate(deployment, input_task, task_instance)
+        timings = api.Task.validate(deployment, input_task, task_instance)
         print(_("Task config is valid :)"))
+        if profile:
+            self._print_validation_profile(timings or [])
         return input_task
 
+    def _print_validation_profile(self, timings):
+        print(_("\nValidators:"))
+        if not timings:
+            print(_("No validators were called."))
+            return
+        formatters = {"duration": cliutils.pretty_float_formatter(
+            "duration", 3)}
+        cliutils.print_list([rutils.Struct(**row) for row in timings],
+                            fields=["validator", "calls", "cached",
+                                    "duration"],
+                            field_labels=["Validator", "Calls", "Cached",
+                                          "Duration (sec)"],
+                            formatters=formatters)
+
     @cliutils.args("--deployment", type=str, dest="deployment",
                    required=False, help="UUID or name of the deployment")
     @cliutils.args("--task", "--filename",
@@ -151,10 +206,12 @@ class TaskCommands(object):
                    help="Path to the file with input task args (dict in "
                         "json/yaml). These args are used to render input "
                         "task that is jinja2 template.")
+    @cliutils.args("--profile", action="store_true",
+                   help="Print number of calls and duration of validators")
     @envutils.with_default_deployment(cli_arg_name="deployment")
-    @plugins.ensure_plugins_are_loaded
+    @plugins.ensure_plugins_are_lazy_loaded
     def validate(self, task, deployment=None, task_args=None,
-                 task_args_file=None):
+                 task_args_file=None, profile=False):
         """Validate a task configuration file.
 
         This will check that task configuration file has valid syntax and
@@ -167,10 +224,11 @@ class TaskCommands(object):
                                These args are used to render input task that
                                is jinja2 template.
         :param deployment: UUID or name of a deployment
+        :param profile: print timings of validators
         """
         try:
             self._load_and_validate_task(task, task_args, task_args_file,
-                                         deployment)
+                                         deployment, profile=profile)
 
         except (exceptions.InvalidTaskException, FailedToLoadTask) as e:
             print(e, file=sys.stderr)
@@ -193,10 +251,14 @@ class TaskCommands(object):
                    dest="abort_on_sla_failure",
                    help="Abort the execution of a benchmark scenario when"
                         "any SLA check for it fails")
+    @cliutils.args("--distributed", action="store_true",
+                   help="Split the load of every benchmark scenario between "
+                        "worker agents started with `rally worker start`")
     @envutils.with_default_deployment(cli_arg_name="deployment")
-    @plugins.ensure_plugins_are_loaded
+    @plugins.ensure_plugins_are_lazy_loaded
     def start(self, task, deployment=None, task_args=None, task_args_file=None,
-              tag=None, do_use=False, abort_on_sla_failure=False):
+              tag=None, do_use=False, abort_on_sla_failure=False,
+              distributed=False):
         """Start benchmark task.
 
         :param task: a file with yaml/json task
@@ -212,6 +274,8 @@ class TaskCommands(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param distributed: if True, the load of every scenario is split
+                            between registered worker agents
         """
 
         task_instance = api.Task.create(deployment, tag)
@@ -233,7 +297,8 @@ class TaskCommands(object):
                 self.use(task_instance["uuid"])
 
             api.Task.start(deployment, input_task, task=task_instance,
-                           abort_on_sla_failure=abort_on_sla_failure)
+                           abort_on_sla_failure=abort_on_sla_failure,
+                           distributed=distributed)
             self.detailed(task_id=task_instance["uuid"])
 
         except (exceptions.InvalidTaskException, FailedToLoadTask) as e:
@@ -271,9 +336,77 @@ class TaskCommands(object):
         Returns current status of task
         """
 
-        task = db.task_get(task_id)
         print(_("Task %(task_id)s: %(status)s")
-              % {"task_id": task_id, "status": task["status"]})
+              % {"task_id": task_id, "status": db.task_get_status(task_id)})
+
+    @cliutils.args("--uuid", type=str, dest="task_id", help="UUID of task")
+    @cliutils.args("--interval", type=float, dest="interval", default=1.0,
+                   help="Interval between updates, in seconds")
+    @envutils.with_default_task_id
+    def watch(self, task_id=None, interval=1.0):
+        """Display live progress of a running task.
+
+        Throughput, error rate, number of iterations in flight and response
+        times of the iterations finished within the last progress_window
+        seconds are shown for every running scenario until the task ends.
+
+        :param task_id: Task uuid
+        :param interval: Interval between updates, in seconds
+        """
+        table_cols = ["scenario", "iterations", "failures", "throughput",
+                      "error_rate", "in_flight", "min", "median", "90%ile",
+                      "95%ile", "max"]
+        float_cols = ["throughput", "in_flight", "min", "median", "90%ile",
+                      "95%ile", "max"]
+        formatters = dict(zip(float_cols,
+                              [cliutils.pretty_float_formatter(col, 3)
+                               for col in float_cols]))
+        formatters["error_rate"] = lambda row: "%.1f%%" % (
+            row.error_rate * 100)
+        field_labels = ["Scenario", "Iterations", "Failures", "Iter/s",
+                        "Error rate", "In flight", "Min (sec)", "Median",
+                        "90%ile", "95%ile", "Max"]
+        done = (consts.TaskStatus.FINISHED, consts.TaskStatus.FAILED,
+                consts.TaskStatus.ABORTED)
+
+        try:
+            while True:
+                status = db.task_get_status(task_id)
+                data = None
+                address = progress.get_address(task_id)
+                if address and status not in done:
+                    try:
+                        data = progress.fetch(address)
+                    except IOError:
+                        pass
+
+                if sys.stdout.isatty():
+                    print("\033[2J\033[H", end="")
+                print(_("Task %(task_id)s: %(status)s")
+                      % {"task_id": task_id, "status": status})
+                if status in done:
+                    return
+
+                if data and data["scenarios"]:
+                    table_rows = []
+                    for scenario in data["scenarios"]:
+                        row = dict(scenario["latency"],
+                                   scenario="%s [%s]" % (scenario["name"],
+                                                         scenario["pos"]))
+                        for col in ("iterations", "failures", "throughput",
+                                    "error_rate", "in_flight"):
+                            row[col] = scenario[col]
+                        table_rows.append(rutils.Struct(**row))
+                    cliutils.print_list(
+                        table_rows, fields=table_cols, formatters=formatters,
+                        field_labels=field_labels, sortby_index=None,
+                        table_label=_("Last %d seconds")
+                        % data["scenarios"][0]["window"])
+                else:
+                    print(_("No scenarios are running."))
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
 
     @cliutils.args("--uuid", type=str, dest="task_id",
                    help=("uuid of task, if --uuid is \"last\" results of most "
@@ -290,35 +423,35 @@ class TaskCommands(object):
         Prints detailed information of task.
         """
 
-        def _print_iterations_data(raw_data):
+        def _print_iterations_data(raw_data, atomic_actions):
             headers = ["iteration", "full duration"]
             float_cols = ["full duration"]
-            atomic_actions = []
-            for row in raw_data:
-                # find first non-error result to get atomic actions names
-                if not row["error"] and "atomic_actions" in row:
-                    atomic_actions = row["atomic_actions"].keys()
-            for row in raw_data:
-                if row["atomic_actions"]:
-                    for (c, a) in enumerate(atomic_actions, 1):
-                        action = "%(no)i. %(action)s" % {"no": c, "action": a}
-                        headers.append(action)
-                        float_cols.append(action)
-                    break
-            table_rows = []
+            for (c, a) in enumerate(atomic_actions, 1):
+                action = "%(no)i. %(action)s" % {"no": c, "action": a}
+                headers.append(action)
+                float_cols.append(action)
             formatters = dict(zip(float_cols,
                                   [cliutils.pretty_float_formatter(col, 3)
                                    for col in float_cols]))
+
+            def print_page(table_rows):
+                cliutils.print_list(table_rows,
+                                    fields=headers,
+                                    formatters=formatters)
+
+            table_rows = []
+            c = 0
             for (c, r) in enumerate(raw_data, 1):
                 dlist = [c]
                 dlist.append(r["duration"])
-                if r["atomic_actions"]:
-                    for action in atomic_actions:
-                        dlist.append(r["atomic_actions"].get(action) or 0)
+                for action in atomic_actions:
+                    dlist.append(r["atomic_actions"].get(action) or 0)
                 table_rows.append(rutils.Struct(**dict(zip(headers, dlist))))
-            cliutils.print_list(table_rows,
-                                fields=headers,
-                                formatters=formatters)
+                if len(table_rows) == ITERATIONS_PAGE_SIZE:
+                    print_page(table_rows)
+                    table_rows = []
+            if table_rows or not c:
+                print_page(table_rows)
             print()
 
         task = db.task_get_detailed(task_id)
@@ -355,7 +488,8 @@ class TaskCommands(object):
             print("args values:")
             print(json.dumps(key["kw"], indent=2))
 
-            raw = result["data"]["raw"]
+            raw = objects.task.ResultIterations(result.get("id"),
+                                                result["data"]["raw"])
             table_cols = ["action", "min", "median",
                           "90%ile", "95%ile", "max",
                           "avg", "success", "count"]
@@ -367,22 +501,30 @@ class TaskCommands(object):
                                    for col in float_cols]))
             table_rows = []
 
-            actions_data = utils.get_atomic_actions_data(raw)
-            for action in actions_data:
-                durations = actions_data[action]
-                if durations:
-                    data = [action,
-                            round(min(durations), 3),
-                            round(utils.median(durations), 3),
-                            round(utils.percentile(durations, 0.90), 3),
-                            round(utils.percentile(durations, 0.95), 3),
-                            round(max(durations), 3),
-                            round(utils.mean(durations), 3),
-                            "%.1f%%" % (len(durations) * 100.0 / len(raw)),
-                            len(raw)]
+            info = result["data"].get("info")
+            if not info or "durations" not in info:
+                # NOTE: results stored before the aggregates were computed
+                #       by ResultConsumer
+                result_info = objects.task.ResultInfo()
+                for itr in raw:
+                    result_info.add(itr)
+                info = result_info.to_dict()
+
+            actions = [(name, value["durations"])
+                       for name, value in info["atomic"].items()]
+            actions.append(("total", info["durations"]))
+            count = info["iterations_count"]
+            for action, durations in actions:
+                if durations["count"]:
+                    data = ([action] +
+                            [round(durations[col], 3) for col in
+                             ("min", "median", "90%ile", "95%ile", "max",
+                              "avg")] +
+                            ["%.1f%%" % (durations["count"] * 100.0 / count),
+                             count])
                 else:
                     data = [action, None, None, None, None, None, None,
-                            "0.0%", len(raw)]
+                            "0.0%", count]
                 table_rows.append(rutils.Struct(**dict(zip(table_cols, data))))
 
             cliutils.print_list(table_rows, fields=table_cols,
@@ -391,21 +533,20 @@ class TaskCommands(object):
                                 sortby_index=None)
 
             if iterations_data:
-                _print_iterations_data(raw)
+                _print_iterations_data(raw, list(info["atomic"]))
 
             print(_("Load duration: %s") % result["data"]["load_duration"])
             print(_("Full duration: %s") % result["data"]["full_duration"])
 
             # NOTE(hughsaunders): ssrs=scenario specific results
-            ssrs = []
-            for result in raw:
-                data = result["scenario_output"].get("data")
-                if data:
-                    ssrs.append(data)
+            ssrs = {}
+            for result in (raw if info["output_names"] else []):
+                data = result["scenario_output"].get("data") or {}
+                for key, value in data.items():
+                    if key not in ssrs:
+                        ssrs[key] = objects.task.DurationStats()
+                    ssrs[key].add(float(value))
             if ssrs:
-                keys = set()
-                for ssr in ssrs:
-                    keys.update(ssr.keys())
                 headers = ["key", "min", "median",
                            "90%ile", "95%ile", "max",
                            "avg"]
@@ -415,19 +556,10 @@ class TaskCommands(object):
                                   [cliutils.pretty_float_formatter(col, 3)
                                    for col in float_cols]))
                 table_rows = []
-                for key in keys:
-                    values = [float(ssr[key]) for ssr in ssrs if key in ssr]
-
-                    if values:
-                        row = [str(key),
-                               round(min(values), 3),
-                               round(utils.median(values), 3),
-                               round(utils.percentile(values, 0.90), 3),
-                               round(utils.percentile(values, 0.95), 3),
-                               round(max(values), 3),
-                               round(utils.mean(values), 3)]
-                    else:
-                        row = [str(key)] + ["n/a"] * 6
+                for key in sorted(ssrs):
+                    stats = ssrs[key].to_dict()
+                    row = [str(key)] + [round(stats[col], 3)
+                                        for col in float_cols]
                     table_rows.append(rutils.Struct(**dict(zip(headers, row))))
                 print("\nScenario Specific Results\n")
                 cliutils.print_list(table_rows,
@@ -453,23 +585,33 @@ class TaskCommands(object):
         print("\trally task results %s\n" % task["uuid"])
 
     @cliutils.args("--uuid", type=str, dest="task_id", help="uuid of task")
+    @cliutils.args("--format", type=str, dest="out_format",
+                   choices=["json", "binary"], default="json",
+                   help="Output format: json (default) or compact binary "
+                        "format that is accepted by 'rally task report'.")
     @envutils.with_default_task_id
     @cliutils.suppress_warnings
-    def results(self, task_id=None):
+    def results(self, task_id=None, out_format="json"):
         """Display raw task results.
 
         This will produce a lot of output data about every iteration.
 
         :param task_id: Task uuid
+        :param out_format: output format (json or binary)
         """
-        results = [{"key": x["key"], "result": x["data"]["raw"],
-                    "sla": x["data"]["sla"],
-                    "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+        # NOTE: Iterations are streamed from DB while the output is written
+        results = [_get_task_result(x, _StreamedList(x["data"]["raw"]))
                    for x in objects.Task.get(task_id).get_results()]
 
-        if results:
-            print(json.dumps(results, sort_keys=True, indent=4))
+        if results and out_format == "binary":
+            stdout = getattr(sys.stdout, "buffer", sys.stdout)
+            results_file.dump(results, stdout)
+            stdout.flush()
+        elif results:
+            encoder = json.JSONEncoder(sort_keys=True, indent=4)
+            for chunk in encoder.iterencode(results):
+                sys.stdout.write(chunk)
+            sys.stdout.write("\n")
         else:
             print(_("The task %s marked as '%s'. Results "
                     "available when it is '%s' .") % (
@@ -518,7 +660,7 @@ class TaskCommands(object):
         if not all_deployments:
             filters.setdefault("deployment", deployment)
 
-        task_list = [task.to_dict() for task in objects.Task.list(**filters)]
+        task_list = objects.Task.list_brief(**filters)
 
         for x in task_list:
             x["duration"] = x["updated_at"] - x["created_at"]
@@ -542,7 +684,8 @@ class TaskCommands(object):
                         "\trally task start"))
 
     @cliutils.args("--tasks", dest="tasks", nargs="+",
-                   help="uuids of tasks or json files with task results")
+                   help="uuids of tasks or json/binary files with task "
+                        "results")
     @cliutils.args("--out", type=str, dest="out", required=True,
                    help="Path to output file.")
     @cliutils.args("--open", dest="open_it", action="store_true",
@@ -560,6 +703,7 @@ class TaskCommands(object):
 
         :param task_id: UUID, task identifier
         :param tasks: list, UUIDs od tasks or pathes files with tasks results
+                      in json or binary format of `rally task results`
         :param out: str, output file name
         :param open_it: bool, whether to open output file in web browser
         :param out_format: output format (junit or html)
@@ -571,7 +715,22 @@ class TaskCommands(object):
         message = []
         processed_names = {}
         for task_file_or_uuid in tasks:
-            if os.path.exists(os.path.expanduser(task_file_or_uuid)):
+            if (os.path.exists(os.path.expanduser(task_file_or_uuid)) and
+                    results_file.is_binary(
+                        os.path.expanduser(task_file_or_uuid))):
+                # NOTE: Only scenario headers of binary files are validated,
+                #       iterations can't be malformed in this format
+                try:
+                    with open(os.path.expanduser(task_file_or_uuid),
+                              "rb") as inp_bin:
+                        tasks_results = results_file.load(inp_bin)
+                except exceptions.InvalidResultsFile as e:
+                    print(_("ERROR: Invalid task result format in %s")
+                          % task_file_or_uuid, file=sys.stderr)
+                    print(six.text_type(e), file=sys.stderr)
+                    return 1
+
+            elif os.path.exists(os.path.expanduser(task_file_or_uuid)):
                 with open(os.path.expanduser(task_file_or_uuid),
                           "r") as inp_js:
                     tasks_results = json.load(inp_js)
@@ -588,11 +747,7 @@ class TaskCommands(object):
 
             elif uuidutils.is_uuid_like(task_file_or_uuid):
                 tasks_results = map(
-                    lambda x: {"key": x["key"],
-                               "sla": x["data"]["sla"],
-                               "result": x["data"]["raw"],
-                               "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
+                    lambda x: _get_task_result(x, x["data"]["raw"]),
                     objects.Task.get(task_file_or_uuid).get_results())
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
@@ -0,0 +1,62 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+""" Rally command: worker """
+
+from __future__ import print_function
+
+from rally.cli import cliutils
+from rally.common import db
+from rally.common import utils
+from rally import plugins
+from rally.task import distributed
+
+
+class WorkerCommands(object):
+    """Worker agents of distributed tasks.
+
+    Workers run the load of tasks started with `rally task start
+    --distributed`. All the workers have to use the same database as the
+    node that starts the task.
+    """
+
+    @cliutils.args("--hostname", type=str, dest="hostname",
+                   help="Unique name of the worker. Defaults to the host "
+                        "name and PID.")
+    @plugins.ensure_plugins_are_loaded
+    def start(self, hostname=None):
+        """Start a worker agent and run assigned jobs until interrupted.
+
+        :param hostname: unique name of the worker
+        """
+        agent = distributed.WorkerAgent(hostname)
+        print("Worker %s is waiting for jobs. Press Ctrl+C to stop it."
+              % agent.hostname)
+        try:
+            with agent:
+                agent.serve()
+        except KeyboardInterrupt:
+            print("Worker %s stopped." % agent.hostname)
+
+    def list(self):
+        """List registered worker agents."""
+        alive = set(w["hostname"] for w in distributed.get_alive_workers())
+        rows = [utils.Struct(hostname=w["hostname"],
+                             status="alive" if w["hostname"] in alive
+                             else "dead",
+                             created_at=w["created_at"],
+                             updated_at=w["updated_at"])
+                for w in db.worker_list()]
+        cliutils.print_list(rows, fields=["hostname", "status",
+                                          "created_at", "updated_at"])
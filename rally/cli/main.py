@@ -26,6 +26,7 @@ from rally.cli.commands import plugin
 from rally.cli.commands import show
 from rally.cli.commands import task
 from rally.cli.commands import verify
+from rally.cli.commands import worker
 
 
 categories = {
@@ -34,7 +35,8 @@ categories = {
     "plugin": plugin.PluginCommands,
     "show": show.ShowCommands,
     "task": task.TaskCommands,
-    "verify": verify.VerifyCommands
+    "verify": verify.VerifyCommands,
+    "worker": worker.WorkerCommands
 }
 
 
@@ -32,6 +32,17 @@ class DBCommands(object):
         db.db_create()
         envutils.clear_env()
 
+    @cliutils.args("--batch-size", dest="batch_size", type=int, default=100,
+                   help="Number of rows rewritten in one transaction")
+    def compress_results(self, batch_size=100):
+        """Compress task and verification results stored uncompressed.
+
+        Results stored by previous versions are read as they are, so it is
+        optional and only saves space.
+        """
+        count = db.db_compress_results(batch_size=batch_size)
+        print("%d results are compressed." % count)
+
 
 def main():
     categories = {"db": DBCommands}
@@ -45,6 +45,19 @@ else:
     import json
 
 
+# NOTE: asyncio.ensure_future() is available since Python 3.4.4, event loop
+#       based runners and scenarios can't be used with older versions
+ASYNCIO_MIN_VERSION = (3, 4, 4)
+
+
+def get_asyncio():
+    """Return asyncio module or None if the Python version is too old."""
+    if sys.version_info < ASYNCIO_MIN_VERSION:
+        return None
+    import asyncio
+    return asyncio
+
+
 def json_loads(*args, **kwargs):
     """Deserialize a str or unicode instance to a Python object.
 
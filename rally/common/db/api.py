@@ -80,6 +80,15 @@ def db_drop():
     get_impl().db_drop()
 
 
+def db_compress_results(batch_size=100):
+    """Compress task and verification results stored uncompressed.
+
+    :param batch_size: number of rows rewritten in one transaction
+    :returns: number of rewritten rows
+    """
+    return get_impl().db_compress_results(batch_size=batch_size)
+
+
 def task_get(uuid):
     """Returns task by uuid.
 
@@ -162,6 +171,24 @@ def task_list(status=None, deployment=None):
     return get_impl().task_list(status=status, deployment=deployment)
 
 
+def task_list_brief(status=None, deployment=None):
+    """Get a list of tasks without their logs and results.
+
+    Only the columns shown by `rally task list` are loaded, names of
+    deployments are loaded in the same query.
+
+    :param status: Task status to filter the returned list on. If set to
+                   None, all the tasks will be returned.
+    :param deployment: UUID or name of deployment to filter the returned
+                       list on. If set to None tasks from all deployments
+                       will be returned.
+    :returns: A list of dicts with uuid, status, tag, created_at,
+              updated_at, deployment_uuid and deployment_name of the tasks
+              sorted by created_at.
+    """
+    return get_impl().task_list_brief(status=status, deployment=deployment)
+
+
 def task_delete(uuid, status=None):
     """Delete a task.
 
@@ -197,6 +224,49 @@ def task_result_create(task_uuid, key, data):
     return get_impl().task_result_create(task_uuid, key, data)
 
 
+def task_result_update(result_id, data):
+    """Replace data of task result record.
+
+    :param result_id: ID of TaskResult instance.
+    :param data: data expected to be stored in task result.
+    :raises: :class:`rally.exceptions.NotFoundException` if the result
+             does not exist.
+    :returns: TaskResult instance updated.
+    """
+    return get_impl().task_result_update(result_id, data)
+
+
+def task_result_chunk_create(task_result_id, iterations):
+    """Append chunk of iterations to task result.
+
+    :param task_result_id: ID of TaskResult instance.
+    :param iterations: list of iteration dicts sorted by timestamp.
+    :returns: TaskResultChunk instance appended.
+    """
+    return get_impl().task_result_chunk_create(task_result_id, iterations)
+
+
+def task_result_chunk_list(task_result_id):
+    """Get chunks of task result without their iterations data.
+
+    :param task_result_id: ID of TaskResult instance.
+    :returns: list of TaskResultChunk instances with loaded id,
+              iterations_count and min_timestamp, ordered by min_timestamp.
+    """
+    return get_impl().task_result_chunk_list(task_result_id)
+
+
+def task_result_chunk_get(chunk_id):
+    """Get iterations stored in chunk.
+
+    :param chunk_id: ID of TaskResultChunk instance.
+    :raises: :class:`rally.exceptions.NotFoundException` if the chunk
+             does not exist.
+    :returns: list of iteration dicts sorted by timestamp.
+    """
+    return get_impl().task_result_chunk_get(chunk_id)
+
+
 def deployment_create(values):
     """Create a deployment from the values dictionary.
 
@@ -397,3 +467,77 @@ def update_worker(hostname):
     :raises: WorkerNotFound
     """
     get_impl().update_worker(hostname)
+
+
+def worker_list(alive_since=None):
+    """Get a list of registered worker services.
+
+    :param alive_since: datetime, if specified only the workers that have
+                        updated "updated_at" since then are returned.
+    :returns: A list of workers ordered by hostname.
+    """
+    return get_impl().worker_list(alive_since=alive_since)
+
+
+def worker_job_create(values):
+    """Assign a job to a worker service.
+
+    :param values: dict with "task_uuid", "worker" (hostname of the worker
+                   service) and "key" (scenario config of the job).
+    :returns: WorkerJob instance.
+    """
+    return get_impl().worker_job_create(values)
+
+
+def worker_job_get(job_id):
+    """Get a worker job.
+
+    :param job_id: ID of WorkerJob instance.
+    :raises: :class:`rally.exceptions.NotFoundException` if the job
+             does not exist.
+    :returns: WorkerJob instance.
+    """
+    return get_impl().worker_job_get(job_id)
+
+
+def worker_job_list(worker=None, task_uuid=None, status=None):
+    """Get a list of worker jobs.
+
+    :param worker: hostname of the worker service.
+    :param task_uuid: UUID of the task the jobs belong to.
+    :param status: job status to filter the jobs by.
+    :returns: A list of WorkerJob instances ordered by ID.
+    """
+    return get_impl().worker_job_list(worker=worker, task_uuid=task_uuid,
+                                      status=status)
+
+
+def worker_job_update(job_id, values, statuses=None):
+    """Update a worker job.
+
+    :param job_id: ID of WorkerJob instance.
+    :param values: dict with values to update.
+    :param statuses: list of statuses, if specified the job is updated only
+                     if it is in one of them.
+    :returns: number of updated jobs, 0 or 1.
+    """
+    return get_impl().worker_job_update(job_id, values, statuses=statuses)
+
+
+def worker_job_result_create(job_id, iterations):
+    """Send a chunk of iterations of a worker job.
+
+    :param job_id: ID of WorkerJob instance.
+    :param iterations: list of iteration dicts.
+    :returns: WorkerJobResult instance.
+    """
+    return get_impl().worker_job_result_create(job_id, iterations)
+
+
+def worker_job_result_pop(job_id):
+    """Get and delete the chunks of iterations sent by a worker job.
+
+    :param job_id: ID of WorkerJob instance.
+    :returns: list of lists of iteration dicts, in order of sending.
+    """
+    return get_impl().worker_job_result_pop(job_id)
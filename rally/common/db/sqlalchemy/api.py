@@ -24,7 +24,9 @@ import sqlalchemy as sa
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
 
+from rally.common import costilius
 from rally.common.db.sqlalchemy import models
+from rally.common.db.sqlalchemy import types as sa_types
 from rally.common.i18n import _
 from rally import exceptions
 
@@ -71,6 +73,43 @@ class Connection(object):
     def db_drop(self):
         models.drop_db()
 
+    def db_compress_results(self, batch_size=100):
+        """Rewrite results stored before as compressed values.
+
+        Values of CompressedJSONEncodedDict columns without the marker of
+        compressed values are plain JSON. They are read as they are, so it
+        is optional and just saves space.
+
+        :param batch_size: number of rows rewritten in one transaction
+        :returns: number of rewritten rows
+        """
+        count = 0
+        for model in (models.TaskResult, models.TaskResultChunk,
+                      models.VerificationResult):
+            table = model.__table__
+            raw = sa.type_coerce(table.c.data, sa.Text)
+            last_id = 0
+            while True:
+                session = get_session()
+                with session.begin():
+                    rows = session.execute(
+                        sa.select([table.c.id, raw]).
+                        where(table.c.id > last_id).
+                        order_by(table.c.id).limit(batch_size)).fetchall()
+                    for row_id, value in rows:
+                        if value.startswith(sa_types.MARKER):
+                            continue
+                        session.execute(
+                            table.update().where(table.c.id == row_id).
+                            values(data=costilius.json_loads(
+                                value,
+                                object_pairs_hook=costilius.OrderedDict)))
+                        count += 1
+                if len(rows) < batch_size:
+                    break
+                last_id = rows[-1][0]
+        return count
+
     def model_query(self, model, session=None):
         """The helper method to create query.
 
@@ -113,7 +152,12 @@ class Connection(object):
                 filter_by(uuid=uuid).first())
 
     def task_get_status(self, uuid):
-        return self._task_get(uuid, load_only="status").status
+        task = (self.model_query(models.Task).
+                with_entities(models.Task.status).
+                filter_by(uuid=uuid).first())
+        if not task:
+            raise exceptions.TaskNotFound(uuid=uuid)
+        return task.status
 
     def task_get_detailed_last(self):
         return (self.model_query(models.Task).
@@ -164,6 +208,25 @@ class Connection(object):
             query = query.filter_by(**filters)
         return query.all()
 
+    def task_list_brief(self, status=None, deployment=None):
+        query = (self.model_query(models.Task).
+                 outerjoin(models.Deployment,
+                           models.Task.deployment_uuid ==
+                           models.Deployment.uuid).
+                 with_entities(models.Task.uuid, models.Task.status,
+                               models.Task.tag, models.Task.created_at,
+                               models.Task.updated_at,
+                               models.Task.deployment_uuid,
+                               models.Deployment.name.label(
+                                   "deployment_name")))
+        if status is not None:
+            query = query.filter(models.Task.status == status)
+        if deployment is not None:
+            query = query.filter(models.Task.deployment_uuid ==
+                                 self._deployment_get_uuid(deployment))
+        return [row._asdict() for row in
+                query.order_by(models.Task.created_at, models.Task.id)]
+
     def task_delete(self, uuid, status=None):
         session = get_session()
         with session.begin():
@@ -172,9 +235,24 @@ class Connection(object):
             if status is not None:
                 query = base_query.filter_by(status=status)
 
+            result_ids = (self.model_query(models.TaskResult).
+                          filter_by(task_uuid=uuid).
+                          with_entities(models.TaskResult.id).subquery())
+            (self.model_query(models.TaskResultChunk).
+             filter(models.TaskResultChunk.task_result_id.in_(result_ids)).
+             delete(synchronize_session=False))
             (self.model_query(models.TaskResult).filter_by(task_uuid=uuid).
              delete(synchronize_session=False))
 
+            job_ids = (self.model_query(models.WorkerJob).
+                       filter_by(task_uuid=uuid).
+                       with_entities(models.WorkerJob.id).subquery())
+            (self.model_query(models.WorkerJobResult).
+             filter(models.WorkerJobResult.job_id.in_(job_ids)).
+             delete(synchronize_session=False))
+            (self.model_query(models.WorkerJob).filter_by(task_uuid=uuid).
+             delete(synchronize_session=False))
+
             count = query.delete(synchronize_session=False)
             if not count:
                 if status is not None:
@@ -191,10 +269,50 @@ class Connection(object):
         result.save()
         return result
 
+    def task_result_update(self, result_id, data):
+        session = get_session()
+        with session.begin():
+            result = (self.model_query(models.TaskResult, session=session).
+                      filter_by(id=result_id).first())
+            if not result:
+                raise exceptions.NotFoundException(
+                    "Can't find any task result with following ID '%s'." %
+                    result_id)
+            result.update({"data": data})
+        return result
+
     def task_result_get_all_by_uuid(self, uuid):
         return (self.model_query(models.TaskResult).
                 filter_by(task_uuid=uuid).all())
 
+    def task_result_chunk_create(self, task_result_id, iterations):
+        chunk = models.TaskResultChunk()
+        chunk.update({
+            "task_result_id": task_result_id,
+            "iterations_count": len(iterations),
+            "min_timestamp": min(
+                [itr["timestamp"] for itr in iterations] or [None]),
+            "data": {"raw": iterations}})
+        chunk.save()
+        return chunk
+
+    def task_result_chunk_list(self, task_result_id):
+        return (self.model_query(models.TaskResultChunk).
+                options(sa_loadonly("id", "iterations_count",
+                                    "min_timestamp")).
+                filter_by(task_result_id=task_result_id).
+                order_by(models.TaskResultChunk.min_timestamp,
+                         models.TaskResultChunk.id).all())
+
+    def task_result_chunk_get(self, chunk_id):
+        chunk = (self.model_query(models.TaskResultChunk).
+                 filter_by(id=chunk_id).first())
+        if not chunk:
+            raise exceptions.NotFoundException(
+                "Can't find any task result chunk with following ID '%s'." %
+                chunk_id)
+        return chunk["data"]["raw"]
+
     def _deployment_get(self, deployment, session=None):
         stored_deployment = self.model_query(
             models.Deployment,
@@ -208,6 +326,15 @@ class Connection(object):
             raise exceptions.DeploymentNotFound(deployment=deployment)
         return stored_deployment
 
+    def _deployment_get_uuid(self, deployment):
+        query = (self.model_query(models.Deployment).
+                 with_entities(models.Deployment.uuid))
+        stored_deployment = (query.filter_by(name=deployment).first() or
+                             query.filter_by(uuid=deployment).first())
+        if not stored_deployment:
+            raise exceptions.DeploymentNotFound(deployment=deployment)
+        return stored_deployment.uuid
+
     def deployment_create(self, values):
         deployment = models.Deployment()
         try:
@@ -355,3 +482,63 @@ class Connection(object):
                  update({"updated_at": timeutils.utcnow()}))
         if count == 0:
             raise exceptions.WorkerNotFound(worker=hostname)
+
+    def worker_list(self, alive_since=None):
+        query = self.model_query(models.Worker)
+        if alive_since is not None:
+            query = query.filter(models.Worker.updated_at >= alive_since)
+        return query.order_by(models.Worker.hostname).all()
+
+    def worker_job_create(self, values):
+        job = models.WorkerJob()
+        job.update(values)
+        job.save()
+        return job
+
+    def worker_job_get(self, job_id):
+        job = (self.model_query(models.WorkerJob).
+               filter_by(id=job_id).first())
+        if not job:
+            raise exceptions.NotFoundException(
+                "Can't find any worker job with following ID '%s'." % job_id)
+        return job
+
+    def worker_job_list(self, worker=None, task_uuid=None, status=None):
+        query = self.model_query(models.WorkerJob)
+        filters = {}
+        if worker is not None:
+            filters["worker"] = worker
+        if task_uuid is not None:
+            filters["task_uuid"] = task_uuid
+        if status is not None:
+            filters["status"] = status
+        if filters:
+            query = query.filter_by(**filters)
+        return query.order_by(models.WorkerJob.id).all()
+
+    def worker_job_update(self, job_id, values, statuses=None):
+        query = self.model_query(models.WorkerJob).filter_by(id=job_id)
+        if statuses is not None:
+            query = query.filter(models.WorkerJob.status.in_(statuses))
+        values = dict(values, updated_at=timeutils.utcnow())
+        return query.update(values, synchronize_session=False)
+
+    def worker_job_result_create(self, job_id, iterations):
+        result = models.WorkerJobResult()
+        result.update({"job_id": job_id, "data": {"raw": iterations}})
+        result.save()
+        return result
+
+    def worker_job_result_pop(self, job_id):
+        session = get_session()
+        with session.begin():
+            results = (self.model_query(models.WorkerJobResult,
+                                        session=session).
+                       filter_by(job_id=job_id).
+                       order_by(models.WorkerJobResult.id).all())
+            if results:
+                (self.model_query(models.WorkerJobResult, session=session).
+                 filter(models.WorkerJobResult.id.in_(
+                     [r.id for r in results])).
+                 delete(synchronize_session=False))
+        return [r["data"]["raw"] for r in results]
@@ -142,6 +142,7 @@ class Task(BASE, RallyBase):
         sa.Index("task_uuid", "uuid", unique=True),
         sa.Index("task_status", "status"),
         sa.Index("task_deployment", "deployment_uuid"),
+        sa.Index("task_created_at", "created_at"),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
@@ -174,7 +175,8 @@ class TaskResult(BASE, RallyBase):
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
 
     key = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
-    data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
+    data = sa.Column(sa_types.MutableCompressedJSONEncodedDict(),
+                     nullable=False)
 
     task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"))
     task = sa.orm.relationship(Task,
@@ -183,6 +185,26 @@ class TaskResult(BASE, RallyBase):
                                primaryjoin="TaskResult.task_uuid == Task.uuid")
 
 
+class TaskResultChunk(BASE, RallyBase):
+    """Represents a chunk of iterations of a task result.
+
+    Iterations are sorted by timestamp inside of a chunk, but chunks of
+    one result may overlap, because iterations finish out of order.
+    """
+    __tablename__ = "task_result_chunks"
+    __table_args__ = (
+        sa.Index("task_result_chunk_result_id", "task_result_id"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_result_id = sa.Column(sa.Integer, sa.ForeignKey("task_results.id"),
+                               nullable=False)
+    iterations_count = sa.Column(sa.Integer, default=0, nullable=False)
+    min_timestamp = sa.Column(sa.Float)
+
+    data = sa.Column(sa_types.CompressedJSONEncodedDict(), nullable=False)
+
+
 class Verification(BASE, RallyBase):
     """Represents a verifier result."""
 
@@ -221,7 +243,9 @@ class VerificationResult(BASE, RallyBase):
     verification_uuid = sa.Column(sa.String(36),
                                   sa.ForeignKey("verifications.uuid"))
 
-    data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
+    # NOTE: tests are sorted when they are shown, the order does not matter
+    data = sa.Column(sa_types.MutableCompressedJSONEncodedDict(ordered=False),
+                     nullable=False)
 
 
 class Worker(BASE, RallyBase):
@@ -233,6 +257,45 @@ class Worker(BASE, RallyBase):
     hostname = sa.Column(sa.String(255))
 
 
+class WorkerJob(BASE, RallyBase):
+    """Represents a share of scenario load assigned to a worker agent."""
+
+    __tablename__ = "worker_jobs"
+    __table_args__ = (
+        sa.Index("worker_job_worker_status", "worker", "status"),
+        sa.Index("worker_job_task_uuid", "task_uuid"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_uuid = sa.Column(sa.String(36), sa.ForeignKey(Task.uuid),
+                          nullable=False)
+    worker = sa.Column(sa.String(255), nullable=False)
+
+    status = sa.Column(sa.Enum(*list(consts.WorkerJobStatus),
+                       name="enum_worker_jobs_status"),
+                       default=consts.WorkerJobStatus.PENDING,
+                       nullable=False)
+
+    key = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
+    load_duration = sa.Column(sa.Float, default=0.0)
+    error = sa.Column(sa.Text, default="")
+
+
+class WorkerJobResult(BASE, RallyBase):
+    """Represents a chunk of iterations sent by a worker agent."""
+
+    __tablename__ = "worker_job_results"
+    __table_args__ = (
+        sa.Index("worker_job_result_job_id", "job_id"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    job_id = sa.Column(sa.Integer, sa.ForeignKey("worker_jobs.id"),
+                       nullable=False)
+
+    data = sa.Column(sa_types.BigJSONEncodedDict, nullable=False)
+
+
 def create_db():
     from rally.common.db.sqlalchemy import api as sa_api
 
@@ -13,13 +13,60 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import json
+import sys
+import zlib
 
+from oslo_config import cfg
 from sqlalchemy.dialects import mysql as mysql_types
 from sqlalchemy.ext import mutable
 from sqlalchemy import types as sa_types
 
 from rally.common import costilius
+from rally.common.i18n import _
+from rally.common import log as logging
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+LOG = logging.getLogger(__name__)
+
+DB_RESULTS_OPTS = [
+    cfg.StrOpt("results_compression",
+               default="zlib",
+               choices=["zlib", "lz4", "zstd"],
+               help="Compression of task and verification results stored "
+                    "in DB, zlib is used if the library of the compression "
+                    "is not installed"),
+    cfg.StrOpt("results_encoding",
+               default="json",
+               choices=["json", "msgpack"],
+               help="Encoding of task and verification results stored in "
+                    "DB, json is used if msgpack is not installed")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_opts(DB_RESULTS_OPTS, group=benchmark_group)
+
+# NOTE: dicts keep the order of keys since python 3.7, so it is kept
+#       without the slow object_pairs_hook
+DICTS_ARE_ORDERED = sys.version_info >= (3, 7)
 
 
 class JSONEncodedDict(sa_types.TypeDecorator):
@@ -55,6 +102,134 @@ class BigJSONEncodedDict(JSONEncodedDict):
             return dialect.type_descriptor(sa_types.Text)
 
 
+def _lz4_compress(data):
+    return lz4_frame.compress(data)
+
+
+def _lz4_decompress(data):
+    return lz4_frame.decompress(data)
+
+
+def _zstd_compress(data):
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data):
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# NOTE: name: (module, compress, decompress)
+COMPRESSIONS = {
+    "zlib": (zlib, zlib.compress, zlib.decompress),
+    "lz4": (lz4_frame, _lz4_compress, _lz4_decompress),
+    "zstd": (zstandard, _zstd_compress, _zstd_decompress)
+}
+
+# NOTE: compressed values start with the marker, which JSON text of
+#       values stored before never starts with
+MARKER = "~"
+
+
+def _dumps_json(value):
+    return json.dumps(value, sort_keys=False).encode("utf-8")
+
+
+def _loads_json(data, object_pairs_hook):
+    return costilius.json_loads(data.decode("utf-8"),
+                                object_pairs_hook=object_pairs_hook)
+
+
+def _dumps_msgpack(value):
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _loads_msgpack(data, object_pairs_hook):
+    return msgpack.unpackb(data, raw=False,
+                           object_pairs_hook=object_pairs_hook)
+
+
+# NOTE: name: (module, dumps, loads)
+ENCODINGS = {
+    "json": (json, _dumps_json, _loads_json),
+    "msgpack": (msgpack, _dumps_msgpack, _loads_msgpack)
+}
+
+
+_WARNED = set()
+
+
+def _warn_once(message):
+    if message not in _WARNED:
+        _WARNED.add(message)
+        LOG.warning(message)
+
+
+class CompressedJSONEncodedDict(BigJSONEncodedDict):
+    """Represents an immutable structure as a compressed string.
+
+       Values are encoded with results_encoding, compressed with
+       results_compression and stored as MARKER, "<compression>.<encoding>:"
+       and base64 of the payload, so they fit text columns created for
+       BigJSONEncodedDict. Values without MARKER are read as JSON, so rows
+       stored before are read as is.
+
+       Iterations are compressed 10-20 times, which is much more than base64
+       costs.
+    """
+
+    def __init__(self, ordered=True, *args, **kwargs):
+        """Init type.
+
+        :param ordered: whether the order of keys of dicts matters. If it
+                        does not or if dicts are ordered, values are loaded
+                        without the slow object_pairs_hook
+        """
+        super(CompressedJSONEncodedDict, self).__init__(*args, **kwargs)
+        self.ordered = ordered
+
+    def _object_pairs_hook(self):
+        if self.ordered and not DICTS_ARE_ORDERED:
+            return costilius.OrderedDict
+        return None
+
+    @staticmethod
+    def _get_format():
+        compression = CONF.benchmark.results_compression
+        if COMPRESSIONS[compression][0] is None:
+            _warn_once(_("Library of %s compression is not installed, "
+                         "zlib is used") % compression)
+            compression = "zlib"
+        encoding = CONF.benchmark.results_encoding
+        if ENCODINGS[encoding][0] is None:
+            _warn_once(_("msgpack is not installed, json is used"))
+            encoding = "json"
+        return compression, encoding
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        compression, encoding = self._get_format()
+        payload = COMPRESSIONS[compression][1](ENCODINGS[encoding][1](value))
+        return "%s%s.%s:%s" % (MARKER, compression, encoding,
+                               base64.b64encode(payload).decode("ascii"))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        if not value.startswith(MARKER):
+            return costilius.json_loads(
+                value, object_pairs_hook=self._object_pairs_hook())
+
+        fmt, payload = value[len(MARKER):].split(":", 1)
+        compression, encoding = fmt.split(".")
+        if (COMPRESSIONS[compression][0] is None or
+                ENCODINGS[encoding][0] is None):
+            raise ValueError(_("Library of %s format of DB value is not "
+                               "installed") % fmt)
+        data = COMPRESSIONS[compression][2](base64.b64decode(payload))
+        return ENCODINGS[encoding][2](data, self._object_pairs_hook())
+
+
 class MutableDict(mutable.Mutable, dict):
     @classmethod
     def coerce(cls, key, value):
@@ -90,5 +265,10 @@ class BigMutableJSONEncodedDict(BigJSONEncodedDict):
     """Represent a big mutable structure as a json-encoded string."""
 
 
+class MutableCompressedJSONEncodedDict(CompressedJSONEncodedDict):
+    """Represent a big mutable structure as a compressed string."""
+
+
 MutableDict.associate_with(MutableJSONEncodedDict)
 MutableDict.associate_with(BigMutableJSONEncodedDict)
+MutableDict.associate_with(MutableCompressedJSONEncodedDict)
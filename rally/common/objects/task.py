@@ -13,12 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import heapq
+import itertools
 import json
+import math
 import uuid
 
 from rally.common import costilius
 from rally.common import db
 from rally.common.i18n import _LE
+from rally.common import streaming_algorithms
 from rally import consts
 from rally import exceptions
 
@@ -100,6 +105,9 @@ TASK_RESULT_SCHEMA = {
         "full_duration": {
             "type": "number",
         },
+        "tstamp_base": {
+            "type": "number",
+        },
     },
     "required": ["key", "sla", "result", "load_duration",
                  "full_duration"],
@@ -198,7 +206,10 @@ TASK_EXTENDED_RESULT_SCHEMA = {
                 "iterations_failed": {"type": "integer"},
                 "min_duration": {"type": "number"},
                 "max_duration": {"type": "number"},
+                "durations": {"type": "object"},
+                "schedule": {"type": "array"},
                 "tstamp_start": {"type": "number"},
+                "tstamp_base": {"type": "number"},
                 "full_duration": {"type": "number"},
                 "load_duration": {"type": "number"}
             }
@@ -209,6 +220,187 @@ TASK_EXTENDED_RESULT_SCHEMA = {
 }
 
 
+class ResultIterations(object):
+    """Iterations of a task result, streamed from DB in timestamp order.
+
+    Results are stored in chunks while the scenario runs (see
+    ResultConsumer), so only chunks that may contain the next iteration are
+    loaded. Results stored before chunking was introduced keep their
+    iterations inline in data["raw"]; they are served as is.
+    """
+
+    def __init__(self, task_result_id, raw=None):
+        """ResultIterations constructor.
+
+        :param task_result_id: ID of TaskResult or None if there are no
+                               chunks to load
+        :param raw: list of iterations stored inline in TaskResult data
+        """
+        self.task_result_id = task_result_id
+        self.raw = raw or []
+        self._chunks = None
+
+    def _get_chunks(self):
+        if self._chunks is None:
+            if self.task_result_id is None:
+                self._chunks = []
+            else:
+                self._chunks = [
+                    {"id": c["id"], "iterations_count": c["iterations_count"],
+                     "min_timestamp": c["min_timestamp"]}
+                    for c in db.task_result_chunk_list(self.task_result_id)]
+        return self._chunks
+
+    def __len__(self):
+        return len(self.raw) + sum(c["iterations_count"]
+                                   for c in self._get_chunks())
+
+    def __iter__(self):
+        chunks = collections.deque(self._get_chunks())
+        if not chunks:
+            for itr in self.raw:
+                yield itr
+            return
+
+        heap = []
+        counter = itertools.count()
+
+        def push(iterations):
+            for itr in iterations:
+                heapq.heappush(heap, (itr["timestamp"], next(counter), itr))
+
+        push(self.raw)
+        while chunks or heap:
+            while chunks and (not heap
+                              or chunks[0]["min_timestamp"] <= heap[0][0]):
+                push(db.task_result_chunk_get(chunks.popleft()["id"]))
+            yield heapq.heappop(heap)[2]
+
+
+class DurationStats(object):
+    """Summary of a stream of durations, as shown in "task detailed"."""
+
+    QUANTILES = (("median", 0.5), ("90%ile", 0.9), ("95%ile", 0.95))
+
+    def __init__(self):
+        self.min = streaming_algorithms.MinComputation()
+        self.max = streaming_algorithms.MaxComputation()
+        self.avg = streaming_algorithms.MeanComputation()
+        self.sketch = streaming_algorithms.QuantileSketch()
+
+    def add(self, duration):
+        for computation in (self.min, self.max, self.avg, self.sketch):
+            computation.add(duration)
+
+    def to_dict(self):
+        if not self.avg.count:
+            return dict([("min", None), ("max", None), ("avg", None),
+                         ("count", 0)] +
+                        [(name, None) for name, percent in self.QUANTILES])
+        return dict([("min", self.min.result()), ("max", self.max.result()),
+                     ("avg", self.avg.result()), ("count", self.avg.count)] +
+                    [(name, self.sketch.quantile(percent))
+                     for name, percent in self.QUANTILES])
+
+
+class ResultInfo(object):
+    """Aggregated data of task result iterations, computed incrementally.
+
+    ResultConsumer feeds every iteration here while the scenario runs and
+    stores the aggregates in TaskResult data["info"], so they are available
+    without loading the iterations.
+    """
+
+    def __init__(self):
+        self.atomic = costilius.OrderedDict()
+        self.output_names = set()
+        self.iterations_count = streaming_algorithms.IncrementComputation()
+        self.iterations_failed = streaming_algorithms.IncrementComputation()
+        self.min_duration = streaming_algorithms.MinComputation()
+        self.max_duration = streaming_algorithms.MaxComputation()
+        self.durations = DurationStats()
+        self.tstamp_start = streaming_algorithms.MinComputation()
+        self.schedule = {}
+
+    @staticmethod
+    def _result(computation, default=0):
+        try:
+            return computation.result()
+        except ValueError:
+            return default
+
+    def _schedule_second(self, timestamp):
+        second = int(math.floor(timestamp))
+        if second not in self.schedule:
+            self.schedule[second] = [
+                streaming_algorithms.IncrementComputation(),
+                streaming_algorithms.MeanComputation(),
+                streaming_algorithms.MaxComputation()]
+        return self.schedule[second]
+
+    def _add_schedule(self, intended, actual):
+        # NOTE: Results come in the order they finish, so iterations are
+        #       counted per wall clock second rather than from the schedule
+        #       origin, which is not known until all of them are processed
+        self._schedule_second(actual)[0].add()
+        lag = max(actual - intended, 0)
+        for computation in self._schedule_second(intended)[1:]:
+            computation.add(lag)
+
+    def add(self, itr):
+        """Process a single iteration."""
+        self.iterations_count.add()
+        if "intended_timestamp" in itr:
+            self._add_schedule(itr["intended_timestamp"], itr["timestamp"])
+        for atomic_name, duration in itr["atomic_actions"].items():
+            if atomic_name not in self.atomic:
+                self.atomic[atomic_name] = (
+                    streaming_algorithms.MinComputation(),
+                    streaming_algorithms.MaxComputation(),
+                    DurationStats())
+            min_comp, max_comp, stats = self.atomic[atomic_name]
+            min_comp.add(duration or 0)
+            max_comp.add(duration or 0)
+            if duration is not None:
+                stats.add(duration)
+
+        self.output_names.update(itr["scenario_output"]["data"].keys())
+        self.tstamp_start.add(itr["timestamp"])
+
+        if itr["error"]:
+            self.iterations_failed.add()
+        else:
+            self.min_duration.add(itr["duration"] or 0)
+            self.max_duration.add(itr["duration"] or 0)
+            self.durations.add(itr["duration"] or 0)
+
+    def to_dict(self):
+        """Return aggregated data in the TaskResult data["info"] format."""
+        atomic = costilius.OrderedDict()
+        for atomic_name, (min_comp, max_comp, stats) in self.atomic.items():
+            atomic[atomic_name] = {"min_duration": min_comp.result(),
+                                   "max_duration": max_comp.result(),
+                                   "durations": stats.to_dict()}
+        info = {"atomic": atomic,
+                "output_names": sorted(self.output_names),
+                "iterations_count": self.iterations_count.result(),
+                "iterations_failed": self.iterations_failed.result(),
+                "min_duration": self._result(self.min_duration),
+                "max_duration": self._result(self.max_duration),
+                "durations": self.durations.to_dict(),
+                "tstamp_start": self._result(self.tstamp_start)}
+        if self.schedule:
+            first = min(self.schedule)
+            info["schedule"] = [
+                {"second": second - first,
+                 "started": started.result(),
+                 "lag_avg": lag_avg.result() if lag_avg.count else 0,
+                 "lag_max": self._result(lag_max)}
+                for second, (started, lag_avg, lag_max)
+                in sorted(self.schedule.items())]
+        return info
+
+
 class Task(object):
     """Represents a task object."""
 
@@ -257,6 +449,15 @@ class Task(object):
     def list(status=None, deployment=None):
         return [Task(db_task) for db_task in db.task_list(status, deployment)]
 
+    @staticmethod
+    def list_brief(status=None, deployment=None):
+        """Return dicts with the data of tasks shown by `rally task list`.
+
+        Unlike list(), it does not load logs of tasks and does not query
+        deployments one by one for their names.
+        """
+        return db.task_list_brief(status=status, deployment=deployment)
+
     @staticmethod
     def delete_by_uuid(uuid, status=None):
         db.task_delete(uuid, status=status)
@@ -279,7 +480,19 @@ class Task(object):
                       "verification_log": json.dumps(log)})
 
     def get_results(self):
-        return db.task_result_get_all_by_uuid(self.task["uuid"])
+        """Return task results with iterations streamed from DB.
+
+        :returns: list of dicts with TaskResult fields, where data["raw"]
+                  is ResultIterations instance
+        """
+        results = []
+        for db_result in db.task_result_get_all_by_uuid(self.task["uuid"]):
+            result = dict(db_result)
+            result["data"] = dict(result["data"])
+            result["data"]["raw"] = ResultIterations(
+                result["id"], result["data"].get("raw"))
+            results.append(result)
+        return results
 
     @classmethod
     def extend_results(cls, results, serializable=False):
@@ -310,12 +523,21 @@ class Task(object):
                   info:
                       atomic - dict where key is one of atomic action names
                                and value is dict {min_duration: number,
-                                                  max_duration: number}
+                                                  max_duration: number,
+                                                  durations: dict}
                       output_names - list of str output values names (if any)
                       iterations_count - int number of iterations
                       iterations_failed - int number of iterations with errors
                       min_duration - float minimum iteration duration
                       max_duration - float maximum iteration duration
+                      durations - dict with min, median, 90%ile, 95%ile,
+                                  max, avg and count of durations (of
+                                  successful iterations or atomic actions
+                                  that have finished)
+                      schedule - list of dicts with achieved rate ("started")
+                                 and schedule lag (avg and max) per second,
+                                 only for iterations started from a
+                                 schedule (with intended_timestamp)
                       tstamp_start - float timestamp of the first iteration
                       full_duration - float full scenario duration
                       load_duration - float load scenario duration
@@ -323,37 +545,14 @@ class Task(object):
         extended = []
         for scenario_result in results:
             scenario = dict(scenario_result)
-            tstamp_start = 0
-            min_duration = 0
-            max_duration = 0
-            iterations_failed = 0
-            atomic = costilius.OrderedDict()
-            output_names = set()
-
-            for itr in scenario["data"]["raw"]:
-                for atomic_name, duration in itr["atomic_actions"].items():
-                    duration = duration or 0
-                    if atomic_name not in atomic:
-                        atomic[atomic_name] = {"min_duration": duration,
-                                               "max_duration": duration}
-                    elif duration < atomic[atomic_name]["min_duration"]:
-                        atomic[atomic_name]["min_duration"] = duration
-                    elif duration > atomic[atomic_name]["max_duration"]:
-                        atomic[atomic_name]["max_duration"] = duration
-
-                output_names.update(itr["scenario_output"]["data"].keys())
-
-                if not tstamp_start or itr["timestamp"] < tstamp_start:
-                    tstamp_start = itr["timestamp"]
-
-                if itr["error"]:
-                    iterations_failed += 1
-                else:
-                    duration = itr["duration"] or 0
-                    if not min_duration or duration < min_duration:
-                        min_duration = duration
-                    if not max_duration or duration > max_duration:
-                        max_duration = duration
+            info = scenario["data"].get("info")
+            if info is None:
+                # NOTE: results stored before aggregates were computed
+                #       by ResultConsumer
+                result_info = ResultInfo()
+                for itr in scenario["data"]["raw"]:
+                    result_info.add(itr)
+                info = result_info.to_dict()
 
             for k in "created_at", "updated_at":
                 if serializable:
@@ -364,18 +563,14 @@ class Task(object):
                 else:
                     del scenario[k]
 
-            scenario["info"] = {
-                "atomic": atomic,
-                "output_names": list(output_names),
-                "iterations_count": len(scenario["data"]["raw"]),
-                "iterations_failed": iterations_failed,
-                "min_duration": min_duration,
-                "max_duration": max_duration,
-                "tstamp_start": tstamp_start,
-                "full_duration": scenario["data"]["full_duration"],
-                "load_duration": scenario["data"]["load_duration"]}
+            scenario["info"] = dict(
+                info,
+                full_duration=scenario["data"]["full_duration"],
+                load_duration=scenario["data"]["load_duration"])
+            # NOTE: scenarios that run in parallel share the same timeline
+            scenario["info"].setdefault("tstamp_base", info["tstamp_start"])
             if serializable:
-                scenario["iterations"] = scenario["data"]["raw"]
+                scenario["iterations"] = list(scenario["data"]["raw"])
             else:
                 scenario["iterations"] = iter(scenario["data"]["raw"])
             scenario["sla"] = scenario["data"]["sla"]
@@ -386,7 +581,13 @@ class Task(object):
         return extended
 
     def append_results(self, key, value):
-        db.task_result_create(self.task["uuid"], key, value)
+        return db.task_result_create(self.task["uuid"], key, value)
+
+    def update_results(self, result_id, value):
+        db.task_result_update(result_id, value)
+
+    def append_results_chunk(self, result_id, iterations):
+        db.task_result_chunk_create(result_id, iterations)
 
     def delete(self, status=None):
         db.task_delete(self.task["uuid"], status=status)
@@ -14,10 +14,13 @@
 
 import itertools
 
+from rally.common.db.sqlalchemy import types as db_types
 from rally.common import log
+from rally import jcsclients
 from rally import osclients
 from rally.plugins.openstack.context.cleanup import base as cleanup_base
 from rally.plugins.openstack.context.keystone import users
+from rally.plugins.openstack import scenario as openstack_scenario
 from rally.plugins.openstack.scenarios.cinder import utils as cinder_utils
 from rally.plugins.openstack.scenarios.ec2 import utils as ec2_utils
 from rally.plugins.openstack.scenarios.glance import utils as glance_utils
@@ -28,6 +31,11 @@ from rally.plugins.openstack.scenarios.murano import utils as murano_utils
 from rally.plugins.openstack.scenarios.nova import utils as nova_utils
 from rally.plugins.openstack.scenarios.sahara import utils as sahara_utils
 from rally.plugins.openstack.scenarios.vm import utils as vm_utils
+from rally.task import distributed
+from rally.task import engine
+from rally.task import progress
+from rally.task import runner
+from rally.task import types
 from rally.verification.tempest import config as tempest_conf
 
 
@@ -35,6 +43,7 @@ def list_opts():
     return [
         ("DEFAULT",
          itertools.chain(log.DEBUG_OPTS,
+                         jcsclients.JCSCLIENTS_OPTS,
                          osclients.OSCLIENTS_OPTS)),
         ("benchmark",
          itertools.chain(cinder_utils.CINDER_BENCHMARK_OPTS,
@@ -45,7 +54,15 @@ def list_opts():
                          manila_utils.MANILA_BENCHMARK_OPTS,
                          murano_utils.MURANO_BENCHMARK_OPTS,
                          nova_utils.NOVA_BENCHMARK_OPTS,
+                         openstack_scenario.STATUS_POLL_OPTS,
+                         db_types.DB_RESULTS_OPTS,
+                         distributed.DISTRIBUTED_OPTS,
+                         engine.RESULT_CONSUMER_OPTS,
+                         engine.SEMANTIC_VALIDATION_OPTS,
+                         progress.PROGRESS_OPTS,
+                         runner.RUNNER_OPTS,
                          sahara_utils.SAHARA_BENCHMARK_OPTS,
+                         types.PREPROCESS_OPTS,
                          vm_utils.VM_BENCHMARK_OPTS)),
         ("image",
          itertools.chain(tempest_conf.IMAGE_OPTS)),
@@ -42,8 +42,8 @@ def itersubclasses(cls, seen=None):
                 yield sub
 
 
-def import_modules_from_package(package):
-    """Import modules from package and append into sys.modules
+def iter_package_modules(package):
+    """Generator over (module name, file path) of modules from package.
 
     :param: package - Full package name. For example: rally.deployment.engines
     """
@@ -55,9 +55,28 @@ def import_modules_from_package(package):
                 continue
             new_package = ".".join(root.split(os.sep)).split("....")[1]
             module_name = "%s.%s" % (new_package, filename[:-3])
-            if module_name not in sys.modules:
-                sys.modules[module_name] = importutils.import_module(
-                    module_name)
+            yield module_name, os.path.abspath(os.path.join(root, filename))
+
+
+def import_modules_from_package(package):
+    """Import modules from package and append into sys.modules
+
+    :param: package - Full package name. For example: rally.deployment.engines
+    """
+    for module_name, path in iter_package_modules(package):
+        if module_name not in sys.modules:
+            sys.modules[module_name] = importutils.import_module(module_name)
+
+
+def iter_plugin_files(dir_or_file):
+    """Generator over paths of files that load_plugins() loads."""
+    if os.path.isdir(dir_or_file):
+        for root, dirs, files in os.walk(dir_or_file, followlinks=True):
+            for plugin in files:
+                if plugin.endswith(".py"):
+                    yield os.path.abspath(os.path.join(root, plugin))
+    elif os.path.isfile(dir_or_file):
+        yield os.path.abspath(dir_or_file)
 
 
 def load_plugins(dir_or_file):
@@ -0,0 +1,111 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""On-disk manifest of modules with plugins.
+
+Importing all the modules with plugins is slow, so the manifest maps plugin
+names to files where plugins are defined, and only modules with plugins that
+are actually used can be imported. Manifest is outdated as soon as any of the
+files is added, removed or modified.
+"""
+
+import json
+import os
+import sys
+
+from rally.common import log as logging
+from rally.common.plugin import plugin
+
+
+LOG = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+def _get_module_file(module_name):
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    if path:
+        return os.path.abspath(os.path.splitext(path)[0] + ".py")
+
+
+def build(sources):
+    """Build manifest of loaded plugins.
+
+    :param sources: list of (module name, file path) of all the modules with
+                    plugins. Module name is None for files that are loaded
+                    by path, e.g. from ~/.rally/plugins
+    :returns: manifest dict
+    """
+    modules = dict((path, {"name": name, "mtime": os.path.getmtime(path)})
+                   for name, path in sources)
+    plugins = {}
+    for p in plugin.Plugin.get_all():
+        path = _get_module_file(p.__module__)
+        if p.get_name() and path in modules:
+            paths = plugins.setdefault(p.get_name(), [])
+            if path not in paths:
+                paths.append(path)
+
+    return {"version": VERSION, "modules": modules, "plugins": plugins}
+
+
+def load(path, sources):
+    """Load manifest from file.
+
+    :param path: path to manifest file
+    :param sources: list of (module name, file path) of all the modules with
+                    plugins, see build()
+    :returns: manifest dict or None if manifest is missing or outdated
+    """
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (IOError, ValueError):
+        return None
+
+    if manifest.get("version") != VERSION:
+        return None
+
+    modules = manifest.get("modules", {})
+    names = dict((module_path, module["name"])
+                 for module_path, module in modules.items())
+    if names != dict((module_path, name) for name, module_path in sources):
+        return None
+    for module_path, module in modules.items():
+        try:
+            if os.path.getmtime(module_path) != module["mtime"]:
+                return None
+        except OSError:
+            return None
+    return manifest
+
+
+def save(path, manifest):
+    """Save manifest to file, errors are only logged.
+
+    :param path: path to manifest file
+    :param manifest: manifest dict, see build()
+    """
+    tmp_path = "%s.%s" % (path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        # NOTE: rename is atomic, so concurrent processes never load
+        #       partially written manifest
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to save plugins manifest %(path)s: %(e)s"
+                  % {"path": path, "e": e})
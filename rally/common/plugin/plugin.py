@@ -13,12 +13,53 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import weakref
+
 from rally.common.plugin import discover
 from rally.common.plugin import info
 from rally.common.plugin import meta
 from rally import exceptions
 
 
+# NOTE: Index of configured plugins, so Plugin.get() does not walk the whole
+#       class tree: name -> list of weak references to plugin classes (one
+#       per namespace).
+_REGISTRY = {}
+
+# NOTE: Imports modules with plugins on demand, see set_lazy_loader()
+_LAZY_LOADER = None
+
+
+def set_lazy_loader(loader):
+    """Set loader that imports modules with plugins on lookup misses.
+
+    :param loader: object with load(name) method that imports modules that
+                   provide plugin with such name and returns True if any
+                   module was imported, and load_all() method that imports
+                   all modules with plugins. None disables lazy loading.
+    """
+    global _LAZY_LOADER
+    _LAZY_LOADER = loader
+
+
+def _load_all_plugins():
+    loader = _LAZY_LOADER
+    if loader:
+        set_lazy_loader(None)
+        loader.load_all()
+
+
+def _registered(name):
+    """Return alive configured plugin classes with specified name."""
+    plugins = []
+    for ref in _REGISTRY.get(name, []):
+        p = ref()
+        if (p is not None and p._meta_is_inited(raise_exc=False)
+                and p._meta_get("name") == name):
+            plugins.append(p)
+    return plugins
+
+
 def deprecated(reason, rally_version):
     """Mark plugin as deprecated.
 
@@ -137,18 +178,24 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
     @classmethod
     def unregister(cls):
         """Removes all pluign meta information and makes it indiscoverable."""
+        name = cls._meta_get("name")
+        refs = [ref for ref in _REGISTRY.get(name, [])
+                if ref() not in (None, cls)]
+        if refs:
+            _REGISTRY[name] = refs
+        else:
+            _REGISTRY.pop(name, None)
         cls._meta_clear()
 
     @classmethod
     def _set_name_and_namespace(cls, name, namespace):
-        try:
-            Plugin.get(name, namespace=namespace)
-        except exceptions.PluginNotFound:
-            cls._meta_set("name", name)
-            cls._meta_set("namespace", namespace)
-        else:
-            raise exceptions.PluginWithSuchNameExists(name=name,
-                                                      namespace=namespace)
+        for p in _registered(name):
+            if p.get_namespace() == namespace:
+                raise exceptions.PluginWithSuchNameExists(name=name,
+                                                          namespace=namespace)
+        cls._meta_set("name", name)
+        cls._meta_set("namespace", namespace)
+        _REGISTRY.setdefault(name, []).append(weakref.ref(cls))
 
     @classmethod
     def _set_deprecated(cls, reason, rally_version):
@@ -168,8 +215,9 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
     def get(cls, name, namespace=None):
         """Return plugin by it's name from specified namespace.
 
-        This method iterates over all subclasses of cls and returns plugin
-        by name from specified namespace.
+        Plugins are looked up in the index of configured plugins, only
+        subclasses of cls are returned. If lazy loading is enabled, modules
+        with plugins are imported on lookup misses.
 
         If namespace is not specified it will return first found plugin from
         any of namespaces.
@@ -177,13 +225,27 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         :param name: Plugin's name
         :param namespace: Namespace where to search for plugins
         """
-        for p in cls.get_all(namespace=namespace):
-            if p.get_name() == name:
-                return p
+        p = cls._get_registered(name, namespace)
+        if p is None and _LAZY_LOADER and _LAZY_LOADER.load(name):
+            p = cls._get_registered(name, namespace)
+        if p is None and _LAZY_LOADER:
+            # NOTE: Discovery manifest can be stale, e.g. plugin
+            #       was moved, so search in all the modules.
+            _load_all_plugins()
+            p = cls._get_registered(name, namespace)
+        if p is not None:
+            return p
 
         raise exceptions.PluginNotFound(
             name=name, namespace=namespace or "any of")
 
+    @classmethod
+    def _get_registered(cls, name, namespace=None):
+        for p in _registered(name):
+            if p is not cls and issubclass(p, cls):
+                if not namespace or namespace == p.get_namespace():
+                    return getattr(p, "func_ref", p)
+
     @classmethod
     def get_all(cls, namespace=None):
         """Return all subclass plugins of plugin.
@@ -192,6 +254,7 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
 
         :param namespace: return only plugins from specified namespace.
         """
+        _load_all_plugins()
         plugins = []
 
         for p in discover.itersubclasses(cls):
@@ -14,13 +14,14 @@
 #    under the License.
 
 import abc
+import bisect
 import math
+import random
 
 import six
 
 from rally.common.i18n import _
 from rally import exceptions
-from rally.task.processing import utils
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -125,30 +126,170 @@ class MaxComputation(StreamingAlgorithm):
         return self._value
 
 
+class QuantileSketch(object):
+    """Mergeable quantile sketch for a stream of numbers.
+
+    This is the KLL sketch (Karnin, Lang, Liberty, "Optimal Quantile
+    Approximation in Streams", 2016). Values are kept in a hierarchy of
+    compactors, where compactor h holds values of weight 2 ** h. When the
+    sketch is full, a full compactor is sorted and every other value
+    (starting from a pseudo-random offset) is promoted to the next one, so
+    the sketch holds O(k + log(n)) values for a stream of n values and
+    does not need n in advance.
+
+    Quantiles are exact while the stream is shorter than k values. After
+    that, the rank of a returned value differs from the requested one by
+    at most eps * n with high probability, where eps is O(1 / k); with the
+    default k=200 it is below 2%.
+
+    Sketches with the same k can be merged, e.g. to combine results
+    collected by different workers. Offsets come from a generator with a
+    fixed seed, so the same values added in the same order give the same
+    quantiles, e.g. when stored results are reported again.
+    """
+
+    # Capacity ratio of neighbour compactors, 2/3 is the value suggested
+    # by the authors
+    CAPACITY_RATIO = 2.0 / 3.0
+
+    def __init__(self, k=200):
+        if k < 8:
+            raise ValueError("Unexpected k: %s" % k)
+        self.k = k
+        self._compactors = [[]]
+        self._count = 0
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._random = random.Random(0)
+
+    def __len__(self):
+        return self._count
+
+    def _capacity(self, level):
+        depth = len(self._compactors) - level - 1
+        return int(math.ceil(self.k * self.CAPACITY_RATIO ** depth)) + 1
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(level)
+                             for level in range(len(self._compactors)))
+
+    def _compress(self):
+        for level in range(len(self._compactors)):
+            items = self._compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._grow()
+                items.sort()
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._random.randint(0, 1)
+                self._compactors[level + 1].extend(items[offset::2])
+                self._compactors[level] = leftover
+                self._size = sum(len(c) for c in self._compactors)
+                if self._size < self._max_size:
+                    break
+
+    def add(self, value):
+        """Process a single value from the input stream."""
+        self._compactors[0].append(value)
+        self._count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values):
+        """Process a sequence of values from the input stream.
+
+        The result is the same as of add() called for each value, but
+        values are appended in slices that fill the sketch up.
+
+        :param values: list of values
+        """
+        start = 0
+        while start < len(values):
+            stop = start + max(self._max_size - self._size, 1)
+            items = values[start:stop]
+            self._compactors[0].extend(items)
+            self._count += len(items)
+            self._size += len(items)
+            if self._size >= self._max_size:
+                self._compress()
+            start = stop
+
+    def merge(self, other):
+        """Merge other sketch into this one.
+
+        :param other: QuantileSketch instance with the same k
+        """
+        if other.k != self.k:
+            raise ValueError("Unable to merge sketches with different k: "
+                             "%s and %s" % (self.k, other.k))
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, items in enumerate(other._compactors):
+            self._compactors[level].extend(items)
+        self._count += other._count
+        self._size = sum(len(c) for c in self._compactors)
+        while self._size >= self._max_size:
+            self._compress()
+
+    def quantile(self, percent):
+        """Return the quantile of values processed so far.
+
+        Like rally.task.processing.utils.percentile(), this interpolates
+        linearly between the closest ranks.
+
+        :param percent: float value from 0.0 to 1.0
+        :returns: float quantile value
+        """
+        if not 0 <= percent <= 1:
+            raise ValueError("Unexpected percent: %s" % percent)
+        items = sorted((value, 2 ** level)
+                       for level, compactor in enumerate(self._compactors)
+                       for value in compactor)
+        if not items:
+            raise ValueError("No values have been processed")
+
+        ranks = []
+        total = 0
+        for value, weight in items:
+            total += weight
+            ranks.append(total)
+
+        def value_at(rank):
+            return items[bisect.bisect_right(ranks, rank)][0]
+
+        k = (total - 1) * percent
+        f = math.floor(k)
+        c = math.ceil(k)
+        if f == c:
+            return value_at(k)
+        return value_at(f) * (c - k) + value_at(c) * (k - f)
+
+
 class PercentileComputation(StreamingAlgorithm):
     """Compute percentile value from a stream of numbers."""
 
-    def __init__(self, percent, length):
+    def __init__(self, percent, length=None):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: count of the measurements, not used anymore and
+                       kept for backward compatibility
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
         self._percent = percent
-
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+        self._sketch = QuantileSketch()
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        self._sketch.add(self._cast_to_float(value))
+
+    def merge(self, other):
+        self._sketch.merge(other._sketch)
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if not results:
-            raise ValueError("No values have been processed")
-        return utils.percentile(results, self._percent)
+        return self._sketch.quantile(self._percent)
 
 
 class IncrementComputation(StreamingAlgorithm):
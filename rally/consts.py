@@ -75,6 +75,14 @@ class _DeployStatus(utils.ImmutableMixin, utils.EnumMixin):
     CLEANUP_FAILED = "cleanup->failed"
 
 
+class _WorkerJobStatus(utils.ImmutableMixin, utils.EnumMixin):
+    PENDING = "pending"
+    RUNNING = "running"
+    ABORTING = "aborting"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+
 class _EndpointPermission(utils.ImmutableMixin, utils.EnumMixin):
     ADMIN = "admin"
     USER = "user"
@@ -177,6 +185,7 @@ class _ServiceType(utils.ImmutableMixin, utils.EnumMixin):
 
 TaskStatus = _TaskStatus()
 DeployStatus = _DeployStatus()
+WorkerJobStatus = _WorkerJobStatus()
 EndpointPermission = _EndpointPermission()
 ServiceType = _ServiceType()
 Service = _Service()
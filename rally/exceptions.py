@@ -75,6 +75,10 @@ class InvalidBenchmarkConfig(InvalidTaskException):
                 "\nReason:\n %(reason)s")
 
 
+class InvalidResultsFile(RallyException):
+    msg_fmt = _("Invalid task results file: %(message)s")
+
+
 class NotFoundException(RallyException):
     msg_fmt = _("Not found.")
 
@@ -212,6 +216,14 @@ class WorkerAlreadyRegistered(RallyException):
     msg_fmt = _("Worker %(worker)s already registered")
 
 
+class NoWorkersAvailable(RallyException):
+    msg_fmt = _("There are no alive workers to run the scenario")
+
+
+class WorkerJobFailed(RallyException):
+    msg_fmt = _("Job %(job)s failed on worker %(worker)s: %(reason)s")
+
+
 class SaharaClusterFailure(RallyException):
     msg_fmt = _("Sahara cluster %(name)s has failed to %(action)s. "
                 "Reason: '%(reason)s'")
@@ -15,9 +15,12 @@
 
 import abc
 import os
+import threading
+import time
 
 from oslo_config import cfg
 
+from rally.common import costilius
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import objects
@@ -37,13 +40,133 @@ JCSCLIENTS_OPTS = [
                 deprecated_for_removal=True),
     cfg.StrOpt("jcs_https_cacert", default=None,
                help="Path to CA server certificate for SSL",
-               deprecated_for_removal=True)
+               deprecated_for_removal=True),
+    cfg.IntOpt("jcs_client_pool_size", default=64,
+               help="Maximum number of boto3 clients kept in the per-process"
+                    " client pool"),
+    cfg.FloatOpt("jcs_client_pool_idle_timeout", default=600.0,
+                 help="Time in seconds after which an unused boto3 client is"
+                      " evicted from the client pool")
 ]
 CONF.register_opts(JCSCLIENTS_OPTS)
 
 _NAMESPACE = "jcs"
 
 
+class ClientPool(object):
+    """Thread-safe LRU pool of boto3 clients with idle eviction.
+
+    Clients are keyed by credentials, region, service and endpoint. Clients
+    are built outside the pool lock, so a slow build does not block lookups
+    of other keys. Concurrent iterations asking for the same missing key
+    wait on a per-key lock for one client instead of building several.
+    """
+
+    def __init__(self, max_size=None, idle_timeout=None):
+        self.max_size = max_size or CONF.jcs_client_pool_size
+        self.idle_timeout = (CONF.jcs_client_pool_idle_timeout
+                             if idle_timeout is None else idle_timeout)
+        self.pid = os.getpid()
+        self._clients = costilius.OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.built = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _evict(self, now):
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if (len(self._clients) <= self.max_size
+                    and now - last_used <= self.idle_timeout):
+                break
+            del self._clients[key]
+            self.evicted += 1
+
+    def _reuse(self, key, now):
+        """Return pooled client and mark it as used, must hold the lock."""
+        entry = self._clients.pop(key, None)
+        if entry is None:
+            return None
+        self.reused += 1
+        # Re-inserting keeps the most recently used client at the end,
+        # so eviction only has to look at the front of the pool.
+        self._clients[key] = (entry[0], now)
+        return entry[0]
+
+    def get(self, key, create):
+        """Return client for key, building it with create() if missing.
+
+        :param key: hashable pool key
+        :param create: callable without arguments that builds a new client
+        :returns: tuple (client, True if client was built by this call)
+        """
+        with self._lock:
+            self._evict(time.time())
+            client = self._reuse(key, time.time())
+            if client is not None:
+                return client, False
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # NOTE: Other thread could build the client while this one
+                #       was waiting for the key lock
+                client = self._reuse(key, time.time())
+            if client is not None:
+                return client, False
+            try:
+                client = create()
+            except Exception:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+            with self._lock:
+                # NOTE: The key lock is dropped together with inserting
+                #       the client, so a thread that misses the pool always
+                #       waits for the build in progress
+                self._key_locks.pop(key, None)
+                self.built += 1
+                self._clients[key] = (client, time.time())
+                self._evict(time.time())
+            return client, True
+
+    def evict(self):
+        """Evict idle clients without looking up any key."""
+        with self._lock:
+            self._evict(time.time())
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self):
+        self.evict()
+        return len(self._clients)
+
+    def stats(self):
+        self.evict()
+        return {"size": len(self._clients), "built": self.built,
+                "reused": self.reused, "evicted": self.evicted}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return client pool of the current process.
+
+    Runner workers are forked processes, and sharing HTTPS connections with
+    the parent is unsafe, so a new pool is created on a pid change.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ClientPool()
+        return _pool
+
+
 def configure(name, default_version=None, default_service_type=None):
     """OpenStack client class wrapper.
 
@@ -64,8 +187,9 @@ def configure(name, default_version=None, default_service_type=None):
 
 
 class JCSClient(plugin.Plugin):
-    def __init__(self, cache_obj):
+    def __init__(self, cache_obj, stats=None):
         self.cache = cache_obj
+        self.stats = stats
 
     def choose_version(self, version=None):
         """Return version string.
@@ -96,31 +220,54 @@ class JCSClient(plugin.Plugin):
         return self._meta_get("default_service_type")
 
     def _get_session(self, auth):
-	from boto3.session import Session
-	session = Session(aws_access_key_id=auth.jcs_access_key_id, \
-			  aws_secret_access_key=auth.jcs_secret_access_key, \
-			  region_name = auth.region_name)
-			
+        from boto3.session import Session
+        session = Session(aws_access_key_id=auth.jcs_access_key_id,
+                          aws_secret_access_key=auth.jcs_secret_access_key,
+                          region_name=auth.region_name)
+
         return session
 
-    def get_session(self, aws_access_key_id=None, aws_secret_access_key=None, region_name=None):
-	return Session(aws_access_key_id=aws_access_key_id, 
-			aws_secret_access_key=aws_secret_access_key, 
-			region_name=region_name)
-    
+    def get_session(self, aws_access_key_id=None, aws_secret_access_key=None,
+                    region_name=None):
+        return Session(aws_access_key_id=aws_access_key_id,
+                       aws_secret_access_key=aws_secret_access_key,
+                       region_name=region_name)
+
     def _get_client(self, service_name, auth=None):
-	return self._get_session(auth).client(service_name)
+        return self._get_session(auth).client(service_name)
 
-    def get_client(self, service_name, region_name=None, api_version=None, use_ssl=True,
-		verify=None, endpoint_url=None, aws_access_key_id=None, 
-		aws_secret_access_key=None, aws_session_token=None, config=None):
-	return self.get_session(aws_access_key_id=aws_access_key_id, 
-		aws_secret_access_key=aws_secret_access_key, region_name=region_name).client(service_name= service_name,
-		region_name=region_name, use_ssl=use_ssl, verify=verify, endpoint_url=endpoint_url, 
-		aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key, config=config)
+    def get_client(self, service_name, region_name=None, api_version=None,
+                   use_ssl=True, verify=None, endpoint_url=None,
+                   aws_access_key_id=None, aws_secret_access_key=None,
+                   aws_session_token=None, config=None):
+        """Return boto3 client from the process-wide client pool.
+
+        Clients are shared between iterations and threads of the current
+        process, so boto3 session construction, service model loading and
+        HTTPS connection pool setup are paid only once per key.
+        """
+        key = (aws_access_key_id, aws_secret_access_key, region_name,
+               service_name, endpoint_url, api_version, use_ssl, verify,
+               config)
+
+        def create():
+            session = self.get_session(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                region_name=region_name)
+            return session.client(
+                service_name=service_name, region_name=region_name,
+                use_ssl=use_ssl, verify=verify, endpoint_url=endpoint_url,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key, config=config)
+
+        client, built = get_pool().get(key, create)
+        if self.stats is not None:
+            self.stats["built" if built else "reused"] += 1
+        return client
 
     def _get_resource(self, service_name, auth=None):
-	return self._get_session(auth).resource(service_name)
+        return self._get_session(auth).resource(service_name)
 
     @abc.abstractmethod
     def create_client(self, *args, **kwargs):
@@ -148,15 +295,16 @@ class JCS_EC2(JCSClient):
 
 @configure("jcs_vpc")
 class JCS_VPC(JCSClient):
-        def create_client(self, *args, **kwargs):
-                vpc_client = self._get_client("ec2",
-						aws_access_key_id=kwargs["access_key"],
-                                                aws_secret_access_key=kwargs["secret_key"],
-                                                region_name="RegionOne", 
-                                                api_version="2016-03-01", 
-						endpoint_url="https://vpc.ind-west-1.staging.jiocloudservices.com")
-                return vpc_client
-
+    def create_client(self, *args, **kwargs):
+        vpc_client = self.get_client(
+            "ec2",
+            aws_access_key_id=kwargs["access_key"],
+            aws_secret_access_key=kwargs["secret_key"],
+            region_name="RegionOne",
+            api_version="2016-03-01",
+            endpoint_url=(
+                "https://vpc.ind-west-1.staging.jiocloudservices.com"))
+        return vpc_client
 
 
 class Clients(object):
@@ -172,12 +320,13 @@ class Clients(object):
         if self.endpoint.cacert is None:
             self.endpoint.cacert = CONF.https_cacert
         """
-	self.cache = {}
+        self.cache = {}
+        self.pool_stats = {"built": 0, "reused": 0}
 
     def __getattr__(self, client_name):
         """Lazy load of clients."""
         return JCSClient.get(client_name, namespace=_NAMESPACE)(
-            self.cache)
+            self.cache, self.pool_stats)
 
     @classmethod
     def create_from_env(cls):
@@ -193,4 +342,3 @@ class Clients(object):
     def clear(self):
         """Remove all cached client handles."""
         self.cache = {}
-		
@@ -14,30 +14,113 @@
 #    under the License.
 
 import os
+import sys
 
 import decorator
+from oslo_utils import importutils
 
 from rally.common.plugin import discover
+from rally.common.plugin import manifest
+from rally.common.plugin import plugin
 
 
 PLUGINS_LOADED = False
 
+PACKAGES = ("rally.deployment.engines", "rally.deployment.serverprovider",
+            "rally.plugins")
+PLUGIN_PATHS = ("/opt/rally/plugins/", os.path.expanduser("~/.rally/plugins/"))
+MANIFEST_PATH = os.path.expanduser("~/.rally/plugins_manifest.json")
+
+# NOTE: Set by lazy_load() if manifest is up to date
+_LOADER = None
+
+
+class _ManifestLoader(object):
+    """Imports modules with plugins listed in manifest on demand."""
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.imported = set()
+
+    def _import(self, path):
+        self.imported.add(path)
+        name = self.manifest["modules"][path]["name"]
+        if name is None:
+            if os.path.dirname(path) not in sys.path:
+                sys.path.append(os.path.dirname(path))
+            discover.load_plugins(path)
+        elif name not in sys.modules:
+            sys.modules[name] = importutils.import_module(str(name))
+
+    def load(self, name):
+        paths = [path for path in self.manifest["plugins"].get(name, [])
+                 if path not in self.imported]
+        for path in paths:
+            self._import(path)
+        return bool(paths)
+
+    def load_all(self):
+        load()
+
+    def import_all(self):
+        for path in sorted(self.manifest["modules"]):
+            if path not in self.imported:
+                self._import(path)
+
+
+def _get_sources():
+    sources = []
+    for package in PACKAGES:
+        sources.extend(discover.iter_package_modules(package))
+    for path in PLUGIN_PATHS:
+        sources.extend((None, f) for f in discover.iter_plugin_files(path))
+    return sources
+
 
 def load():
     global PLUGINS_LOADED
 
     if not PLUGINS_LOADED:
-        discover.import_modules_from_package("rally.deployment.engines")
-        discover.import_modules_from_package("rally.deployment.serverprovider")
-        discover.import_modules_from_package("rally.plugins")
-
-        discover.load_plugins("/opt/rally/plugins/")
-        discover.load_plugins(os.path.expanduser("~/.rally/plugins/"))
+        plugin.set_lazy_loader(None)
+        if _LOADER:
+            _LOADER.import_all()
+        else:
+            for package in PACKAGES:
+                discover.import_modules_from_package(package)
+            for path in PLUGIN_PATHS:
+                discover.load_plugins(path)
 
     PLUGINS_LOADED = True
 
 
+def lazy_load():
+    """Load plugins, importing modules only when their plugins are used.
+
+    Plugin names are looked up in the discovery manifest. If it is missing
+    or outdated all the plugins are loaded and the manifest is rebuilt.
+    """
+    global _LOADER
+
+    if PLUGINS_LOADED or _LOADER:
+        return
+
+    sources = _get_sources()
+    plugins_manifest = manifest.load(MANIFEST_PATH, sources)
+    if plugins_manifest is None:
+        load()
+        manifest.save(MANIFEST_PATH, manifest.build(sources))
+    else:
+        _LOADER = _ManifestLoader(plugins_manifest)
+        plugin.set_lazy_loader(_LOADER)
+
+
 @decorator.decorator
 def ensure_plugins_are_loaded(f, *args, **kwargs):
     load()
     return f(*args, **kwargs)
+
+
+@decorator.decorator
+def ensure_plugins_are_lazy_loaded(f, *args, **kwargs):
+    lazy_load()
+    return f(*args, **kwargs)
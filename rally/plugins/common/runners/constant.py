@@ -13,9 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import multiprocessing
-import threading
 import time
 
 from rally.common import log as logging
@@ -31,11 +29,13 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
                     cls, method_name, args, aborted, info):
     """Start the scenario within threads.
 
-    Spawn threads to support scenario execution for a fixed number of times.
-    This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
-    After execution the result is appended to the queue.
+    Start a pool of `concurrency` long-lived threads to support scenario
+    execution for a fixed number of times. This generates a constant load on
+    the cloud under test by executing each scenario iteration without
+    pausing between iterations. Each thread pulls the next iteration number
+    from iteration_gen, shared by all the processes, runs the scenario
+    method with passed scenario arguments and context and appends the
+    result to the queue.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -51,52 +51,20 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
     :param info: info about all processes count and counter of launched process
     """
 
-    pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
-
     runner._log_worker_info(times=times, concurrency=concurrency,
                             timeout=timeout, cls=cls, method_name=method_name,
                             args=args)
 
-    iteration = next(iteration_gen)
-    while iteration < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(context)
-        scenario_args = (iteration, cls, method_name, scenario_context, args)
-        worker_args = (queue, scenario_args)
-
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
-        thread.start()
-        pool.append((thread, time.time()))
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t[0].isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0][0].isAlive():
-                    pool.popleft()[0].join()
-                    finished_threads_in_pool -= 1
-                break
-
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
+    def next_iteration():
+        if not aborted.is_set():
+            iteration = next(iteration_gen)
+            if iteration < times:
+                return iteration
 
-    # Wait until all threads are done
-    while pool:
-        pool.popleft()[0].join()
+    pool = runner.WorkerThreadPool(queue, next_iteration, cls, method_name,
+                                   context, args)
+    pool.spawn(concurrency)
+    pool.join()
 
 
 @runner.configure(name="constant")
@@ -0,0 +1,289 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+import multiprocessing
+import platform
+import time
+
+from rally.common import costilius
+from rally.common import log as logging
+from rally.common import utils
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+from rally.task import utils as butils
+
+asyncio = costilius.get_asyncio()
+
+LOG = logging.getLogger(__name__)
+
+
+class EventLoopWorker(object):
+    """Runs scenario iterations as concurrent tasks of an event loop.
+
+    Scenario methods should return a future or a coroutine. Every one of
+    `concurrency` slots starts an iteration, and starts the next one when
+    the future is done, so no thread is created per iteration. A method
+    that returns anything else has finished already and blocked the loop
+    meanwhile, its return value is used as the scenario output.
+
+    Scenario contexts are mapped once for at most MAX_SCENARIO_CONTEXTS
+    slots and shared round-robin, so memory does not grow with concurrency.
+    """
+
+    MAX_SCENARIO_CONTEXTS = 100
+
+    def __init__(self, loop, queue, next_iteration, cls, method_name,
+                 context, args, timeout=0):
+        """Init worker.
+
+        :param loop: event loop to run iterations in
+        :param queue: queue object to append results
+        :param next_iteration: callable that returns the next iteration
+                               number or None to stop
+        :param cls: scenario class
+        :param method_name: scenario method name
+        :param context: scenario context object
+        :param args: scenario args
+        :param timeout: iteration timeout in seconds, 0 means no timeout
+        """
+        self.loop = loop
+        self.queue = queue
+        self.next_iteration = next_iteration
+        self.scenario = (cls, method_name, context, args)
+        self.timeout = timeout
+        self.running = 0
+
+    def run(self, concurrency):
+        """Run iterations in concurrency slots until next_iteration stops.
+
+        :param concurrency: number of concurrently running iterations
+        """
+        contexts = [runner._get_scenario_context(self.scenario[2])
+                    for i in range(min(concurrency,
+                                       self.MAX_SCENARIO_CONTEXTS))]
+        self.running = concurrency
+        for i in range(concurrency):
+            self.loop.call_soon(self._start, contexts[i % len(contexts)])
+        self.loop.run_forever()
+
+    def _start(self, scenario_context):
+        iteration = self.next_iteration()
+        if iteration is None:
+            self.running -= 1
+            if not self.running:
+                self.loop.stop()
+            return
+
+        cls, method_name, context, args = self.scenario
+        LOG.info("Task %(task)s | ITER: %(iteration)s START" %
+                 {"task": context["task"]["uuid"], "iteration": iteration})
+        context_obj = dict(scenario_context)
+        context_obj["iteration"] = iteration
+        scenario_inst = cls(context_obj)
+
+        finish = functools.partial(self._finish, scenario_context, iteration,
+                                   scenario_inst, time.time())
+        try:
+            output = getattr(scenario_inst, method_name)(**args)
+            if not (asyncio.iscoroutine(output) or
+                    isinstance(output, asyncio.Future)):
+                finish(output=output)
+                return
+            future = asyncio.ensure_future(output, loop=self.loop)
+        except Exception as e:
+            finish(error=butils.format_exc(e))
+            if logging.is_debug():
+                LOG.exception(e)
+            return
+
+        timer = None
+        if self.timeout:
+            timer = self.loop.call_later(self.timeout, future.cancel)
+        future.add_done_callback(functools.partial(self._done, finish,
+                                                   timer))
+
+    def _done(self, finish, timer, future):
+        if timer:
+            timer.cancel()
+        try:
+            output = future.result()
+        except asyncio.CancelledError as e:
+            finish(result=runner.format_result_on_timeout(e, self.timeout))
+        except Exception as e:
+            finish(error=butils.format_exc(e))
+            if logging.is_debug():
+                LOG.exception(e)
+        else:
+            finish(output=output)
+
+    def _finish(self, scenario_context, iteration, scenario_inst, started,
+                output=None, error=None, result=None):
+        finished = time.time()
+        error = error or []
+        status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
+        LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
+                 {"task": self.scenario[2]["task"]["uuid"],
+                  "iteration": iteration, "status": status})
+
+        if result is None:
+            scenario_output = output or {"errors": "", "data": {}}
+            output_data = scenario_inst.output_data()
+            if output_data:
+                scenario_output.setdefault("data", {}).update(output_data)
+            idle_duration = scenario_inst.idle_duration()
+            result = {"duration": finished - started - idle_duration,
+                      "idle_duration": idle_duration,
+                      "error": error,
+                      "scenario_output": scenario_output,
+                      "atomic_actions": scenario_inst.atomic_actions()}
+        result["timestamp"] = started
+        self.queue.put(result)
+        self.loop.call_soon(self._start, scenario_context)
+
+
+def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
+                    cls, method_name, args, aborted, info):
+    """Start the scenario within an event loop.
+
+    Run `concurrency` scenario iterations at once in the event loop of the
+    process for a fixed number of times. Iteration numbers are pulled from
+    iteration_gen, shared by all the processes.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: operation's timeout
+    :param concurrency: number of concurrently running scenario iterations
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+
+    runner._log_worker_info(times=times, concurrency=concurrency,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args)
+
+    def next_iteration():
+        if not aborted.is_set():
+            iteration = next(iteration_gen)
+            if iteration < times:
+                return iteration
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        EventLoopWorker(loop, queue, next_iteration, cls, method_name,
+                        context, args, timeout).run(concurrency)
+    finally:
+        loop.close()
+
+
+@runner.configure(name="async_constant")
+class AsyncConstantScenarioRunner(runner.ScenarioRunner):
+    """Creates constant load of coroutine scenarios with an event loop.
+
+    This runner executes a scenario a specified number of times like the
+    constant runner, but concurrent iterations are tasks of an event loop
+    per worker process instead of threads, so tens of thousands of
+    iterations of I/O-bound scenarios may be in flight at once.
+
+    Scenario methods should return a future or a coroutine, e.g. ones of
+    AsyncHttpRequests. Requires Python 3.4.4 or newer.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 1
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        if asyncio is None:
+            raise exceptions.IncompatiblePythonVersion(
+                version=platform.python_version(),
+                required_version=".".join(
+                    str(v) for v in costilius.ASYNCIO_MIN_VERSION))
+
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+        times = self.config.get("times", 1)
+        concurrency = self.config.get("concurrency", 1)
+        iteration_gen = utils.RAMInt()
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(cpu_count,
+                           self.config.get("max_cpu_count", cpu_count))
+
+        processes_to_start = min(max_cpu_used, times, concurrency)
+        concurrency_per_worker, concurrency_overhead = divmod(
+            concurrency, processes_to_start)
+
+        self._log_debug_info(times=times, concurrency=concurrency,
+                             timeout=timeout, max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start,
+                             concurrency_per_worker=concurrency_per_worker,
+                             concurrency_overhead=concurrency_overhead)
+
+        result_queue = multiprocessing.Queue()
+
+        def worker_args_gen(concurrency_overhead):
+            while True:
+                yield (result_queue, iteration_gen, timeout,
+                       concurrency_per_worker + (concurrency_overhead and 1),
+                       times, context, cls, method_name, args, self.aborted)
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process,
+            worker_args_gen(concurrency_overhead))
+        self._join_processes(process_pool, result_queue)
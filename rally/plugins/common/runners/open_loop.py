@@ -0,0 +1,281 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import random
+import threading
+import time
+
+from six.moves import queue as Queue
+
+from rally.common import log as logging
+from rally.common import utils
+from rally import consts
+from rally.task import runner
+
+LOG = logging.getLogger(__name__)
+
+# NOTE: time.sleep() may oversleep by up to a scheduler tick, so the last
+#       SPIN_INTERVAL seconds before an arrival are busy-waited.
+SPIN_INTERVAL = 0.002
+MAX_SLEEP_INTERVAL = 0.1
+
+
+def get_schedule(times, rps, arrival="uniform", seed=None):
+    """Return arrival offsets (in seconds) of scenario iterations.
+
+    :param times: number of iterations
+    :param rps: average number of iterations per second
+    :param arrival: "uniform" for fixed intervals, "poisson" for
+                    exponentially distributed intervals
+    :param seed: random seed for "poisson" arrival
+    :returns: list of floats in ascending order, the first one is 0
+    """
+    if arrival == "poisson":
+        rand = random.Random(seed)
+        schedule = [0.0]
+        for i in range(times - 1):
+            schedule.append(schedule[-1] + rand.expovariate(rps))
+        return schedule
+    return [float(i) / rps for i in range(times)]
+
+
+def _sleep_until(timestamp, aborted):
+    """Sleep until timestamp or until aborted is set."""
+    while not aborted.is_set():
+        remaining = timestamp - time.time()
+        if remaining <= 0:
+            return
+        if remaining > SPIN_INTERVAL:
+            time.sleep(min(remaining - SPIN_INTERVAL, MAX_SLEEP_INTERVAL))
+
+
+class ScheduleOrigin(object):
+    """Start time of the schedule that is shared by worker processes.
+
+    The origin is taken when all the worker processes are up, so the time
+    spent on forking them is not reported as schedule lag.
+    """
+
+    def __init__(self):
+        self._ready = multiprocessing.Semaphore(0)
+        self._started = multiprocessing.Event()
+        self._value = multiprocessing.Value("d", 0.0)
+
+    def wait(self, aborted):
+        """Report the worker process is up and wait for the origin.
+
+        :param aborted: multiprocessing.Event that aborts waiting
+        :returns: origin timestamp or None if aborted
+        """
+        self._ready.release()
+        while not self._started.wait(MAX_SLEEP_INTERVAL):
+            if aborted.is_set():
+                return None
+        return self._value.value
+
+    def start(self, process_pool):
+        """Wait for worker processes and set the origin to now.
+
+        :param process_pool: worker processes that use this origin
+        """
+        ready = 0
+        while ready < len(process_pool):
+            if self._ready.acquire(True, MAX_SLEEP_INTERVAL):
+                ready += 1
+            elif not all(process.is_alive() for process in process_pool):
+                break
+        self._value.value = time.time()
+        self._started.set()
+
+
+def _worker_process(queue, iteration_gen, schedule, max_concurrent,
+                    context, cls, method_name, args, aborted, origin, info):
+    """Start scenario iterations at scheduled times.
+
+    Iterations are handed to a pool of at most max_concurrent threads that
+    is grown on demand and reused. An iteration is dispatched at its
+    scheduled time even if all threads are busy; it then waits for a free
+    thread, and the wait is reported as schedule lag instead of silently
+    lowering the load (coordinated omission).
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param schedule: list of offsets from the schedule origin to start
+                     iterations at
+    :param max_concurrent: maximum worker concurrency
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param origin: ScheduleOrigin instance
+    :param info: info about all processes count and counter of runned process
+    """
+    runner._log_worker_info(times=len(schedule), cls=cls,
+                            method_name=method_name, args=args,
+                            max_concurrent=max_concurrent)
+
+    start_time = origin.wait(aborted)
+    if start_time is None:
+        return
+
+    tasks = Queue.Queue()
+    threads = []
+    # NOTE: number of dispatched iterations that are not finished yet
+    pending = [0]
+    lock = threading.Lock()
+
+    def worker(scenario_context):
+        for intended, iteration in iter(tasks.get, None):
+            result = runner._run_scenario_once(
+                (iteration, cls, method_name, dict(scenario_context), args))
+            lag = max(result["timestamp"] - intended, 0)
+            result["intended_timestamp"] = intended
+            result["scenario_output"].setdefault("data", {}).update({
+                "schedule_lag": lag,
+                "corrected_duration": result["duration"] + lag})
+            queue.put(result)
+            with lock:
+                pending[0] -= 1
+
+    for offset in schedule:
+        intended = start_time + offset
+        _sleep_until(intended, aborted)
+        if aborted.is_set():
+            break
+        with lock:
+            spawn = (pending[0] >= len(threads) and
+                     len(threads) < max_concurrent)
+            pending[0] += 1
+        if spawn:
+            # NOTE: every thread maps the scenario context once and reuses
+            #       it, like runner.WorkerThreadPool does
+            thread = threading.Thread(
+                target=worker,
+                args=(runner._get_scenario_context(context),))
+            thread.start()
+            threads.append(thread)
+        tasks.put((intended, next(iteration_gen)))
+
+    for thread in threads:
+        tasks.put(None)
+    for thread in threads:
+        thread.join()
+
+
+@runner.configure(name="open_loop_rps")
+class OpenLoopRPSScenarioRunner(runner.ScenarioRunner):
+    """Scenario runner that starts iterations from an arrival schedule.
+
+    Start times of all the iterations are computed in advance ("uniform"
+    intervals of 1/rps or "poisson" arrivals with the average rate rps) and
+    iterations are started at these times regardless of how long previous
+    iterations take, in a reusable pool of threads in a pool of processes.
+
+    If the cloud slows down and all threads are busy, iterations are
+    started late instead of being skipped. Every result keeps the intended
+    start time; the delay is reported as "schedule_lag" and the latency
+    measured from the intended start as "corrected_duration" in the
+    scenario output. Achieved rate and schedule lag per second are stored
+    in the "schedule" of the task result info.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "rps": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "arrival": {
+                "enum": ["uniform", "poisson"]
+            },
+            "seed": {
+                "type": "integer"
+            },
+            "max_concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
+        "required": ["times", "rps"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        times = self.config["times"]
+        max_concurrency = self.config.get("max_concurrency", times)
+        iteration_gen = utils.RAMInt()
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(cpu_count,
+                           self.config.get("max_cpu_count", cpu_count))
+        processes_to_start = min(max_cpu_used, times, max_concurrency)
+        concurrency_per_worker, concurrency_overhead = divmod(
+            max_concurrency, processes_to_start)
+
+        schedule = get_schedule(times, self.config["rps"],
+                                self.config.get("arrival", "uniform"),
+                                self.config.get("seed"))
+
+        self._log_debug_info(times=times, max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start,
+                             concurrency_per_worker=concurrency_per_worker,
+                             concurrency_overhead=concurrency_overhead)
+
+        result_queue = multiprocessing.Queue()
+        origin = ScheduleOrigin()
+
+        def worker_args_gen(concurrency_overhead):
+            for i in range(processes_to_start):
+                # NOTE: iterations are distributed round-robin, so every
+                #       process gets an even share of each second.
+                yield (result_queue, iteration_gen,
+                       schedule[i::processes_to_start],
+                       concurrency_per_worker + (concurrency_overhead and 1),
+                       context, cls, method_name, args, self.aborted, origin)
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process,
+            worker_args_gen(concurrency_overhead))
+        origin.start(process_pool)
+        self._join_processes(process_pool, result_queue)
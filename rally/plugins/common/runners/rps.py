@@ -13,11 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import multiprocessing
 import threading
 import time
 
+from six.moves import queue as Queue
+
 from rally.common import log as logging
 from rally.common import utils
 from rally import consts
@@ -31,9 +32,10 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
                     args, aborted, info):
     """Start scenario within threads.
 
-    Spawn N threads per second. Each thread runs the scenario once, and appends
-    result to queue. A maximum of max_concurrent threads will be ran
-    concurrently.
+    Start N iterations per second in a pool of long-lived threads. Each
+    thread runs scenario iterations and appends results to queue. The pool
+    grows on demand up to max_concurrent threads; when all of them are busy,
+    the next iteration is not started until one of them is free.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -50,7 +52,18 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
     :param info: info about all processes count and counter of runned process
     """
 
-    pool = collections.deque()
+    iterations = Queue.Queue()
+    # NOTE: Iterations that are started but not finished yet
+    running = threading.BoundedSemaphore(max_concurrent)
+
+    def next_iteration():
+        iteration = iterations.get()
+        if not aborted.is_set():
+            return iteration
+
+    pool = runner.WorkerThreadPool(queue, next_iteration, cls, method_name,
+                                   context, args,
+                                   iteration_done=running.release)
     sleep = 1.0 / rps
 
     runner._log_worker_info(times=times, rps=rps, timeout=timeout,
@@ -63,15 +76,11 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
 
     i = 0
     while i < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(context)
-        scenario_args = (next(iteration_gen), cls, method_name,
-                         scenario_context, args)
-        worker_args = (queue, scenario_args)
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
+        running.acquire()
+        iterations.put(next(iteration_gen))
         i += 1
-        thread.start()
-        pool.append(thread)
+        if i - pool.finished > len(pool) and len(pool) < max_concurrent:
+            pool.spawn()
 
         time_gap = time.time() - start
         real_rps = i / time_gap if time_gap else "Infinity"
@@ -79,19 +88,13 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
         LOG.debug("Worker: %s rps: %s (requested rps: %s)" %
                   (i, real_rps, rps))
 
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
-        while i / (time.time() - start) > rps or len(pool) >= max_concurrent:
-            if pool:
-                pool[0].join(0.001)
-                if not pool[0].isAlive():
-                    pool.popleft()
-            else:
-                time.sleep(0.001)
-
-    while pool:
-        thr = pool.popleft()
-        thr.join()
+        delay = start + i * sleep - time.time()
+        if delay > 0 and i < times:
+            time.sleep(delay)
+
+    for thread in range(len(pool)):
+        iterations.put(None)
+    pool.join()
 
 
 @runner.configure(name="rps")
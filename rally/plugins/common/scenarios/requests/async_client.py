@@ -0,0 +1,393 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Minimal HTTP/1.1 client for event loop based scenarios.
+
+Requests are chained with future callbacks instead of coroutine syntax, so
+the module can be imported by plugin discovery on Python 2, where asyncio
+is not available. Only asyncio API of costilius.ASYNCIO_MIN_VERSION is
+used.
+"""
+
+import collections
+import socket
+import ssl
+
+import six
+from six.moves.urllib import parse
+
+from rally.common import costilius
+from rally.common.i18n import _
+
+asyncio = costilius.get_asyncio()
+
+
+PHASES = ("dns", "connect", "tls", "ttfb", "body")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# NOTE: Clients are per event loop, so connections are reused by all the
+#       iterations the loop runs
+_clients = {}
+
+
+def _copy_state(source, target):
+    """Resolve target future like source one, once it is done."""
+    def done(source):
+        if target.done():
+            return
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+
+    def cancelled(target):
+        if target.cancelled():
+            source.cancel()
+
+    source.add_done_callback(done)
+    target.add_done_callback(cancelled)
+
+
+def then(future, callback, loop, cleanup=None):
+    """Return future resolved with the result of callback(future.result()).
+
+    Errors of future and callback are set to the returned future. If
+    callback returns a future, the returned one is resolved with its result.
+
+    :param future: future or coroutine
+    :param callback: callable with the result of future as argument
+    :param loop: event loop of future
+    :param cleanup: callable without arguments that is called on error
+    :returns: asyncio.Future
+    """
+    future = asyncio.ensure_future(future, loop=loop)
+    result = asyncio.Future(loop=loop)
+
+    def done(future):
+        if not result.done():
+            try:
+                value = callback(future.result())
+            except asyncio.CancelledError:
+                result.cancel()
+            except Exception as e:
+                result.set_exception(e)
+            else:
+                if isinstance(value, asyncio.Future):
+                    _copy_state(value, result)
+                else:
+                    result.set_result(value)
+                return
+        if cleanup:
+            cleanup()
+
+    def cancelled(result):
+        if result.cancelled():
+            future.cancel()
+
+    future.add_done_callback(done)
+    result.add_done_callback(cancelled)
+    return result
+
+
+class Response(object):
+    """Response of AsyncHTTPClient.
+
+    :ivar status_code: HTTP status code
+    :ivar reason: HTTP reason phrase
+    :ivar headers: dict of headers with lower case names
+    :ivar content: response body bytes
+    :ivar timings: durations of PHASES in seconds, connection phases are
+                   zero if a connection is reused
+    """
+
+    def __init__(self, status_code, reason, headers):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = b""
+        self.timings = {}
+
+
+class _HTTPProtocol(asyncio.Protocol if asyncio else object):
+    """Connection that reads one response at a time."""
+
+    def __init__(self):
+        self.transport = None
+        self.closed = False
+        self.reusable = False
+        self._buffer = bytearray()
+        self._waiter = None
+        self._response = None
+        self._remaining = None
+        self._chunked = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.closed = True
+        if self._waiter and not self._waiter.done():
+            if (self._response is not None and self._remaining is None
+                    and not self._chunked):
+                self._finish()
+            else:
+                self._waiter.set_exception(exc or socket.error(
+                    _("Connection closed before the response was read")))
+
+    def close(self):
+        self.closed = True
+        if self.transport:
+            self.transport.close()
+
+    def request(self, message, method, loop):
+        """Send request message and return future of Response."""
+        self._waiter = asyncio.Future(loop=loop)
+        self._loop = loop
+        self._method = method
+        self._response = None
+        self._remaining = None
+        self._chunked = False
+        self._body = bytearray()
+        self._sent = loop.time()
+        self.transport.write(message)
+        return self._waiter
+
+    def data_received(self, data):
+        if self._waiter is None or self._waiter.done():
+            # NOTE: Data without request or of a cancelled request, the
+            #       connection can't be reused
+            self.close()
+            return
+        self._buffer.extend(data)
+        try:
+            if self._response is None:
+                self._parse_headers()
+            if self._response is not None:
+                self._parse_body()
+        except Exception as e:
+            self.close()
+            self._waiter.set_exception(e)
+
+    def _parse_headers(self):
+        end = self._buffer.find(b"\r\n\r\n")
+        if end < 0:
+            return
+        lines = bytes(self._buffer[:end]).decode("latin-1").split("\r\n")
+        del self._buffer[:end + 4]
+        version, status_code, reason = (lines[0].split(" ", 2) + [""])[:3]
+        headers = {}
+        for line in lines[1:]:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        self._response = Response(int(status_code), reason, headers)
+        self._response.timings["ttfb"] = self._loop.time() - self._sent
+        self._headers_received = self._loop.time()
+        self.reusable = (version == "HTTP/1.1" and
+                         headers.get("connection", "").lower() != "close")
+
+        status_code = self._response.status_code
+        if (self._method == "HEAD" or status_code in (204, 304)
+                or 100 <= status_code < 200):
+            self._remaining = 0
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            self._chunked = True
+        elif "content-length" in headers:
+            self._remaining = int(headers["content-length"])
+        else:
+            # NOTE: Body ends when the server closes the connection
+            self.reusable = False
+
+    def _parse_body(self):
+        if self._chunked:
+            self._parse_chunks()
+            return
+        if self._remaining is None:
+            self._body.extend(self._buffer)
+            del self._buffer[:]
+            return
+        data = self._buffer[:self._remaining]
+        del self._buffer[:self._remaining]
+        self._body.extend(data)
+        self._remaining -= len(data)
+        if not self._remaining:
+            self._finish()
+
+    def _parse_chunks(self):
+        while True:
+            end = self._buffer.find(b"\r\n")
+            if end < 0:
+                return
+            size = int(bytes(self._buffer[:end]).split(b";")[0], 16)
+            if not size:
+                trailer = self._buffer.find(b"\r\n", end + 2)
+                if trailer == end + 2:
+                    del self._buffer[:end + 4]
+                else:
+                    trailer = self._buffer.find(b"\r\n\r\n", end + 2)
+                    if trailer < 0:
+                        return
+                    del self._buffer[:trailer + 4]
+                self._finish()
+                return
+            if len(self._buffer) < end + size + 4:
+                return
+            self._body.extend(self._buffer[end + 2:end + 2 + size])
+            del self._buffer[:end + size + 4]
+
+    def _finish(self):
+        self._response.content = bytes(self._body)
+        self._response.timings["body"] = (self._loop.time() -
+                                          self._headers_received)
+        self._waiter.set_result(self._response)
+
+
+class AsyncHTTPClient(object):
+    """HTTP/1.1 client with keep-alive connection pools of an event loop.
+
+    Up to pool_size idle connections are kept open per host, connections
+    that are opened when all of them are busy are closed after use, like
+    connections of requests.Session with pool_block=False.
+    """
+
+    def __init__(self, loop, pool_size=10, keep_alive=True):
+        self.loop = loop
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.ssl_context = ssl.create_default_context()
+        self._idle = collections.defaultdict(collections.deque)
+
+    def request(self, method, url, headers=None, data=None):
+        """Send request and return future of Response.
+
+        :param method: Type of request method (GET | POST ..)
+        :param url: Uniform resource locator
+        :param headers: dict of additional request headers
+        :param data: request body, str or bytes
+        :returns: asyncio.Future
+        """
+        url = parse.urlsplit(url)
+        if url.scheme not in DEFAULT_PORTS:
+            raise ValueError(_("Unsupported URL scheme `%s`") % url.scheme)
+        key = (url.scheme, url.hostname,
+               url.port or DEFAULT_PORTS[url.scheme])
+        message = self._build_message(method.upper(), url, headers, data)
+        timings = dict.fromkeys(PHASES, 0)
+
+        protocol = self._pop_idle(key)
+        if protocol:
+            return self._send(key, protocol, message, method.upper(),
+                              timings)
+        return then(self._connect(key, timings),
+                    lambda protocol: self._send(key, protocol, message,
+                                                method.upper(), timings),
+                    self.loop)
+
+    def _build_message(self, method, url, headers, data):
+        host = url.hostname
+        if url.port and url.port != DEFAULT_PORTS[url.scheme]:
+            host = "%s:%s" % (host, url.port)
+        path = url.path or "/"
+        if url.query:
+            path = "%s?%s" % (path, url.query)
+        request_headers = {"Host": host, "User-Agent": "rally",
+                           "Accept": "*/*",
+                           "Connection": ("keep-alive" if self.keep_alive
+                                          else "close")}
+        request_headers.update(headers or {})
+        if isinstance(data, six.text_type):
+            data = data.encode("utf-8")
+        if data is not None:
+            request_headers["Content-Length"] = str(len(data))
+        lines = ["%s %s HTTP/1.1" % (method, path)]
+        lines.extend("%s: %s" % item for item in request_headers.items())
+        message = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return message + (data or b"")
+
+    def _pop_idle(self, key):
+        idle = self._idle[key]
+        while idle:
+            protocol = idle.pop()
+            if not protocol.closed:
+                return protocol
+
+    def _release(self, key, protocol):
+        idle = self._idle[key]
+        if (self.keep_alive and protocol.reusable and not protocol.closed
+                and len(idle) < self.pool_size):
+            idle.append(protocol)
+        else:
+            protocol.close()
+
+    def _connect(self, key, timings):
+        scheme, host, port = key
+        sock = []
+        started = [self.loop.time()]
+
+        def close():
+            if sock:
+                sock[0].close()
+
+        def resolved(addresses):
+            timings["dns"] = self.loop.time() - started[0]
+            family, type_, proto, canonname, address = addresses[0]
+            sock.append(socket.socket(family, type_, proto))
+            sock[0].setblocking(False)
+            started[0] = self.loop.time()
+            return then(self.loop.sock_connect(sock[0], address), connected,
+                        self.loop, cleanup=close)
+
+        def connected(result):
+            timings["connect"] = self.loop.time() - started[0]
+            started[0] = self.loop.time()
+            https = scheme == "https"
+            return then(self.loop.create_connection(
+                _HTTPProtocol, sock=sock[0],
+                ssl=self.ssl_context if https else None,
+                server_hostname=host if https else None), made,
+                self.loop, cleanup=close)
+
+        def made(connection):
+            if scheme == "https":
+                timings["tls"] = self.loop.time() - started[0]
+            return connection[1]
+
+        return then(self.loop.getaddrinfo(host, port,
+                                          type=socket.SOCK_STREAM),
+                    resolved, self.loop)
+
+    def _send(self, key, protocol, message, method, timings):
+        def received(response):
+            self._release(key, protocol)
+            timings.update(response.timings)
+            response.timings = timings
+            return response
+
+        return then(protocol.request(message, method, self.loop), received,
+                    self.loop, cleanup=protocol.close)
+
+
+def get_client(pool_size=10, keep_alive=True):
+    """Return AsyncHTTPClient of the current event loop.
+
+    :param pool_size: number of connections kept open per host
+    :param keep_alive: whether connections are reused between requests
+    :returns: AsyncHTTPClient instance
+    """
+    loop = asyncio.get_event_loop()
+    clients = _clients.setdefault(loop, {})
+    key = (pool_size, keep_alive)
+    if key not in clients:
+        clients[key] = AsyncHTTPClient(loop, pool_size, keep_alive)
+    return clients[key]
@@ -49,3 +49,99 @@ class HttpRequests(utils.RequestScenario):
         request = random.choice(requests)
         request.setdefault("status_code", status_code)
         self._check_request(**request)
+
+    @scenario.configure()
+    def check_pooled_request(self, url, method, status_code, pool_size=10,
+                             keep_alive=True, **kwargs):
+        """Benchmark web services with pooled keep-alive connections.
+
+        Worker threads of a process send requests with a shared session,
+        so connection setup is paid once per connection instead of once
+        per request. DNS lookup, connect, TLS handshake, time to first byte
+        and body transfer are recorded as separate atomic actions.
+
+        :param url: url for the Request object
+        :param method: method for the Request object
+        :param status_code: expected response code
+        :param pool_size: number of connections kept open per host
+        :param keep_alive: reuse connections between requests, if False
+                           every request opens a new connection
+        :param kwargs: optional additional request parameters
+        """
+
+        self._check_pooled_request(url, method, status_code,
+                                   pool_size=pool_size,
+                                   keep_alive=keep_alive, **kwargs)
+
+    @scenario.configure()
+    def check_weighted_request(self, requests, status_code, pool_size=10,
+                               keep_alive=True):
+        """Benchmark the weighted mix of requests with pooled connections.
+
+        This scenario takes random request from list of requests with
+        probability proportional to its "weight" (1 by default), sends it
+        like check_pooled_request and raises exception if the response is
+        not the expected response.
+
+        :param requests: List of request dicts
+        :param status_code: Expected Response Code it will
+        be used only if we doesn't specified it in request proper
+        :param pool_size: number of connections kept open per host
+        :param keep_alive: reuse connections between requests
+        """
+
+        request = utils.choose_weighted(requests)
+        request.setdefault("status_code", status_code)
+        request.setdefault("pool_size", pool_size)
+        request.setdefault("keep_alive", keep_alive)
+        self._check_pooled_request(**request)
+
+
+class AsyncHttpRequests(utils.AsyncRequestScenario):
+    """Benchmark scenarios for HTTP requests sent from an event loop.
+
+    Scenarios return futures, run them with the async_constant runner.
+    """
+
+    @scenario.configure()
+    def check_request(self, url, method, status_code, pool_size=10,
+                      keep_alive=True, **kwargs):
+        """Benchmark web services with many concurrent requests.
+
+        Like HttpRequests.check_pooled_request, but requests of all the
+        iterations of a worker process share one event loop and its
+        keep-alive connections.
+
+        :param url: url for the Request object
+        :param method: method for the Request object
+        :param status_code: expected response code
+        :param pool_size: number of connections kept open per host
+        :param keep_alive: reuse connections between requests, if False
+                           every request opens a new connection
+        :param kwargs: optional additional request parameters
+        """
+
+        return self._check_async_request(url, method, status_code,
+                                         pool_size=pool_size,
+                                         keep_alive=keep_alive, **kwargs)
+
+    @scenario.configure()
+    def check_weighted_request(self, requests, status_code, pool_size=10,
+                               keep_alive=True):
+        """Benchmark the weighted mix of requests sent from an event loop.
+
+        Like HttpRequests.check_weighted_request, but the request is sent
+        like AsyncHttpRequests.check_request.
+
+        :param requests: List of request dicts
+        :param status_code: Expected Response Code it will
+        be used only if we doesn't specified it in request proper
+        :param pool_size: number of connections kept open per host
+        :param keep_alive: reuse connections between requests
+        """
+
+        request = utils.choose_weighted(requests)
+        request.setdefault("status_code", status_code)
+        request.setdefault("pool_size", pool_size)
+        request.setdefault("keep_alive", keep_alive)
+        return self._check_async_request(**request)
@@ -10,13 +10,158 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
+import os
+import random
+import socket
+import threading
+
 import requests
+from requests import adapters
+from requests.packages.urllib3 import connection
+from requests.packages.urllib3 import connectionpool
 
 from rally.common.i18n import _
+from rally.common import utils
+from rally.plugins.common.scenarios.requests import async_client
 from rally.task import atomic
 from rally.task import scenario
 
 
+# NOTE: Connection phases of the current request, connections record them
+#       in the thread that sends the request
+_phases = threading.local()
+
+# NOTE: Sessions are shared by the worker threads of a process, so up to
+#       pool_size connections per host are reused by all the iterations
+#       the process runs
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+PHASES = ("dns", "connect", "tls")
+
+
+class _PhaseTimer(utils.Timer):
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __exit__(self, type_, value, tb):
+        super(_PhaseTimer, self).__exit__(type_, value, tb)
+        timings = getattr(_phases, "timings", None)
+        if timings is not None:
+            timings[self.phase] = timings.get(self.phase, 0) + self.duration()
+
+
+class _TimedConnectionMixin(object):
+    """Records DNS lookup and TCP connect durations of new connections."""
+
+    def _new_conn(self):
+        host = getattr(self, "_dns_host", self.host)
+        with _PhaseTimer("dns"):
+            address = socket.getaddrinfo(host, self.port, 0,
+                                         socket.SOCK_STREAM)[0][4][0]
+        # NOTE: Connect to the resolved address, so DNS lookup is not
+        #       repeated in the connect phase. Host name is still used
+        #       for TLS SNI and certificate checks.
+        if hasattr(self, "_dns_host"):
+            self._dns_host = address
+        try:
+            with _PhaseTimer("connect"):
+                return super(_TimedConnectionMixin, self)._new_conn()
+        finally:
+            if hasattr(self, "_dns_host"):
+                self._dns_host = host
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, connection.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin,
+                            connection.VerifiedHTTPSConnection):
+
+    def connect(self):
+        timings = getattr(_phases, "timings", None)
+        if timings is None:
+            return super(_TimedHTTPSConnection, self).connect()
+        before = sum(timings.get(phase, 0) for phase in PHASES)
+        with utils.Timer() as timer:
+            super(_TimedHTTPSConnection, self).connect()
+        after = sum(timings.get(phase, 0) for phase in PHASES)
+        timings["tls"] = (timings.get("tls", 0) + timer.duration() -
+                          (after - before))
+
+
+class TimedHTTPAdapter(adapters.HTTPAdapter):
+    """HTTPAdapter with connections that record connection phases."""
+
+    def _set_connection_cls(self, pool):
+        if isinstance(pool, connectionpool.HTTPSConnectionPool):
+            pool.ConnectionCls = _TimedHTTPSConnection
+        else:
+            pool.ConnectionCls = _TimedHTTPConnection
+        return pool
+
+    def get_connection(self, url, proxies=None):
+        return self._set_connection_cls(
+            super(TimedHTTPAdapter, self).get_connection(url, proxies))
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None,
+                                        cert=None):
+        # NOTE: requests 2.32 and newer get connections with this method
+        #       instead of get_connection()
+        return self._set_connection_cls(
+            super(TimedHTTPAdapter, self).get_connection_with_tls_context(
+                request, verify, proxies=proxies, cert=cert))
+
+
+def get_session(pool_size=10, keep_alive=True):
+    """Return requests session shared by the threads of the process.
+
+    Runners may fork worker processes, so every process gets its own
+    sessions and connections.
+
+    :param pool_size: number of connections kept open per host, requests
+                      sent when all of them are busy open new connections
+                      that are closed after use
+    :param keep_alive: whether connections are reused between requests
+    :returns: requests.Session instance
+    """
+    key = (os.getpid(), pool_size, keep_alive)
+    with _sessions_lock:
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = TimedHTTPAdapter(pool_connections=pool_size,
+                                       pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if not keep_alive:
+                session.headers["Connection"] = "close"
+            _sessions[key] = session
+        return _sessions[key]
+
+
+def choose_weighted(items, weight_key="weight"):
+    """Choose random item with probability proportional to its weight.
+
+    :param items: list of dicts, weight is 1 if it is not specified
+    :param weight_key: key of weight in items
+    :returns: copy of chosen item without weight
+    :raises: ValueError if sum of weights is not positive
+    """
+    totals = []
+    total = 0
+    for item in items:
+        total += item.get(weight_key, 1)
+        totals.append(total)
+    if total <= 0:
+        raise ValueError(_("Sum of weights should be positive"))
+    item = dict(items[bisect.bisect_right(totals, random.random() * total)])
+    item.pop(weight_key, None)
+    return item
+
+
 class RequestScenario(scenario.Scenario):
     """Base class for Request scenarios with basic atomic actions."""
 
@@ -33,7 +178,86 @@ class RequestScenario(scenario.Scenario):
         """
 
         resp = requests.request(method, url, **kwargs)
+        self._check_status_code(resp, status_code)
+
+    def _check_status_code(self, resp, status_code):
         if status_code != resp.status_code:
             error_msg = _("Expected HTTP request code is `%s` actual `%s`")
             raise ValueError(
                 error_msg % (status_code, resp.status_code))
+
+    def _check_pooled_request(self, url, method, status_code, pool_size=10,
+                              keep_alive=True, **kwargs):
+        """Compare status code of request sent with pooled session
+
+        Every connection phase is recorded as an atomic action:
+        requests.dns, requests.connect and requests.tls are zero if a
+        connection is reused, requests.ttfb is time to the response
+        headers, and requests.body is time to read the response body.
+        The phases add up to the duration of the request, so it is not
+        recorded as an atomic action of its own.
+
+        :param url: Uniform resource locator
+        :param method: Type of request method (GET | POST ..)
+        :param status_code: Expected status code of request
+        :param pool_size: Number of connections kept open per host
+        :param keep_alive: Whether connections are reused between requests
+        :param kwargs: Optional additional request parameters
+        :raises: ValueError if return http status code
+        not equal to expected status code
+        """
+        session = get_session(pool_size, keep_alive)
+        _phases.timings = timings = {}
+        try:
+            with utils.Timer() as timer:
+                resp = session.request(method, url, stream=True, **kwargs)
+            try:
+                with utils.Timer() as body_timer:
+                    len(resp.content)
+            finally:
+                resp.close()
+        finally:
+            _phases.timings = None
+
+        for phase in PHASES:
+            self._atomic_actions["requests.%s" % phase] = timings.get(phase,
+                                                                      0)
+        self._atomic_actions["requests.ttfb"] = (
+            timer.duration() - sum(timings.values()))
+        self._atomic_actions["requests.body"] = body_timer.duration()
+        self._check_status_code(resp, status_code)
+
+
+class AsyncRequestScenario(RequestScenario):
+    """Base class for Request scenarios that run on an event loop.
+
+    Methods return futures instead of blocking the thread, so these
+    scenarios should be run by the async_constant runner.
+    """
+
+    def _check_async_request(self, url, method, status_code, pool_size=10,
+                             keep_alive=True, **kwargs):
+        """Send request with the client of the event loop and check it
+
+        Atomic actions are the same as ones of _check_pooled_request.
+
+        :param url: Uniform resource locator
+        :param method: Type of request method (GET | POST ..)
+        :param status_code: Expected status code of request
+        :param pool_size: Number of connections kept open per host
+        :param keep_alive: Whether connections are reused between requests
+        :param kwargs: Optional additional request parameters, headers and
+                       data are supported
+        :returns: asyncio.Future, it raises ValueError if return http
+                  status code not equal to expected status code
+        """
+        client = async_client.get_client(pool_size, keep_alive)
+
+        def received(resp):
+            for phase in async_client.PHASES:
+                self._atomic_actions["requests.%s" % phase] = (
+                    resp.timings[phase])
+            self._check_status_code(resp, status_code)
+
+        return async_client.then(client.request(method, url, **kwargs),
+                                 received, client.loop)
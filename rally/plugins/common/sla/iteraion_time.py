@@ -39,6 +39,13 @@ class IterationTime(sla.SLA):
         self.success = self.max_iteration_time <= self.criterion_value
         return self.success
 
+    def add_columns(self, columns):
+        if len(columns):
+            self.max_iteration_time = max(self.max_iteration_time,
+                                          float(columns.duration.max()))
+            self.success = self.max_iteration_time <= self.criterion_value
+        return self.success
+
     def details(self):
         return (_("Maximum seconds per iteration %.2fs <= %.2fs - %s") %
                 (self.max_iteration_time, self.criterion_value, self.status()))
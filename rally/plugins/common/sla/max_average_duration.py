@@ -42,6 +42,16 @@ class MaxAverageDuration(sla.SLA):
         self.success = self.avg <= self.criterion_value
         return self.success
 
+    def add_columns(self, columns):
+        durations = columns.duration[~columns.error]
+        if len(durations):
+            self.avg_comp.total += float(durations.sum())
+            self.avg_comp.count += len(durations)
+            self.avg = self.avg_comp.result()
+        if len(columns):
+            self.success = self.avg <= self.criterion_value
+        return self.success
+
     def details(self):
         return (_("Average duration of one iteration %.2fs <= %.2fs - %s") %
                 (self.avg, self.criterion_value, self.status()))
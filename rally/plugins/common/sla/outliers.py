@@ -22,6 +22,7 @@ with contracted values such as maximum error rate or minimum response time.
 from rally.common.i18n import _
 from rally.common import streaming_algorithms
 from rally import consts
+from rally.task.processing import columns as iteration_columns
 from rally.task import sla
 
 
@@ -76,6 +77,37 @@ class Outliers(sla.SLA):
         self.success = self.outliers <= self.max_outliers
         return self.success
 
+    def add_columns(self, columns):
+        durations = columns.duration[~columns.error]
+        if len(durations):
+            counts, means, dev_sums, stds = iteration_columns.running_stats(
+                durations, self.iterations, self.std_comp.mean,
+                self.std_comp.dev_sum)
+            # NOTE(msdubov): Every iteration is checked against the
+            #                threshold of the iterations before it
+            thresholds = means + self.sigmas * stds
+            if (counts[0] >= self.min_iterations and self.threshold and
+                    durations[0] > self.threshold):
+                self.outliers += 1
+            self.outliers += int(((counts[1:] >= self.min_iterations) &
+                                  (thresholds[:-1] != 0) &
+                                  (durations[1:] > thresholds[:-1])).sum())
+
+            # NOTE: Keep the state of streaming computations, so that
+            #       add_iteration() and add_columns() can be mixed
+            self.iterations = int(counts[-1])
+            for comp in self.mean_comp, self.std_comp.mean_computation:
+                comp.total += float(durations.sum())
+                comp.count += len(durations)
+            self.std_comp.count = self.iterations
+            self.std_comp.mean = float(means[-1])
+            self.std_comp.dev_sum = float(dev_sums[-1])
+            if self.iterations >= 2:
+                self.threshold = float(thresholds[-1])
+
+        self.success = self.outliers <= self.max_outliers
+        return self.success
+
     def details(self):
         return (_("Maximum number of outliers %i <= %i - %s") %
                 (self.outliers, self.max_outliers, self.status()))
@@ -0,0 +1,306 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cleanup of JCS EC2 resources that are left by a task.
+
+Scenarios tag resources they create with the task UUID (see
+JCSScenario._tag_task_resources), so all of them are found with a few
+filtered describe calls per resource type instead of listing and checking
+every resource. Resources are deleted in parallel, every resource type
+starts as soon as types it depends on are deleted.
+"""
+
+import collections
+import sys
+import threading
+import time
+
+from botocore import exceptions as botocore_exceptions
+from oslo_config import cfg
+
+from rally.common import broker
+from rally.common.i18n import _
+from rally.common import log as logging
+from rally.common import utils as rutils
+from rally import consts
+from rally import jcsclients
+from rally.plugins.jcs import scenario
+from rally.plugins.jcs.scenarios.ec2 import waiters
+from rally.task import context
+
+
+LOG = logging.getLogger(__name__)
+
+CLEANUP_OPTS = [
+    cfg.IntOpt("jcs_cleanup_threads",
+               default=20,
+               help="Number of threads that delete resources of one type "
+                    "in jcs_cleanup context")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(CLEANUP_OPTS, group=benchmark_group)
+for opt in ("jcs_ec2_batch_size", "jcs_ec2_server_boot_timeout",
+            "jcs_ec2_server_boot_poll_interval", "jcs_ec2_poll_max_interval"):
+    CONF.import_opt(opt, "rally.plugins.jcs.scenarios.ec2.utils",
+                    group="benchmark")
+
+
+def _instance_ids(response):
+    return [instance["InstanceId"]
+            for reservation in response.get("Reservations", [])
+            for instance in reservation.get("Instances", [])
+            if instance["State"]["Name"] != "terminated"]
+
+
+def _ids(key, id_key):
+    def get_ids(response):
+        return [item[id_key] for item in response.get(key, [])]
+    return get_ids
+
+
+def _security_group_ids(response):
+    return [group["GroupId"] for group in response.get("SecurityGroups", [])
+            if group.get("GroupName") != "default"]
+
+
+Resource = collections.namedtuple(
+    "Resource", ["client", "describe_method", "get_ids", "delete_method",
+                 "id_argument", "depends_on"])
+
+# NOTE: Resources are deleted in parallel, but after all the resources they
+#       depend on. Instances are terminated in batches, other resources one
+#       by one with delete_method(**{id_argument: resource ID}).
+RESOURCES = collections.OrderedDict([
+    ("jcs_ec2.instances", Resource(
+        "jcs_ec2", "describe_instances", _instance_ids,
+        "terminate_instances", "InstanceIds", ())),
+    ("jcs_ec2.volumes", Resource(
+        "jcs_ec2", "describe_volumes", _ids("Volumes", "VolumeId"),
+        "delete_volume", "VolumeId", ("jcs_ec2.instances",))),
+    ("jcs_ec2.key_pairs", Resource(
+        "jcs_ec2", "describe_key_pairs", _ids("KeyPairs", "KeyName"),
+        "delete_key_pair", "KeyName", ())),
+    ("jcs_vpc.addresses", Resource(
+        "jcs_vpc", "describe_addresses", _ids("Addresses", "AllocationId"),
+        "release_address", "AllocationId", ("jcs_ec2.instances",))),
+    ("jcs_vpc.security_groups", Resource(
+        "jcs_vpc", "describe_security_groups", _security_group_ids,
+        "delete_security_group", "GroupId", ("jcs_ec2.instances",))),
+    ("jcs_vpc.subnets", Resource(
+        "jcs_vpc", "describe_subnets", _ids("Subnets", "SubnetId"),
+        "delete_subnet", "SubnetId", ("jcs_ec2.instances",))),
+    ("jcs_vpc.vpcs", Resource(
+        "jcs_vpc", "describe_vpcs", _ids("Vpcs", "VpcId"),
+        "delete_vpc", "VpcId", ("jcs_vpc.addresses",
+                                "jcs_vpc.security_groups",
+                                "jcs_vpc.subnets")))
+])
+
+
+def _is_not_found(e):
+    return e.response.get("Error", {}).get("Code", "").endswith("NotFound")
+
+
+class TaskResources(object):
+    """Finds and deletes resources of one user that are left by a task."""
+
+    def __init__(self, clients, credentials, task_uuid):
+        """TaskResources constructor.
+
+        :param clients: jcsclients.Clients instance
+        :param credentials: dict with access_key and secret_key of user
+        :param task_uuid: UUID of the task that created resources
+        """
+        self.clients = clients
+        self.credentials = credentials
+        self.task_uuid = task_uuid
+        self.discovered = {}
+
+    def _client(self, client_type):
+        return getattr(self.clients, client_type)(**self.credentials)
+
+    def _describe(self, name, filters):
+        """Return IDs of resources that match filters, page by page."""
+        resource = RESOURCES[name]
+        describe = getattr(self._client(resource.client),
+                           resource.describe_method)
+        kwargs = {"Filters": filters}
+        ids = []
+        while True:
+            response = describe(**kwargs)
+            ids.extend(resource.get_ids(response))
+            if not response.get("NextToken"):
+                return ids
+            kwargs["NextToken"] = response["NextToken"]
+
+    def discover(self, name):
+        """Return IDs of resources of the task, results are cached.
+
+        :param name: one of RESOURCES keys
+        """
+        if name not in self.discovered:
+            if name == "jcs_vpc.addresses":
+                # NOTE: Addresses can't be tagged, so they are found by
+                #       instances of the task they are associated with
+                instance_ids = self.discover("jcs_ec2.instances")
+                batch_size = CONF.benchmark.jcs_ec2_batch_size
+                ids = []
+                for i in range(0, len(instance_ids), batch_size):
+                    ids.extend(self._describe(name, [
+                        {"Name": "instance-id",
+                         "Values": instance_ids[i:i + batch_size]}]))
+            else:
+                ids = self._describe(name, [
+                    {"Name": "tag:%s" % scenario.TASK_TAG,
+                     "Values": [self.task_uuid]}])
+            self.discovered[name] = ids
+        return self.discovered[name]
+
+    def _terminate_instances(self, ids):
+        client = self._client("jcs_ec2")
+        batch_size = CONF.benchmark.jcs_ec2_batch_size
+        for i in range(0, len(ids), batch_size):
+            client.terminate_instances(InstanceIds=ids[i:i + batch_size])
+        waiters.EC2BatchWaiter(
+            client, "instance",
+            timeout=CONF.benchmark.jcs_ec2_server_boot_timeout,
+            min_interval=CONF.benchmark.jcs_ec2_server_boot_poll_interval,
+            max_interval=CONF.benchmark.jcs_ec2_poll_max_interval,
+            batch_size=batch_size).wait(ids, ["terminated"], gone=True)
+
+    def delete(self, name):
+        """Delete discovered resources of one type.
+
+        Errors are only logged, so the rest of resources are deleted anyway.
+
+        :param name: one of RESOURCES keys
+        """
+        ids = self.discover(name)
+        if not ids:
+            return
+        if name == "jcs_ec2.instances":
+            try:
+                self._terminate_instances(ids)
+            except Exception as e:
+                LOG.warning(_("Failed to terminate instances %(ids)s: %(e)s")
+                            % {"ids": ", ".join(ids), "e": e})
+            return
+
+        resource = RESOURCES[name]
+        delete = getattr(self._client(resource.client),
+                         resource.delete_method)
+
+        def publish(queue):
+            queue.extend(ids)
+
+        def consume(cache, resource_id):
+            try:
+                delete(**{resource.id_argument: resource_id})
+            except botocore_exceptions.ClientError as e:
+                if not _is_not_found(e):
+                    LOG.warning(_("Failed to delete %(name)s %(id)s: %(e)s")
+                                % {"name": name, "id": resource_id, "e": e})
+
+        broker.run(publish, consume,
+                   min(len(ids), CONF.benchmark.jcs_cleanup_threads))
+
+
+# NOTE: Contexts are cleaned up in reverse order, so this runs after the
+#       OpenStack cleanup contexts, but before all the other contexts
+@context.configure(name="jcs_cleanup", order=(sys.maxsize - 2), hidden=True)
+class JCSCleanup(context.Context):
+    """Context class for cleanup of JCS resources created by the task.
+
+    Config is a list of client types (e.g. "jcs_ec2") or resource names
+    (e.g. "jcs_vpc.subnets") to clean up.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "array",
+        "$schema": consts.JSON_SCHEMA,
+        "items": {
+            "type": "string",
+            "enum": sorted(set(RESOURCES) |
+                           set(name.split(".")[0] for name in RESOURCES))
+        },
+        "additionalProperties": False
+    }
+
+    def setup(self):
+        pass
+
+    def _get_resource_names(self):
+        return [name for name in RESOURCES
+                if name in self.config or name.split(".")[0] in self.config]
+
+    def _get_credentials(self):
+        credentials = collections.OrderedDict()
+        for user in self.context.get("config", {}).get("existing_users", []):
+            credentials.setdefault(user["access_key"], {
+                "access_key": user["access_key"],
+                "secret_key": user["secret_key"]})
+        return list(credentials.values())
+
+    def _delete(self, resources, name, done, durations):
+        for dependency in RESOURCES[name].depends_on:
+            if dependency in done:
+                done[dependency].wait()
+        try:
+            with rutils.Timer() as timer:
+                resources.delete(name)
+            durations[name].append(timer.duration())
+        finally:
+            done[name].set()
+
+    @rutils.log_task_wrapper(LOG.info, _("Exit context: `jcs_cleanup`"))
+    def cleanup(self):
+        names = self._get_resource_names()
+        clients = jcsclients.Clients()
+        durations = dict((name, collections.deque()) for name in names)
+        counts = dict.fromkeys(names, 0)
+        start = time.time()
+
+        threads = []
+        for credentials in self._get_credentials():
+            resources = TaskResources(clients, credentials,
+                                      self.context["task"]["uuid"])
+            # NOTE: All the resources are found before anything is
+            #       deleted, because addresses are found by instances
+            for name in names:
+                try:
+                    counts[name] += len(resources.discover(name))
+                except Exception as e:
+                    LOG.warning(_("Failed to list %(name)s: %(e)s")
+                                % {"name": name, "e": e})
+                    resources.discovered[name] = []
+
+            done = dict((name, threading.Event()) for name in names)
+            for name in names:
+                thread = threading.Thread(
+                    target=self._delete,
+                    args=(resources, name, done, durations))
+                thread.start()
+                threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+        LOG.info(_("Task resources are deleted in %(duration).2fs: %(stats)s")
+                 % {"duration": time.time() - start,
+                    "stats": ", ".join(
+                        "%s %d in %.2fs" % (name, counts[name],
+                                            max(durations[name] or [0]))
+                        for name in names)})
@@ -14,12 +14,17 @@
 #    under the License.
 
 from rally import jcsclients
+from rally.task import atomic
 from rally.task import scenario
 
 # NOTE(boris-42): Shortcut to remove import of both rally.task.scenario and
 #                 rally.plugins.openstack.scenario
 configure = scenario.configure
 
+# NOTE: Key of the tag with task UUID, jcs_cleanup context finds resources
+#       that are left by the task with it
+TASK_TAG = "rally_task_uuid"
+
 
 class JCSScenario(scenario.Scenario):
     """Base class for all JCS scenarios."""
@@ -70,3 +75,33 @@ class JCSScenario(scenario.Scenario):
 
     def admin_clients(self, client_type, version=None):
 	pass
+
+    def _get_task_tags(self):
+        """Returns tags that mark resources created by the current task."""
+        task = self.context.get("task") if self.context else None
+        return {TASK_TAG: task["uuid"]} if task else {}
+
+    def _tag_task_resources(self, client_type, resource_ids):
+        """Tag new resources with the task UUID for jcs_cleanup context.
+
+        :param client_type: Client type of EC2 API, e.g. "jcs_vpc"
+        :param resource_ids: list of resource IDs
+        """
+        tags = self._get_task_tags()
+        if tags and resource_ids:
+            with atomic.ActionTimer(self, "%s.create_tags" % client_type):
+                self.clients(client_type).create_tags(
+                    Resources=resource_ids,
+                    Tags=[{"Key": k, "Value": v} for k, v in tags.items()])
+
+    def output_data(self):
+        """Returns client pool usage of this iteration.
+
+        Clients are shared through jcsclients.get_pool(), so built stays
+        zero for most iterations once every user has its clients.
+        """
+        data = super(JCSScenario, self).output_data()
+        stats = self._clients.pool_stats
+        data["jcs_client_pool_built"] = stats["built"]
+        data["jcs_client_pool_reused"] = stats["reused"]
+        return data
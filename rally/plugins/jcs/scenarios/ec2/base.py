@@ -9,6 +9,8 @@ from oslo_log import log
 import six
 import config as cfg
 
+from rally.plugins.jcs.scenarios.ec2 import waiters
+
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
@@ -53,6 +55,11 @@ class EC2Waiter(object):
         self.wait_func = wait_func
         self.default_timeout = CONF.aws.build_timeout
         self.default_check_interval = CONF.aws.build_interval
+        self.max_check_interval = CONF.aws.build_max_interval
+
+    def _delays(self):
+        return waiters.backoff_delays(self.default_check_interval,
+                                      self.max_check_interval)
 
     def _state_wait(self, f, f_args=None, f_kwargs=None,
                     final_set=set(), error_set=('error')):
@@ -60,7 +67,7 @@ class EC2Waiter(object):
             final_set = set((final_set,))
         if not isinstance(error_set, set):
             error_set = set((error_set,))
-        interval = self.default_check_interval
+        delays = self._delays()
         start_time = time.time()
         args = f_args if f_args is not None else []
         kwargs = f_kwargs if f_kwargs is not None else {}
@@ -85,8 +92,7 @@ class EC2Waiter(object):
                     'State change timeout exceeded! '
                     '(%ds) While waiting for %s at "%s"' %
                     (dtime, final_set, status))
-            time.sleep(interval)
-            interval += self.default_check_interval
+            time.sleep(next(delays))
             old_status = status
             try:
                 status = f(*args, **kwargs)
@@ -94,7 +100,7 @@ class EC2Waiter(object):
                 status = "NotFound"
 
     def _state_wait_gone(self, f, f_args=None, f_kwargs=None):
-        interval = self.default_check_interval
+        delays = self._delays()
         start_time = time.time()
         args = f_args if f_args is not None else []
         kwargs = f_kwargs if f_kwargs is not None else {}
@@ -109,8 +115,7 @@ class EC2Waiter(object):
                     raise testtools.TestCase.failureException(
                         "State change timeout exceeded while waiting"
                         " for deleting")
-                time.sleep(interval)
-                interval += self.default_check_interval
+                time.sleep(next(delays))
                 old_status = status
                 status = f(*args, **kwargs)
         except exceptions.NotFound:
@@ -124,7 +129,7 @@ class EC2Waiter(object):
         self._state_wait_gone(self.wait_func, f_args=[obj_id])
 
     def wait_no_exception(self, *args, **kwargs):
-        interval = self.default_check_interval
+        delays = self._delays()
         start_time = time.time()
         while True:
             try:
@@ -137,8 +142,7 @@ class EC2Waiter(object):
             if dtime > self.default_timeout:
                 raise testtools.TestCase.failureException(
                     "Timeout exceeded while waiting")
-            time.sleep(interval)
-            interval += self.default_check_interval
+            time.sleep(next(delays))
 
 class ScenarioBase():
     """Recommended to use as base class for boto related test."""
@@ -56,6 +56,10 @@ AWSGroup = [
     cfg.IntOpt('build_interval',
                default=1,
                help="Status Change Test Interval"),
+    cfg.IntOpt('build_max_interval',
+               default=10,
+               help="Maximum Status Change Test Interval, the interval "
+                    "grows exponentially from build_interval"),
     cfg.StrOpt('instance_type',
                default="m1.tiny",
                help="Instance type"),
@@ -28,7 +28,7 @@ class JCSEC2Servers(utils.JCSEC2Scenario):
 
     #@validation.required_services(consts.Service.EC2)
     #@validation.required_openstack(users=True)
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def list_servers(self):
         """List all servers.
 
@@ -37,31 +37,31 @@ class JCSEC2Servers(utils.JCSEC2Scenario):
         """
         self._list_servers()
 
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def run_instances(self, ImageId, InstanceTypeId, **kwargs):
         self._run_instances(ImageId, InstanceTypeId, **kwargs)
 
    
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def create_list_delete_keypair(self):
 	keyName =  self.generate_random_name()
 	(keyMaterial, response) = self._create_key_pair(keyName)
 	self._list_key_pair()
 	self._delete_key_pair(keyName)
 		
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def run_instances_1(self, imageId, instanceTypeId, instanceCount, subnetId):
 	self._run_instances(imageId, instanceTypeId, instanceCount, subnetId)
 
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def run_and_stop_instances(self, imageId = "ami-96f1c1c4", instanceType="m3.medium", instanceCount=128):
         self._run_and_stop_instances(imageId, instanceType, instanceCount)
 
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def create_volume(self, az="ap-southeast-1a", size=1):
 	self._create_volume(az, size)
 
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def run_instance_and_attach_volume(self, imageId = "ami-96f1c1c4", instanceType="t2.micro", instanceCount=1, size=1):
 	self._run_instance_and_attach_volume(imageId, instanceType, instanceCount, size)
 
@@ -70,7 +70,7 @@ class JCSEC2Servers(utils.JCSEC2Scenario):
     @validation.image_valid_on_flavor("flavor", "image")
     #@validation.required_services(consts.Service.EC2)
     #@validation.required_openstack(users=True)
-    @scenario.configure(context={"cleanup": ["jcs_ec2"]})
+    @scenario.configure(context={"jcs_cleanup": ["jcs_ec2"]})
     def boot_server(self, image, flavor, **kwargs):
         """Boot a server.
 
@@ -17,6 +17,7 @@ import time
 from oslo_config import cfg
 
 from rally.plugins.jcs import scenario
+from rally.plugins.jcs.scenarios.ec2 import waiters
 from rally.task import atomic
 from rally.task import utils
 
@@ -36,6 +37,17 @@ EC2_BENCHMARK_OPTS = [
         "jcs_ec2_server_boot_poll_interval",
         default=1.0,
         help="Server boot poll interval"
+    ),
+    cfg.FloatOpt(
+        "jcs_ec2_poll_max_interval",
+        default=10.0,
+        help="Maximum interval between polls of resource states, the "
+             "interval grows exponentially from the poll interval"
+    ),
+    cfg.IntOpt(
+        "jcs_ec2_batch_size",
+        default=100,
+        help="Maximum number of resource IDs per describe or tag call"
     )
 ]
 
@@ -46,7 +58,16 @@ CONF.register_opts(EC2_BENCHMARK_OPTS, group=benchmark_group)
 
 
 class JCSEC2Scenario(scenario.JCSScenario):
-    """Base class for EC2 scenarios with basic atomic actions."""
+    """Base class for EC2 scenarios with basic atomic actions.
+
+    Waits are done by waiters.EC2BatchWaiter. Waiting time is recorded as
+    a "jcs_ec2.wait_for_*" atomic action, and the number of describe calls
+    made by the wait as "<atomic action name>.polls" in scenario output.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(JCSEC2Scenario, self).__init__(*args, **kwargs)
+        self._polls = {}
 
     """
     ec2 = boto3.client("ec2")
@@ -61,6 +82,35 @@ class JCSEC2Scenario(scenario.JCSScenario):
     """
 	ubuntu-trusty-14.04-amd64-server-20150325 (ami-96f1c1c4)
     """
+    def _wait_for(self, resource_type, ids, final_states, action_name,
+                  gone=False):
+        """Wait for resources with batched describe calls.
+
+        :param resource_type: one of waiters.RESOURCES keys
+        :param ids: list of resource IDs
+        :param final_states: states to wait for
+        :param action_name: name of the atomic action of waiting
+        :param gone: True if resources that do not exist are finished
+        """
+        waiter = waiters.EC2BatchWaiter(
+            self.clients("jcs_ec2"), resource_type,
+            timeout=CONF.benchmark.jcs_ec2_server_boot_timeout,
+            min_interval=CONF.benchmark.jcs_ec2_server_boot_poll_interval,
+            max_interval=CONF.benchmark.jcs_ec2_poll_max_interval,
+            batch_size=CONF.benchmark.jcs_ec2_batch_size)
+        try:
+            with atomic.ActionTimer(self, action_name):
+                return waiter.wait(ids, final_states, gone=gone)
+        finally:
+            self._polls[action_name] = (self._polls.get(action_name, 0) +
+                                        waiter.polls)
+
+    def output_data(self):
+        data = super(JCSEC2Scenario, self).output_data()
+        for action_name, polls in self._polls.items():
+            data["%s.polls" % action_name] = polls
+        return data
+
     @atomic.action_timer("jcs_ec2.list_servers")
     def _list_servers(self):
         """Returns user servers list."""
@@ -71,18 +121,18 @@ class JCSEC2Scenario(scenario.JCSScenario):
 	"""Stop given instances id, will wait till all the instances are in stop state.
 	:param: instanceIds: [string], list of instance ids to stop
 	"""
-	self.clients("jcs_ec2").stop_instances(InstanceIds = InstanceIds)
-        waiter_i_stop = self.clients("jcs_ec2").get_waiter('instance_stopped')
-        waiter_i_stop.wait(InstanceIds= InstanceIds)
+	self.clients("jcs_ec2").stop_instances(InstanceIds=InstanceIds)
+	self._wait_for("instance", InstanceIds, ["stopped"],
+	               "jcs_ec2.wait_for_instances_stopped")
 
     @atomic.action_timer("jcs_ec2.terminate_instances")
     def _terminate_instances(self, InstanceIds):
         """terminate given instance ids, will wait till all the instances are in stop state.
         :param: instanceIds: [string], list of instance ids to stop
         """
-        self.clients("jcs_ec2").terminate_instances(InstanceIds = InstanceIds)
-        waiter_i_stop = self.clients("jcs_ec2").get_waiter('instance_terminated')
-        waiter_i_stop.wait(InstanceIds= InstanceIds)
+        self.clients("jcs_ec2").terminate_instances(InstanceIds=InstanceIds)
+        self._wait_for("instance", InstanceIds, ["terminated"],
+                       "jcs_ec2.wait_for_instances_terminated", gone=True)
 
     @atomic.action_timer("jcs_ec2.run_instances")
     def _run_instances(self, ImageId, InstanceTypeId, **kwargs):
@@ -94,17 +144,31 @@ class JCSEC2Scenario(scenario.JCSScenario):
 	#TBD Vishnu --> need to get subnet 
         instances = self.clients("jcs_ec2", self.context["jcs_user"]).run_instances(ImageId= ImageId, \
                                         InstanceTypeId=InstanceTypeId, **kwargs)
-        instanceIds = []
-        for instance in instances["Instances"]:
-                instanceIds.append(instance["InstanceId"])
-        for instanceId in instanceIds:
-                self.clients("jcs_ec2").create_tags(Resources=[instanceId],\
-                                        Tags=[{"Key":"Name", "Value":"benchmark_test_%s"%instanceId}])
+        instanceIds = [i["InstanceId"] for i in instances["Instances"]]
+        self._create_tags(instanceIds, {
+            "Name": "benchmark_test_%s" % instances.get("ReservationId",
+                                                        instanceIds[0])})
+        self._wait_for("instance", instanceIds, ["running"],
+                       "jcs_ec2.wait_for_instances_running")
+
+        return (instanceIds, instances)
 
-        waiter = self.clients("jcs_ec2").get_waiter('instance_running')
-        waiter.wait(InstanceIds= instanceIds)
+    @atomic.action_timer("jcs_ec2.create_tags")
+    def _create_tags(self, resource_ids, tags):
+        """Tag resources in bulk, with one call per batch of resources.
 
-	return (instanceIds, instances)
+        Resources are tagged with the task UUID as well, see
+        _tag_task_resources().
+
+        :param resource_ids: list of resource IDs
+        :param tags: dict of tag values by keys
+        """
+        tags = dict(self._get_task_tags(), **tags)
+        tags = [{"Key": k, "Value": v} for k, v in sorted(tags.items())]
+        batch_size = CONF.benchmark.jcs_ec2_batch_size
+        for i in range(0, len(resource_ids), batch_size):
+            self.clients("jcs_ec2").create_tags(
+                Resources=resource_ids[i:i + batch_size], Tags=tags)
 
     @atomic.action_timer("jcs_ec2.run_and_stop_instances")
     def _run_and_stop_instances(self, ImageId, InstanceType, **kwargs):
@@ -128,6 +192,9 @@ class JCSEC2Scenario(scenario.JCSScenario):
     @atomic.action_timer("jcs_ec2.create_key_pair")
     def _create_key_pair(self, keyName):
 	response = self.clients("jcs_ec2").create_key_pair(KeyName=keyName)
+	# NOTE: key pairs have IDs for tagging only in newer API versions
+	if "KeyPairId" in response:
+	    self._tag_task_resources("jcs_ec2", [response["KeyPairId"]])
 	keyName = response['KeyName']
 	keyFingerPrint = response['KeyFingerprint']
 	keyMaterial = response['KeyMaterial']
@@ -182,8 +249,9 @@ class JCSEC2Scenario(scenario.JCSScenario):
 	"""
 	response = self.clients("jcs_ec2").create_volume(**kwargs)
 	volumeId = response["VolumeId"]
-	vol_available_waiter = self.clients("jcs_ec2").get_waiter('volume_available')
-	vol_available_waiter.wait(VolumeIds=[volumeId])
+	self._tag_task_resources("jcs_ec2", [volumeId])
+	self._wait_for("volume", [volumeId], ["available"],
+	               "jcs_ec2.wait_for_volume_available")
 
 	return (volumeId, response)
 
@@ -197,10 +265,9 @@ class JCSEC2Scenario(scenario.JCSScenario):
 	#The volume must be in the available state (not attached to an instance).
 	"""
 	#Need to check wether volume is in available state or not.
-	response = self.clients("jcs_ec2").delete_volume(VolumeId = volumeId)
-	
-	vol_deleted_waiter = self.clients("jcs_ec2").get_waiter('volume_deleted')
-        vol_deleted_waiter.wait(VolumeIds=[volumeId])
+	self.clients("jcs_ec2").delete_volume(VolumeId=volumeId)
+	self._wait_for("volume", [volumeId], ["deleted"],
+	               "jcs_ec2.wait_for_volume_deleted", gone=True)
 
     @atomic.action_timer("jcs_ec2.attach_volume")
     def _attach_volume(self, VolumeId, InstanceId, Device):
@@ -212,10 +279,10 @@ class JCSEC2Scenario(scenario.JCSScenario):
     	Device='string'
 	)
 	"""
-	response = self.clients("jcs_ec2").attach_volume(VolumeId=VolumeId, InstanceId=InstanceId, Device=device)
-	vol_in_use_waiter = self.clients("jcs_ec2").get_waiter('volume_in_use')
-	
-	vol_in_use_waiter.wait(VolumeIds=[volumeId])
+	self.clients("jcs_ec2").attach_volume(
+	    VolumeId=VolumeId, InstanceId=InstanceId, Device=Device)
+	self._wait_for("volume", [VolumeId], ["in-use"],
+	               "jcs_ec2.wait_for_volume_in_use")
 
     @atomic.action_timer("jcs_ec2.detach_volume")
     def _detach_volume(self, volumeId, instanceId, force=False, **kwargs):
@@ -229,10 +296,9 @@ class JCSEC2Scenario(scenario.JCSScenario):
 	)
 	"""
 	response = self.clients("jcs_ec2").detach_volume(VolumeId=volumeId, InstanceId=instanceId, Force=force, **kwargs)
-	volumeId= response["VolumeId"]
-	
-    	vol_available_waiter = self.clients("jcs_ec2").get_waiter('volume_available')
-        vol_available_waiter.wait(VolumeIds=[volumeId])
+	volumeId = response["VolumeId"]
+	self._wait_for("volume", [volumeId], ["available"],
+	               "jcs_ec2.wait_for_volume_available")
 
     @atomic.action_timer("jcs_ec2.run_instance_attach_volume")
     def _run_instance_and_attach_volume(self, imageId, instanceType, instanceCount, size):
@@ -107,6 +107,7 @@ class JCSSBSScenario(scenario.JCSScenario):
 	"""
 	response = self.clients("jcs_ec2").create_volume(**kwargs)
 	volumeId = response["VolumeId"]
+	self._tag_task_resources("jcs_ec2", [volumeId])
 	vol_available_waiter = self.clients("jcs_ec2").get_waiter('volume_available')
 	vol_available_waiter.wait(VolumeIds=[volumeId])
 
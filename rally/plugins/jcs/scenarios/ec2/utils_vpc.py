@@ -70,6 +70,7 @@ class JCSVPCScenario(scenario.JCSScenario):
     def _create_vpc(self, cidr):
 	response = self.clients("jcs_vpc").create_vpc(CidrBlock=cidr)
 	vpcId = response["VpcId"]
+	self._tag_task_resources("jcs_vpc", [vpcId])
 	vpc_available_waiter = self.clients("jcs_vpc").get_waiter('vpc_available')
 	vpc_available_waiter.wait(VpcIds=[vpcId])
 
@@ -89,6 +90,7 @@ class JCSVPCScenario(scenario.JCSScenario):
     def _create_subnet(self, vpcId, cidrBlock):
         response = self.clients("jcs_vpc").create_subnet(VpcId=vpcId, CidrBlock=cidr)
         subnetId = response["SubnetId"]
+        self._tag_task_resources("jcs_vpc", [subnetId])
         vpc_available_waiter = self.clients("jcs_vpc").get_waiter('subnet_available')
         vpc_available_waiter.wait(VpcIds=[vpcId])
 
@@ -98,6 +100,7 @@ class JCSVPCScenario(scenario.JCSScenario):
     def _create_security_group(self, vpcId, groupName, groupDescription):
 	response = self.clients("jcs_vpc").create_security_group(vpcId, groupName, groupDescription)
 	sec_grp_id = response["GroupId"]
+	self._tag_task_resources("jcs_vpc", [sec_grp_id])
 	return (sec_grp_id, response)
 
     @atomic.action_timer("jcs_vpc.create_open_security_group")
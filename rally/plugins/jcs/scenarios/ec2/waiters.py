@@ -0,0 +1,171 @@
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Batched waiters for JCS EC2 resources.
+
+boto3 waiters and EC2Waiter poll resources with fixed or linearly growing
+intervals. EC2BatchWaiter checks all the resources of a wait with one
+describe call per batch_size resources, and backs off exponentially with
+jitter, so waits for many resources do not throttle the API.
+"""
+
+import random
+import time
+
+from botocore import exceptions as botocore_exceptions
+
+from rally.common import log as logging
+from rally import exceptions
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _instance_states(response):
+    return dict((instance["InstanceId"], instance["State"]["Name"])
+                for reservation in response.get("Reservations", [])
+                for instance in reservation.get("Instances", []))
+
+
+def _volume_states(response):
+    return dict((volume["VolumeId"], volume["State"])
+                for volume in response.get("Volumes", []))
+
+
+def _snapshot_states(response):
+    return dict((snapshot["SnapshotId"], snapshot["State"])
+                for snapshot in response.get("Snapshots", []))
+
+
+def _image_states(response):
+    return dict((image["ImageId"], image["State"])
+                for image in response.get("Images", []))
+
+
+# NOTE: resource type -> (describe method, IDs argument, "not found" error
+#       code, function that maps a response to {resource ID: state})
+RESOURCES = {
+    "instance": ("describe_instances", "InstanceIds",
+                 "InvalidInstanceID.NotFound", _instance_states),
+    "volume": ("describe_volumes", "VolumeIds",
+               "InvalidVolume.NotFound", _volume_states),
+    "snapshot": ("describe_snapshots", "SnapshotIds",
+                 "InvalidSnapshot.NotFound", _snapshot_states),
+    "image": ("describe_images", "ImageIds",
+              "InvalidAMIID.NotFound", _image_states)
+}
+
+
+def backoff_delays(min_interval, max_interval, jitter=0.5):
+    """Generate capped exponential delays with jitter.
+
+    Every delay is doubled up to max_interval and then reduced by a random
+    fraction of at most jitter, so concurrent waiters do not poll in step.
+
+    :param min_interval: first delay
+    :param max_interval: maximum delay
+    :param jitter: maximum fraction of a delay that is randomly cut off
+    """
+    delay = min_interval
+    while True:
+        yield delay * (1 - jitter * random.random())
+        delay = min(delay * 2, max_interval)
+
+
+class EC2BatchWaiter(object):
+    """Waits for many EC2 resources of one type with batched describe calls.
+
+    The number of describe calls made is counted in the polls attribute.
+    """
+
+    def __init__(self, client, resource_type, timeout=300.0,
+                 min_interval=1.0, max_interval=10.0, batch_size=100):
+        """EC2BatchWaiter constructor.
+
+        :param client: boto3 EC2 client
+        :param resource_type: one of RESOURCES keys
+        :param timeout: maximum time to wait in seconds
+        :param min_interval: first interval between polls in seconds
+        :param max_interval: maximum interval between polls in seconds
+        :param batch_size: maximum number of resource IDs per describe call
+        """
+        self.client = client
+        self.resource_type = resource_type
+        (self.describe_method, self.ids_argument,
+         self.not_found_code, self.get_states) = RESOURCES[resource_type]
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self.polls = 0
+
+    def _describe(self, ids):
+        """Return states of the resources that exist."""
+        self.polls += 1
+        try:
+            response = getattr(self.client, self.describe_method)(
+                **{self.ids_argument: ids})
+        except botocore_exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") != self.not_found_code:
+                raise
+            if len(ids) == 1:
+                return {}
+            # NOTE: one missing resource fails the whole call, so the
+            #       batch is checked by halves
+            states = self._describe(ids[:len(ids) // 2])
+            states.update(self._describe(ids[len(ids) // 2:]))
+            return states
+        return self.get_states(response)
+
+    def wait(self, ids, final_states, error_states=("error",), gone=False):
+        """Wait until all the resources reach one of final states.
+
+        :param ids: list of resource IDs
+        :param final_states: states to wait for
+        :param error_states: states that fail the wait
+        :param gone: True if resources that do not exist are finished,
+                     e.g. while waiting for deletion. Otherwise they are
+                     considered not visible yet
+        :returns: dict of final states (None for gone resources) by IDs
+        :raises GetResourceErrorStatus: if a resource is in an error state
+        :raises TimeoutException: if timeout is reached
+        """
+        states = {}
+        pending = list(ids)
+        delays = backoff_delays(self.min_interval, self.max_interval)
+        start = time.time()
+        while True:
+            current = {}
+            for i in range(0, len(pending), self.batch_size):
+                current.update(self._describe(pending[i:i + self.batch_size]))
+
+            for resource_id in pending:
+                state = current.get(resource_id)
+                if state in error_states:
+                    raise exceptions.GetResourceErrorStatus(
+                        resource=resource_id, status=state, fault="")
+                if state in final_states or (state is None and gone):
+                    states[resource_id] = state
+            pending = [i for i in pending if i not in states]
+            if not pending:
+                return states
+
+            if time.time() - start > self.timeout:
+                raise exceptions.TimeoutException(
+                    desired_status="/".join(final_states),
+                    resource_name=", ".join(pending),
+                    resource_type=self.resource_type, resource_id="",
+                    resource_status="/".join(
+                        sorted(set(str(current.get(i)) for i in pending))))
+            time.sleep(next(delays))
@@ -23,7 +23,10 @@ CONF = cfg.CONF
 
 CLEANUP_OPTS = [
     cfg.IntOpt("resource_deletion_timeout", default=600,
-               help="A timeout in seconds for deleting resources")
+               help="A timeout in seconds for deleting resources"),
+    cfg.IntOpt("cleanup_threads", default=50,
+               help="Maximum number of resources that are deleted "
+                    "simultaneously by all resource managers")
 ]
 cleanup_group = cfg.OptGroup(name="cleanup", title="Cleanup Options")
 CONF.register_group(cleanup_group)
@@ -33,7 +36,7 @@ CONF.register_opts(CLEANUP_OPTS, cleanup_group)
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.cleanup.resource_deletion_timeout,
-             interval=1, threads=20):
+             interval=1, threads=20, depends_on=None, batch_polling=False):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -53,6 +56,13 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param depends_on: List of <service> or <service>.<resource> names of
+                       resource managers with lower order that should finish
+                       cleanup before this one. Managers of the same service
+                       are always cleaned up by order. None means that all
+                       managers with lower order should finish
+    :param batch_polling: Poll statuses of all deleted resources of a user
+                          with one list() call, see filter_deleted()
     """
 
     def inner(cls):
@@ -67,6 +77,8 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._depends_on = depends_on
+        cls._batch_polling = batch_polling
 
         return cls
 
@@ -112,6 +124,21 @@ class ResourceManager(object):
 
         return utils.get_status(resource) in ("DELETED", "DELETE_COMPLETE")
 
+    def filter_deleted(self, resources):
+        """Returns resources that seem to be deleted.
+
+        Lists all resources of the user once instead of fetching resources
+        one by one. Resources that are not listed may be just missing in the
+        list, so is_deleted() should confirm the result.
+
+        :param resources: Resource managers initiated with resources of the
+                          same user as this one
+        """
+        existing = set(r.id for r in self.list()
+                       if utils.get_status(r) not in ("DELETED",
+                                                      "DELETE_COMPLETE"))
+        return [r for r in resources if r.id() not in existing]
+
     def delete(self):
         """Delete resource that corresponds to instance of this class."""
         self._manager().delete(self.id())
@@ -13,8 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
 import time
 
+from oslo_config import cfg
+
 from rally.common import broker
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -22,14 +26,18 @@ from rally.common.plugin import discover
 from rally.common import utils as rutils
 from rally import osclients
 from rally.plugins.openstack.context.cleanup import base
+# NOTE: Resource managers are found among subclasses of base.ResourceManager,
+#       so they have to be imported even if plugins are loaded lazily
+from rally.plugins.openstack.context.cleanup import resources  # noqa
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
 class SeekAndDestroy(object):
 
-    def __init__(self, manager_cls, admin, users):
+    def __init__(self, manager_cls, admin, users, budget=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -38,10 +46,14 @@ class SeekAndDestroy(object):
         :param manager_cls: subclass of base.ResourceManager
         :param admin: admin endpoint like in context["admin"]
         :param users: users endpoints like in context["users"]
+        :param budget: semaphore shared by all managers that limits number
+                       of resources deleted simultaneously
         """
         self.manager_cls = manager_cls
         self.admin = admin
         self.users = users or []
+        self.budget = budget
+        self.deleted = collections.deque()
 
     @staticmethod
     def _get_cached_client(user, cache=None):
@@ -59,29 +71,32 @@ class SeekAndDestroy(object):
 
         return cache[key]
 
-    def _delete_single_resource(self, resource):
-        """Safe resource deletion with retries and timeouts.
-
-        Send request to delete resource, in case of failures repeat it few
-        times. After that pull status of resource until it's deleted.
+    @staticmethod
+    def _get_msg_kw(resource):
+        return {
+            "uuid": resource.id(),
+            "service": resource._service,
+            "resource": resource._resource
+        }
 
-        Writes in LOG warning with UUID of resource that wasn't deleted
+    def _request_deletion(self, resource):
+        """Send request to delete resource, retry it in case of failures.
 
         :param resource: instance of resource manager initiated with resource
                          that should be deleted.
+        :returns: True if the request was accepted
         """
-
-        msg_kw = {
-            "uuid": resource.id(),
-            "service": resource._service,
-            "resource": resource._resource
-        }
+        msg_kw = self._get_msg_kw(resource)
 
         LOG.debug("Deleting %(service)s %(resource)s object %(uuid)s" %
                   msg_kw)
 
         try:
-            rutils.retry(resource._max_attempts, resource.delete)
+            if self.budget:
+                with self.budget:
+                    rutils.retry(resource._max_attempts, resource.delete)
+            else:
+                rutils.retry(resource._max_attempts, resource.delete)
         except Exception as e:
             msg_kw["reason"] = e
             LOG.warning(
@@ -90,7 +105,22 @@ class SeekAndDestroy(object):
                 % msg_kw)
             if logging.is_debug():
                 LOG.exception(e)
-        else:
+            return False
+        return True
+
+    def _delete_single_resource(self, resource):
+        """Safe resource deletion with retries and timeouts.
+
+        Send request to delete resource, in case of failures repeat it few
+        times. After that pull status of resource until it's deleted.
+
+        Writes in LOG warning with UUID of resource that wasn't deleted
+
+        :param resource: instance of resource manager initiated with resource
+                         that should be deleted.
+        """
+
+        if self._request_deletion(resource):
             started = time.time()
             failures_count = 0
             while time.time() - started < resource._timeout:
@@ -115,7 +145,52 @@ class SeekAndDestroy(object):
 
             LOG.warning(_("Resource deletion failed, timeout occurred for "
                           "%(service)s.%(resource)s: %(uuid)s.")
-                        % msg_kw)
+                        % self._get_msg_kw(resource))
+
+    def _wait_for_deletion(self, deleted_resources):
+        """Poll statuses of deleted resources in batches.
+
+        Every round lists resources of every user once with
+        filter_deleted(), and confirms that missing resources are deleted
+        with is_deleted().
+
+        :param deleted_resources: instances of resource manager initiated
+                                  with resources that deletion was requested
+                                  for.
+        """
+        pending = list(deleted_resources)
+        started = time.time()
+        failures_count = 0
+        while pending and time.time() - started < self.manager_cls._timeout:
+            by_tenant = collections.defaultdict(list)
+            for resource in pending:
+                by_tenant[resource.tenant_uuid].append(resource)
+
+            deleted = set()
+            for tenant_resources in by_tenant.values():
+                try:
+                    for resource in tenant_resources[0].filter_deleted(
+                            tenant_resources):
+                        if resource.is_deleted():
+                            deleted.add(resource)
+                except Exception as e:
+                    LOG.warning(
+                        _("Seems like %s.%s.filter_deleted(self) method is "
+                          "broken. It shouldn't raise any exceptions.")
+                        % (self.manager_cls.__module__,
+                           self.manager_cls.__name__))
+                    LOG.exception(e)
+                    failures_count += 1
+
+            pending = [r for r in pending if r not in deleted]
+            if not pending or failures_count > self.manager_cls._max_attempts:
+                break
+            time.sleep(self.manager_cls._interval)
+
+        for resource in pending:
+            LOG.warning(_("Resource deletion failed, timeout occurred for "
+                          "%(service)s.%(resource)s: %(uuid)s.")
+                        % self._get_msg_kw(resource))
 
     def _gen_publisher(self):
         """Returns publisher for deletion jobs.
@@ -180,7 +255,10 @@ class SeekAndDestroy(object):
                 user=self._get_cached_client(user, cache=cache),
                 tenant_uuid=user and user["tenant_id"])
 
-            self._delete_single_resource(manager)
+            if not self.manager_cls._batch_polling:
+                self._delete_single_resource(manager)
+            elif self._request_deletion(manager):
+                self.deleted.append(manager)
 
         return consumer
 
@@ -189,6 +267,8 @@ class SeekAndDestroy(object):
 
         broker.run(self._gen_publisher(), self._gen_consumer(),
                    consumers_count=self.manager_cls._threads)
+        if self.deleted:
+            self._wait_for_deletion(self.deleted)
 
 
 def list_resource_names(admin_required=None):
@@ -248,6 +328,25 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def get_dependencies(resource_managers):
+    """Returns resource managers that should be cleaned up before others.
+
+    :param resource_managers: List of resource manager classes
+    :returns: dict with lists of resource managers with lower _order that
+              should finish cleanup before every resource manager
+    """
+    dependencies = {}
+    for mgr in resource_managers:
+        names = mgr._depends_on
+        dependencies[mgr] = [
+            other for other in resource_managers
+            if other._order < mgr._order and (
+                names is None or other._service == mgr._service
+                or other._service in names
+                or "%s.%s" % (other._service, other._resource) in names)]
+    return dependencies
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None):
     """Generic cleaner.
 
@@ -255,7 +354,10 @@ def cleanup(names=None, admin_required=None, admin=None, users=None):
     with _service from services or _resource from resources.
 
     Then goes through all passed users and using cleaners cleans all related
-    resources.
+    resources. Resource managers start as soon as managers they depend on
+    (see get_dependencies()) finish, so independent managers work
+    simultaneously. Number of resources that are deleted at the same time is
+    limited by cleanup_threads option.
 
     :param names: Use only resource manages that has name from this list.
                   There are in as _service or
@@ -275,8 +377,40 @@ def cleanup(names=None, admin_required=None, admin=None, users=None):
 
                   }
     """
-    for manager in find_resource_managers(names, admin_required):
-        LOG.debug("Cleaning up %(service)s %(resource)s objects" %
-                  {"service": manager._service,
-                   "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users).exterminate()
+    resource_managers = find_resource_managers(names, admin_required)
+    dependencies = get_dependencies(resource_managers)
+    finished = dict((mgr, threading.Event()) for mgr in resource_managers)
+    budget = threading.BoundedSemaphore(CONF.cleanup.cleanup_threads)
+    durations = []
+    errors = []
+
+    def exterminate(manager):
+        try:
+            for dependency in dependencies[manager]:
+                finished[dependency].wait()
+
+            LOG.debug("Cleaning up %(service)s %(resource)s objects" %
+                      {"service": manager._service,
+                       "resource": manager._resource})
+            started = time.time()
+            SeekAndDestroy(manager, admin, users, budget=budget).exterminate()
+            durations.append((time.time() - started, manager))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            finished[manager].set()
+
+    threads = [threading.Thread(target=exterminate, args=(mgr,))
+               for mgr in resource_managers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for duration, manager in sorted(durations, key=lambda x: -x[0]):
+        LOG.info(_("Cleanup of %(service)s.%(resource)s took %(duration).2f "
+                   "sec") % {"service": manager._service,
+                             "resource": manager._resource,
+                             "duration": duration})
+    if errors:
+        raise errors[0]
@@ -52,7 +52,11 @@ class QuotaMixin(SynchronizedDeletion):
 
 # HEAT
 
-@base.resource("heat", "stacks", order=100, tenant_resource=True)
+_heat_depends_on = []
+
+
+@base.resource("heat", "stacks", order=100, tenant_resource=True,
+               depends_on=_heat_depends_on, batch_polling=True)
 class HeatStack(base.ResourceManager):
     pass
 
@@ -60,9 +64,11 @@ class HeatStack(base.ResourceManager):
 # NOVA
 
 _nova_order = get_order(200)
+_nova_depends_on = ["heat"]
 
 
-@base.resource("nova", "servers", order=next(_nova_order))
+@base.resource("nova", "servers", order=next(_nova_order),
+               depends_on=_nova_depends_on, batch_polling=True)
 class NovaServer(base.ResourceManager):
     def list(self):
         """List all servers."""
@@ -95,17 +101,20 @@ class NovaServer(base.ResourceManager):
         super(NovaServer, self).delete()
 
 
-@base.resource("nova", "floating_ips", order=next(_nova_order))
+@base.resource("nova", "floating_ips", order=next(_nova_order),
+               depends_on=_nova_depends_on)
 class NovaFloatingIPs(SynchronizedDeletion, base.ResourceManager):
     pass
 
 
-@base.resource("nova", "keypairs", order=next(_nova_order))
+@base.resource("nova", "keypairs", order=next(_nova_order),
+               depends_on=_nova_depends_on)
 class NovaKeypair(SynchronizedDeletion, base.ResourceManager):
     pass
 
 
-@base.resource("nova", "security_groups", order=next(_nova_order))
+@base.resource("nova", "security_groups", order=next(_nova_order),
+               depends_on=_nova_depends_on)
 class NovaSecurityGroup(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
@@ -114,13 +123,14 @@ class NovaSecurityGroup(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("nova", "quotas", order=next(_nova_order),
-               admin_required=True, tenant_resource=True)
+               admin_required=True, tenant_resource=True,
+               depends_on=_nova_depends_on)
 class NovaQuotas(QuotaMixin, base.ResourceManager):
     pass
 
 
 @base.resource("nova", "floating_ips_bulk", order=next(_nova_order),
-               admin_required=True)
+               admin_required=True, depends_on=_nova_depends_on)
 class NovaFloatingIpsBulk(SynchronizedDeletion, base.ResourceManager):
 
     def id(self):
@@ -133,7 +143,8 @@ class NovaFloatingIpsBulk(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("nova", "networks", order=next(_nova_order),
-               admin_required=True, tenant_resource=True)
+               admin_required=True, tenant_resource=True,
+               depends_on=_nova_depends_on)
 class NovaNetworks(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
@@ -146,6 +157,7 @@ class NovaNetworks(SynchronizedDeletion, base.ResourceManager):
 # EC2
 
 _ec2_order = get_order(250)
+_ec2_depends_on = ["heat", "nova"]
 
 
 class EC2Mixin(object):
@@ -154,7 +166,8 @@ class EC2Mixin(object):
         return getattr(self.user, self._service)()
 
 
-@base.resource("ec2", "servers", order=next(_ec2_order))
+@base.resource("ec2", "servers", order=next(_ec2_order),
+               depends_on=_ec2_depends_on)
 class EC2Server(EC2Mixin, base.ResourceManager):
 
     def is_deleted(self):
@@ -184,6 +197,7 @@ class EC2Server(EC2Mixin, base.ResourceManager):
 # NEUTRON
 
 _neutron_order = get_order(300)
+_neutron_depends_on = ["heat", "nova", "ec2"]
 
 
 @base.resource(service=None, resource=None, admin_required=True)
@@ -224,25 +238,25 @@ class NeutronLbaasV1Mixin(NeutronMixin):
 
 
 @base.resource("neutron", "vip", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronV1Vip(NeutronLbaasV1Mixin):
     pass
 
 
 @base.resource("neutron", "health_monitor", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronV1Healthmonitor(NeutronLbaasV1Mixin):
     pass
 
 
 @base.resource("neutron", "pool", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronV1Pool(NeutronLbaasV1Mixin):
     pass
 
 
 @base.resource("neutron", "port", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronPort(NeutronMixin):
 
     def delete(self):
@@ -263,31 +277,32 @@ class NeutronPort(NeutronMixin):
 
 
 @base.resource("neutron", "router", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronRouter(NeutronMixin):
     pass
 
 
 @base.resource("neutron", "subnet", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronSubnet(NeutronMixin):
     pass
 
 
 @base.resource("neutron", "network", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronNetwork(NeutronMixin):
     pass
 
 
 @base.resource("neutron", "floatingip", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_neutron_depends_on)
 class NeutronFloatingIP(NeutronMixin):
     pass
 
 
 @base.resource("neutron", "quota", order=next(_neutron_order),
-               admin_required=True, tenant_resource=True)
+               admin_required=True, tenant_resource=True,
+               depends_on=_neutron_depends_on)
 class NeutronQuota(QuotaMixin, NeutronMixin):
 
     def delete(self):
@@ -297,34 +312,39 @@ class NeutronQuota(QuotaMixin, NeutronMixin):
 # CINDER
 
 _cinder_order = get_order(400)
+_cinder_depends_on = ["heat", "nova"]
 
 
 @base.resource("cinder", "backups", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on,
+               batch_polling=True)
 class CinderVolumeBackup(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "volume_snapshots", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on,
+               batch_polling=True)
 class CinderVolumeSnapshot(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "transfers", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on)
 class CinderVolumeTransfer(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "volumes", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on,
+               batch_polling=True)
 class CinderVolume(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "quotas", order=next(_cinder_order),
-               admin_required=True, tenant_resource=True)
+               admin_required=True, tenant_resource=True,
+               depends_on=_cinder_depends_on)
 class CinderQuotas(QuotaMixin, base.ResourceManager):
     pass
 
@@ -354,7 +374,11 @@ class ManilaSecurityService(base.ResourceManager):
 
 # GLANCE
 
-@base.resource("glance", "images", order=500, tenant_resource=True)
+_glance_depends_on = ["heat", "nova"]
+
+
+@base.resource("glance", "images", order=500, tenant_resource=True,
+               depends_on=_glance_depends_on)
 class GlanceImage(base.ResourceManager):
 
     def list(self):
@@ -427,7 +451,11 @@ class SaharaNodeGroup(SynchronizedDeletion, base.ResourceManager):
 
 # CEILOMETER
 
-@base.resource("ceilometer", "alarms", order=700, tenant_resource=True)
+_ceilometer_depends_on = []
+
+
+@base.resource("ceilometer", "alarms", order=700, tenant_resource=True,
+               depends_on=_ceilometer_depends_on)
 class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
     def id(self):
@@ -444,7 +472,10 @@ class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
 # ZAQAR
 
-@base.resource("zaqar", "queues", order=800)
+_zaqar_depends_on = []
+
+
+@base.resource("zaqar", "queues", order=800, depends_on=_zaqar_depends_on)
 class ZaqarQueues(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
@@ -454,15 +485,18 @@ class ZaqarQueues(SynchronizedDeletion, base.ResourceManager):
 # DESIGNATE
 
 _designate_order = get_order(900)
+_designate_depends_on = []
 
 
-@base.resource("designate", "domains", order=next(_designate_order))
+@base.resource("designate", "domains", order=next(_designate_order),
+               depends_on=_designate_depends_on)
 class Designate(SynchronizedDeletion, base.ResourceManager):
     pass
 
 
 @base.resource("designate", "servers", order=next(_designate_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               depends_on=_designate_depends_on)
 class DesignateServer(SynchronizedDeletion, base.ResourceManager):
     pass
 
@@ -470,6 +504,7 @@ class DesignateServer(SynchronizedDeletion, base.ResourceManager):
 # SWIFT
 
 _swift_order = get_order(1000)
+_swift_depends_on = []
 
 
 class SwiftMixin(SynchronizedDeletion, base.ResourceManager):
@@ -490,7 +525,7 @@ class SwiftMixin(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("swift", "object", order=next(_swift_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_swift_depends_on)
 class SwiftObject(SwiftMixin):
 
     def list(self):
@@ -506,7 +541,7 @@ class SwiftObject(SwiftMixin):
 
 
 @base.resource("swift", "container", order=next(_swift_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_swift_depends_on)
 class SwiftContainer(SwiftMixin):
 
     def list(self):
@@ -516,7 +551,11 @@ class SwiftContainer(SwiftMixin):
 
 # MISTRAL
 
-@base.resource("mistral", "workbooks", order=1100, tenant_resource=True)
+_mistral_depends_on = []
+
+
+@base.resource("mistral", "workbooks", order=1100, tenant_resource=True,
+               depends_on=_mistral_depends_on)
 class MistralWorkbooks(SynchronizedDeletion, base.ResourceManager):
     def delete(self):
         self._manager().delete(self.raw_resource.name)
@@ -525,16 +564,17 @@ class MistralWorkbooks(SynchronizedDeletion, base.ResourceManager):
 # MURANO
 
 _murano_order = get_order(1200)
+_murano_depends_on = ["heat"]
 
 
 @base.resource("murano", "environments", tenant_resource=True,
-               order=next(_murano_order))
+               order=next(_murano_order), depends_on=_murano_depends_on)
 class MuranoEnvironments(SynchronizedDeletion, base.ResourceManager):
     pass
 
 
 @base.resource("murano", "packages", tenant_resource=True,
-               order=next(_murano_order))
+               order=next(_murano_order), depends_on=_murano_depends_on)
 class MuranoPackages(base.ResourceManager):
     def list(self):
         return filter(lambda x: x.name != "Core library",
@@ -544,10 +584,12 @@ class MuranoPackages(base.ResourceManager):
 # IRONIC
 
 _ironic_order = get_order(1300)
+_ironic_depends_on = ["nova"]
 
 
 @base.resource("ironic", "node", admin_required=True,
-               order=next(_ironic_order), perform_for_admin_only=True)
+               order=next(_ironic_order), perform_for_admin_only=True,
+               depends_on=_ironic_depends_on)
 class IronicNodes(base.ResourceManager):
 
     def id(self):
@@ -556,8 +598,12 @@ class IronicNodes(base.ResourceManager):
 
 # FUEL
 
+_fuel_depends_on = []
+
+
 @base.resource("fuel", "environment", order=1400,
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               depends_on=_fuel_depends_on)
 class FuelEnvironment(base.ResourceManager):
     """Fuel environment.
 
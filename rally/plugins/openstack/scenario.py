@@ -13,14 +13,62 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
+
 from rally import osclients
 from rally.task import scenario
+from rally.task import utils
+
+
+STATUS_POLL_OPTS = [
+    cfg.BoolOpt("status_poll_multiplexing",
+                default=True,
+                help="Wait for statuses of resources of one type and user "
+                     "with a list call per poll interval shared by all the "
+                     "iterations of a process, instead of a get call per "
+                     "resource"),
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(STATUS_POLL_OPTS, group=benchmark_group)
 
 # NOTE(boris-42): Shortcut to remove import of both rally.task.scenario and
 #                 rally.plugins.openstack.scenario
 configure = scenario.configure
 
 
+def _list_waited_resources(resources):
+    """List resources of a manager that are in the status of the given ones.
+
+    The most common status of the given resources is used as the filter
+    of the list call, so it returns resources that are still waited for
+    rather than all the resources of the user (e.g. the public images),
+    the rest of the given resources are checked with get calls.
+
+    :param resources: non-empty list of resources of one manager
+    :returns: list of resources
+    """
+    manager = resources[0].manager
+    module = manager.__class__.__module__
+    counts = {}
+    for resource in resources:
+        status = getattr(resource, "status", None)
+        counts[status] = counts.get(status, 0) + 1
+    status = max(counts, key=counts.get)
+
+    if module.startswith("glanceclient."):
+        filters = {"status": status} if status else {}
+        owner = getattr(resources[0], "owner", None)
+        if owner and not module.startswith("glanceclient.v1."):
+            filters["owner"] = owner
+        return list(manager.list(filters=filters))
+    if module.startswith(("novaclient.", "cinderclient.")):
+        return manager.list(detailed=True,
+                            search_opts={"status": status} if status else None)
+    return manager.list()
+
+
 class OpenStackScenario(scenario.Scenario):
     """Base class for all OpenStack scenarios."""
 
@@ -48,6 +96,8 @@ class OpenStackScenario(scenario.Scenario):
                     "Only one of context[\"user\"] or clients"
                     " must be supplied")
             self._clients = clients
+        self._status_waits = 0
+        self._status_polls_saved = 0.0
 
     def clients(self, client_type, version=None):
         """Returns a python openstack client of the requested type.
@@ -75,3 +125,60 @@ class OpenStackScenario(scenario.Scenario):
         client = getattr(self._admin_clients, client_type)
 
         return client(version) if version is not None else client()
+
+    def _wait_for_status(self, resource, ready_statuses, timeout=60,
+                         check_interval=1, check_deletion=False):
+        """Wait for a resource of the user to come into a ready status.
+
+        With status_poll_multiplexing the status is polled by the shared
+        StatusPollMultiplexer, grouped by the type of the resource and the
+        user, with list calls filtered by the status of the resources
+        that are waited for, otherwise with a get call per check interval.
+        The resource must be created by self.clients, "ERROR" status is a
+        failure.
+
+        :param resource: The resource object with id and manager
+        :param ready_statuses: List of statuses which mean that the resource
+                               is ready
+        :param timeout: Timeout in seconds
+        :param check_interval: Interval in seconds between the two
+                               consecutive polls
+        :param check_deletion: Whether the wait is over once the resource
+                               is deleted
+        :returns: The "ready" resource object
+        """
+        endpoint = getattr(getattr(self, "_clients", None), "endpoint", None)
+        if not CONF.benchmark.status_poll_multiplexing or endpoint is None:
+            return utils.wait_for_status(
+                resource,
+                ready_statuses=ready_statuses,
+                check_deletion=check_deletion,
+                update_resource=utils.get_from_manager(),
+                timeout=timeout,
+                check_interval=check_interval)
+
+        manager = resource.manager
+        group = ("%s.%s" % (manager.__class__.__module__,
+                            manager.__class__.__name__),
+                 endpoint.auth_url, endpoint.username, endpoint.tenant_name,
+                 endpoint.region_name)
+        waiter = utils.get_status_poll_multiplexer().register(
+            resource, group, ready_statuses, failure_statuses=["ERROR"],
+            list_resources=_list_waited_resources, timeout=timeout,
+            check_interval=check_interval, check_deletion=check_deletion)
+        try:
+            return waiter.wait()
+        finally:
+            self._status_waits += 1
+            self._status_polls_saved += waiter.polls_saved
+
+    def output_data(self):
+        """Returns the number of status polls saved by shared polls.
+
+        It is reported only by iterations that waited for statuses with
+        status_poll_multiplexing.
+        """
+        data = super(OpenStackScenario, self).output_data()
+        if self._status_waits:
+            data["status_polls_saved"] = self._status_polls_saved
+        return data
@@ -137,10 +137,9 @@ class CinderScenario(scenario.OpenStackScenario):
         # NOTE(msdubov): It is reasonable to wait 5 secs before starting to
         #                check whether the volume is ready => less API calls.
         time.sleep(CONF.benchmark.cinder_volume_create_prepoll_delay)
-        volume = bench_utils.wait_for(
+        volume = self._wait_for_status(
             volume,
-            is_ready=bench_utils.resource_is("available"),
-            update_resource=bench_utils.get_from_manager(),
+            ready_statuses=["available"],
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
@@ -169,11 +168,10 @@ class CinderScenario(scenario.OpenStackScenario):
         :param volume: volume object
         """
         volume.delete()
-        bench_utils.wait_for_status(
+        self._wait_for_status(
             volume,
             ready_statuses=["deleted"],
             check_deletion=True,
-            update_resource=bench_utils.get_from_manager(),
             timeout=CONF.benchmark.cinder_volume_delete_timeout,
             check_interval=CONF.benchmark.cinder_volume_delete_poll_interval
         )
@@ -196,10 +194,9 @@ class CinderScenario(scenario.OpenStackScenario):
             new_size = random.randint(new_size["min"], new_size["max"])
 
         volume.extend(volume, new_size)
-        volume = bench_utils.wait_for(
+        volume = self._wait_for_status(
             volume,
-            is_ready=bench_utils.resource_is("available"),
-            update_resource=bench_utils.get_from_manager(),
+            ready_statuses=["available"],
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
@@ -224,10 +221,9 @@ class CinderScenario(scenario.OpenStackScenario):
                                            container_format, disk_format)
         # NOTE (e0ne): upload_to_image changes volume status to uploading so
         # we need to wait until it will be available.
-        volume = bench_utils.wait_for(
+        volume = self._wait_for_status(
             volume,
-            is_ready=bench_utils.resource_is("available"),
-            update_resource=bench_utils.get_from_manager(),
+            ready_statuses=["available"],
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
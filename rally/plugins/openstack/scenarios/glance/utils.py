@@ -20,7 +20,6 @@ from oslo_config import cfg
 
 from rally.plugins.openstack import scenario
 from rally.task import atomic
-from rally.task import utils
 
 
 GLANCE_BENCHMARK_OPTS = [
@@ -91,10 +90,9 @@ class GlanceScenario(scenario.OpenStackScenario):
 
             time.sleep(CONF.benchmark.glance_image_create_prepoll_delay)
 
-            image = utils.wait_for(
+            image = self._wait_for_status(
                 image,
-                is_ready=utils.resource_is("active"),
-                update_resource=utils.get_from_manager(),
+                ready_statuses=["active"],
                 timeout=CONF.benchmark.glance_image_create_timeout,
                 check_interval=CONF.benchmark.
                 glance_image_create_poll_interval)
@@ -114,10 +112,9 @@ class GlanceScenario(scenario.OpenStackScenario):
         :param image: Image object
         """
         image.delete()
-        utils.wait_for_status(
+        self._wait_for_status(
             image,
             ready_statuses=["deleted"],
             check_deletion=True,
-            update_resource=utils.get_from_manager(),
             timeout=CONF.benchmark.glance_image_delete_timeout,
             check_interval=CONF.benchmark.glance_image_delete_poll_interval)
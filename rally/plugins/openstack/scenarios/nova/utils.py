@@ -139,10 +139,9 @@ class NovaScenario(scenario.OpenStackScenario):
             server_name, image_id, flavor_id, **kwargs)
 
         time.sleep(CONF.benchmark.nova_server_boot_prepoll_delay)
-        server = utils.wait_for(
+        server = self._wait_for_status(
             server,
-            is_ready=utils.resource_is("ACTIVE"),
-            update_resource=utils.get_from_manager(),
+            ready_statuses=["ACTIVE"],
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
         )
@@ -389,11 +388,10 @@ class NovaScenario(scenario.OpenStackScenario):
             else:
                 server.delete()
 
-            utils.wait_for_status(
+            self._wait_for_status(
                 server,
                 ready_statuses=["deleted"],
                 check_deletion=True,
-                update_resource=utils.get_from_manager(),
                 timeout=CONF.benchmark.nova_server_delete_timeout,
                 check_interval=CONF.benchmark.nova_server_delete_poll_interval
             )
@@ -413,11 +411,10 @@ class NovaScenario(scenario.OpenStackScenario):
                     server.delete()
 
             for server in servers:
-                utils.wait_for_status(
+                self._wait_for_status(
                     server,
                     ready_statuses=["deleted"],
                     check_deletion=True,
-                    update_resource=utils.get_from_manager(),
                     timeout=CONF.benchmark.nova_server_delete_timeout,
                     check_interval=CONF.
                     benchmark.nova_server_delete_poll_interval
@@ -536,11 +533,9 @@ class NovaScenario(scenario.OpenStackScenario):
         servers = [s for s in self.clients("nova").servers.list()
                    if s.name.startswith(name_prefix)]
         time.sleep(CONF.benchmark.nova_server_boot_prepoll_delay)
-        servers = [utils.wait_for(
+        servers = [self._wait_for_status(
             server,
-            is_ready=utils.resource_is("ACTIVE"),
-            update_resource=utils.
-            get_from_manager(),
+            ready_statuses=["ACTIVE"],
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
         ) for server in servers]
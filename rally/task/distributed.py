@@ -0,0 +1,402 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Distributed load generation.
+
+Load of a scenario is split between worker agents (see WorkerAgent and
+`rally worker start`) registered in the database. All the agents and the
+node that runs `rally task start --distributed` have to use the same
+database, e.g. several local agents may share one SQLite file:
+
+    rally worker start --hostname agent-1 &
+    rally worker start --hostname agent-2 &
+    rally task start --distributed --task task.yaml
+
+The scenario context is set up once by the node that runs the task and
+its data is sent to the agents with the jobs, so all the agents share the
+same users, tenants and other resources. Thus context data has to be JSON
+serializable (endpoints are sent as dicts); contexts that keep objects
+like clients or open files in it can't be used in distributed tasks.
+"""
+
+import datetime
+import os
+import socket
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+import six
+
+from rally.common import db
+from rally.common import log as logging
+from rally.common import objects
+from rally.common import utils as rutils
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+
+
+LOG = logging.getLogger(__name__)
+
+DISTRIBUTED_OPTS = [
+    cfg.IntOpt("worker_heartbeat_interval",
+               default=5,
+               help="Interval between heartbeats of a worker agent, in "
+                    "seconds"),
+    cfg.IntOpt("worker_timeout",
+               default=30,
+               help="Worker agent that did not send a heartbeat for this "
+                    "number of seconds is considered dead"),
+    cfg.FloatOpt("worker_poll_interval",
+                 default=1.0,
+                 help="Interval between checks of worker jobs and their "
+                      "results, in seconds")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_opts(DISTRIBUTED_OPTS, group=benchmark_group)
+
+# NOTE: runner config fields that define the load and their defaults
+LOAD_FIELDS = {"times": 1, "concurrency": 1,
+               "max_concurrency": None, "rps": None}
+
+
+def get_alive_workers():
+    """Return workers that have sent a heartbeat within worker_timeout."""
+    alive_since = timeutils.utcnow() - datetime.timedelta(
+        seconds=CONF.benchmark.worker_timeout)
+    return db.worker_list(alive_since=alive_since)
+
+
+def dump_context(context_obj):
+    """Return data of a set up context to send it to workers.
+
+    The task object is not sent, workers load it from the database.
+
+    :param context_obj: scenario context object
+    :returns: JSON serializable copy of the context, endpoints are
+              replaced with {"__endpoint__": dict with their fields}
+    :raises TypeError: if the context has data that can't be sent
+    """
+    def dump(value):
+        if isinstance(value, objects.Endpoint):
+            return {"__endpoint__": value.to_dict(include_permission=True)}
+        if isinstance(value, dict):
+            return dict((k, dump(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return [dump(v) for v in value]
+        if value is None or isinstance(
+                value, six.string_types + six.integer_types + (float,)):
+            return value
+        raise TypeError("Context data of type %s can't be sent to workers"
+                        % type(value).__name__)
+
+    return dump(dict((k, v) for k, v in context_obj.items() if k != "task"))
+
+
+def load_context(data, task):
+    """Restore context sent by dump_context().
+
+    :param data: context data returned by dump_context()
+    :param task: Task object of the context
+    :returns: scenario context object
+    """
+    def load(value):
+        if isinstance(value, dict):
+            if "__endpoint__" in value:
+                return objects.Endpoint(**value["__endpoint__"])
+            return dict((k, load(v)) for k, v in value.items())
+        if isinstance(value, list):
+            return [load(v) for v in value]
+        return value
+
+    context_obj = load(data)
+    context_obj["task"] = task
+    return context_obj
+
+
+def split_runner_config(config, count):
+    """Split the load defined by a runner config between workers.
+
+    Numbers of iterations and concurrency are split as evenly as possible,
+    rps is divided equally. Other fields (e.g. duration or timeout) are
+    kept as is.
+
+    :param config: runner config of a scenario
+    :param count: number of available workers
+    :returns: list of at most count runner configs, every share runs at
+              least one iteration
+    """
+    properties = runner.ScenarioRunner.get(
+        config["type"]).CONFIG_SCHEMA.get("properties", {})
+    load = {}
+    for field, default in LOAD_FIELDS.items():
+        value = config.get(field, default)
+        if field in properties and value is not None:
+            load[field] = value
+
+    count = min([count] + [v for f, v in load.items() if f != "rps"])
+    configs = []
+    for i in range(count):
+        share = dict(config)
+        for field, value in load.items():
+            if field == "rps":
+                share[field] = float(value) / count
+            else:
+                share[field] = value // count + int(i < value % count)
+        configs.append(share)
+    return configs
+
+
+class DistributedRunner(runner.ScenarioRunner):
+    """Scenario runner that splits the load between worker agents.
+
+    The runner config is split with split_runner_config() and every share
+    is assigned to an alive worker as a job together with the data of the
+    scenario context, that is set up by the caller. Workers run their
+    shares with the configured runner in this context. Results are
+    streamed back via the database and sent to the consumer as if they were
+    produced locally, so SLA is checked on this node for the whole load.
+    """
+
+    def run(self, name, context, args):
+        # NOTE: args are preprocessed by workers
+        with rutils.Timer() as timer:
+            self._run_scenario(name, context, args)
+        self.run_duration = timer.duration()
+        return self.run_duration
+
+    def _create_jobs(self, name, context, args):
+        workers = get_alive_workers()
+        if not workers:
+            raise exceptions.NoWorkersAvailable()
+
+        jobs = {}
+        context_data = dump_context(context)
+        shares = split_runner_config(self.config, len(workers))
+        for worker, share in zip(workers, shares):
+            job = db.worker_job_create({
+                "task_uuid": self.task["uuid"],
+                "worker": worker["hostname"],
+                "key": {"name": name, "args": args,
+                        "context": context_data, "runner": share}})
+            jobs[job["id"]] = worker["hostname"]
+        LOG.info("Load of %(name)s is split between workers: %(workers)s"
+                 % {"name": name,
+                    "workers": ", ".join(sorted(jobs.values()))})
+        return jobs
+
+    def _run_scenario(self, name, context, args):
+        """Run the scenario on workers and wait for their results.
+
+        :raises WorkerJobFailed: if any job failed or its worker died
+        """
+        jobs = self._create_jobs(name, context, args)
+        failures = []
+        aborting = False
+
+        while jobs:
+            if self.aborted.is_set() and not aborting:
+                aborting = True
+                for job_id in jobs:
+                    db.worker_job_update(
+                        job_id, {"status": consts.WorkerJobStatus.ABORTING},
+                        statuses=[consts.WorkerJobStatus.PENDING,
+                                  consts.WorkerJobStatus.RUNNING])
+
+            alive = set(w["hostname"] for w in get_alive_workers())
+            for job_id, worker in list(jobs.items()):
+                # NOTE: status is read before results, so all the results
+                #       of a finished job are received
+                job = db.worker_job_get(job_id)
+                for iterations in db.worker_job_result_pop(job_id):
+                    for result in iterations:
+                        self._send_result(result)
+
+                if job["status"] == consts.WorkerJobStatus.FAILED:
+                    failures.append({"job": job_id, "worker": worker,
+                                     "reason": job["error"]})
+                elif worker not in alive:
+                    reason = "worker stopped sending heartbeats"
+                    db.worker_job_update(
+                        job_id, {"status": consts.WorkerJobStatus.FAILED,
+                                 "error": reason})
+                    failures.append({"job": job_id, "worker": worker,
+                                     "reason": reason})
+                elif job["status"] != consts.WorkerJobStatus.FINISHED:
+                    continue
+                del jobs[job_id]
+
+            if jobs:
+                time.sleep(CONF.benchmark.worker_poll_interval)
+
+        if failures:
+            raise exceptions.WorkerJobFailed(**failures[0])
+
+
+class JobResultPublisher(object):
+    """Sends results of a worker job to the node that runs the task.
+
+    Results are sent in batches as soon as the runner produces them. The
+    runner is aborted if the job is switched to "aborting" status.
+    """
+
+    def __init__(self, job_id, runner):
+        """JobResultPublisher constructor.
+
+        :param job_id: ID of the worker job
+        :param runner: ScenarioRunner instance that produces results
+        """
+        self.job_id = job_id
+        self.runner = runner
+        self.is_done = threading.Event()
+        self.thread = threading.Thread(target=self._publish_results)
+        self.aborting_checker = threading.Thread(target=self.wait_and_abort)
+
+    def __enter__(self):
+        self.thread.start()
+        self.aborting_checker.start()
+        return self
+
+    def _publish_results(self):
+        while True:
+            if self.runner.result_queue:
+                queue = self.runner.result_queue
+                db.worker_job_result_create(
+                    self.job_id, [queue.popleft() for i in range(len(queue))])
+            elif self.is_done.isSet():
+                break
+            else:
+                self.runner.wait_for_results(self.is_done)
+
+    def wait_and_abort(self):
+        """Wait until the job is aborted and abort the runner in this case."""
+        while not self.is_done.wait(CONF.benchmark.worker_poll_interval):
+            job = db.worker_job_get(self.job_id)
+            if job["status"] == consts.WorkerJobStatus.ABORTING:
+                self.runner.abort()
+                break
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.is_done.set()
+        self.runner.notify_results()
+        self.aborting_checker.join()
+        self.thread.join()
+
+
+class WorkerAgent(object):
+    """Worker agent that runs jobs of distributed tasks.
+
+    Agent registers itself in the database, sends heartbeats while it is
+    running and runs every job assigned to it in a separate thread.
+
+    .. note::
+
+        Typical usage:
+            with WorkerAgent("agent-1") as agent:
+                agent.serve()   # until agent.stop() is called
+    """
+
+    def __init__(self, hostname=None):
+        """WorkerAgent constructor.
+
+        :param hostname: unique name of the agent, defaults to the host name
+                         and PID, so several agents may run on one host
+        """
+        self.hostname = hostname or "%s-%d" % (socket.gethostname(),
+                                               os.getpid())
+        self.stopped = threading.Event()
+        self.heartbeat_stopped = threading.Event()
+        self.heartbeat = threading.Thread(target=self._send_heartbeats)
+        self.jobs = []
+        self.runners = {}
+
+    def __enter__(self):
+        db.register_worker({"hostname": self.hostname})
+        self.heartbeat.start()
+        LOG.info("Worker %s started." % self.hostname)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+        if exc_type:
+            for runner_obj in list(self.runners.values()):
+                runner_obj.abort()
+        # NOTE: heartbeats are sent until all the jobs are finished, so the
+        #       jobs are not considered failed meanwhile
+        for thread in self.jobs:
+            thread.join()
+        self.heartbeat_stopped.set()
+        self.heartbeat.join()
+        db.unregister_worker(self.hostname)
+        LOG.info("Worker %s stopped." % self.hostname)
+
+    def _send_heartbeats(self):
+        while not self.heartbeat_stopped.wait(
+                CONF.benchmark.worker_heartbeat_interval):
+            db.update_worker(self.hostname)
+
+    def stop(self):
+        """Stop taking new jobs."""
+        self.stopped.set()
+
+    def serve(self):
+        """Take and run assigned jobs until stop() is called."""
+        while not self.stopped.is_set():
+            self.jobs = [t for t in self.jobs if t.is_alive()]
+            for job in db.worker_job_list(
+                    worker=self.hostname,
+                    status=consts.WorkerJobStatus.PENDING):
+                self.start_job(job)
+            self.stopped.wait(CONF.benchmark.worker_poll_interval)
+
+    def start_job(self, job):
+        """Run the job in a separate thread unless it is aborted already."""
+        if not db.worker_job_update(
+                job["id"], {"status": consts.WorkerJobStatus.RUNNING},
+                statuses=[consts.WorkerJobStatus.PENDING]):
+            return
+        thread = threading.Thread(target=self.run_job, args=(job,))
+        thread.start()
+        self.jobs.append(thread)
+
+    def run_job(self, job):
+        """Run the share of the load of the job in the context of the job."""
+        key = job["key"]
+        LOG.info("Worker %(worker)s runs job %(job)s of task %(task)s."
+                 % {"worker": self.hostname, "job": job["id"],
+                    "task": job["task_uuid"]})
+        try:
+            task = objects.Task.get(job["task_uuid"])
+            runner_obj = runner.ScenarioRunner.get(key["runner"]["type"])(
+                task, key["runner"])
+            self.runners[job["id"]] = runner_obj
+            context_obj = load_context(key["context"], task)
+            with JobResultPublisher(job["id"], runner_obj):
+                runner_obj.run(key["name"], context_obj, key["args"])
+        except Exception as e:
+            LOG.exception(e)
+            db.worker_job_update(
+                job["id"], {"status": consts.WorkerJobStatus.FAILED,
+                            "error": "%s: %s" % (type(e).__name__, e)})
+        else:
+            db.worker_job_update(
+                job["id"], {"status": consts.WorkerJobStatus.FINISHED,
+                            "load_duration": runner_obj.run_duration})
+        finally:
+            self.runners.pop(job["id"], None)
@@ -14,12 +14,15 @@
 #    under the License.
 
 import copy
+import itertools
 import json
+import sys
 import threading
 import time
 import traceback
 
 import jsonschema
+from oslo_config import cfg
 import six
 
 from rally.common.i18n import _
@@ -32,18 +35,59 @@ from rally import osclients
 from rally.plugins.openstack.context.keystone import existing_users
 from rally.plugins.openstack.context.keystone import users as users_ctx
 from rally.task import context
+from rally.task import distributed
+from rally.task.processing import columns
+from rally.task import progress
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
+from rally.task import types
+from rally.task import validation
 
 
 LOG = logging.getLogger(__name__)
 
+RESULT_CONSUMER_OPTS = [
+    cfg.IntOpt("result_chunk_size",
+               default=1000,
+               help="Number of iteration results stored in DB at once while "
+                    "a scenario is running"),
+    cfg.FloatOpt("abort_poll_interval",
+                 default=2.0,
+                 help="Interval between checks of the task status for abort "
+                      "while a scenario is running, in seconds. Aborts from "
+                      "the same host are noticed at once via the progress "
+                      "server")
+]
+
+SEMANTIC_VALIDATION_OPTS = [
+    cfg.BoolOpt("semantic_validation_enabled",
+                default=False,
+                help="Run validators of scenarios against the cloud before "
+                     "the task is started, they require OpenStack clients"),
+    cfg.IntOpt("semantic_validation_workers",
+               default=8,
+               help="Max number of scenario validations run at once")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_opts(RESULT_CONSUMER_OPTS, group=benchmark_group)
+CONF.register_opts(SEMANTIC_VALIDATION_OPTS, group=benchmark_group)
+
 
 class ResultConsumer(object):
-    """ResultConsumer class stores results from ScenarioRunner, checks SLA."""
+    """ResultConsumer class stores results from ScenarioRunner, checks SLA.
+
+    Results are stored in DB in chunks of result_chunk_size iterations, so
+    memory usage does not depend on the number of iterations. Aggregated
+    data (see objects.task.ResultInfo) is computed on the fly and stored
+    along with SLA results.
+    """
 
-    def __init__(self, key, task, runner, abort_on_sla_failure):
+    def __init__(self, key, task, runner, abort_on_sla_failure,
+                 tstamp_base=None, progress_server=None):
         """ResultConsumer constructor.
 
         :param key: Scenario identifier
@@ -52,6 +96,11 @@ class ResultConsumer(object):
                        consumed
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param tstamp_base: timestamp the iterations timeline starts from,
+                            shared by scenarios that run in parallel.
+                            Defaults to the start of the first iteration
+        :param progress_server: ProgressServer instance to publish live
+                                progress of the scenario with
         """
 
         self.key = key
@@ -59,15 +108,30 @@ class ResultConsumer(object):
         self.runner = runner
         self.sla_checker = sla.SLAChecker(key["kw"])
         self.abort_on_sla_failure = abort_on_sla_failure
+        # NOTE: Failed SLA should abort the runner as soon as the failed
+        #       iteration is done, not when a batch of results is ready
+        self.runner.notify_every_result = abort_on_sla_failure
         self.is_done = threading.Event()
         self.unexpected_failure = {}
         self.results = []
+        self.result_info = objects.task.ResultInfo()
+        self.chunk_size = CONF.benchmark.result_chunk_size
+        self.task_result = None
+        self.tstamp_base = tstamp_base
+        self.progress_server = progress_server
+        self.progress = progress_server and progress.ScenarioProgress(key)
         self.thread = threading.Thread(
             target=self._consume_results
         )
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
+        self.wakeup = threading.Event()
 
     def __enter__(self):
+        self.task_result = self.task.append_results(self.key, {
+            "raw": [], "load_duration": 0, "full_duration": 0, "sla": []})
+        if self.progress_server:
+            self.progress_server.register(self.progress)
+            self.progress_server.add_abort_listener(self.wakeup)
         self.thread.start()
         self.aborting_checker.start()
         self.start = time.time()
@@ -76,22 +140,60 @@ class ResultConsumer(object):
     def _consume_results(self):
         while True:
             if self.runner.result_queue:
-                result = self.runner.result_queue.popleft()
-                self.results.append(result)
+                self._consume_batch()
+            elif self.is_done.isSet():
+                break
+            else:
+                self.runner.wait_for_results(self.is_done)
+
+    def _consume_batch(self):
+        """Process results that are queued at the moment of the call.
+
+        SLA is checked for the whole batch at once with IterationColumns,
+        or for every result if abort_on_sla_failure is set (or NumPy is
+        not installed). In that case the runner wakes the consumer up with
+        every first queued result, so runner is aborted right after the
+        iteration that failed SLA.
+        """
+        batch = [self.runner.result_queue.popleft()
+                 for i in range(len(self.runner.result_queue))]
+        check_each = self.abort_on_sla_failure or not columns.is_available()
+        if not check_each:
+            self.sla_checker.add_columns(columns.IterationColumns(batch))
+
+        for result in batch:
+            self.results.append(result)
+            self.result_info.add(result)
+            if self.progress:
+                self.progress.add(result)
+            if check_each:
                 success = self.sla_checker.add_iteration(result)
                 if self.abort_on_sla_failure and not success:
                     self.sla_checker.set_aborted_on_sla()
                     self.runner.abort()
-            elif self.is_done.isSet():
-                break
-            else:
-                time.sleep(0.1)
+            if len(self.results) >= self.chunk_size:
+                self._flush_results()
+
+    def _flush_results(self):
+        """Store results that are not in DB yet as one chunk."""
+        if self.results:
+            # NOTE(boris-42): Sort in order of starting instead of order of
+            #                 ending
+            self.results.sort(key=lambda x: x["timestamp"])
+            self.task.append_results_chunk(self.task_result["id"],
+                                           self.results)
+            self.results = []
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.wakeup.set()
+        self.runner.notify_results()
         self.aborting_checker.join()
         self.thread.join()
+        if self.progress_server:
+            self.progress_server.unregister(self.progress)
+            self.progress_server.remove_abort_listener(self.wakeup)
 
         if exc_type:
             self.sla_checker.set_unexpected_failure(exc_value)
@@ -100,14 +202,15 @@ class ResultConsumer(object):
                 self.task["uuid"]) == consts.TaskStatus.ABORTED:
             self.sla_checker.set_aborted_manually()
 
-        # NOTE(boris-42): Sort in order of starting instead of order of ending
-        self.results.sort(key=lambda x: x["timestamp"])
-
-        self.task.append_results(self.key, {
-            "raw": self.results,
+        self._flush_results()
+        info = self.result_info.to_dict()
+        info["tstamp_base"] = self.tstamp_base or info["tstamp_start"]
+        self.task.update_results(self.task_result["id"], {
+            "raw": [],
             "load_duration": self.runner.run_duration,
             "full_duration": self.finish - self.start,
-            "sla": self.sla_checker.results()})
+            "sla": self.sla_checker.results(),
+            "info": info})
 
     @staticmethod
     def is_task_in_aborting_status(task_uuid, check_soft=True):
@@ -127,16 +230,22 @@ class ResultConsumer(object):
         """Waits until abort signal is received and aborts runner in this case.
 
         Has to be run from different thread simultaneously with the
-        runner.run method.
+        runner.run method. The status is checked every abort_poll_interval
+        seconds, or at once when the progress server is notified of abort
+        or the scenario is done.
         """
 
-        while not self.is_done.isSet():
+        while True:
+            # NOTE: cleared before the checks, so a wake up is not lost
+            self.wakeup.clear()
+            if self.is_done.isSet():
+                break
             if self.is_task_in_aborting_status(self.task["uuid"],
                                                check_soft=False):
                 self.runner.abort()
                 self.task.update_status(consts.TaskStatus.ABORTED)
                 break
-            time.sleep(2.0)
+            self.wakeup.wait(CONF.benchmark.abort_poll_interval)
 
 
 class BenchmarkEngine(object):
@@ -162,7 +271,7 @@ class BenchmarkEngine(object):
     """
 
     def __init__(self, config, task, admin=None, users=None,
-                 abort_on_sla_failure=False):
+                 abort_on_sla_failure=False, distributed=False):
         """BenchmarkEngine constructor.
 
         :param config: Dict with configuration of specified benchmark scenarios
@@ -172,6 +281,8 @@ class BenchmarkEngine(object):
         :param users: List of dicts with user credentials
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param distributed: True if the load of every scenario should be
+                            split between worker agents
         """
         try:
             self.config = TaskConfig(config)
@@ -184,6 +295,9 @@ class BenchmarkEngine(object):
         self.admin = admin and objects.Endpoint(**admin) or None
         self.existing_users = users or []
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.distributed = distributed
+        self.progress_server = None
+        self.validation_run = validation.ValidationRun()
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation check cloud."))
     def _check_cloud(self):
@@ -194,16 +308,20 @@ class BenchmarkEngine(object):
     @rutils.log_task_wrapper(LOG.info,
                              _("Task validation of scenarios names."))
     def _validate_config_scenarios_name(self, config):
-        available = set(s.get_name() for s in scenario.Scenario.get_all())
-
         specified = set()
         for subtask in config.subtasks:
             for s in subtask.scenarios:
                 specified.add(s["name"])
 
-        if not specified.issubset(available):
-            names = ", ".join(specified - available)
-            raise exceptions.NotFoundScenarios(names=names)
+        missing = []
+        for name in sorted(specified):
+            try:
+                scenario.Scenario.get(name)
+            except exceptions.PluginNotFound:
+                missing.append(name)
+
+        if missing:
+            raise exceptions.NotFoundScenarios(names=", ".join(missing))
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation of syntax."))
     def _validate_config_syntax(self, config):
@@ -227,7 +345,8 @@ class BenchmarkEngine(object):
                                          deployment, kwargs):
         try:
             scenario.Scenario.validate(
-                name, kwargs, admin=admin, users=[user], deployment=deployment)
+                name, kwargs, admin=admin, users=[user], deployment=deployment,
+                validation_run=self.validation_run)
         except exceptions.InvalidScenarioArgument as e:
             kw = {"name": name, "pos": pos,
                   "config": kwargs, "reason": six.text_type(e)}
@@ -242,6 +361,46 @@ class BenchmarkEngine(object):
 
         return user_context
 
+    def _run_validation_jobs(self, jobs):
+        """Run semantic validations on a bounded pool of threads.
+
+        Validations of scenarios are independent, so they are run at once
+        by up to semantic_validation_workers threads. New jobs are not
+        started after a failure, and the failure of the first job in order
+        is raised, so the error does not depend on timings.
+
+        :param jobs: list of args of _validate_config_semantic_helper
+        """
+        jobs = list(jobs)
+        pending = iter(enumerate(jobs))
+        errors = {}
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if errors:
+                        return
+                    index, job = next(pending, (None, None))
+                if job is None:
+                    return
+                try:
+                    self._validate_config_semantic_helper(*job)
+                except Exception:
+                    with lock:
+                        errors[index] = sys.exc_info()
+
+        workers = min(max(CONF.benchmark.semantic_validation_workers, 1),
+                      len(jobs))
+        threads = [threading.Thread(target=worker) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            six.reraise(*errors[min(errors)])
+
     @rutils.log_task_wrapper(LOG.info, _("Task validation of semantic."))
     def _validate_config_semantic(self, config):
         self._check_cloud()
@@ -254,26 +413,30 @@ class BenchmarkEngine(object):
         #                 specified. So after switching to plugin base
         #                 and refactoring validation mechanism this place
         #                 will be replaced
-	with self._get_user_ctx_for_validation(ctx_conf) as ctx:
+        with self._get_user_ctx_for_validation(ctx_conf) as ctx:
             ctx.setup()
-	    admin = None
-            #admin = osclients.Clients(self.admin)
-            #user = osclients.Clients(ctx_conf["users"][0]["endpoint"])
-	    user = None
+            # NOTE: validators of scenarios require OpenStack clients,
+            #       so they are not run unless they are enabled
+            if not CONF.benchmark.semantic_validation_enabled:
+                return
+            admin = osclients.Clients(self.admin)
+            jobs = []
             for u in ctx_conf["users"]:
-                #user = osclients.Clients(u["endpoint"])
-		user = None
+                user = osclients.Clients(u["endpoint"])
                 for subtask in config.subtasks:
                     for pos, scenario_obj in enumerate(subtask.scenarios):
-                        #self._validate_config_semantic_helper(
-                        #    admin, user, scenario_obj["name"],
-                        #    pos, deployment, scenario_obj)
-			pass
+                        jobs.append((admin, user, scenario_obj["name"],
+                                     pos, deployment, scenario_obj))
+            self._run_validation_jobs(jobs)
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation."))
     def validate(self):
-        """Perform full task configuration validation."""
+        """Perform full task configuration validation.
+
+        :returns: list of timings of validators, see ValidationRun.profile()
+        """
         self.task.update_status(consts.TaskStatus.VERIFYING)
+        self.validation_run = validation.ValidationRun()
         try:
             self._validate_config_scenarios_name(self.config)
             self._validate_config_syntax(self.config)
@@ -282,9 +445,12 @@ class BenchmarkEngine(object):
             log = [str(type(e)), str(e), json.dumps(traceback.format_exc())]
             self.task.set_failed(log=log)
             raise exceptions.InvalidTaskException(str(e))
+        return self.validation_run.profile()
 
     def _get_runner(self, config):
         conf = config.get("runner", {"type": "serial"})
+        if self.distributed:
+            return distributed.DistributedRunner(self.task, conf)
         return runner.ScenarioRunner.get(conf["type"])(self.task, conf)
 
     def _prepare_context(self, ctx, name, endpoint):
@@ -305,43 +471,98 @@ class BenchmarkEngine(object):
 
         return context_obj
 
+    def _is_task_aborting(self):
+        if ResultConsumer.is_task_in_aborting_status(self.task["uuid"]):
+            LOG.info("Received aborting signal.")
+            self.task.update_status(consts.TaskStatus.ABORTED)
+            return True
+        return False
+
+    def _run_scenario(self, pos, scenario_obj, tstamp_base=None):
+        name = scenario_obj["name"]
+        key = {"name": name, "pos": pos, "kw": scenario_obj}
+        LOG.info("Running benchmark with key: \n%s"
+                 % json.dumps(key, indent=2))
+        runner_obj = self._get_runner(scenario_obj)
+        context_obj = self._prepare_context(
+            scenario_obj.get("context", {}), name, self.admin)
+        try:
+            with ResultConsumer(key, self.task, runner_obj,
+                                self.abort_on_sla_failure,
+                                tstamp_base=tstamp_base,
+                                progress_server=self.progress_server):
+                # NOTE: for distributed tasks the context is set up here
+                #       once and its data is sent to all the workers
+                try:
+                    with context.ContextManager(context_obj):
+                        # NOTE: contexts create and delete resources, e.g.
+                        #       flavors and images, so arguments resolved
+                        #       before their setup and cleanup are dropped
+                        types.clear_preprocess_cache(self.task["uuid"])
+                        runner_obj.run(name, context_obj,
+                                       scenario_obj.get("args", {}))
+                finally:
+                    types.clear_preprocess_cache(self.task["uuid"])
+        except Exception as e:
+            LOG.exception(e)
+
+    def _run_in_parallel(self, subtasks):
+        """Run scenarios of the subtasks concurrently.
+
+        Every scenario gets its own runner, context and ResultConsumer,
+        all results share the same tstamp_base. Like in the serial run,
+        failures of a scenario are logged and do not stop the others.
+
+        :param subtasks: list of SubTask instances
+        """
+        tstamp_base = time.time()
+        threads = []
+        for subtask in subtasks:
+            for pos, scenario_obj in enumerate(subtask.scenarios):
+                threads.append(threading.Thread(
+                    target=self._run_scenario,
+                    args=(pos, scenario_obj, tstamp_base)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
     @rutils.log_task_wrapper(LOG.info, _("Benchmarking."))
     def run(self):
         """Run the benchmark according to the test configuration.
 
         Test configuration is specified on engine initialization.
+        Consecutive subtasks with run_in_parallel are run concurrently.
 
         :returns: List of dicts, each dict containing the results of all the
                   corresponding benchmark test launches
         """
         self.task.update_status(consts.TaskStatus.RUNNING)
-
-        for subtask in self.config.subtasks:
-            for pos, scenario_obj in enumerate(subtask.scenarios):
-
-                if ResultConsumer.is_task_in_aborting_status(
-                        self.task["uuid"]):
-                    LOG.info("Received aborting signal.")
-                    self.task.update_status(consts.TaskStatus.ABORTED)
+        if CONF.benchmark.progress_enabled:
+            self.progress_server = progress.ProgressServer(self.task["uuid"])
+            self.progress_server.start()
+        try:
+            self._run_subtasks()
+        finally:
+            types.clear_preprocess_cache(self.task["uuid"])
+            if self.progress_server:
+                self.progress_server.stop()
+                self.progress_server = None
+
+    def _run_subtasks(self):
+        for in_parallel, subtasks in itertools.groupby(
+                self.config.subtasks, key=lambda s: s.run_in_parallel):
+            if in_parallel:
+                if self._is_task_aborting():
                     return
+                self._run_in_parallel(list(subtasks))
+                continue
 
-                name = scenario_obj["name"]
-                key = {"name": name, "pos": pos, "kw": scenario_obj}
-                LOG.info("Running benchmark with key: \n%s"
-                         % json.dumps(key, indent=2))
-                runner_obj = self._get_runner(scenario_obj)
-                context_obj = self._prepare_context(
-                    scenario_obj.get("context", {}), name, self.admin)
-                try:
-                    with ResultConsumer(key, self.task, runner_obj,
-                                        self.abort_on_sla_failure):
-			print "Vishnu1"
-                        with context.ContextManager(context_obj):
-                            runner_obj.run(name, context_obj,
-                                           scenario_obj.get("args", {}))
-			    print "Vishnu2"
-                except Exception as e:
-                    LOG.exception(e)
+            for subtask in subtasks:
+                for pos, scenario_obj in enumerate(subtask.scenarios):
+                    if self._is_task_aborting():
+                        return
+                    self._run_scenario(pos, scenario_obj)
 
         if objects.Task.get_status(
                 self.task["uuid"]) != consts.TaskStatus.ABORTED:
@@ -505,3 +726,4 @@ class SubTask(object):
         self.description = config.get("description")
         self.scenarios = config["scenarios"]
         self.context = config.get("context", {})
+        self.run_in_parallel = config.get("run_in_parallel", False)
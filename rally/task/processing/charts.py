@@ -22,6 +22,7 @@ import six
 from rally.common import costilius
 from rally.common import streaming_algorithms as streaming
 from rally import exceptions
+from rally.task.processing import columns as iteration_columns
 from rally.task.processing import utils
 
 
@@ -56,6 +57,15 @@ class Chart(object):
                                                      self.zipped_size)
             self._data[name].add_point(value)
 
+    def add_columns(self, columns):
+        """Add data of iterations given as IterationColumns.
+
+        Charts with batch implementations override this method, others
+        add the iterations one by one.
+        """
+        for iteration in columns.iterations:
+            self.add_iteration(iteration)
+
     def render(self):
         """Generate chart data ready for drawing."""
         return [(name, points.get_zipped_graph())
@@ -150,8 +160,12 @@ class LoadProfileChart(Chart):
         """
         super(LoadProfileChart, self).__init__(benchmark_info)
         self._name = name
-        self._duration = benchmark_info["load_duration"]
-        self._tstamp_start = benchmark_info["tstamp_start"]
+        # NOTE: Scenarios that run in parallel share tstamp_base, so their
+        #       load profiles are drawn on the same time axis
+        self._tstamp_start = benchmark_info.get("tstamp_base",
+                                                benchmark_info["tstamp_start"])
+        self._duration = (benchmark_info["load_duration"] +
+                          benchmark_info["tstamp_start"] - self._tstamp_start)
 
         # NOTE(amaretskiy): Determine a chart `step' - duration between
         #   two X points, rounded with minimal accuracy (digits after point)
@@ -184,6 +198,15 @@ class LoadProfileChart(Chart):
         self._started[bisect.bisect(self._time_axis, ts_start)] += 1
         self._stopped[bisect.bisect(self._time_axis, ts_stop)] += 1
 
+    def add_columns(self, columns):
+        ts_start = columns.timestamp - self._tstamp_start
+        ts_stop = ts_start + columns.duration * ~columns.error
+        for counts, values in ((self._started, ts_start),
+                               (self._stopped, ts_stop)):
+            for i, count in enumerate(iteration_columns.bisect_counts(
+                    values, self._time_axis)):
+                counts[i] += count
+
     def render(self):
         data = []
         running = 0
@@ -232,6 +255,18 @@ class HistogramChart(Chart):
                         self._data[name]["views"][i]["y"][bin_i] += 1
                         break
 
+    def add_columns(self, columns):
+        for name, values in self._map_columns(columns):
+            if name not in self._data:
+                raise KeyError("Unexpected histogram name: %s" % name)
+            for view in self._data[name]["views"]:
+                counts = iteration_columns.histogram(values, view["x"])
+                view["y"] = [y + count for y, count in zip(view["y"], counts)]
+
+    @abc.abstractmethod
+    def _map_columns(self, columns):
+        """Get (name, values array) pairs for processing from columns."""
+
     def render(self):
         data = []
         for name, hist in self._data.items():
@@ -253,6 +288,9 @@ class MainHistogramChart(HistogramChart):
     def _map_iteration_values(self, iteration):
         return [("task", 0 if iteration["error"] else iteration["duration"])]
 
+    def _map_columns(self, columns):
+        return [("task", columns.duration * ~columns.error)]
+
 
 class AtomicHistogramChart(HistogramChart):
 
@@ -269,10 +307,16 @@ class AtomicHistogramChart(HistogramChart):
         iteration = self._fix_atomic_actions(iteration)
         return list(iteration["atomic_actions"].items())
 
+    def _map_columns(self, columns):
+        # NOTE: Absent and None atomic actions count as 0, like they do
+        #       in add_iteration()
+        return [(name, iteration_columns.nan_to_zero(values))
+                for name, values in columns.atomic.items()]
+
 
 class MainStatsTable(Chart):
 
-    def _init_row(self, name, iterations_count):
+    def _init_row(self, name):
 
         def round_3(stream, no_result):
             if no_result:
@@ -282,12 +326,9 @@ class MainStatsTable(Chart):
         return [
             ("Action", name),
             ("Min (sec)", streaming.MinComputation(), round_3),
-            ("Median (sec)",
-             streaming.PercentileComputation(0.5, iterations_count), round_3),
-            ("90%ile (sec)",
-             streaming.PercentileComputation(0.9, iterations_count), round_3),
-            ("95%ile (sec)",
-             streaming.PercentileComputation(0.95, iterations_count), round_3),
+            ("Median (sec)", streaming.PercentileComputation(0.5), round_3),
+            ("90%ile (sec)", streaming.PercentileComputation(0.9), round_3),
+            ("95%ile (sec)", streaming.PercentileComputation(0.95), round_3),
             ("Max (sec)", streaming.MaxComputation(), round_3),
             ("Avg (sec)", streaming.MeanComputation(), round_3),
             ("Success", streaming.MeanComputation(),
@@ -301,10 +342,18 @@ class MainStatsTable(Chart):
         self.rows = list(benchmark_info["atomic"].keys())
         self.rows.append("total")
         self.rows_index = dict((name, i) for i, name in enumerate(self.rows))
-        self.table = [self._init_row(name, benchmark_info["iterations_count"])
-                      for name in self.rows]
+        self.table = [self._init_row(name) for name in self.rows]
+        self._iterations_added = False
+        # NOTE: Per row count, number of successful iterations, min, max and
+        #       sum of their durations and a sketch of the durations, filled
+        #       by add_columns() that can not be mixed with add_iteration()
+        self._batches = None
 
     def add_iteration(self, iteration):
+        if self._batches is not None:
+            raise RuntimeError("Unable to add an iteration to the table "
+                               "that columns were added to")
+        self._iterations_added = True
         data = copy.copy(iteration["atomic_actions"])
         data["total"] = iteration["duration"]
 
@@ -318,9 +367,62 @@ class MainStatsTable(Chart):
                 for elem in self.table[index][1:-2]:
                     elem[1].add(value)
 
+    def add_columns(self, columns):
+        if self._iterations_added:
+            raise RuntimeError("Unable to add columns to the table "
+                               "that iterations were added to")
+        if self._batches is None:
+            self._batches = [{"count": 0, "successes": 0, "min": None,
+                              "max": None, "sum": 0.0,
+                              "sketch": streaming.QuantileSketch()}
+                             for name in self.rows]
+        data = [(name, columns.atomic[name], columns.atomic_present[name])
+                for name in columns.atomic]
+        data.append(("total", columns.duration, None))
+
+        for name, values, present in data:
+            if present is None:
+                count = len(values)
+                success = ~columns.error
+            elif not present.any():
+                continue
+            else:
+                count = int(present.sum())
+                success = present & ~columns.error
+            batch = self._batches[self.rows_index[name]]
+            batch["count"] += count
+            durations = values[success]
+            if not len(durations):
+                continue
+            low, high = float(durations.min()), float(durations.max())
+            if batch["successes"]:
+                low, high = min(low, batch["min"]), max(high, batch["max"])
+            batch["min"], batch["max"] = low, high
+            batch["successes"] += len(durations)
+            batch["sum"] += float(durations.sum())
+            batch["sketch"].extend(durations.tolist())
+
+    def _render_batch(self, name, batch):
+        if not batch["successes"]:
+            return ([name] + ["n/a"] * (len(self.table[0]) - 2) +
+                    [batch["count"]])
+        sketch = batch["sketch"]
+        stats = [batch["min"], sketch.quantile(0.5), sketch.quantile(0.9),
+                 sketch.quantile(0.95), batch["max"],
+                 batch["sum"] / batch["successes"]]
+        return ([name] + [round(value, 3) for value in stats] +
+                ["%.1f%%" % (float(batch["successes"]) / batch["count"] *
+                             100), batch["count"]])
+
     def render(self):
         rows = []
 
+        if self._batches is not None:
+            rows = [self._render_batch(name, batch)
+                    for name, batch in zip(self.rows, self._batches)]
+            return {"cols": list(map(lambda x: x[0], self.table[0])),
+                    "rows": rows}
+
         for i in range(len(self.table)):
             row = [self.table[i][0][1]]
             # no results if all iterations failed
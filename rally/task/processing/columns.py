@@ -0,0 +1,154 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Columnar representation of iteration results.
+
+Charts and SLA criteria that have batch implementations process whole
+columns with NumPy instead of one iteration dict at a time. NumPy is an
+optional dependency, use is_available() before creating IterationColumns.
+"""
+
+from rally.common import costilius
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_available():
+    """Whether batch processing of iteration columns is possible."""
+    return numpy is not None
+
+
+class IterationColumns(object):
+    """Iteration results as columns of NumPy arrays.
+
+    :ivar iterations: list of iteration dicts the columns are built from,
+                      for the charts that have no batch implementation
+    :ivar timestamp: float array of iteration timestamps
+    :ivar duration: float array of iteration durations
+    :ivar idle_duration: float array of iteration idle durations
+    :ivar error: bool array, True for failed iterations
+    :ivar atomic: OrderedDict of float arrays of atomic action durations by
+                  action name, NaN where an action is absent or None
+    :ivar atomic_present: OrderedDict of bool arrays by action name, True
+                          where an action is in atomic_actions (even if its
+                          duration is None)
+    """
+
+    def __init__(self, iterations, atomic_names=None):
+        """Build columns.
+
+        :param iterations: list of iteration results
+        :param atomic_names: names of atomic actions to make columns for,
+                             by default all of the names in order of
+                             appearance
+        """
+        self.iterations = iterations
+        self.timestamp = numpy.array([itr["timestamp"] for itr in iterations],
+                                     dtype=float)
+        self.duration = numpy.array([itr["duration"] for itr in iterations],
+                                    dtype=float)
+        self.idle_duration = numpy.array(
+            [itr["idle_duration"] for itr in iterations], dtype=float)
+        self.error = numpy.array([bool(itr["error"]) for itr in iterations],
+                                 dtype=bool)
+
+        if atomic_names is None:
+            atomic_names = costilius.OrderedDict()
+            for itr in iterations:
+                for name in itr["atomic_actions"]:
+                    atomic_names[name] = True
+
+        nan = float("nan")
+        self.atomic = costilius.OrderedDict()
+        self.atomic_present = costilius.OrderedDict()
+        for name in atomic_names:
+            values = [itr["atomic_actions"].get(name, nan)
+                      for itr in iterations]
+            self.atomic[name] = numpy.array(
+                [nan if value is None else value for value in values],
+                dtype=float)
+            self.atomic_present[name] = numpy.array(
+                [name in itr["atomic_actions"] for itr in iterations],
+                dtype=bool)
+
+    def __len__(self):
+        return len(self.iterations)
+
+
+def concatenate(arrays):
+    """Join list of arrays into one array."""
+    return numpy.concatenate(arrays)
+
+
+def nan_to_zero(values):
+    """Return copy of float array with NaN values replaced by 0."""
+    return numpy.where(numpy.isnan(values), 0.0, values)
+
+
+def histogram(values, bounds):
+    """Count values in bins like HistogramChart.add_iteration() does.
+
+    :param values: float array
+    :param bounds: ascending list of upper bounds of bins, a value belongs
+                   to the first bin with the bound that is not less than
+                   the value; values greater than all bounds are skipped
+    :returns: list of int counts, one per bin
+    """
+    indexes = numpy.searchsorted(bounds, values, side="left")
+    return numpy.bincount(indexes,
+                          minlength=len(bounds) + 1)[:len(bounds)].tolist()
+
+
+def bisect_counts(values, bounds):
+    """Count values by bisect.bisect(bounds, value).
+
+    :param values: float array
+    :param bounds: ascending list of floats
+    :returns: list of int counts by index, it is longer than bounds if
+              some values are not less than the last bound
+    """
+    indexes = numpy.searchsorted(bounds, values, side="right")
+    return numpy.bincount(indexes, minlength=len(bounds)).tolist()
+
+
+def running_stats(values, count=0, mean=0.0, dev_sum=0.0):
+    """Compute running statistics like StdDevComputation.add() does.
+
+    Element i of the returned arrays describes the stream of count values
+    with the given mean and sum of squared deviations followed by
+    values[:i + 1].
+
+    :param values: non-empty float array
+    :param count: number of preceding values
+    :param mean: mean of preceding values
+    :param dev_sum: sum of squared deviations of preceding values
+    :returns: tuple of arrays of counts, means, sums of squared deviations
+              and sample standard deviations (NaN where count < 2)
+    """
+    # NOTE: Values are shifted by a value close to the mean to keep round-off
+    #       errors of the sum of squares low.
+    shift = mean if count else values[0]
+    shifted = values - shift
+    counts = count + numpy.arange(1, len(values) + 1)
+    shifted_means = (count * (mean - shift) + shifted.cumsum()) / counts
+    dev_sums = (dev_sum + count * (mean - shift) ** 2 +
+                (shifted ** 2).cumsum() - counts * shifted_means ** 2)
+    dev_sums = numpy.maximum(dev_sums, 0)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        stds = numpy.where(counts >= 2,
+                           numpy.sqrt(dev_sums / (counts - 1)), numpy.nan)
+    return counts, shifted_means + shift, dev_sums, stds
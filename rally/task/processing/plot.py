@@ -13,13 +13,31 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import collections
 import json
+import zlib
 
 from rally.common import objects
 from rally.task.processing import charts
+from rally.task.processing import columns
+from rally.task.processing import utils
 from rally.ui import utils as ui_utils
 
+# NOTE: Max deviation of a dropped point of stacked area charts
+#       from the drawn line, relative to the range of chart values
+SERIES_TOLERANCE = 0.01
+
+
+def _simplify(graphs):
+    return utils.simplify_graphs(graphs, SERIES_TOLERANCE)
+
+
+def _encode_detail(detail):
+    """Pack scenario detail into zlib compressed base64 encoded JSON."""
+    data = zlib.compress(json.dumps(detail).encode("utf-8"))
+    return base64.b64encode(data).decode("ascii")
+
 
 def _process_scenario(data, pos):
     main_area = charts.MainStackedAreaChart(data["info"])
@@ -31,9 +49,21 @@ def _process_scenario(data, pos):
     atomic_hist = charts.AtomicHistogramChart(data["info"])
     output_area = charts.OutputStackedAreaChart(data["info"])
 
+    all_charts = (main_area, main_hist, main_stat, load_profile,
+                  atomic_pie, atomic_area, atomic_hist, output_area)
+    iterations = data["iterations"]
+    if columns.is_available():
+        # NOTE: Charts with batch implementations process columns at once
+        iterations = list(iterations)
+        iteration_columns = columns.IterationColumns(
+            iterations, data["info"]["atomic"])
+        for chart in all_charts:
+            chart.add_columns(iteration_columns)
+        all_charts = ()
+
     errors = []
     output_errors = []
-    for idx, itr in enumerate(data["iterations"]):
+    for idx, itr in enumerate(iterations):
         if itr["error"]:
             typ, msg, trace = itr["error"]
             errors.append({"iteration": idx,
@@ -42,12 +72,14 @@ def _process_scenario(data, pos):
         if itr["scenario_output"]["errors"]:
             output_errors.append((idx, itr["scenario_output"]["errors"]))
 
-        for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist, output_area):
+        for chart in all_charts:
             chart.add_iteration(itr)
 
     kw = data["key"]["kw"]
     cls, method = data["key"]["name"].split(".")
+    main_iter = main_area.render()
+    atomic_iter = atomic_area.render()
+    output = output_area.render()
 
     return {
         "cls": cls,
@@ -57,19 +89,23 @@ def _process_scenario(data, pos):
         "runner": kw["runner"]["type"],
         "config": json.dumps({data["key"]["name"]: [kw]}, indent=2),
         "iterations": {
-            "iter": main_area.render(),
+            "iter": _simplify(main_iter),
             "pie": [("success", (data["info"]["iterations_count"]
                                  - len(errors))),
                     ("errors", len(errors))],
             "histogram": main_hist.render()[0]},
-        "load_profile": load_profile.render(),
+        "load_profile": _simplify(load_profile.render()),
         "atomic": {"histogram": atomic_hist.render(),
-                   "iter": atomic_area.render(),
+                   "iter": _simplify(atomic_iter),
                    "pie": atomic_pie.render()},
         "table": main_stat.render(),
-        "output": output_area.render(),
-        "output_errors": output_errors,
-        "errors": errors,
+        "output": _simplify(output),
+        "errors_count": len(errors),
+        "detail": {"iterations": {"iter": main_iter},
+                   "atomic": {"iter": atomic_iter},
+                   "output": output,
+                   "output_errors": output_errors,
+                   "errors": errors},
         "load_duration": data["info"]["load_duration"],
         "full_duration": data["info"]["full_duration"],
         "sla": data["sla"],
@@ -111,9 +147,16 @@ def plot(tasks_results):
                     "load_duration"]},
             "created_at": None,
             "updated_at": None}
-        extended_results.extend(
-            objects.Task.extend_results([generic]))
+        extended = objects.Task.extend_results([generic])
+        if "tstamp_base" in result:
+            for scenario in extended:
+                scenario["info"]["tstamp_base"] = result["tstamp_base"]
+        extended_results.extend(extended)
 
     template = ui_utils.get_template("task/report.mako")
     source, data = _process_tasks(extended_results)
-    return template.render(source=json.dumps(source), data=json.dumps(data))
+    # NOTE: Failures and full resolution series are embedded
+    #       as separate compressed chunks, the page decodes them on demand
+    details = [_encode_detail(scenario.pop("detail")) for scenario in data]
+    return template.render(source=json.dumps(source), data=json.dumps(data),
+                           details=details)
@@ -0,0 +1,328 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compact binary format of task results.
+
+The format holds the same data as `rally task results` JSON output, i.e.
+a list of TASK_RESULT_SCHEMA objects, but stores iterations by columns.
+
+File layout::
+
+    MAGIC, version (1 byte), flags (1 byte)
+    record*
+
+Every record is a record type (1 byte), payload length (4 bytes) and
+payload, payloads are compressed with zlib if FLAG_ZLIB is set. Integers
+are big-endian.
+
+A scenario is a RECORD_SCENARIO record followed by RECORD_ITERATIONS
+records. Scenario payload is JSON of the scenario result without
+iterations, plus the number of iterations. It is validated against
+SCENARIO_SCHEMA, iterations are not validated one by one since their
+layout is fixed by the format.
+
+Iterations payload is the number of iterations N (4 bytes), length of
+JSON (4 bytes), JSON with names of atomic actions of the record and
+sparse columns with [index, value] pairs of non-default values of error,
+scenario_output and any other keys of iterations, N doubles for every one
+of duration, idle_duration and timestamp (NaN if absent), and N doubles
+and N state bytes (ATOMIC_*) for every atomic action.
+"""
+
+import copy
+import itertools
+import json
+import struct
+import zlib
+
+import jsonschema
+import six
+
+from rally.common import costilius
+from rally.common.i18n import _
+from rally.common import objects
+from rally import exceptions
+
+
+MAGIC = b"RALLYRES"
+VERSION = 1
+
+FLAG_ZLIB = 1
+
+RECORD_SCENARIO = 1
+RECORD_ITERATIONS = 2
+
+ATOMIC_ABSENT = 0
+ATOMIC_VALUE = 1
+ATOMIC_NONE = 2
+
+BLOCK_SIZE = 1000
+
+NUMBER_COLUMNS = ("duration", "idle_duration", "timestamp")
+
+_PREAMBLE = struct.Struct(">%dsBB" % len(MAGIC))
+_RECORD = struct.Struct(">BI")
+_COUNT = struct.Struct(">I")
+
+SCENARIO_SCHEMA = copy.deepcopy(objects.task.TASK_RESULT_SCHEMA)
+del SCENARIO_SCHEMA["properties"]["result"]
+SCENARIO_SCHEMA["properties"]["iterations"] = {"type": "integer",
+                                               "minimum": 1}
+SCENARIO_SCHEMA["required"] = [
+    name for name in SCENARIO_SCHEMA["required"]
+    if name != "result"] + ["iterations"]
+
+
+def _default_scenario_output():
+    return {"errors": "", "data": {}}
+
+
+def is_binary(path):
+    """Check whether file starts with MAGIC.
+
+    :param path: path to file
+    :returns: bool
+    """
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class Writer(object):
+    """Writes task results to a binary file object."""
+
+    def __init__(self, fileobj, compress=True, block_size=BLOCK_SIZE):
+        """Init writer and write the file preamble.
+
+        :param fileobj: file object opened in binary mode
+        :param compress: whether to compress records with zlib
+        :param block_size: max number of iterations per record
+        """
+        self.fileobj = fileobj
+        self.compress = compress
+        self.block_size = block_size
+        self.fileobj.write(_PREAMBLE.pack(MAGIC, VERSION,
+                                          FLAG_ZLIB if compress else 0))
+
+    def _write_record(self, record_type, payload):
+        if self.compress:
+            payload = zlib.compress(payload)
+        self.fileobj.write(_RECORD.pack(record_type, len(payload)))
+        self.fileobj.write(payload)
+
+    def write(self, result):
+        """Write the result of one scenario.
+
+        Iterations are consumed block by block, so they may be streamed.
+
+        :param result: dict in TASK_RESULT_SCHEMA format, "result" may be
+                       any iterable of iterations that supports len()
+        """
+        scenario = dict((k, v) for k, v in result.items() if k != "result")
+        scenario["iterations"] = len(result["result"])
+        self._write_record(RECORD_SCENARIO,
+                           json.dumps(scenario).encode("utf-8"))
+
+        iterations = iter(result["result"])
+        while True:
+            block = list(itertools.islice(iterations, self.block_size))
+            if not block:
+                break
+            self._write_record(RECORD_ITERATIONS,
+                               self._pack_iterations(block))
+
+    def _pack_iterations(self, iterations):
+        atomic_names = costilius.OrderedDict()
+        for itr in iterations:
+            for name in itr["atomic_actions"]:
+                atomic_names[name] = True
+
+        meta = {"atomic": list(atomic_names), "error": [],
+                "scenario_output": [], "extra": []}
+        known = set(NUMBER_COLUMNS + ("atomic_actions", "error",
+                                      "scenario_output"))
+        for i, itr in enumerate(iterations):
+            if itr["error"]:
+                meta["error"].append([i, itr["error"]])
+            if itr["scenario_output"] != _default_scenario_output():
+                meta["scenario_output"].append([i, itr["scenario_output"]])
+            extra = dict((k, v) for k, v in itr.items() if k not in known)
+            if extra:
+                meta["extra"].append([i, extra])
+        meta = json.dumps(meta).encode("utf-8")
+
+        count = len(iterations)
+        doubles = struct.Struct(">%dd" % count)
+        nan = float("nan")
+        chunks = [_COUNT.pack(count), _COUNT.pack(len(meta)), meta]
+        for column in NUMBER_COLUMNS:
+            chunks.append(doubles.pack(*[itr.get(column, nan)
+                                         for itr in iterations]))
+        for name in atomic_names:
+            values = []
+            states = bytearray()
+            for itr in iterations:
+                value = itr["atomic_actions"].get(name)
+                values.append(nan if value is None else value)
+                if name not in itr["atomic_actions"]:
+                    states.append(ATOMIC_ABSENT)
+                elif value is None:
+                    states.append(ATOMIC_NONE)
+                else:
+                    states.append(ATOMIC_VALUE)
+            chunks.append(doubles.pack(*values))
+            chunks.append(bytes(states))
+        return b"".join(chunks)
+
+
+class Reader(object):
+    """Reads task results from a binary file object one scenario at a time.
+
+    Only one scenario is kept in memory, so it is possible to process
+    files that are larger than available memory.
+    """
+
+    def __init__(self, fileobj):
+        """Init reader and check the file preamble.
+
+        :param fileobj: file object opened in binary mode
+        :raises InvalidResultsFile: if it is not a file of this format
+        """
+        self.fileobj = fileobj
+        preamble = self._read(_PREAMBLE.size)
+        magic, version, flags = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise exceptions.InvalidResultsFile(
+                message=_("unknown file format"))
+        if version != VERSION:
+            raise exceptions.InvalidResultsFile(
+                message=_("unsupported version %d") % version)
+        self.compressed = bool(flags & FLAG_ZLIB)
+
+    def _read(self, size):
+        data = self.fileobj.read(size)
+        if len(data) != size:
+            raise exceptions.InvalidResultsFile(
+                message=_("unexpected end of file"))
+        return data
+
+    def _read_record(self, expected_type):
+        header = self.fileobj.read(_RECORD.size)
+        if not header and expected_type == RECORD_SCENARIO:
+            return None
+        if len(header) != _RECORD.size:
+            raise exceptions.InvalidResultsFile(
+                message=_("unexpected end of file"))
+        record_type, size = _RECORD.unpack(header)
+        if record_type != expected_type:
+            raise exceptions.InvalidResultsFile(
+                message=_("unexpected record type %d") % record_type)
+        payload = self._read(size)
+        if self.compressed:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise exceptions.InvalidResultsFile(message=str(e))
+        return payload
+
+    def __iter__(self):
+        while True:
+            payload = self._read_record(RECORD_SCENARIO)
+            if payload is None:
+                return
+            scenario = json.loads(payload.decode("utf-8"))
+            try:
+                jsonschema.validate(scenario, SCENARIO_SCHEMA)
+            except jsonschema.ValidationError as e:
+                raise exceptions.InvalidResultsFile(
+                    message=six.text_type(e))
+
+            count = scenario.pop("iterations")
+            scenario["result"] = []
+            while len(scenario["result"]) < count:
+                scenario["result"].extend(self._unpack_iterations(
+                    self._read_record(RECORD_ITERATIONS)))
+            if len(scenario["result"]) != count:
+                raise exceptions.InvalidResultsFile(
+                    message=_("wrong number of iterations"))
+            yield scenario
+
+    def _unpack_iterations(self, payload):
+        try:
+            count = _COUNT.unpack_from(payload)[0]
+            size = _COUNT.unpack_from(payload, _COUNT.size)[0]
+            offset = _COUNT.size * 2
+            meta = json.loads(payload[offset:offset + size].decode("utf-8"))
+            offset += size
+            doubles = struct.Struct(">%dd" % count)
+            columns = {}
+            for column in NUMBER_COLUMNS:
+                columns[column] = doubles.unpack_from(payload, offset)
+                offset += doubles.size
+            atomic = []
+            for name in meta["atomic"]:
+                values = doubles.unpack_from(payload, offset)
+                offset += doubles.size
+                states = bytearray(payload[offset:offset + count])
+                offset += count
+                atomic.append((name, values, states))
+        except (struct.error, ValueError) as e:
+            raise exceptions.InvalidResultsFile(message=str(e))
+        if offset != len(payload):
+            raise exceptions.InvalidResultsFile(
+                message=_("wrong size of iterations record"))
+
+        iterations = []
+        for i in range(count):
+            itr = {"error": [],
+                   "scenario_output": _default_scenario_output(),
+                   "atomic_actions": costilius.OrderedDict()}
+            for column in NUMBER_COLUMNS:
+                value = columns[column][i]
+                if value == value:
+                    itr[column] = value
+            for name, values, states in atomic:
+                if states[i] == ATOMIC_VALUE:
+                    itr["atomic_actions"][name] = values[i]
+                elif states[i] == ATOMIC_NONE:
+                    itr["atomic_actions"][name] = None
+            iterations.append(itr)
+        for i, error in meta["error"]:
+            iterations[i]["error"] = error
+        for i, output in meta["scenario_output"]:
+            iterations[i]["scenario_output"] = output
+        for i, extra in meta["extra"]:
+            iterations[i].update(extra)
+        return iterations
+
+
+def dump(results, fileobj, compress=True):
+    """Write task results to a binary file object.
+
+    :param results: iterable of dicts in TASK_RESULT_SCHEMA format
+    :param fileobj: file object opened in binary mode
+    :param compress: whether to compress the data with zlib
+    """
+    writer = Writer(fileobj, compress=compress)
+    for result in results:
+        writer.write(result)
+
+
+def load(fileobj):
+    """Read task results from a binary file object.
+
+    :param fileobj: file object opened in binary mode
+    :returns: list of dicts in TASK_RESULT_SCHEMA format
+    :raises InvalidResultsFile: if the file is malformed
+    """
+    return list(Reader(fileobj))
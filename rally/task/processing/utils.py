@@ -161,3 +161,52 @@ class GraphZipper(object):
 
     def get_zipped_graph(self):
         return self.zipped_graph
+
+
+def simplify_graphs(graphs, tolerance):
+    """Drop points of graphs that are restorable by linear interpolation.
+
+    This is Ramer-Douglas-Peucker algorithm by vertical distance: every
+    dropped point deviates from the line between the nearest kept points by
+    no more than `tolerance' of the range of its graph values. Graphs are
+    simplified together, so a point is kept in all of them if any graph
+    needs it and the graphs can still be stacked.
+
+    :param graphs: list of (name, points) pairs, points are [x, y] lists
+                   with the same x values in all graphs
+    :param tolerance: float, max deviation relative to the values range
+    :returns: list of (name, points) pairs
+    """
+    if not graphs or len(graphs[0][1]) < 3:
+        return graphs
+
+    limits = []
+    for name, points in graphs:
+        values = [p[1] for p in points]
+        limits.append(tolerance * (max(values) - min(values)))
+
+    size = len(graphs[0][1])
+    keep = [False] * size
+    keep[0] = keep[-1] = True
+    segments = [(0, size - 1)]
+    while segments:
+        first, last = segments.pop()
+        worst_idx, worst_ratio = None, 1
+        for (name, points), limit in zip(graphs, limits):
+            (x0, y0), (x1, y1) = points[first], points[last]
+            slope = (y1 - y0) / float(x1 - x0)
+            for idx in range(first + 1, last):
+                x, y = points[idx]
+                error = abs(y - y0 - slope * (x - x0))
+                if not error:
+                    continue
+                ratio = error / limit if limit else float("inf")
+                if ratio > worst_ratio:
+                    worst_idx, worst_ratio = idx, ratio
+        if worst_idx is not None:
+            keep[worst_idx] = True
+            segments.append((first, worst_idx))
+            segments.append((worst_idx, last))
+
+    return [(name, [p for p, kept in zip(points, keep) if kept])
+            for name, points in graphs]
@@ -0,0 +1,355 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Live progress of running tasks.
+
+ResultConsumer adds every iteration result to ScenarioProgress, which
+keeps per-second statistics for the last `progress_window' seconds.
+ProgressServer serves statistics of all the running scenarios of a task
+as JSON over HTTP on localhost, `rally task watch' polls it:
+
+    rally task start --task task.yaml &
+    rally task watch
+
+The address of the server is written to a file named by the task UUID in
+`progress_dir', so the server is found by the task UUID only. The same
+way `rally task abort' on the host of the task wakes the task up with a
+POST to /abort, so the abort does not wait for the next status poll.
+"""
+
+import collections
+import json
+import os
+import socket
+import threading
+import time
+
+from oslo_config import cfg
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import request as urllib_request
+
+from rally.common import log as logging
+from rally.common import streaming_algorithms
+
+
+LOG = logging.getLogger(__name__)
+
+PROGRESS_OPTS = [
+    cfg.BoolOpt("progress_enabled",
+                default=True,
+                help="Serve live progress of running tasks over HTTP, "
+                     "see `rally task watch`"),
+    cfg.StrOpt("progress_host",
+               default="127.0.0.1",
+               help="Address the progress server listens on"),
+    cfg.IntOpt("progress_port",
+               default=0,
+               help="Port the progress server listens on, 0 means any "
+                    "free port"),
+    cfg.StrOpt("progress_dir",
+               default="~/.rally/progress",
+               help="Directory with addresses of progress servers of "
+                    "running tasks"),
+    cfg.IntOpt("progress_window",
+               default=10,
+               help="Number of last seconds the progress statistics are "
+                    "computed over")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_opts(PROGRESS_OPTS, group=benchmark_group)
+
+QUANTILES = (("median", 0.5), ("90%ile", 0.9), ("95%ile", 0.95))
+
+
+def get_address_file(task_uuid):
+    """Return path to the file with address of the task progress server."""
+    return os.path.join(os.path.expanduser(CONF.benchmark.progress_dir),
+                        task_uuid)
+
+
+def get_address(task_uuid):
+    """Return "host:port" of the task progress server or None."""
+    try:
+        with open(get_address_file(task_uuid)) as f:
+            return f.read().strip() or None
+    except IOError:
+        return None
+
+
+def fetch(address, timeout=5):
+    """Get progress of the running scenarios from the progress server.
+
+    :param address: "host:port" of the progress server
+    :param timeout: socket timeout, in seconds
+    :returns: dict with task UUID and list of ScenarioProgress.to_dict()
+    :raises IOError: if the server is not reachable
+    """
+    response = urllib_request.urlopen("http://%s/" % address,
+                                      timeout=timeout)
+    try:
+        return json.loads(response.read().decode("utf-8"))
+    finally:
+        response.close()
+
+
+def notify_abort(task_uuid, timeout=5):
+    """Wake up the task to check its status for abort at once.
+
+    Only tasks running on this host with the progress server are found,
+    others notice the abort with the next poll of the status.
+
+    :param task_uuid: UUID of the task
+    :param timeout: socket timeout, in seconds
+    :returns: True if the task is notified
+    """
+    address = get_address(task_uuid)
+    if not address:
+        return False
+    try:
+        urllib_request.urlopen(
+            urllib_request.Request("http://%s/abort" % address, data=b""),
+            timeout=timeout).close()
+    except IOError as e:
+        LOG.debug("Failed to notify task %s of abort: %s" % (task_uuid, e))
+        return False
+    return True
+
+
+class _Bucket(object):
+    """Statistics of iterations finished within one second."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = streaming_algorithms.QuantileSketch()
+
+    def add(self, result):
+        self.count += 1
+        self.busy += result["duration"]
+        if result["error"]:
+            self.errors += 1
+            return
+        duration = result["duration"]
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+        self.sketch.add(duration)
+
+
+class ScenarioProgress(object):
+    """Rolling statistics of the iterations of a running scenario.
+
+    Iterations are grouped in buckets by the second they finished in, and
+    statistics are computed over the buckets of the last `window' full
+    seconds. The number of iterations in flight is the average number
+    of iterations run at once in the window: the sum of their durations
+    divided by the window (Little's law). Iterations that are not finished
+    yet are not known, so it lags behind by the duration of an iteration.
+    """
+
+    def __init__(self, key, window=None):
+        """Init progress.
+
+        :param key: scenario identifier, dict with name and pos
+        :param window: number of seconds, defaults to progress_window
+        """
+        self.key = key
+        self.window = window or CONF.benchmark.progress_window
+        self.iterations = 0
+        self.failures = 0
+        self._buckets = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, result):
+        """Add result of an iteration.
+
+        :param result: iteration result in the format of ScenarioRunner
+        """
+        second = int(result["timestamp"] + result["duration"])
+        with self._lock:
+            self.iterations += 1
+            if result["error"]:
+                self.failures += 1
+            if second not in self._buckets:
+                self._buckets[second] = _Bucket()
+            self._buckets[second].add(result)
+
+    def to_dict(self, now=None):
+        """Return statistics of the last window.
+
+        :param now: current timestamp, defaults to time.time()
+        :returns: dict with totals, throughput (iterations per second),
+                  per_second list of numbers of iterations, error_rate,
+                  in_flight and latency quantiles of successful iterations
+        """
+        last = int(now or time.time())
+        first = last - self.window
+        with self._lock:
+            for second in list(self._buckets):
+                if second < first:
+                    del self._buckets[second]
+            buckets = [self._buckets.get(second, _Bucket())
+                       for second in range(first, last)]
+            iterations, failures = self.iterations, self.failures
+
+        count = sum(b.count for b in buckets)
+        errors = sum(b.errors for b in buckets)
+        sketch = streaming_algorithms.QuantileSketch()
+        for bucket in buckets:
+            sketch.merge(bucket.sketch)
+        latency = dict([("min", None), ("max", None)] +
+                       [(name, None) for name, percent in QUANTILES])
+        if len(sketch):
+            latency["min"] = min(b.min for b in buckets if b.min is not None)
+            latency["max"] = max(b.max for b in buckets if b.max is not None)
+            for name, percent in QUANTILES:
+                latency[name] = sketch.quantile(percent)
+
+        return {"name": self.key["name"], "pos": self.key["pos"],
+                "iterations": iterations, "failures": failures,
+                "window": self.window,
+                "throughput": count / float(self.window),
+                "per_second": [b.count for b in buckets],
+                "error_rate": errors / float(count) if count else 0.0,
+                "in_flight": sum(b.busy for b in buckets) / self.window,
+                "latency": latency}
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                           BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class ProgressServer(object):
+    """Serves progress of the running scenarios of a task over HTTP."""
+
+    def __init__(self, task_uuid):
+        self.task_uuid = task_uuid
+        self.address = None
+        self._progress = []
+        self._abort_listeners = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def register(self, progress):
+        """Start serving ScenarioProgress of a scenario."""
+        with self._lock:
+            self._progress.append(progress)
+
+    def unregister(self, progress):
+        """Stop serving ScenarioProgress of a finished scenario."""
+        with self._lock:
+            self._progress.remove(progress)
+
+    def add_abort_listener(self, event):
+        """Set the threading.Event when the task is notified of abort."""
+        with self._lock:
+            self._abort_listeners.append(event)
+
+    def remove_abort_listener(self, event):
+        with self._lock:
+            self._abort_listeners.remove(event)
+
+    def notify_abort(self):
+        with self._lock:
+            listeners = list(self._abort_listeners)
+        for event in listeners:
+            event.set()
+
+    def to_dict(self):
+        with self._lock:
+            progress = list(self._progress)
+        return {"task": self.task_uuid,
+                "scenarios": [p.to_dict() for p in progress]}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                body = json.dumps(server.to_dict()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path != "/abort":
+                    self.send_error(404)
+                    return
+                server.notify_abort()
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                LOG.debug("Progress server: " + format % args)
+
+        return Handler
+
+    def start(self):
+        """Start serving and publish the address of the server.
+
+        The task must not fail because of its progress, so errors are
+        logged and the task runs without the server.
+        """
+        try:
+            self._server = _ThreadingHTTPServer(
+                (CONF.benchmark.progress_host, CONF.benchmark.progress_port),
+                self._make_handler())
+            host, port = self._server.server_address[:2]
+            self.address = "%s:%s" % (host, port)
+            path = get_address_file(self.task_uuid)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, "w") as f:
+                f.write(self.address)
+        except (socket.error, IOError, OSError) as e:
+            LOG.warning("Failed to start progress server: %s" % e)
+            self.stop()
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and remove the address of the server."""
+        if self._thread:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        if self._server:
+            self._server.server_close()
+            self._server = None
+        if self.address:
+            self.address = None
+            try:
+                os.remove(get_address_file(self.task_uuid))
+            except OSError:
+                pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
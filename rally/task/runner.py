@@ -16,9 +16,11 @@
 import abc
 import collections
 import multiprocessing
-import time
+import threading
 
 import jsonschema
+from oslo_config import cfg
+from six.moves import queue as Queue
 
 from rally.common import log as logging
 from rally.common.plugin import plugin
@@ -32,6 +34,22 @@ from rally.task import utils
 
 LOG = logging.getLogger(__name__)
 
+RUNNER_OPTS = [
+    cfg.IntOpt("result_batch_size",
+               default=100,
+               help="Number of iteration results that wake up the result "
+                    "consumer at once"),
+    cfg.FloatOpt("result_flush_interval",
+                 default=0.5,
+                 help="Maximum time in seconds an iteration result waits in "
+                      "a partial batch before it is consumed")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_opts(RUNNER_OPTS, group=benchmark_group)
+
 
 def format_result_on_timeout(exc, timeout):
     return {
@@ -72,6 +90,10 @@ def _run_scenario_once(args):
                  {"task": context_obj["task"]["uuid"], "iteration": iteration,
                   "status": status})
 
+        output_data = scenario_inst.output_data()
+        if output_data:
+            scenario_output.setdefault("data", {}).update(output_data)
+
         return {"duration": timer.duration() - scenario_inst.idle_duration(),
                 "timestamp": timer.timestamp(),
                 "idle_duration": scenario_inst.idle_duration(),
@@ -84,6 +106,101 @@ def _worker_thread(queue, args):
     queue.put(_run_scenario_once(args))
 
 
+class WorkerThreadPool(object):
+    """Pool of long-lived threads that run scenario iterations.
+
+    Every thread maps the scenario context once and then pulls iteration
+    numbers from next_iteration() until it returns None, so neither
+    a thread nor a full scenario context is created per iteration (each
+    iteration gets a shallow copy of the thread context). As a result,
+    a thread keeps the same user for all its iterations.
+
+    Runner overhead (running an iteration and queueing its result, except
+    the scenario method itself) is measured per iteration, time spent in
+    next_iteration() waiting for an iteration to start is not included. It
+    is expected to stay below
+    ITERATION_OVERHEAD_BUDGET seconds and a warning is logged otherwise.
+    """
+
+    ITERATION_OVERHEAD_BUDGET = 0.001
+
+    def __init__(self, queue, next_iteration, cls, method_name, context,
+                 args, iteration_done=None):
+        """Init pool of threads.
+
+        :param queue: queue object to append results
+        :param next_iteration: thread-safe callable that returns the next
+                               iteration number or None to stop
+        :param cls: scenario class
+        :param method_name: scenario method name
+        :param context: scenario context object
+        :param args: scenario args
+        :param iteration_done: thread-safe callable without arguments that
+                               is called after every finished iteration
+        """
+        self.queue = queue
+        self.next_iteration = next_iteration
+        self.iteration_done = iteration_done
+        self.scenario = (cls, method_name, context, args)
+        self.threads = []
+        self.finished = 0
+        self.overhead = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.threads)
+
+    def _worker(self, scenario_context):
+        cls, method_name, context, args = self.scenario
+        overhead = 0.0
+        iteration = self.next_iteration()
+        while iteration is not None:
+            with rutils.Timer() as timer:
+                result = _run_scenario_once(
+                    (iteration, cls, method_name, dict(scenario_context),
+                     args))
+                self.queue.put(result)
+                with self._lock:
+                    self.finished += 1
+            overhead += (timer.duration() - result["duration"] -
+                         result["idle_duration"])
+            if self.iteration_done:
+                self.iteration_done()
+            iteration = self.next_iteration()
+        with self._lock:
+            self.overhead += overhead
+
+    def spawn(self, count=1):
+        """Start new threads.
+
+        :param count: number of threads to start
+        """
+        # NOTE: contexts are mapped before any of the new threads starts,
+        #       so the global context is not copied while they use it
+        contexts = [_get_scenario_context(self.scenario[2])
+                    for i in range(count)]
+        for scenario_context in contexts:
+            thread = threading.Thread(target=self._worker,
+                                      args=(scenario_context,))
+            thread.start()
+            self.threads.append(thread)
+
+    def join(self):
+        """Wait for all threads and check the runner overhead.
+
+        :returns: average runner overhead per iteration in seconds
+        """
+        for thread in self.threads:
+            thread.join()
+        overhead = self.overhead / self.finished if self.finished else 0
+        LOG.debug("Runner overhead per iteration: %.6fs" % overhead)
+        if overhead > self.ITERATION_OVERHEAD_BUDGET:
+            LOG.warning("Runner overhead per iteration %.6fs exceeds the "
+                        "budget of %ss; measured durations may include it."
+                        % (overhead, self.ITERATION_OVERHEAD_BUDGET))
+        return overhead
+
+
 def _log_worker_info(**info):
     """Log worker parameters for debugging.
 
@@ -107,6 +224,9 @@ class ScenarioRunnerResult(dict):
             "timestamp": {
                 "type": "number"
             },
+            "intended_timestamp": {
+                "type": "number"
+            },
             "idle_duration": {
                 "type": "number"
             },
@@ -168,6 +288,10 @@ class ScenarioRunner(plugin.Plugin):
 
         It sets task and config to local variables. Also initialize
         result_queue, where results will be put by _send_result method.
+        Consumers are woken up once per result_batch_size results or every
+        result_flush_interval seconds, see wait_for_results(). If
+        notify_every_result is set, e.g. to abort on SLA failure without
+        delay, consumers are woken up as soon as any result is queued.
 
         :param task: Instance of objects.Task
         :param config: Dict with runner section from benchmark configuration
@@ -175,6 +299,10 @@ class ScenarioRunner(plugin.Plugin):
         self.task = task
         self.config = config
         self.result_queue = collections.deque()
+        self.result_batch_size = CONF.benchmark.result_batch_size
+        self.result_flush_interval = CONF.benchmark.result_flush_interval
+        self.notify_every_result = False
+        self._result_ready = threading.Condition()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
 
@@ -240,19 +368,31 @@ class ScenarioRunner(plugin.Plugin):
     def _join_processes(self, process_pool, result_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Blocks on result_queue instead of polling it, and hands results over
+        in batches of at most result_batch_size.
+
         :param process_pool: pool of processes to join
         :result_queue: multiprocessing.Queue that receives the results
         """
         while process_pool:
             while process_pool and not process_pool[0].is_alive():
                 process_pool.popleft().join()
-
-            if result_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.001)
-
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+            if not process_pool:
+                break
+
+            try:
+                batch = [result_queue.get(
+                    timeout=self.result_flush_interval)]
+            except Queue.Empty:
+                continue
+            while (len(batch) < self.result_batch_size
+                   and not result_queue.empty()):
+                batch.append(result_queue.get())
+            for result in batch:
+                self._send_result(result)
+
+        while not result_queue.empty():
+            self._send_result(result_queue.get())
         result_queue.close()
 
     def _send_result(self, result):
@@ -262,7 +402,35 @@ class ScenarioRunner(plugin.Plugin):
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
         """
-        self.result_queue.append(ScenarioRunnerResult(result))
+        result = ScenarioRunnerResult(result)
+        # NOTE: Only the first result of a batch wakes up the consumer in
+        #       notify_every_result mode, the rest is consumed with it
+        first = not self.result_queue
+        self.result_queue.append(result)
+        if (len(self.result_queue) >= self.result_batch_size
+                or (first and self.notify_every_result)):
+            self.notify_results()
+
+    def notify_results(self):
+        """Wake up the consumer waiting in wait_for_results()."""
+        with self._result_ready:
+            self._result_ready.notify_all()
+
+    def wait_for_results(self, stop_event):
+        """Block until a batch of results is ready to be consumed.
+
+        Returns after result_flush_interval seconds at the latest, so that
+        partial batches are consumed as well. Returns at once if there are
+        results and notify_every_result is set.
+
+        :param stop_event: threading.Event, which stops waiting when set.
+                           Call notify_results() after setting it.
+        """
+        with self._result_ready:
+            if (len(self.result_queue) < self.result_batch_size
+                    and not (self.notify_every_result and self.result_queue)
+                    and not stop_event.is_set()):
+                self._result_ready.wait(self.result_flush_interval)
 
     def _log_debug_info(self, **info):
         """Log runner parameters for debugging.
@@ -109,11 +109,16 @@ class Scenario(plugin.Plugin,
         self._idle_duration = 0
 
     @staticmethod
-    def _validate_helper(validators, clients, config, deployment):
+    def _validate_helper(validators, clients, config, deployment,
+                         validation_run=None):
         for validator in validators:
             try:
-                result = validator(config, clients=clients,
-                                   deployment=deployment)
+                if validation_run:
+                    result = validation_run.validate(validator, config,
+                                                     clients, deployment)
+                else:
+                    result = validator(config, clients=clients,
+                                       deployment=deployment)
             except Exception as e:
                 LOG.exception(e)
                 raise exceptions.InvalidScenarioArgument(e)
@@ -122,8 +127,14 @@ class Scenario(plugin.Plugin,
                     raise exceptions.InvalidScenarioArgument(result.msg)
 
     @classmethod
-    def validate(cls, name, config, admin=None, users=None, deployment=None):
-        """Semantic check of benchmark arguments."""
+    def validate(cls, name, config, admin=None, users=None, deployment=None,
+                 validation_run=None):
+        """Semantic check of benchmark arguments.
+
+        :param validation_run: ValidationRun that memoizes results of
+                               validators, validators are called directly
+                               if it is not specified
+        """
         validators = Scenario.get(name)._meta_get("validators", default=[])
 
         if not validators:
@@ -137,10 +148,12 @@ class Scenario(plugin.Plugin,
         # NOTE(boris-42): Potential bug, what if we don't have "admin" client
         #                 and scenario have "admin" validators.
         if admin:
-            cls._validate_helper(admin_validators, admin, config, deployment)
+            cls._validate_helper(admin_validators, admin, config, deployment,
+                                 validation_run)
         if users:
             for user in users:
-                cls._validate_helper(user_validators, user, config, deployment)
+                cls._validate_helper(user_validators, user, config, deployment,
+                                     validation_run)
 
     def sleep_between(self, min_sleep, max_sleep):
         """Performs a time.sleep() call for a random amount of seconds.
@@ -163,3 +176,12 @@ class Scenario(plugin.Plugin,
     def idle_duration(self):
         """Returns duration of all sleep_between."""
         return self._idle_duration
+
+    def output_data(self):
+        """Returns numeric data collected by the scenario base class.
+
+        The data is merged into the scenario output of the iteration, so
+        base classes can report runtime counters without changing the
+        return value of scenario methods.
+        """
+        return {}
@@ -26,6 +26,7 @@ import six
 
 from rally.common.i18n import _
 from rally.common.plugin import plugin
+from rally import exceptions
 
 
 def _format_result(criterion_name, success, detail):
@@ -57,6 +58,16 @@ class SLAChecker(object):
         """
         return all([sla.add_iteration(iteration) for sla in self.sla_criteria])
 
+    def add_columns(self, columns):
+        """Process the results of iterations given as IterationColumns.
+
+        The call to add_columns() will return True if all the SLA checks
+        passed after the last of the iterations, and False otherwise.
+
+        :param columns: rally.task.processing.columns.IterationColumns
+        """
+        return all([sla.add_columns(columns) for sla in self.sla_criteria])
+
     def results(self):
         results = [sla.result() for sla in self.sla_criteria]
         if self.aborted_on_sla:
@@ -101,8 +112,13 @@ class SLA(plugin.Plugin):
 
     @staticmethod
     def validate(config):
-        properties = dict([(s.get_name(), s.CONFIG_SCHEMA)
-                           for s in SLA.get_all()])
+        properties = {}
+        if isinstance(config, dict):
+            for name in config:
+                try:
+                    properties[name] = SLA.get(name).CONFIG_SCHEMA
+                except exceptions.PluginNotFound:
+                    pass
         schema = {
             "type": "object",
             "properties": properties,
@@ -121,6 +137,19 @@ class SLA(plugin.Plugin):
         :returns: True if the SLA check passed, False otherwise
         """
 
+    def add_columns(self, columns):
+        """Process the results of iterations given as IterationColumns.
+
+        Criteria with batch implementations override this method, others
+        check the iterations one by one.
+
+        :param columns: rally.task.processing.columns.IterationColumns
+        :returns: True if the SLA check passed, False otherwise
+        """
+        for iteration in columns.iterations:
+            self.add_iteration(iteration)
+        return self.success
+
     def result(self):
         """Returns the SLA result dict corresponding to the current state."""
         return _format_result(self.get_name(), self.success, self.details())
@@ -15,10 +15,14 @@
 
 import abc
 import copy
+import json
 import operator
 import os.path
 import re
+import threading
+import time
 
+from oslo_config import cfg
 import requests
 
 from rally import exceptions
@@ -26,6 +30,19 @@ from rally import osclients
 from rally.task import scenario
 
 
+PREPROCESS_OPTS = [
+    cfg.IntOpt("preprocess_cache_ttl",
+               default=300,
+               help="Number of seconds the resources listed to resolve "
+                    "scenario arguments and the resolved arguments are "
+                    "reused by the scenarios of a task, 0 disables reuse")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(PREPROCESS_OPTS, group=benchmark_group)
+
+
 def set(**kwargs):
     """Decorator to define resource transformation(s) on scenario parameters.
 
@@ -53,17 +70,90 @@ def preprocess(name, context, args):
     """
     preprocessors = scenario.Scenario.get(name)._meta_get("preprocessors",
                                                           default={})
-    clients = osclients.Clients(context["admin"]["endpoint"])
+    task = context.get("task")
+    if task:
+        cache = get_preprocess_cache(task["uuid"],
+                                     context["admin"]["endpoint"])
+    else:
+        cache = PreprocessCache(context["admin"]["endpoint"], ttl=0)
     processed_args = copy.deepcopy(args)
 
     for src, preprocessor in preprocessors.items():
         resource_cfg = processed_args.get(src)
         if resource_cfg:
-            processed_args[src] = preprocessor.transform(
-                clients=clients, resource_config=resource_cfg)
+            processed_args[src] = cache.transform(preprocessor, resource_cfg)
     return processed_args
 
 
+class PreprocessCache(object):
+    """Scenario arguments resolved for the scenarios of a task.
+
+    Results of ResourceType.transform are kept by resource type and
+    resource config for `preprocess_cache_ttl' seconds. All the transforms
+    share admin clients of the cache, and resources they list are kept
+    in the cache of the clients for the same time (see _list_resources).
+    Contexts may create and delete resources, so BenchmarkEngine drops
+    the cache after every context setup and cleanup.
+    """
+
+    def __init__(self, endpoint, ttl=None):
+        self.clients = osclients.Clients(endpoint)
+        self.ttl = CONF.benchmark.preprocess_cache_ttl if ttl is None else ttl
+        self.last_used = time.time()
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def transform(self, preprocessor, resource_config):
+        """Return the transformed resource config, resolved once per TTL.
+
+        :param preprocessor: ResourceType subclass
+        :param resource_config: scenario config of resource
+        :returns: transformed value of resource
+        """
+        key = (preprocessor, json.dumps(resource_config, sort_keys=True))
+        now = self.last_used = time.time()
+        with self._lock:
+            if key in self._resolved:
+                resolved_at, value = self._resolved[key]
+                if now - resolved_at < self.ttl:
+                    return copy.deepcopy(value)
+        value = preprocessor.transform(clients=self.clients,
+                                       resource_config=resource_config)
+        if self.ttl > 0:
+            with self._lock:
+                self._resolved[key] = (now, copy.deepcopy(value))
+        return value
+
+
+_preprocess_caches = {}
+_preprocess_caches_lock = threading.Lock()
+
+
+def get_preprocess_cache(task_uuid, endpoint):
+    """Return PreprocessCache of the task, create it if there is none.
+
+    Caches of other tasks unused for longer than their TTL are dropped,
+    e.g. caches of tasks that ran on a distributed worker.
+
+    :param task_uuid: UUID of the task
+    :param endpoint: admin endpoint of the task
+    """
+    now = time.time()
+    with _preprocess_caches_lock:
+        for uuid, cache in list(_preprocess_caches.items()):
+            if uuid != task_uuid and now - cache.last_used >= cache.ttl:
+                del _preprocess_caches[uuid]
+        if task_uuid not in _preprocess_caches:
+            _preprocess_caches[task_uuid] = PreprocessCache(endpoint)
+        return _preprocess_caches[task_uuid]
+
+
+def clear_preprocess_cache(task_uuid):
+    """Drop PreprocessCache of the finished task."""
+    with _preprocess_caches_lock:
+        _preprocess_caches.pop(task_uuid, None)
+
+
 class ResourceType(object):
 
     @classmethod
@@ -78,6 +168,32 @@ class ResourceType(object):
         """
 
 
+def _list_resources(clients, name, list_resources):
+    """Return resources listed by list_resources, reused for the TTL.
+
+    Listed resources are kept in the cache of osclients.Clients, the same
+    way as its client handles, so they are reused only by transforms that
+    share the clients of PreprocessCache.
+
+    :param clients: openstack admin client handles
+    :param name: name of the listing, e.g. "nova.flavors"
+    :param list_resources: function that returns an iterable of resources
+    :returns: list of resources
+    """
+    cache = getattr(clients, "cache", None)
+    if not isinstance(cache, dict):
+        return list(list_resources())
+    key = "preprocess_listing:%s" % name
+    ttl = CONF.benchmark.preprocess_cache_ttl
+    now = time.time()
+    if key in cache and now - cache[key][0] < ttl:
+        return cache[key][1]
+    resources = list(list_resources())
+    if ttl > 0:
+        cache[key] = (now, resources)
+    return resources
+
+
 def obj_from_name(resource_config, resources, typename):
     """Return the resource whose name matches the pattern.
 
@@ -212,9 +328,11 @@ class FlavorResourceType(ResourceType):
         resource_id = resource_config.get("id")
         if not resource_id:
             novaclient = clients.nova()
-            resource_id = _id_from_name(resource_config=resource_config,
-                                        resources=novaclient.flavors.list(),
-                                        typename="flavor")
+            resource_id = _id_from_name(
+                resource_config=resource_config,
+                resources=_list_resources(clients, "nova.flavors",
+                                          novaclient.flavors.list),
+                typename="flavor")
         return resource_id
 
 
@@ -236,9 +354,11 @@ class EC2FlavorResourceType(ResourceType):
         if not resource_name:
             # NOTE(wtakase): gets resource name from OpenStack id
             novaclient = clients.nova()
-            resource_name = _name_from_id(resource_config=resource_config,
-                                          resources=novaclient.flavors.list(),
-                                          typename="flavor")
+            resource_name = _name_from_id(
+                resource_config=resource_config,
+                resources=_list_resources(clients, "nova.flavors",
+                                          novaclient.flavors.list),
+                typename="flavor")
         return resource_name
 
 
@@ -256,10 +376,11 @@ class ImageResourceType(ResourceType):
         resource_id = resource_config.get("id")
         if not resource_id:
             glanceclient = clients.glance()
-            resource_id = _id_from_name(resource_config=resource_config,
-                                        resources=list(
-                                            glanceclient.images.list()),
-                                        typename="image")
+            resource_id = _id_from_name(
+                resource_config=resource_config,
+                resources=_list_resources(clients, "glance.images",
+                                          glanceclient.images.list),
+                typename="image")
         return resource_id
 
 
@@ -280,18 +401,30 @@ class EC2ImageResourceType(ResourceType):
         if "name" not in resource_config and "regex" not in resource_config:
             # NOTE(wtakase): gets resource name from OpenStack id
             glanceclient = clients.glance()
-            resource_name = _name_from_id(resource_config=resource_config,
-                                          resources=list(
-                                              glanceclient.images.list()),
-                                          typename="image")
+            resource_name = _name_from_id(
+                resource_config=resource_config,
+                resources=_list_resources(clients, "glance.images",
+                                          glanceclient.images.list),
+                typename="image")
             resource_config["name"] = resource_name
 
         # NOTE(wtakase): gets EC2 resource id from name or regex
         ec2client = clients.ec2()
-        resource_ec2_id = _id_from_name(resource_config=resource_config,
-                                        resources=list(
-                                            ec2client.get_all_images()),
-                                        typename="ec2_image")
+        if "name" in resource_config:
+            # NOTE: images named exactly as the name are described by
+            #       a filter, the name is a regex if there are none
+            images = list(ec2client.get_all_images(
+                filters={"name": resource_config["name"]}))
+            if any(image.name == resource_config["name"]
+                   for image in images):
+                return _id_from_name(resource_config=resource_config,
+                                     resources=images,
+                                     typename="ec2_image")
+        resource_ec2_id = _id_from_name(
+            resource_config=resource_config,
+            resources=_list_resources(clients, "ec2.images",
+                                      ec2client.get_all_images),
+            typename="ec2_image")
         return resource_ec2_id
 
 
@@ -309,10 +442,11 @@ class VolumeTypeResourceType(ResourceType):
         resource_id = resource_config.get("id")
         if not resource_id:
             cinderclient = clients.cinder()
-            resource_id = _id_from_name(resource_config=resource_config,
-                                        resources=cinderclient.
-                                        volume_types.list(),
-                                        typename="volume_type")
+            resource_id = _id_from_name(
+                resource_config=resource_config,
+                resources=_list_resources(clients, "cinder.volume_types",
+                                          cinderclient.volume_types.list),
+                typename="volume_type")
         return resource_id
 
 
@@ -332,7 +466,10 @@ class NeutronNetworkResourceType(ResourceType):
             return resource_id
         else:
             neutronclient = clients.neutron()
-            for net in neutronclient.list_networks()["networks"]:
+            networks = _list_resources(
+                clients, "neutron.networks",
+                lambda: neutronclient.list_networks()["networks"])
+            for net in networks:
                 if net["name"] == resource_config.get("name"):
                     return net["id"]
 
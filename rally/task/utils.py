@@ -14,6 +14,8 @@
 #    under the License.
 
 import itertools
+import os
+import threading
 import time
 import traceback
 
@@ -67,6 +69,10 @@ class resource_is(object):
         return str(self.desired_status)
 
 
+def _is_not_found(e):
+    return getattr(e, "code", getattr(e, "http_status", 400)) == 404
+
+
 def get_from_manager(error_statuses=None):
     error_statuses = error_statuses or ["ERROR"]
     error_statuses = map(lambda str: str.upper(), error_statuses)
@@ -76,7 +82,7 @@ def get_from_manager(error_statuses=None):
         try:
             res = resource.manager.get(resource.id)
         except Exception as e:
-            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
+            if _is_not_found(e):
                 raise exceptions.GetResourceNotFound(resource=resource)
             raise exceptions.GetResourceFailure(resource=resource, err=e)
 
@@ -278,6 +284,235 @@ def wait_for_delete(resource, update_resource=None, timeout=60,
                 resource_status=get_status(resource))
 
 
+class StatusWaiter(object):
+    """Wait for the status of a resource registered in StatusPollMultiplexer.
+
+    The waiter is updated by the poller thread of the multiplexer, so
+    the waiting thread only blocks on an event until the resource comes
+    into a ready or a failure status, or until the timeout.
+    """
+
+    def __init__(self, multiplexer, resource, group, ready_statuses,
+                 failure_statuses, status_attr, timeout, check_interval,
+                 check_deletion):
+        self.multiplexer = multiplexer
+        self.resource = resource
+        self.group = group
+        self.ready_statuses = ready_statuses
+        self.failure_statuses = failure_statuses
+        self.status_attr = status_attr
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.check_deletion = check_deletion
+        self.polls_saved = 0.0
+        self.error = None
+        self._done = threading.Event()
+
+    def is_done(self):
+        return self._done.is_set()
+
+    def update(self, resource):
+        """Check the status of the resource returned by a poll."""
+        self.resource = resource
+        status = get_status(resource, self.status_attr)
+        if status in self.ready_statuses:
+            self._done.set()
+        elif status in ("DELETED", "DELETE_COMPLETE"):
+            self.deleted()
+        elif status in self.failure_statuses:
+            self.fail(exceptions.GetResourceErrorStatus(
+                resource=resource, status=status,
+                fault=getattr(resource, "fault", "n/a")))
+
+    def deleted(self):
+        """Finish the wait of the resource that is not found anymore."""
+        if self.check_deletion:
+            self.resource = None
+            self._done.set()
+        else:
+            self.fail(exceptions.GetResourceNotFound(resource=self.resource))
+
+    def fail(self, error):
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        """Block until the wait is over.
+
+        :returns: The "ready" resource object, or None if the resource is
+                  deleted and check_deletion is set
+        :raises TimeoutException: if the timeout is exceeded
+        """
+        resource_repr = getattr(self.resource, "name", repr(self.resource))
+        try:
+            self._done.wait(self.timeout)
+        finally:
+            self.multiplexer.unregister(self)
+        # NOTE: the poller may finish the wait right after the timeout,
+        #       the waiter is not updated anymore once it is unregistered
+        if not self._done.is_set():
+            raise exceptions.TimeoutException(
+                desired_status=sorted(self.ready_statuses),
+                resource_name=resource_repr,
+                resource_type=self.resource.__class__.__name__,
+                resource_id=getattr(self.resource, "id", "<no id>"),
+                resource_status=get_status(self.resource, self.status_attr))
+        if self.error:
+            raise self.error
+        return self.resource
+
+
+class StatusPollMultiplexer(object):
+    """Waits for statuses of many resources with shared list calls.
+
+    Waiters are registered in groups of resources that are returned by
+    the same list call, e.g. servers of one user. A background poller
+    thread makes one list call per group every check interval and
+    updates all the waiters of the group from it, instead of a get call
+    per waiter and interval. The list call is given the resources that are
+    waited for, so it can be limited to them with filters. Resources
+    missing from the list (deleted, filtered out or beyond the page size
+    of the API) are checked with a get call, as well as all the resources
+    of the group if the list call fails. A group with a single waiter is
+    checked with a get call only, since it is cheaper than a list call.
+
+    The poller thread runs while there are waiters, use
+    get_status_poll_multiplexer() to share the multiplexer of the process.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._groups = {}
+        self._thread = None
+
+    def register(self, resource, group, ready_statuses,
+                 failure_statuses=None, status_attr="status",
+                 list_resources=None, timeout=60, check_interval=1,
+                 check_deletion=False):
+        """Register a wait for the status of a resource.
+
+        :param resource: The resource object with id and manager
+        :param group: Hashable key of resources returned by list_resources
+        :param ready_statuses: List of statuses which mean that the resource
+                               is ready
+        :param failure_statuses: List of statuses which mean that an error
+                                 has occurred while waiting for the resource
+        :param status_attr: The name of the status attribute of the resource
+        :param list_resources: Function that is called with the list of
+                               resources that are waited for in the group
+                               and returns resources of the group including
+                               them, defaults to resource.manager.list()
+        :param timeout: Timeout in seconds after which a TimeoutException
+                        will be raised
+        :param check_interval: Interval in seconds between the two
+                               consecutive polls
+        :param check_deletion: Whether the wait is over once the resource
+                               is not found
+        :returns: StatusWaiter, call its wait() to get the resource
+        """
+        ready_statuses = set([s.upper() for s in ready_statuses])
+        failure_statuses = set([s.upper() for s in failure_statuses or []])
+        if not ready_statuses:
+            raise ValueError("No ready statuses provided")
+        if ready_statuses & failure_statuses:
+            raise ValueError("Ready and failure statuses conflict")
+
+        waiter = StatusWaiter(self, resource, group, ready_statuses,
+                              failure_statuses, status_attr, timeout,
+                              check_interval, check_deletion)
+        with self._lock:
+            entry = self._groups.setdefault(group, [None, []])
+            entry[0] = list_resources or _list_from_manager
+            entry[1].append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        return waiter
+
+    def unregister(self, waiter):
+        with self._lock:
+            waiters = self._groups[waiter.group][1]
+            waiters.remove(waiter)
+            if not waiters:
+                del self._groups[waiter.group]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._groups:
+                    self._thread = None
+                    return
+                groups = [(list_resources, list(waiters))
+                          for list_resources, waiters in self._groups.values()]
+            for list_resources, waiters in groups:
+                self._poll(list_resources,
+                           [w for w in waiters if not w.is_done()])
+            time.sleep(min(w.check_interval
+                           for list_resources, waiters in groups
+                           for w in waiters))
+
+    def _poll(self, list_resources, waiters):
+        if not waiters:
+            return
+        resources = {}
+        polls = 0
+        if len(waiters) > 1:
+            polls = 1
+            try:
+                resources = dict(
+                    (r.id, r)
+                    for r in list_resources([w.resource for w in waiters]))
+            except Exception as e:
+                # NOTE: a failed list call must not fail all the waiters of
+                #       the group, every one of them falls back to its get
+                #       call
+                LOG.debug("Failed to list resources, falling back to get "
+                          "calls: %s" % e)
+
+        for waiter in waiters:
+            resource = resources.get(waiter.resource.id)
+            if resource is None:
+                polls += 1
+                try:
+                    resource = waiter.resource.manager.get(waiter.resource.id)
+                except Exception as e:
+                    if _is_not_found(e):
+                        waiter.deleted()
+                    else:
+                        waiter.fail(exceptions.GetResourceFailure(
+                            resource=waiter.resource, err=e))
+                    continue
+            waiter.update(resource)
+
+        # NOTE: every waiter would make a get call on its own, the calls
+        #       saved are shared among the waiters of the poll
+        saved = float(len(waiters) - polls) / len(waiters)
+        for waiter in waiters:
+            waiter.polls_saved += saved
+
+
+def _list_from_manager(resources):
+    return resources[0].manager.list()
+
+
+_multiplexer = None
+_multiplexer_lock = threading.Lock()
+
+
+def get_status_poll_multiplexer():
+    """Return StatusPollMultiplexer shared by the threads of the process.
+
+    Runners may fork worker processes, so every process gets its own one.
+    """
+    global _multiplexer
+    with _multiplexer_lock:
+        if _multiplexer is None or _multiplexer.pid != os.getpid():
+            _multiplexer = StatusPollMultiplexer()
+        return _multiplexer
+
+
 def format_exc(exc):
     return [exc.__class__.__name__, str(exc), traceback.format_exc()]
 
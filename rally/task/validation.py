@@ -15,8 +15,10 @@
 #    under the License.
 
 import functools
+import json
 import os
 import re
+import threading
 
 from glanceclient import exc as glance_exc
 from novaclient import exceptions as nova_exc
@@ -24,6 +26,7 @@ import six
 
 from rally.common.i18n import _
 from rally.common import objects
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from rally import osclients
@@ -42,6 +45,82 @@ class ValidationResult(object):
         self.msg = msg
 
 
+class ValidationRun(object):
+    """Memoized results and timings of validators of a task validation.
+
+    A validator gives the same result for the same arguments, scenario
+    args and context and credentials, so within a run it is called once
+    for them. Validators don't read other parts of scenario config, e.g.
+    runner or sla, so they are not a part of the key. Runs are meant to
+    last one validation, results are not expired.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _credentials(clients):
+        endpoint = getattr(clients, "endpoint", None)
+        if endpoint is None:
+            return None
+        return (endpoint.auth_url, endpoint.username, endpoint.tenant_name,
+                endpoint.region_name)
+
+    def _record(self, name, duration, cached):
+        with self._lock:
+            stats = self._stats.setdefault(
+                name, {"validator": name, "calls": 0, "cached": 0,
+                       "duration": 0.0})
+            stats["calls"] += 1
+            stats["cached"] += int(cached)
+            stats["duration"] += duration
+
+    def validate(self, validator, config, clients, deployment):
+        """Call the validator unless it is called with the same arguments.
+
+        Exceptions are not memoized, the validator is called again.
+
+        :param validator: validator made by the validator decorator
+        :param config: scenario config
+        :param clients: osclients.Clients of the credentials
+        :param deployment: deployment of the task
+        :returns: ValidationResult
+        """
+        name = getattr(validator, "__name__", repr(validator))
+        cache_key = getattr(validator, "cache_key", None)
+        key = None
+        if cache_key is not None:
+            key = (cache_key, self._credentials(clients),
+                   json.dumps([config.get("args"), config.get("context")],
+                              sort_keys=True, default=repr))
+            with self._lock:
+                result = self._results.get(key)
+            if result is not None:
+                self._record(name, 0.0, cached=True)
+                return result
+
+        with utils.Timer() as timer:
+            result = validator(config, clients=clients, deployment=deployment)
+        self._record(name, timer.duration(), cached=False)
+        if key is not None:
+            with self._lock:
+                self._results[key] = result
+        return result
+
+    def profile(self):
+        """Return timings of validators, the slowest first.
+
+        :returns: list of dicts with validator name, number of calls, number
+                  of calls answered from memoized results and total duration
+                  of the calls in seconds
+        """
+        with self._lock:
+            stats = [dict(s) for s in self._stats.values()]
+        return sorted(stats, key=lambda s: (-s["duration"], s["validator"]))
+
+
 def validator(fn):
     """Decorator that constructs a scenario validator from given function.
 
@@ -64,6 +143,10 @@ def validator(fn):
             return (fn(config, clients, deployment, *args, **kwargs) or
                     ValidationResult(True))
 
+        # NOTE: identifies the validator with its arguments for ValidationRun
+        wrap_validator.cache_key = (fn.__module__, fn.__name__, repr(args),
+                                    repr(sorted(kwargs.items())))
+
         def wrap_scenario(scenario):
             # TODO(boris-42): remove this in future.
             wrap_validator.permission = getattr(fn, "permission",
@@ -77,6 +77,7 @@
           $scope.view = {is_scenario:true};
           $scope.scenario = $scope.scenarios_map[uri.path];
           $scope.nav_idx = $scope.nav_map[uri.path];
+          $scope.loadDetail($scope.scenario);
           $scope.showTab(uri.hash);
         } else {
           $scope.scenario = null;
@@ -92,6 +93,37 @@
         $scope.route($scope.location.uri())
       });
 
+      /* Detail */
+
+      $scope.loadDetail = function(sc) {
+        /* Failures and full resolution series of scenario are stored
+           as zlib compressed JSON chunk, decode it when scenario is opened */
+        if (sc.detail) {
+          return
+        }
+        if (! window.DecompressionStream) {
+          return $scope.showError("Browser can not decompress scenario details")
+        }
+        sc.detail = "loading";
+        var encoded = atob(document.getElementById("detail-" + sc.idx).textContent);
+        var bytes = new Uint8Array(encoded.length);
+        for (var i = 0; i < encoded.length; i++) {
+          bytes[i] = encoded.charCodeAt(i)
+        }
+        var stream = new Blob([bytes]).stream().pipeThrough(
+          new DecompressionStream("deflate"));
+        new Response(stream).text().then(function(text) {
+          var detail = JSON.parse(text);
+          sc.iterations.iter = detail.iterations.iter;
+          sc.atomic.iter = detail.atomic.iter;
+          sc.output = detail.output;
+          sc.output_errors = detail.output_errors;
+          sc.errors = detail.errors;
+          sc.detail = "loaded";
+          $scope.$apply()
+        })
+      }
+
       /* Navigation */
 
       $scope.showNav  = function(nav_idx) {
@@ -116,7 +148,7 @@
         },{
           id: "failures",
           name: "Failures",
-          visible: function(){ return !! $scope.scenario.errors.length }
+          visible: function(){ return !! $scope.scenario.errors_count }
         },{
           id: "task",
           name: "Input task",
@@ -329,6 +361,7 @@
             itr = 1
           }
 
+          sc.idx = idx;
           sc.ref = $scope.location.normalize(sc.cls+"."+sc.met+(itr > 1 ? "-"+itr : ""));
           $scope.scenarios_map[sc.ref] = sc;
           $scope.nav_map[sc.ref] = cls_idx;
@@ -493,11 +526,11 @@
                 </span>
               <th class="sortable"
                   title="Number of errors occured"
-                  ng-click="ov_srt='errors.length'; ov_dir=!ov_dir">
+                  ng-click="ov_srt='errors_count'; ov_dir=!ov_dir">
                 Errors
                 <span class="arrow">
-                  <b ng-show="ov_srt=='errors.length' && !ov_dir">&#x25b4;</b>
-                  <b ng-show="ov_srt=='errors.length' && ov_dir">&#x25be;</b>
+                  <b ng-show="ov_srt=='errors_count' && !ov_dir">&#x25b4;</b>
+                  <b ng-show="ov_srt=='errors_count' && ov_dir">&#x25be;</b>
                 </span>
               <th class="sortable"
                   title="Whether SLA check is successful"
@@ -517,7 +550,7 @@
               <td>{{sc.full_duration | number:3}}
               <td>{{sc.iterations_count}}
               <td>{{sc.runner}}
-              <td>{{sc.errors.length}}
+              <td>{{sc.errors_count}}
               <td>
                 <span ng-show="sc.sla_success" class="status-pass">&#x2714;</span>
                 <span ng-hide="sc.sla_success" class="status-fail">&#x2716;</span>
@@ -551,7 +584,7 @@
             Load duration: <b>{{scenario.load_duration | number:3}} s</b> &nbsp;
             Full duration: <b>{{scenario.full_duration | number:3}} s</b> &nbsp;
             Iterations: <b>{{scenario.iterations_count}}</b> &nbsp;
-            Failures: <b>{{scenario.errors.length}}</b>
+            Failures: <b>{{scenario.errors_count}}</b>
           </p>
 
           <div ng-show="scenario.sla.length">
@@ -647,10 +680,11 @@
 
         <script type="text/ng-template" id="failures">
           <h2>Task failures (<ng-pluralize
-            count="scenario.errors.length"
+            count="scenario.errors_count"
             when="{'1': '1 iteration', 'other': '{} iterations'}"></ng-pluralize> failed)
           </h2>
-          <table class="striped">
+          <p ng-hide="scenario.errors">Loading...</p>
+          <table class="striped" ng-show="scenario.errors">
             <thead>
               <tr>
                 <th>
@@ -685,6 +719,10 @@
 
     </div>
     <div class="clearfix"></div>
+
+    % for idx, detail in enumerate(details):
+    <script type="text/plain" id="detail-${idx}">${detail}</script>
+    % endfor
 </%block>
 
 <%block name="js_after">
@@ -15,9 +15,11 @@
 
 import copy
 import datetime as date
+import json
 import os.path
 
 import mock
+import six
 
 from rally.cli.commands import task
 from rally import consts
@@ -26,6 +28,21 @@ from tests.unit import fakes
 from tests.unit import test
 
 
+class OneShotIterations(object):
+    """Iterations that nothing but the first iterator should read."""
+
+    def __init__(self, iterations):
+        self.iterations = iterations
+
+    def __len__(self):
+        return len(self.iterations)
+
+    def __iter__(self):
+        for itr in self.iterations:
+            yield itr
+        del self.iterations[:]
+
+
 class TaskCommandsTestCase(test.TestCase):
 
     def setUp(self):
@@ -168,7 +185,8 @@ class TaskCommandsTestCase(test.TestCase):
             deployment_id, None)
         mock_task_start.assert_called_once_with(
             deployment_id, mock__load_task.return_value,
-            task=mock_task_validate.return_value, abort_on_sla_failure=False)
+            task=mock_task_validate.return_value, abort_on_sla_failure=False,
+            distributed=False)
         mock__load_task.assert_called_once_with(task_path, None, None)
         mock_use.assert_called_once_with("some_new_uuid")
         mock_detailed.assert_called_once_with(task_id="some_new_uuid")
@@ -198,7 +216,8 @@ class TaskCommandsTestCase(test.TestCase):
             "any", mock__load_task.return_value, {})
         mock_task_start.assert_called_once_with(
             "any", mock__load_task.return_value,
-            task=mock_task_create.return_value, abort_on_sla_failure=False)
+            task=mock_task_create.return_value, abort_on_sla_failure=False,
+            distributed=False)
         mock_detailed.assert_called_once_with(
             task_id=mock_task_create.return_value["uuid"])
         mock_task_create.assert_called_once_with("any", "some_tag")
@@ -229,7 +248,8 @@ class TaskCommandsTestCase(test.TestCase):
 
         mock_task_start.assert_called_once_with(
             "deployment", mock__load_task.return_value,
-            task=mock_task_create.return_value, abort_on_sla_failure=False)
+            task=mock_task_create.return_value, abort_on_sla_failure=False,
+            distributed=False)
 
     @mock.patch("rally.cli.commands.task.api")
     def test_abort(self, mock_api):
@@ -247,11 +267,10 @@ class TaskCommandsTestCase(test.TestCase):
 
     def test_status(self):
         test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
-        value = {"task_id": "task", "status": "status"}
         with mock.patch("rally.cli.commands.task.db") as mock_db:
-            mock_db.task_get = mock.MagicMock(return_value=value)
+            mock_db.task_get_status.return_value = "status"
             self.task.status(test_uuid)
-            mock_db.task_get.assert_called_once_with(test_uuid)
+            mock_db.task_get_status.assert_called_once_with(test_uuid)
 
     @mock.patch("rally.cli.commands.task.envutils.get_global")
     def test_status_no_task_id(self, mock_get_global):
@@ -259,6 +278,65 @@ class TaskCommandsTestCase(test.TestCase):
         self.assertRaises(exceptions.InvalidArgumentsException,
                           self.task.status, None)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.time.sleep")
+    @mock.patch("rally.cli.commands.task.progress")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_watch(self, mock_db, mock_progress, mock_sleep,
+                   mock_print_list):
+        mock_db.task_get_status.side_effect = [
+            consts.TaskStatus.RUNNING, consts.TaskStatus.RUNNING,
+            consts.TaskStatus.FINISHED]
+        mock_progress.get_address.return_value = "127.0.0.1:4242"
+        scenario = {"name": "Foo.bar", "pos": 0, "iterations": 42,
+                    "failures": 2, "window": 10, "throughput": 4.2,
+                    "per_second": [4] * 10, "error_rate": 0.05,
+                    "in_flight": 3.3,
+                    "latency": {"min": 0.5, "median": 0.75, "90%ile": 0.9,
+                                "95%ile": 0.95, "max": 1.25}}
+        mock_progress.fetch.side_effect = [
+            {"task": "task-uuid", "scenarios": [scenario]}, IOError]
+
+        with mock.patch("sys.stdout",
+                        new_callable=six.moves.StringIO) as mock_stdout:
+            self.task.watch("task-uuid", interval=0.5)
+        output = mock_stdout.getvalue()
+
+        mock_progress.fetch.assert_called_with("127.0.0.1:4242")
+        self.assertEqual(2, mock_progress.fetch.call_count)
+        self.assertEqual([mock.call(0.5)] * 2, mock_sleep.mock_calls)
+        self.assertEqual(1, mock_print_list.call_count)
+        rows = mock_print_list.call_args[0][0]
+        kwargs = mock_print_list.call_args[1]
+        self.assertEqual("Last 10 seconds", kwargs["table_label"])
+        self.assertEqual(["Foo.bar [0]"], [r.scenario for r in rows])
+        self.assertEqual(
+            ["Foo.bar [0]", 42, 2, 4.2, "5.0%", 3.3, 0.5, 0.75, 0.9, 0.95,
+             1.25],
+            [kwargs["formatters"][f](rows[0])
+             if f in kwargs["formatters"] else getattr(rows[0], f)
+             for f in kwargs["fields"]])
+        self.assertIn("No scenarios are running.", output)
+        self.assertTrue(output.endswith(
+            "Task task-uuid: %s\n" % consts.TaskStatus.FINISHED))
+
+    @mock.patch("rally.cli.commands.task.progress")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_watch_interrupted(self, mock_db, mock_progress):
+        mock_db.task_get_status.return_value = consts.TaskStatus.RUNNING
+        mock_progress.get_address.return_value = None
+
+        with mock.patch("rally.cli.commands.task.time.sleep",
+                        side_effect=KeyboardInterrupt):
+            self.task.watch("task-uuid")
+        self.assertFalse(mock_progress.fetch.called)
+
+    @mock.patch("rally.cli.commands.task.envutils.get_global")
+    def test_watch_no_task_id(self, mock_get_global):
+        mock_get_global.side_effect = exceptions.InvalidArgumentsException
+        self.assertRaises(exceptions.InvalidArgumentsException,
+                          self.task.watch, None)
+
     @mock.patch("rally.cli.commands.task.db")
     def test_detailed(self, mock_db):
         test_uuid = "c0d874d4-7195-4fd5-8688-abe82bfad36f"
@@ -278,6 +356,7 @@ class TaskCommandsTestCase(test.TestCase):
                         "full_duration": 2.0,
                         "raw": [
                             {
+                                "timestamp": 1,
                                 "duration": 0.9,
                                 "idle_duration": 0.5,
                                 "scenario_output": {
@@ -293,6 +372,7 @@ class TaskCommandsTestCase(test.TestCase):
                                 "error": ["type", "message", "traceback"]
                             },
                             {
+                                "timestamp": 2,
                                 "duration": 0.5,
                                 "idle_duration": 0.2,
                                 "scenario_output": {
@@ -308,6 +388,7 @@ class TaskCommandsTestCase(test.TestCase):
                                 "error": None
                             },
                             {
+                                "timestamp": 3,
                                 "duration": 0.6,
                                 "idle_duration": 0.4,
                                 "scenario_output": {
@@ -333,6 +414,88 @@ class TaskCommandsTestCase(test.TestCase):
 
         self.task.detailed(test_uuid, iterations_data=True)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed_with_stored_info(self, mock_db, mock_print_list):
+        durations = {"min": 0.2, "median": 0.3, "90%ile": 0.4,
+                     "95%ile": 0.5, "max": 0.6, "avg": 0.35, "count": 2}
+        mock_db.task_get_detailed.return_value = {
+            "id": "task", "uuid": "task_uuid", "status": "status",
+            "results": [{
+                "key": {"name": "fake_name", "pos": 0, "kw": {}},
+                "data": {
+                    "load_duration": 1.0, "full_duration": 2.0,
+                    "raw": [],
+                    "info": {
+                        "atomic": {"a": {"min_duration": 0,
+                                         "max_duration": 0.6,
+                                         "durations": durations},
+                                   "b": {"min_duration": 0,
+                                         "max_duration": 0,
+                                         "durations": {"count": 0}}},
+                        "durations": durations,
+                        "output_names": [], "iterations_count": 4}}}]}
+
+        self.task.detailed("task_uuid")
+
+        rows = [row.__dict__ for row in mock_print_list.call_args[0][0]]
+        self.assertEqual(
+            sorted([
+                {"action": "a", "min": 0.2, "median": 0.3, "90%ile": 0.4,
+                 "95%ile": 0.5, "max": 0.6, "avg": 0.35, "success": "50.0%",
+                 "count": 4},
+                {"action": "b", "min": None, "median": None, "90%ile": None,
+                 "95%ile": None, "max": None, "avg": None,
+                 "success": "0.0%", "count": 4},
+                {"action": "total", "min": 0.2, "median": 0.3, "90%ile": 0.4,
+                 "95%ile": 0.5, "max": 0.6, "avg": 0.35, "success": "50.0%",
+                 "count": 4}], key=lambda row: row["action"]),
+            sorted(rows, key=lambda row: row["action"]))
+
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed_iterations_data_pages(self, mock_db, mock_print_list):
+        durations = {"min": 0.2, "median": 0.3, "90%ile": 0.4,
+                     "95%ile": 0.5, "max": 0.6, "avg": 0.35, "count": 3}
+        raw = [{"duration": 0.1 * i, "timestamp": i, "error": [],
+                "scenario_output": {"data": {"x": i}, "errors": ""},
+                "atomic_actions": {"a": 0.1, "b": None}}
+               for i in range(1, 4)]
+        mock_db.task_get_detailed.return_value = {
+            "id": "task", "uuid": "task_uuid", "status": "status",
+            "results": [{
+                "key": {"name": "fake_name", "pos": 0, "kw": {}},
+                "data": {
+                    "load_duration": 1.0, "full_duration": 2.0,
+                    "raw": raw,
+                    "info": {
+                        "atomic": {"a": {"min_duration": 0.1,
+                                         "max_duration": 0.1,
+                                         "durations": durations},
+                                   "b": {"min_duration": 0,
+                                         "max_duration": 0,
+                                         "durations": {"count": 0}}},
+                        "durations": durations,
+                        "output_names": ["x"], "iterations_count": 3}}}]}
+
+        with mock.patch("rally.cli.commands.task.ITERATIONS_PAGE_SIZE", 2):
+            self.task.detailed("task_uuid", iterations_data=True)
+
+        # NOTE: summary table, two pages of iterations and outputs table
+        self.assertEqual(4, mock_print_list.call_count)
+        pages = [c[0][0] for c in mock_print_list.call_args_list[1:3]]
+        self.assertEqual(
+            [[1, 2], [3]],
+            [[row.iteration for row in page] for page in pages])
+        self.assertEqual(["iteration", "full duration", "1. a", "2. b"],
+                         mock_print_list.call_args_list[1][1]["fields"])
+        self.assertEqual(0, getattr(pages[1][0], "2. b"))
+        outputs = mock_print_list.call_args_list[3][0][0]
+        self.assertEqual(
+            [{"key": "x", "min": 1.0, "median": 2.0, "90%ile": 2.8,
+              "95%ile": 2.9, "max": 3.0, "avg": 2.0}],
+            [row.__dict__ for row in outputs])
+
     @mock.patch("rally.cli.commands.task.db")
     @mock.patch("rally.cli.commands.task.logging")
     def test_detailed_task_failed(self, mock_logging, mock_db):
@@ -364,31 +527,72 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.detailed(test_uuid)
         mock_db.task_get_detailed.assert_called_once_with(test_uuid)
 
-    @mock.patch("json.dumps")
+    @mock.patch("rally.cli.commands.task.sys.stdout",
+                new_callable=six.moves.StringIO)
     @mock.patch("rally.cli.commands.task.objects.Task.get")
-    def test_results(self, mock_task_get, mock_json_dumps):
+    def test_results(self, mock_task_get, mock_stdout):
         task_id = "foo_task_id"
         data = [
-            {"key": "foo_key", "data": {"raw": "foo_raw", "sla": [],
+            {"key": "foo_key", "data": {"raw": [{"timestamp": 1}],
+                                        "sla": [],
                                         "load_duration": "lo_duration",
-                                        "full_duration": "fu_duration"}}
+                                        "full_duration": "fu_duration"}},
+            {"key": "bar_key", "data": {"raw": [{"timestamp": 2}],
+                                        "sla": [],
+                                        "load_duration": "lo_duration",
+                                        "full_duration": "fu_duration",
+                                        "info": {"tstamp_base": 1}}}
         ]
-        result = map(lambda x: {"key": x["key"],
-                                "result": x["data"]["raw"],
-                                "load_duration": x["data"]["load_duration"],
-                                "full_duration": x["data"]["full_duration"],
-                                "sla": x["data"]["sla"]}, data)
+        result = [{"key": x["key"],
+                   "result": x["data"]["raw"],
+                   "load_duration": x["data"]["load_duration"],
+                   "full_duration": x["data"]["full_duration"],
+                   "sla": x["data"]["sla"]} for x in data]
+        result[1]["tstamp_base"] = 1
         mock_results = mock.Mock(return_value=data)
         mock_task_get.return_value = mock.Mock(get_results=mock_results)
 
         self.task.results(task_id)
-        self.assertEqual(1, mock_json_dumps.call_count)
-        self.assertEqual(1, len(mock_json_dumps.call_args[0]))
-        self.assertSequenceEqual(result, mock_json_dumps.call_args[0][0])
-        self.assertEqual({"sort_keys": True, "indent": 4},
-                         mock_json_dumps.call_args[1])
+        self.assertEqual(json.dumps(result, sort_keys=True, indent=4) + "\n",
+                         mock_stdout.getvalue())
         mock_task_get.assert_called_once_with(task_id)
 
+    @mock.patch("rally.cli.commands.task.sys.stdout",
+                new_callable=six.moves.StringIO)
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_results_streams_iterations(self, mock_task_get, mock_stdout):
+        iterations = [{"timestamp": i, "duration": 0.5} for i in range(3)]
+        mock_task_get.return_value.get_results.return_value = [
+            {"key": "foo_key", "data": {"raw": OneShotIterations(iterations),
+                                        "sla": [],
+                                        "load_duration": 1,
+                                        "full_duration": 2}}]
+        expected = [{"key": "foo_key", "result": list(iterations),
+                     "sla": [], "load_duration": 1, "full_duration": 2}]
+
+        self.task.results("foo_task_id")
+        self.assertEqual(expected, json.loads(mock_stdout.getvalue()))
+
+    @mock.patch("rally.cli.commands.task.results_file.dump")
+    @mock.patch("rally.cli.commands.task.sys.stdout")
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_results_binary(self, mock_task_get, mock_stdout,
+                            mock_results_file_dump):
+        data = [{"key": "foo_key", "data": {"raw": [{"timestamp": 1}],
+                                            "sla": [],
+                                            "load_duration": 1.2,
+                                            "full_duration": 2.3}}]
+        mock_task_get.return_value = mock.Mock(
+            get_results=mock.Mock(return_value=data))
+
+        self.task.results("foo_task_id", out_format="binary")
+        results, fileobj = mock_results_file_dump.call_args[0]
+        self.assertEqual(mock_stdout.buffer, fileobj)
+        self.assertEqual([{"timestamp": 1}], list(results[0].pop("result")))
+        self.assertEqual([{"key": "foo_key", "sla": [], "load_duration": 1.2,
+                           "full_duration": 2.3}], results)
+        mock_stdout.buffer.flush.assert_called_once_with()
+
     @mock.patch("rally.cli.commands.task.sys.stdout")
     @mock.patch("rally.cli.commands.task.objects.Task.get")
     def test_results_no_data(self, mock_task_get, mock_stdout):
@@ -506,6 +710,8 @@ class TaskCommandsTestCase(test.TestCase):
         expected_get_calls = [mock.call(task) for task in tasks]
         mock_task_get.assert_has_calls(expected_get_calls, any_order=True)
 
+    @mock.patch("rally.cli.commands.task.results_file.is_binary",
+                return_value=False)
     @mock.patch("rally.cli.commands.task.json.load")
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.jsonschema.validate",
@@ -515,7 +721,8 @@ class TaskCommandsTestCase(test.TestCase):
     @mock.patch("rally.cli.commands.task.open", create=True)
     @mock.patch("rally.cli.commands.task.plot")
     def test_report_one_file(self, mock_plot, mock_open, mock_realpath,
-                             mock_validate, mock_path_exists, mock_json_load):
+                             mock_validate, mock_path_exists, mock_json_load,
+                             mock_is_binary):
 
         task_file = "/tmp/some_file.json"
         data = [
@@ -551,11 +758,59 @@ class TaskCommandsTestCase(test.TestCase):
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
 
+    @mock.patch("rally.cli.commands.task.results_file")
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.cli.commands.task.jsonschema.validate")
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_report_one_binary_file(self, mock_plot, mock_open,
+                                    mock_validate, mock_path_exists,
+                                    mock_results_file):
+        results = [{"key": {"name": "test", "pos": 0},
+                    "result": "foo_raw", "sla": "foo_sla",
+                    "load_duration": 0.1, "full_duration": 1.2}]
+        mock_results_file.is_binary.return_value = True
+        mock_results_file.load.return_value = results
+        mock_plot.plot.return_value = "html_report"
+
+        self.task.report(tasks="/tmp/task.bin", out="/tmp/1_test.html")
+        mock_results_file.is_binary.assert_called_once_with("/tmp/task.bin")
+        mock_open.assert_has_calls([mock.call("/tmp/task.bin", "rb"),
+                                    mock.call("/tmp/1_test.html", "w+")],
+                                   any_order=True)
+        mock_results_file.load.assert_called_once_with(
+            mock_open.side_effect())
+        self.assertFalse(mock_validate.called)
+        mock_plot.plot.assert_called_once_with(results)
+
+    @mock.patch("rally.cli.commands.task.sys.stderr")
+    @mock.patch("rally.cli.commands.task.results_file.load",
+                side_effect=exceptions.InvalidResultsFile(message="foo"))
+    @mock.patch("rally.cli.commands.task.results_file.is_binary",
+                return_value=True)
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_report_invalid_binary_file(self, mock_plot, mock_open,
+                                        mock_path_exists, mock_is_binary,
+                                        mock_results_file_load, mock_stderr):
+        ret = self.task.report(tasks="/tmp/task.bin", out="/tmp/1_test.html")
+
+        self.assertEqual(1, ret)
+        self.assertFalse(mock_plot.plot.called)
+        mock_stderr.write.assert_has_calls(
+            [mock.call("ERROR: Invalid task result format in /tmp/task.bin"),
+             mock.call("Invalid task results file: foo")], any_order=True)
+
+    @mock.patch("rally.cli.commands.task.results_file.is_binary",
+                return_value=False)
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.json.load")
     @mock.patch("rally.cli.commands.task.open", create=True)
     def test_report_exceptions(self, mock_open, mock_json_load,
-                               mock_path_exists):
+                               mock_path_exists, mock_is_binary):
 
         results = [
             {"key": {"name": "test", "pos": 0},
@@ -577,12 +832,15 @@ class TaskCommandsTestCase(test.TestCase):
                                out="/tmp/tmp.hsml")
         self.assertEqual(ret, 1)
 
+    @mock.patch("rally.cli.commands.task.results_file.is_binary",
+                return_value=False)
     @mock.patch("rally.cli.commands.task.sys.stderr")
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.json.load")
     @mock.patch("rally.cli.commands.task.open", create=True)
     def test_report_invalid_format(self, mock_open, mock_json_load,
-                                   mock_path_exists, mock_stderr):
+                                   mock_path_exists, mock_stderr,
+                                   mock_is_binary):
         result = self.task.report(tasks="/tmp/task.json", out="/tmp/tmp.html",
                                   out_format="invalid")
         self.assertEqual(1, result)
@@ -592,17 +850,18 @@ class TaskCommandsTestCase(test.TestCase):
     @mock.patch("rally.cli.commands.task.cliutils.print_list")
     @mock.patch("rally.cli.commands.task.envutils.get_global",
                 return_value="123456789")
-    @mock.patch("rally.cli.commands.task.objects.Task.list",
-                return_value=[fakes.FakeTask(uuid="a",
-                                             created_at=date.datetime.now(),
-                                             updated_at=date.datetime.now(),
-                                             status="c",
-                                             tag="d",
-                                             deployment_name="some_name")])
-    def test_list(self, mock_task_list, mock_get_global, mock_print_list):
+    @mock.patch("rally.cli.commands.task.objects.Task.list_brief",
+                return_value=[{"uuid": "a",
+                               "created_at": date.datetime.now(),
+                               "updated_at": date.datetime.now(),
+                               "status": "c",
+                               "tag": "d",
+                               "deployment_name": "some_name"}])
+    def test_list(self, mock_task_list_brief, mock_get_global,
+                  mock_print_list):
 
         self.task.list(status="running")
-        mock_task_list.assert_called_once_with(
+        mock_task_list_brief.assert_called_once_with(
             deployment=mock_get_global.return_value,
             status=consts.TaskStatus.RUNNING)
 
@@ -610,44 +869,45 @@ class TaskCommandsTestCase(test.TestCase):
                    "status", "tag"]
 
         mock_print_list.assert_called_once_with(
-            mock_task_list.return_value, headers,
+            mock_task_list_brief.return_value, headers,
             sortby_index=headers.index("created_at"))
 
     @mock.patch("rally.cli.commands.task.cliutils.print_list")
     @mock.patch("rally.cli.commands.task.envutils.get_global",
                 return_value="123456789")
-    @mock.patch("rally.cli.commands.task.objects.Task.list",
-                return_value=[fakes.FakeTask(uuid="a",
-                                             created_at=date.datetime.now(),
-                                             updated_at=date.datetime.now(),
-                                             status="c",
-                                             tag="d",
-                                             deployment_name="some_name")])
-    def test_list_uuids_only(self, mock_task_list, mock_get_global,
+    @mock.patch("rally.cli.commands.task.objects.Task.list_brief",
+                return_value=[{"uuid": "a",
+                               "created_at": date.datetime.now(),
+                               "updated_at": date.datetime.now(),
+                               "status": "c",
+                               "tag": "d",
+                               "deployment_name": "some_name"}])
+    def test_list_uuids_only(self, mock_task_list_brief, mock_get_global,
                              mock_print_list):
         self.task.list(status="running", uuids_only=True)
-        mock_task_list.assert_called_once_with(
+        mock_task_list_brief.assert_called_once_with(
             deployment=mock_get_global.return_value,
             status=consts.TaskStatus.RUNNING)
         mock_print_list.assert_called_once_with(
-            mock_task_list.return_value, ["uuid"],
+            mock_task_list_brief.return_value, ["uuid"],
             print_header=False, print_border=False)
 
     def test_list_wrong_status(self):
         self.assertEqual(1, self.task.list(deployment="fake",
                                            status="wrong non existing status"))
 
-    @mock.patch("rally.cli.commands.task.objects.Task.list", return_value=[])
-    def test_list_no_results(self, mock_task_list):
+    @mock.patch("rally.cli.commands.task.objects.Task.list_brief",
+                return_value=[])
+    def test_list_no_results(self, mock_task_list_brief):
         self.assertIsNone(
             self.task.list(deployment="fake", all_deployments=True))
-        mock_task_list.assert_called_once_with()
-        mock_task_list.reset_mock()
+        mock_task_list_brief.assert_called_once_with()
+        mock_task_list_brief.reset_mock()
 
         self.assertIsNone(
             self.task.list(deployment="d", status=consts.TaskStatus.RUNNING)
         )
-        mock_task_list.assert_called_once_with(
+        mock_task_list_brief.assert_called_once_with(
             deployment="d", status=consts.TaskStatus.RUNNING)
 
     def test_delete(self):
@@ -708,6 +968,39 @@ class TaskCommandsTestCase(test.TestCase):
         mock_task_validate.assert_called_once_with("fake_id", {"some": "json"},
                                                    None)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.api.Task.validate",
+                return_value=[{"validator": "image_exists", "calls": 3,
+                               "cached": 2, "duration": 0.5}])
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(read_data="{\"some\": \"json\"}"),
+                create=True)
+    def test_validate_profile(self, mock_open, mock_task_validate,
+                              mock_os_path_exists, mock_print_list):
+        self.task.validate("path_to_config.json", "fake_id", profile=True)
+
+        mock_task_validate.assert_called_once_with("fake_id", {"some": "json"},
+                                                   None)
+        rows = mock_print_list.call_args[0][0]
+        self.assertEqual([("image_exists", 3, 2, 0.5)],
+                         [(r.validator, r.calls, r.cached, r.duration)
+                          for r in rows])
+        self.assertEqual(["validator", "calls", "cached", "duration"],
+                         mock_print_list.call_args[1]["fields"])
+
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.api.Task.validate", return_value=[])
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(read_data="{\"some\": \"json\"}"),
+                create=True)
+    def test_validate_profile_no_validators(
+            self, mock_open, mock_task_validate, mock_os_path_exists,
+            mock_print_list):
+        self.task.validate("path_to_config.json", "fake_id", profile=True)
+        self.assertFalse(mock_print_list.called)
+
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.TaskCommands._load_task",
                 side_effect=task.FailedToLoadTask)
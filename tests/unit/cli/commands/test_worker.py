@@ -0,0 +1,55 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.cli.commands import worker
+from tests.unit import test
+
+
+class WorkerCommandsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerCommandsTestCase, self).setUp()
+        self.worker = worker.WorkerCommands()
+
+    @mock.patch("rally.cli.commands.worker.distributed.WorkerAgent")
+    def test_start(self, mock_worker_agent):
+        agent = mock_worker_agent.return_value
+        agent.serve.side_effect = KeyboardInterrupt
+
+        self.worker.start("agent-1")
+
+        mock_worker_agent.assert_called_once_with("agent-1")
+        agent.__enter__.assert_called_once_with()
+        agent.serve.assert_called_once_with()
+        self.assertTrue(agent.__exit__.called)
+
+    @mock.patch("rally.cli.commands.worker.cliutils.print_list")
+    @mock.patch("rally.cli.commands.worker.db.worker_list")
+    @mock.patch("rally.cli.commands.worker.distributed.get_alive_workers")
+    def test_list(self, mock_get_alive_workers, mock_worker_list,
+                  mock_print_list):
+        workers = [{"hostname": "w1", "created_at": "c1", "updated_at": "u1"},
+                   {"hostname": "w2", "created_at": "c2", "updated_at": "u2"}]
+        mock_worker_list.return_value = workers
+        mock_get_alive_workers.return_value = workers[:1]
+
+        self.worker.list()
+
+        rows = mock_print_list.call_args[0][0]
+        self.assertEqual([("w1", "alive"), ("w2", "dead")],
+                         [(r.hostname, r.status) for r in rows])
+        mock_print_list.assert_called_once_with(
+            rows, fields=["hostname", "status", "created_at", "updated_at"])
@@ -41,3 +41,9 @@ class DBCommandsTestCase(test.TestCase):
         self.db_commands.recreate()
         calls = [mock.call.db_drop(), mock.call.db_create()]
         self.assertEqual(calls, mock_db.mock_calls)
+
+    @mock.patch("rally.cli.manage.db")
+    def test_compress_results(self, mock_db):
+        mock_db.db_compress_results.return_value = 3
+        self.db_commands.compress_results(batch_size=10)
+        mock_db.db_compress_results.assert_called_once_with(batch_size=10)
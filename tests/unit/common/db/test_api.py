@@ -15,9 +15,13 @@
 
 """Tests for db.api layer."""
 
+import json
+
 from six import moves
+import sqlalchemy as sa
 
 from rally.common import db
+from rally.common.db.sqlalchemy import api as sa_api
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -116,6 +120,36 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_brief(self):
+        deployment = db.deployment_create({"name": "brief"})
+        task1 = self._create_task({"status": consts.TaskStatus.FAILED,
+                                   "deployment_uuid": deployment["uuid"],
+                                   "tag": "a"})
+        task2 = self._create_task()
+
+        tasks = db.task_list_brief()
+        self.assertEqual([task1["uuid"], task2["uuid"]],
+                         [t["uuid"] for t in tasks])
+        self.assertEqual(
+            {"uuid": task1["uuid"], "status": consts.TaskStatus.FAILED,
+             "tag": "a", "created_at": task1["created_at"],
+             "updated_at": task1["updated_at"],
+             "deployment_uuid": deployment["uuid"],
+             "deployment_name": "brief"},
+            tasks[0])
+
+        for deployment_id in (deployment["uuid"], "brief"):
+            self.assertEqual(
+                [task1["uuid"]],
+                [t["uuid"] for t in db.task_list_brief(
+                    deployment=deployment_id)])
+        self.assertEqual(
+            [task2["uuid"]],
+            [t["uuid"] for t in db.task_list_brief(
+                status=consts.TaskStatus.INIT)])
+        self.assertRaises(exceptions.DeploymentNotFound,
+                          db.task_list_brief, deployment="unknown")
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -176,6 +210,58 @@ class TasksTestCase(test.DBTestCase):
             self.assertEqual(res[0]["key"], data)
             self.assertEqual(res[0]["data"], data)
 
+    def test_task_result_update(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"a": 1})
+        db.task_result_update(result["id"], {"a": 2})
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual({"a": 2}, res[0]["data"])
+
+    def test_task_result_update_not_found(self):
+        self.assertRaises(exceptions.NotFoundException,
+                          db.task_result_update, 42, {})
+
+    def test_task_result_chunks(self):
+        task_id = self._create_task()["uuid"]
+        result_id = db.task_result_create(task_id, {"name": "foo"},
+                                          {"raw": []})["id"]
+        second = [{"timestamp": 3}, {"timestamp": 4}]
+        first = [{"timestamp": 1}, {"timestamp": 5}]
+        db.task_result_chunk_create(result_id, second)
+        db.task_result_chunk_create(result_id, first)
+
+        chunks = db.task_result_chunk_list(result_id)
+        self.assertEqual([(2, 1), (2, 3)],
+                         [(c["iterations_count"], c["min_timestamp"])
+                          for c in chunks])
+        self.assertEqual(first, db.task_result_chunk_get(chunks[0]["id"]))
+        self.assertEqual(second, db.task_result_chunk_get(chunks[1]["id"]))
+
+        db.task_delete(task_id)
+        self.assertEqual([], db.task_result_chunk_list(result_id))
+        self.assertRaises(exceptions.NotFoundException,
+                          db.task_result_chunk_get, chunks[0]["id"])
+
+    def test_db_compress_results(self):
+        task_id = self._create_task()["uuid"]
+        results = [db.task_result_create(task_id, {"name": "foo"}, {"a": i})
+                   for i in range(4)]
+        # NOTE: results stored before are plain JSON
+        session = sa_api.get_session()
+        with session.begin():
+            for result in results[:3]:
+                session.execute(
+                    sa.text("UPDATE task_results SET data = :data "
+                            "WHERE id = :id"),
+                    {"data": json.dumps(result["data"]), "id": result["id"]})
+
+        self.assertEqual(3, db.db_compress_results(batch_size=2))
+        self.assertEqual(0, db.db_compress_results())
+        results = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual([{"a": i} for i in range(4)],
+                         sorted([r["data"] for r in results],
+                                key=lambda data: data["a"]))
+
     def test_task_get_detailed(self):
         task1 = self._create_task()
         key = {"name": "atata"}
@@ -478,4 +564,82 @@ class WorkerTestCase(test.DBTestCase):
         self.assertNotEqual(self.worker["updated_at"], worker["updated_at"])
 
     def test_update_worker_not_found(self):
-        self.assertRaises(exceptions.WorkerNotFound, db.update_worker, "fake")
\ No newline at end of file
+        self.assertRaises(exceptions.WorkerNotFound, db.update_worker, "fake")
+
+    def test_worker_list(self):
+        db.register_worker({"hostname": "another"})
+        self.assertEqual(["another", "test"],
+                         [w["hostname"] for w in db.worker_list()])
+
+    def test_worker_list_alive_since(self):
+        worker = db.register_worker({"hostname": "another"})
+        self.assertEqual(
+            ["another"],
+            [w["hostname"]
+             for w in db.worker_list(alive_since=worker["updated_at"])])
+
+
+class WorkerJobTestCase(test.DBTestCase):
+    def setUp(self):
+        super(WorkerJobTestCase, self).setUp()
+        deployment = db.deployment_create({})
+        self.task = db.task_create({"deployment_uuid": deployment["uuid"]})
+        self.job = db.worker_job_create({"task_uuid": self.task["uuid"],
+                                         "worker": "test",
+                                         "key": {"name": "foo"}})
+
+    def test_worker_job_create(self):
+        job = db.worker_job_get(self.job["id"])
+        self.assertEqual(consts.WorkerJobStatus.PENDING, job["status"])
+        self.assertEqual({"name": "foo"}, job["key"])
+        self.assertEqual("test", job["worker"])
+
+    def test_worker_job_get_not_found(self):
+        self.assertRaises(exceptions.NotFoundException,
+                          db.worker_job_get, 42)
+
+    def test_worker_job_list(self):
+        another = db.worker_job_create({"task_uuid": self.task["uuid"],
+                                        "worker": "another", "key": {}})
+        db.worker_job_update(another["id"],
+                             {"status": consts.WorkerJobStatus.RUNNING})
+
+        self.assertEqual([self.job["id"], another["id"]],
+                         [j["id"] for j in db.worker_job_list()])
+        self.assertEqual(
+            [self.job["id"]],
+            [j["id"] for j in db.worker_job_list(
+                worker="test", task_uuid=self.task["uuid"],
+                status=consts.WorkerJobStatus.PENDING)])
+        self.assertEqual([], db.worker_job_list(
+            worker="another", status=consts.WorkerJobStatus.PENDING))
+
+    def test_worker_job_update(self):
+        self.assertEqual(1, db.worker_job_update(
+            self.job["id"], {"status": consts.WorkerJobStatus.FAILED,
+                             "error": "foo"}))
+        job = db.worker_job_get(self.job["id"])
+        self.assertEqual(consts.WorkerJobStatus.FAILED, job["status"])
+        self.assertEqual("foo", job["error"])
+
+    def test_worker_job_update_statuses(self):
+        self.assertEqual(0, db.worker_job_update(
+            self.job["id"], {"status": consts.WorkerJobStatus.ABORTING},
+            statuses=[consts.WorkerJobStatus.RUNNING]))
+        self.assertEqual(consts.WorkerJobStatus.PENDING,
+                         db.worker_job_get(self.job["id"])["status"])
+
+    def test_worker_job_results(self):
+        db.worker_job_result_create(self.job["id"], [{"a": 1}])
+        db.worker_job_result_create(self.job["id"], [{"b": 2}, {"c": 3}])
+
+        self.assertEqual([[{"a": 1}], [{"b": 2}, {"c": 3}]],
+                         db.worker_job_result_pop(self.job["id"]))
+        self.assertEqual([], db.worker_job_result_pop(self.job["id"]))
+
+    def test_task_delete_deletes_worker_jobs(self):
+        db.worker_job_result_create(self.job["id"], [{"a": 1}])
+        db.task_delete(self.task["uuid"])
+
+        self.assertEqual([], db.worker_job_list())
+        self.assertEqual([], db.worker_job_result_pop(self.job["id"]))
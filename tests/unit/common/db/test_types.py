@@ -0,0 +1,123 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import ddt
+import mock
+from oslo_config import cfg
+
+from rally.common import costilius
+from rally.common.db.sqlalchemy import types
+from tests.unit import test
+
+
+BASE = "rally.common.db.sqlalchemy.types."
+CONF = cfg.CONF
+
+
+def set_overrides(test_case, **overrides):
+    for name, value in overrides.items():
+        CONF.set_override(name, value, "benchmark")
+        test_case.addCleanup(CONF.clear_override, name, "benchmark")
+
+
+def generate_data(iterations_count=100):
+    return {"raw": [{"duration": 1.5 + i, "idle_duration": 0,
+                     "timestamp": 1e9 + i, "error": [],
+                     "scenario_output": {"errors": "", "data": {}},
+                     "atomic_actions": costilius.OrderedDict(
+                         [("foo", 0.5 + i), ("bar", 0.25)])}
+                    for i in range(iterations_count)]}
+
+
+@ddt.ddt
+class CompressedJSONEncodedDictTestCase(test.TestCase):
+
+    def _round_trip(self, value, **kwargs):
+        column_type = types.CompressedJSONEncodedDict(**kwargs)
+        stored = column_type.process_bind_param(value, None)
+        return stored, column_type.process_result_value(stored, None)
+
+    def test_process_bind_param(self):
+        data = generate_data()
+        stored, loaded = self._round_trip(data)
+
+        self.assertTrue(stored.startswith(types.MARKER + "zlib.json:"))
+        self.assertEqual(json.loads(json.dumps(data)), loaded)
+        self.assertLess(len(stored) * 5, len(json.dumps(data)))
+
+    def test_process_result_value_keeps_order(self):
+        stored, loaded = self._round_trip(generate_data(1))
+        self.assertEqual(["foo", "bar"],
+                         list(loaded["raw"][0]["atomic_actions"]))
+
+    def test_process_result_value_plain_json(self):
+        data = generate_data(3)
+        column_type = types.CompressedJSONEncodedDict()
+
+        loaded = column_type.process_result_value(json.dumps(data), None)
+        self.assertEqual(json.loads(json.dumps(data)), loaded)
+        self.assertEqual(["foo", "bar"],
+                         list(loaded["raw"][0]["atomic_actions"]))
+
+    @ddt.data({"ordered": True, "hook": costilius.OrderedDict},
+              {"ordered": False, "hook": None})
+    @ddt.unpack
+    @mock.patch(BASE + "costilius.json_loads")
+    def test_process_result_value_object_pairs_hook(
+            self, mock_json_loads, ordered, hook):
+        column_type = types.CompressedJSONEncodedDict(ordered=ordered)
+        with mock.patch(BASE + "DICTS_ARE_ORDERED", False):
+            column_type.process_result_value("{}", None)
+        mock_json_loads.assert_called_once_with("{}", object_pairs_hook=hook)
+
+    def test_none(self):
+        self.assertEqual((None, None), self._round_trip(None))
+
+    @mock.patch(BASE + "LOG")
+    def test_process_bind_param_library_is_not_installed(self, mock_log):
+        set_overrides(self, results_compression="zstd",
+                      results_encoding="msgpack")
+        with mock.patch(BASE + "_WARNED", set()):
+            with mock.patch.dict(types.COMPRESSIONS,
+                                 {"zstd": (None, None, None)}):
+                with mock.patch.dict(types.ENCODINGS,
+                                     {"msgpack": (None, None, None)}):
+                    stored, loaded = self._round_trip({"a": 1})
+
+        self.assertTrue(stored.startswith(types.MARKER + "zlib.json:"))
+        self.assertEqual({"a": 1}, loaded)
+        self.assertEqual(2, mock_log.warning.call_count)
+
+    def test_process_result_value_library_is_not_installed(self):
+        stored, loaded = self._round_trip({"a": 1})
+        stored = stored.replace("zlib", "zstd", 1)
+        with mock.patch.dict(types.COMPRESSIONS,
+                             {"zstd": (None, None, None)}):
+            self.assertRaises(
+                ValueError,
+                types.CompressedJSONEncodedDict().process_result_value,
+                stored, None)
+
+    def test_formats(self):
+        data = generate_data(3)
+        fake_codec = (json, lambda data: data[::-1],
+                      lambda data: data[::-1])
+        with mock.patch.dict(types.COMPRESSIONS, {"zstd": fake_codec}):
+            set_overrides(self, results_compression="zstd")
+            stored, loaded = self._round_trip(data)
+
+        self.assertTrue(stored.startswith(types.MARKER + "zstd.json:"))
+        self.assertEqual(json.loads(json.dumps(data)), loaded)
@@ -74,6 +74,14 @@ class TaskTestCase(test.TestCase):
         status = task.get_status(task["uuid"])
         self.assertEqual(status, mock_task_get_status.return_value)
 
+    @mock.patch("rally.common.objects.task.db.task_list_brief")
+    def test_list_brief(self, mock_task_list_brief):
+        self.assertEqual(mock_task_list_brief.return_value,
+                         objects.Task.list_brief(status="running",
+                                                 deployment="d"))
+        mock_task_list_brief.assert_called_once_with(status="running",
+                                                     deployment="d")
+
     @mock.patch("rally.common.objects.task.db.task_delete")
     @mock.patch("rally.common.objects.task.db.task_create")
     def test_create_and_delete(self, mock_task_create, mock_task_delete):
@@ -190,11 +198,14 @@ class TaskTestCase(test.TestCase):
             {"iterations": "foo_iterations", "sla": [],
              "key": {"kw": {"foo": 42}, "name": "Foo.bar", "pos": 0},
              "info": {
-                 "atomic": {"keystone.create_user": {"max_duration": 19,
-                                                     "min_duration": 10}},
+                 "atomic": {"keystone.create_user": {
+                     "max_duration": 19, "min_duration": 10,
+                     "durations": mock.ANY}},
              "iterations_count": 10, "iterations_failed": 0,
              "max_duration": 14, "min_duration": 5, "output_names": [],
-             "tstamp_start": 2, "full_duration": 40, "load_duration": 32}}]
+             "durations": mock.ANY,
+             "tstamp_start": 2, "tstamp_base": 2, "full_duration": 40,
+             "load_duration": 32}}]
 
         # serializable is default
         results = objects.Task.extend_results(obsolete)
@@ -220,22 +231,60 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
-    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
-                return_value="foo_results")
-    def test_get_results(self, mock_task_result_get_all_by_uuid):
+    def test_extend_results_with_stored_info(self):
+        info = {"atomic": {}, "output_names": [], "iterations_count": 2,
+                "iterations_failed": 1, "min_duration": 1, "max_duration": 1,
+                "tstamp_start": 3}
+        results = objects.Task.extend_results([
+            {"task_uuid": "foo_uuid", "created_at": None, "updated_at": None,
+             "id": 11, "key": {"kw": {}, "name": "Foo.bar", "pos": 0},
+             "data": {"raw": [], "sla": [], "info": info,
+                      "full_duration": 40, "load_duration": 32}}])
+
+        self.assertEqual(dict(info, full_duration=40, load_duration=32,
+                              tstamp_base=3),
+                         results[0]["info"])
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_list",
+                return_value=[])
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results(self, mock_task_result_get_all_by_uuid,
+                         mock_task_result_chunk_list):
+        raw = [{"timestamp": 1}, {"timestamp": 2}]
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"id": 42, "key": "foo_key", "data": {"raw": raw, "sla": []}}]
         task = objects.Task(task=self.task)
         results = task.get_results()
         mock_task_result_get_all_by_uuid.assert_called_once_with(
             self.task["uuid"])
-        self.assertEqual(results, "foo_results")
+        self.assertEqual(1, len(results))
+        self.assertEqual("foo_key", results[0]["key"])
+        self.assertEqual([], results[0]["data"]["sla"])
+        self.assertIsInstance(results[0]["data"]["raw"],
+                              objects.task.ResultIterations)
+        self.assertEqual(raw, list(results[0]["data"]["raw"]))
+        mock_task_result_chunk_list.assert_called_once_with(42)
 
     @mock.patch("rally.common.objects.task.db.task_result_create")
     def test_append_results(self, mock_task_result_create):
         task = objects.Task(task=self.task)
-        task.append_results("opt", "val")
+        self.assertEqual(mock_task_result_create.return_value,
+                         task.append_results("opt", "val"))
         mock_task_result_create.assert_called_once_with(
             self.task["uuid"], "opt", "val")
 
+    @mock.patch("rally.common.objects.task.db.task_result_update")
+    def test_update_results(self, mock_task_result_update):
+        task = objects.Task(task=self.task)
+        task.update_results(42, "val")
+        mock_task_result_update.assert_called_once_with(42, "val")
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_create")
+    def test_append_results_chunk(self, mock_task_result_chunk_create):
+        task = objects.Task(task=self.task)
+        task.append_results_chunk(42, ["itr"])
+        mock_task_result_chunk_create.assert_called_once_with(42, ["itr"])
+
     @mock.patch("rally.common.objects.task.db.task_update")
     def test_set_failed(self, mock_task_update):
         mock_task_update.return_value = self.task
@@ -319,3 +368,117 @@ class TaskTestCase(test.TestCase):
             allowed_statuses=(consts.TaskStatus.RUNNING,
                               consts.TaskStatus.SOFT_ABORTING)
         )
+
+
+class ResultInfoTestCase(test.TestCase):
+
+    def _itr(self, timestamp, duration, error=None, atomic=None, data=None):
+        return {"timestamp": timestamp, "duration": duration,
+                "error": error or [], "idle_duration": 0,
+                "atomic_actions": atomic or {},
+                "scenario_output": {"data": data or {}, "errors": ""}}
+
+    def test_to_dict_empty(self):
+        self.assertEqual({"atomic": {}, "output_names": [],
+                          "iterations_count": 0, "iterations_failed": 0,
+                          "min_duration": 0, "max_duration": 0,
+                          "durations": {"min": None, "median": None,
+                                        "90%ile": None, "95%ile": None,
+                                        "max": None, "avg": None,
+                                        "count": 0},
+                          "tstamp_start": 0},
+                         objects.task.ResultInfo().to_dict())
+
+    def test_add(self):
+        info = objects.task.ResultInfo()
+        info.add(self._itr(5, 2, atomic={"a": 1, "b": None},
+                           data={"foo": 1}))
+        info.add(self._itr(3, 0.5, atomic={"a": 3}))
+        info.add(self._itr(4, 9, error=["Error"], atomic={"a": 0.5},
+                           data={"bar": 2}))
+
+        result = info.to_dict()
+        for durations in ([result["durations"]] +
+                          [v["durations"] for v in result["atomic"].values()]):
+            for k, v in durations.items():
+                durations[k] = v if v is None else round(v, 3)
+        self.assertEqual(["a", "b"], list(result["atomic"]))
+        self.assertEqual(
+            {"a": {"min_duration": 0.5, "max_duration": 3,
+                   "durations": {"min": 0.5, "median": 1, "90%ile": 2.6,
+                                 "95%ile": 2.8, "max": 3, "avg": 1.5,
+                                 "count": 3}},
+             "b": {"min_duration": 0, "max_duration": 0,
+                   "durations": {"min": None, "median": None,
+                                 "90%ile": None, "95%ile": None,
+                                 "max": None, "avg": None, "count": 0}}},
+            result["atomic"])
+        self.assertEqual({"output_names": ["bar", "foo"],
+                          "iterations_count": 3, "iterations_failed": 1,
+                          "min_duration": 0.5, "max_duration": 2,
+                          "durations": {"min": 0.5, "median": 1.25,
+                                        "90%ile": 1.85, "95%ile": 1.925,
+                                        "max": 2, "avg": 1.25, "count": 2},
+                          "tstamp_start": 3},
+                         dict((k, v) for k, v in result.items()
+                              if k != "atomic"))
+
+    def test_add_schedule(self):
+        info = objects.task.ResultInfo()
+        for intended, actual in ((100.5, 100.6), (100, 100.1),
+                                 (101, 101.4), (103, 103)):
+            itr = self._itr(actual, 1)
+            itr["intended_timestamp"] = intended
+            info.add(itr)
+
+        schedule = info.to_dict()["schedule"]
+        for second in schedule:
+            second["lag_avg"] = round(second["lag_avg"], 3)
+            second["lag_max"] = round(second["lag_max"], 3)
+        self.assertEqual(
+            [{"second": 0, "started": 2, "lag_avg": 0.1, "lag_max": 0.1},
+             {"second": 1, "started": 1, "lag_avg": 0.4, "lag_max": 0.4},
+             {"second": 3, "started": 1, "lag_avg": 0, "lag_max": 0}],
+            schedule)
+
+    def test_to_dict_without_schedule(self):
+        info = objects.task.ResultInfo()
+        info.add(self._itr(1, 1))
+        self.assertNotIn("schedule", info.to_dict())
+
+
+class ResultIterationsTestCase(test.TestCase):
+
+    def test_without_chunks(self):
+        raw = [{"timestamp": 2}, {"timestamp": 1}]
+        iterations = objects.task.ResultIterations(None, raw)
+        self.assertEqual(2, len(iterations))
+        self.assertEqual(raw, list(iterations))
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get")
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_list")
+    def test_chunks_are_merged(self, mock_task_result_chunk_list,
+                               mock_task_result_chunk_get):
+        chunks = {1: [{"timestamp": 1}, {"timestamp": 4}],
+                  2: [{"timestamp": 2}, {"timestamp": 3}],
+                  3: [{"timestamp": 5}, {"timestamp": 6}]}
+        mock_task_result_chunk_list.return_value = [
+            {"id": 1, "iterations_count": 2, "min_timestamp": 1},
+            {"id": 2, "iterations_count": 2, "min_timestamp": 2},
+            {"id": 3, "iterations_count": 2, "min_timestamp": 5}]
+        loaded = []
+
+        def chunk_get(chunk_id):
+            loaded.append(chunk_id)
+            return chunks[chunk_id]
+
+        mock_task_result_chunk_get.side_effect = chunk_get
+        iterations = objects.task.ResultIterations(42)
+
+        self.assertEqual(6, len(iterations))
+        stream = iter(iterations)
+        self.assertEqual([{"timestamp": t} for t in (1, 2, 3, 4)],
+                         [next(stream) for i in range(4)])
+        self.assertEqual([1, 2], loaded)
+        self.assertEqual([{"timestamp": 5}, {"timestamp": 6}], list(stream))
+        mock_task_result_chunk_list.assert_called_once_with(42)
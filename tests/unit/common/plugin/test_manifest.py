@@ -0,0 +1,96 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+
+from rally.common.plugin import manifest
+from rally.common.plugin import plugin
+from tests.unit import test
+
+
+@plugin.configure(name="test_manifest_plugin")
+class ManifestPlugin(plugin.Plugin):
+    pass
+
+
+class ManifestTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ManifestTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "manifest.json")
+        self.sources = [(__name__, os.path.abspath(__file__.replace(
+            ".pyc", ".py"))), (None, os.path.join(self.tmp_dir, "p.py"))]
+        with open(self.sources[1][1], "w") as f:
+            f.write("")
+
+    def test_build(self):
+        result = manifest.build(self.sources)
+
+        self.assertEqual(manifest.VERSION, result["version"])
+        self.assertEqual(
+            {__name__: self.sources[0][1], None: self.sources[1][1]},
+            dict((m["name"], p) for p, m in result["modules"].items()))
+        self.assertEqual([self.sources[0][1]],
+                         result["plugins"]["test_manifest_plugin"])
+        self.assertNotIn("test_some_plugin", result["plugins"])
+
+    def test_save_and_load(self):
+        result = manifest.build(self.sources)
+        manifest.save(self.path, result)
+
+        self.assertEqual(result, manifest.load(self.path, self.sources))
+
+    def test_load_missing(self):
+        self.assertIsNone(manifest.load(self.path, self.sources))
+
+    def test_load_corrupted(self):
+        with open(self.path, "w") as f:
+            f.write("{")
+
+        self.assertIsNone(manifest.load(self.path, self.sources))
+
+    def test_load_other_sources(self):
+        manifest.save(self.path, manifest.build(self.sources))
+
+        self.assertIsNone(manifest.load(self.path, self.sources[:1]))
+        self.assertIsNone(manifest.load(self.path, self.sources + [
+            (None, os.path.join(self.tmp_dir, "new.py"))]))
+
+    def test_load_modified(self):
+        manifest.save(self.path, manifest.build(self.sources))
+        mtime = os.path.getmtime(self.sources[1][1])
+        os.utime(self.sources[1][1], (mtime + 10, mtime + 10))
+
+        self.assertIsNone(manifest.load(self.path, self.sources))
+
+    def test_load_removed(self):
+        manifest.save(self.path, manifest.build(self.sources))
+        os.remove(self.sources[1][1])
+
+        self.assertIsNone(manifest.load(self.path, self.sources))
+
+    @mock.patch("rally.common.plugin.manifest.LOG")
+    def test_save_fails(self, mock_log):
+        path = os.path.join(self.tmp_dir, "p.py", "manifest.json")
+
+        manifest.save(path, {})
+
+        self.assertTrue(mock_log.debug.called)
+        self.assertFalse(os.path.exists(path))
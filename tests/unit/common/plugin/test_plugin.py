@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.common.plugin import plugin
 from rally import exceptions
 from tests.unit import test
@@ -158,3 +160,87 @@ class PluginTestCase(test.TestCase):
         self.assertFalse(SomePlugin.is_deprecated())
         self.assertEqual(DeprecatedPlugin.is_deprecated(),
                          {"reason": "some_reason", "rally_version": "0.1.1"})
+
+    def test_get_other_base(self):
+
+        class OtherBasePlugin(plugin.Plugin):
+            pass
+
+        self.assertRaises(exceptions.PluginNotFound,
+                          OtherBasePlugin.get, "test_some_plugin")
+
+    def test_get_after_reregister(self):
+
+        @plugin.configure(name="test_reregistered_plugin")
+        class SomeTempPlugin(BasePlugin):
+            pass
+
+        SomeTempPlugin.unregister()
+
+        @plugin.configure(name="test_reregistered_plugin")
+        class OtherTempPlugin(BasePlugin):
+            pass
+
+        self.addCleanup(OtherTempPlugin.unregister)
+        self.assertEqual(OtherTempPlugin,
+                         BasePlugin.get("test_reregistered_plugin"))
+
+    def test_get_namespace(self):
+
+        @plugin.configure(name="test_some_plugin", namespace="other")
+        class OtherNamespacePlugin(BasePlugin):
+            pass
+
+        self.addCleanup(OtherNamespacePlugin.unregister)
+        self.assertEqual(OtherNamespacePlugin,
+                         BasePlugin.get("test_some_plugin", "other"))
+        self.assertEqual(SomePlugin,
+                         BasePlugin.get("test_some_plugin", "default"))
+
+
+class LazyLoaderTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LazyLoaderTestCase, self).setUp()
+        self.loader = mock.Mock()
+        plugin.set_lazy_loader(self.loader)
+        self.addCleanup(plugin.set_lazy_loader, None)
+
+    def test_get_registered(self):
+        self.assertEqual(SomePlugin, BasePlugin.get("test_some_plugin"))
+        self.assertFalse(self.loader.load.called)
+        self.assertFalse(self.loader.load_all.called)
+
+    def test_get_lazy_loaded(self):
+
+        def load(name):
+
+            @plugin.configure(name=name)
+            class LazyPlugin(BasePlugin):
+                pass
+
+            self.addCleanup(LazyPlugin.unregister)
+            return True
+
+        self.loader.load.side_effect = load
+
+        p = BasePlugin.get("test_lazy_plugin")
+
+        self.assertEqual("test_lazy_plugin", p.get_name())
+        self.loader.load.assert_called_once_with("test_lazy_plugin")
+        self.assertFalse(self.loader.load_all.called)
+
+    def test_get_not_found(self):
+        self.loader.load.return_value = False
+
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "non_existing")
+        self.loader.load.assert_called_once_with("non_existing")
+        self.loader.load_all.assert_called_once_with()
+        self.assertIsNone(plugin._LAZY_LOADER)
+
+    def test_get_all(self):
+        self.assertEqual(set([SomePlugin, DeprecatedPlugin]),
+                         set(BasePlugin.get_all()))
+        self.loader.load_all.assert_called_once_with()
+        self.assertIsNone(plugin._LAZY_LOADER)
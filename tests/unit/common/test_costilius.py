@@ -100,3 +100,18 @@ class GetInterpreterTestCase(test.TestCase):
         self.assertEqual(1, mock_sp_check_output.call_count)
         self.assertIn(
             found_interpreter, ["%s/%s" % (f, "python2.7") for f in paths])
+
+
+class GetAsyncioTestCase(test.TestCase):
+
+    @mock.patch("%s.sys" % PATH)
+    def test_get_asyncio_old_python(self, mock_sys):
+        mock_sys.version_info = (3, 4, 3)
+        self.assertIsNone(costilius.get_asyncio())
+
+    @mock.patch("%s.sys" % PATH)
+    def test_get_asyncio(self, mock_sys):
+        mock_sys.version_info = (3, 4, 4)
+        mock_asyncio = mock.Mock()
+        with mock.patch.dict("sys.modules", {"asyncio": mock_asyncio}):
+            self.assertEqual(mock_asyncio, costilius.get_asyncio())
@@ -19,6 +19,7 @@ import math
 
 from rally.common import streaming_algorithms as algo
 from rally import exceptions
+from rally.task.processing import utils
 from tests.unit import test
 
 
@@ -121,7 +122,8 @@ class PercentileComputationTestCase(test.TestCase):
                26.27, 97.3, 56.6, 19.75, 69, 25.03, 10.76, 17.71, 29.4, 15.75,
                19.88, 90.16, 82.0, 63.4, 14.84, 49.07, 72.06, 41, 1.48, 82.19,
                48.45, 53, 88.33, 52.31, 62, 15.96, 21.17, 25.33, 53.27]
-    mixed5000 = mixed50 * 1000
+    mixed5000 = mixed50 * 100
+    range100 = range(100)
     range5000 = range(5000)
 
     @ddt.data(
@@ -138,14 +140,7 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
-        {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
-        {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
-        {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
-        {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
-        {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
+        {"stream": "range100", "percent": 0.50, "expected": 49.5})
     @ddt.unpack
     def test_add_and_result(self, percent, stream, expected):
         comp = algo.PercentileComputation(percent=percent, length=len(
@@ -153,6 +148,33 @@ class PercentileComputationTestCase(test.TestCase):
         [comp.add(i) for i in getattr(self, stream)]
         self.assertEqual(expected, comp.result())
 
+    @ddt.data(
+        {"stream": "mixed5000", "percent": 0.25},
+        {"stream": "mixed5000", "percent": 0.50},
+        {"stream": "mixed5000", "percent": 0.90},
+        {"stream": "range5000", "percent": 0.25},
+        {"stream": "range5000", "percent": 0.50},
+        {"stream": "range5000", "percent": 0.90},
+        {"stream": "range5000", "percent": 0.99})
+    @ddt.unpack
+    def test_add_and_result_rank_error(self, percent, stream):
+        values = getattr(self, stream)
+        comp = algo.PercentileComputation(percent=percent)
+        [comp.add(i) for i in values]
+        result = comp.result()
+        lower = len([v for v in values if v < result]) / float(len(values))
+        upper = len([v for v in values if v <= result]) / float(len(values))
+        self.assertTrue(lower - 0.02 <= percent <= upper + 0.02,
+                        "%s is not %s percentile" % (result, percent))
+
+    def test_merge(self):
+        comp1 = algo.PercentileComputation(0.5)
+        comp2 = algo.PercentileComputation(0.5)
+        [comp1.add(i) for i in range(0, 100, 2)]
+        [comp2.add(i) for i in range(1, 100, 2)]
+        comp1.merge(comp2)
+        self.assertEqual(49.5, comp1.result())
+
     def test_add_raises(self):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertRaises(TypeError, comp.add)
@@ -163,6 +185,73 @@ class PercentileComputationTestCase(test.TestCase):
         self.assertRaises(ValueError, comp.result)
 
 
+class QuantileSketchTestCase(test.TestCase):
+
+    def test_init_raises(self):
+        self.assertRaises(ValueError, algo.QuantileSketch, k=2)
+
+    def test_quantile_raises(self):
+        sketch = algo.QuantileSketch()
+        self.assertRaises(ValueError, sketch.quantile, 0.5)
+        sketch.add(1)
+        self.assertRaises(ValueError, sketch.quantile, 1.5)
+
+    def test_quantile_exact(self):
+        sketch = algo.QuantileSketch(k=100)
+        values = [(i * 37) % 100 for i in range(100)]
+        [sketch.add(v) for v in values]
+        self.assertEqual(100, len(sketch))
+        for percent in (0, 0.1, 0.25, 0.5, 0.9, 0.95, 1):
+            self.assertEqual(utils.percentile(values, percent),
+                             sketch.quantile(percent))
+
+    def test_size_is_bounded(self):
+        sketch = algo.QuantileSketch(k=50)
+        for i in range(100000):
+            sketch.add(i)
+        self.assertEqual(100000, len(sketch))
+        self.assertTrue(sum(len(c) for c in sketch._compactors) < 300)
+        self.assertTrue(abs(sketch.quantile(0.5) - 50000) < 100000 * 0.05)
+
+    def test_quantile_is_reproducible(self):
+        quantiles = []
+        for i in range(2):
+            sketch = algo.QuantileSketch(k=50)
+            for value in range(1000):
+                sketch.add((value * 37) % 1000)
+            quantiles.append([sketch.quantile(p) for p in (0.5, 0.9, 0.95)])
+        self.assertEqual(quantiles[0], quantiles[1])
+
+    def test_extend(self):
+        values = [(i * 37) % 1000 / 10.0 for i in range(1000)]
+        sketch = algo.QuantileSketch(k=50)
+        for value in values:
+            sketch.add(value)
+        batch_sketch = algo.QuantileSketch(k=50)
+        batch_sketch.extend(values[:1])
+        batch_sketch.extend(values[1:300])
+        batch_sketch.extend([])
+        batch_sketch.extend(values[300:])
+
+        self.assertEqual(1000, len(batch_sketch))
+        self.assertEqual(sketch._compactors, batch_sketch._compactors)
+
+    def test_merge(self):
+        sketch1 = algo.QuantileSketch(k=50)
+        sketch2 = algo.QuantileSketch(k=50)
+        for i in range(10000):
+            (sketch1 if i % 3 else sketch2).add(i)
+        sketch1.merge(sketch2)
+        self.assertEqual(10000, len(sketch1))
+        self.assertTrue(
+            sum(len(c) for c in sketch1._compactors) < sketch1._max_size)
+        self.assertTrue(abs(sketch1.quantile(0.9) - 9000) < 10000 * 0.05)
+
+    def test_merge_raises(self):
+        self.assertRaises(ValueError, algo.QuantileSketch(k=50).merge,
+                          algo.QuantileSketch(k=60))
+
+
 class IncrementComputationTestCase(test.TestCase):
 
     def test_add_and_result(self):
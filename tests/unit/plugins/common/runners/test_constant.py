@@ -46,19 +46,11 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                           runner.ScenarioRunner.validate,
                           self.config)
 
-    @mock.patch(RUNNERS + "constant.time")
-    @mock.patch(RUNNERS + "constant.threading.Thread")
-    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
-
+    def test__worker_process(self, mock_runner):
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
+        mock_queue = mock.MagicMock()
 
         times = 4
 
@@ -72,18 +64,17 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                                  context, "Dummy", "dummy", (), mock_event,
                                  info)
 
-        self.assertEqual(times, mock_thread.call_count)
-        self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_runner._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+        mock_runner.WorkerThreadPool.assert_called_once_with(
+            mock_queue, mock.ANY, "Dummy", "dummy", context, ())
+        mock_pool = mock_runner.WorkerThreadPool.return_value
+        mock_pool.spawn.assert_called_once_with(2)
+        mock_pool.join.assert_called_once_with()
+
+        next_iteration = mock_runner.WorkerThreadPool.call_args[0][1]
+        self.assertEqual([0, 1, 2, 3, None],
+                         [next_iteration() for i in range(5)])
+        mock_event.is_set.return_value = True
+        self.assertIsNone(next_iteration())
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -0,0 +1,178 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+import testtools
+
+from rally import exceptions
+from rally.plugins.common.runners import event_loop
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+class FakeAsyncScenario(fakes.FakeScenario):
+
+    def sleep(self, **kwargs):
+        return event_loop.asyncio.sleep(0.01, result={"data": {"a": 1}})
+
+    def fail(self, **kwargs):
+        future = event_loop.asyncio.Future()
+        future.set_exception(Exception("Something went wrong"))
+        return future
+
+    def too_long(self, **kwargs):
+        return event_loop.asyncio.sleep(10)
+
+
+@testtools.skipIf(event_loop.asyncio is None, "asyncio is not available")
+class EventLoopWorkerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(EventLoopWorkerTestCase, self).setUp()
+        self.loop = event_loop.asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.results = []
+        self.queue = mock.Mock(put=self.results.append)
+        self.context = {"task": {"uuid": "uuid"}, "config": {}}
+
+    def _run(self, method_name, times, concurrency, timeout=0):
+        iterations = iter(range(times))
+        worker = event_loop.EventLoopWorker(
+            self.loop, self.queue, lambda: next(iterations, None),
+            FakeAsyncScenario, method_name, self.context, {}, timeout)
+        worker.run(concurrency)
+
+    def test_run(self):
+        self._run("sleep", 20, 10)
+
+        self.assertEqual(20, len(self.results))
+        for result in self.results:
+            runner.ScenarioRunnerResult(result)
+            self.assertEqual([], result["error"])
+            self.assertEqual({"a": 1}, result["scenario_output"]["data"])
+            self.assertGreaterEqual(result["duration"], 0.01)
+        # NOTE: the first `concurrency` iterations start at once
+        timestamps = sorted(r["timestamp"] for r in self.results)
+        self.assertLess(timestamps[9] - timestamps[0], 0.01)
+
+    def test_run_concurrency_more_than_times(self):
+        self._run("sleep", 2, 1000)
+
+        self.assertEqual(2, len(self.results))
+
+    def test_run_errors(self):
+        self._run("fail", 2, 2)
+        self._run("something_went_wrong", 2, 2)
+
+        self.assertEqual(4, len(self.results))
+        for result in self.results:
+            runner.ScenarioRunnerResult(result)
+            self.assertEqual(["Exception", "Something went wrong"],
+                             result["error"][:2])
+
+    def test_run_not_coroutine(self):
+        self._run("with_output", 3, 2)
+
+        self.assertEqual(3, len(self.results))
+        self.assertEqual({"a": 1}, self.results[0]["scenario_output"]["data"])
+
+    def test_run_timeout(self):
+        self._run("too_long", 2, 2, timeout=0.01)
+
+        self.assertEqual(2, len(self.results))
+        for result in self.results:
+            runner.ScenarioRunnerResult(result)
+            self.assertEqual("CancelledError", result["error"][0])
+            self.assertEqual(0.01, result["duration"])
+
+
+class AsyncConstantScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncConstantScenarioRunnerTestCase, self).setUp()
+        self.config = {"times": 4, "concurrency": 3,
+                       "timeout": 2, "type": "async_constant",
+                       "max_cpu_count": 2}
+        self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
+        self.task = mock.MagicMock()
+
+    def test_validate(self):
+        event_loop.AsyncConstantScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        self.config["new_key"] = "should fail"
+        self.assertRaises(jsonschema.ValidationError,
+                          runner.ScenarioRunner.validate,
+                          self.config)
+
+    @mock.patch(RUNNERS + "event_loop.asyncio")
+    @mock.patch(RUNNERS + "event_loop.EventLoopWorker")
+    def test__worker_process(self, mock_event_loop_worker, mock_asyncio):
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        mock_queue = mock.MagicMock()
+        info = {"processes_to_start": 1, "processes_counter": 1}
+
+        event_loop._worker_process(mock_queue, iter(range(10)), 1, 2, 4,
+                                   self.context, "Dummy", "dummy", (),
+                                   mock_event, info)
+
+        mock_loop = mock_asyncio.new_event_loop.return_value
+        mock_asyncio.set_event_loop.assert_called_once_with(mock_loop)
+        mock_event_loop_worker.assert_called_once_with(
+            mock_loop, mock_queue, mock.ANY, "Dummy", "dummy", self.context,
+            (), 1)
+        mock_event_loop_worker.return_value.run.assert_called_once_with(2)
+        mock_loop.close.assert_called_once_with()
+
+        next_iteration = mock_event_loop_worker.call_args[0][2]
+        self.assertEqual([0, 1, 2, 3, None],
+                         [next_iteration() for i in range(5)])
+        mock_event.is_set.return_value = True
+        self.assertIsNone(next_iteration())
+
+    @mock.patch(RUNNERS + "event_loop.asyncio")
+    @mock.patch(RUNNERS + "event_loop.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "event_loop.multiprocessing.cpu_count")
+    @mock.patch(RUNNERS + "event_loop.AsyncConstantScenarioRunner."
+                "_join_processes")
+    @mock.patch(RUNNERS + "event_loop.AsyncConstantScenarioRunner."
+                "_create_process_pool")
+    def test__run_scenario(self, mock__create_process_pool,
+                           mock__join_processes, mock_cpu_count,
+                           mock_queue, mock_asyncio):
+        mock_cpu_count.return_value = 4
+        runner_obj = event_loop.AsyncConstantScenarioRunner(self.task,
+                                                            self.config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                                 {})
+
+        self.assertEqual(2, mock__create_process_pool.call_args[0][0])
+        args_gen = mock__create_process_pool.call_args[0][2]
+        self.assertEqual([2, 1], [next(args_gen)[3] for i in range(2)])
+        mock__join_processes.assert_called_once_with(
+            mock__create_process_pool.return_value, mock_queue.return_value)
+
+    def test__run_scenario_no_asyncio(self):
+        runner_obj = event_loop.AsyncConstantScenarioRunner(self.task,
+                                                            self.config)
+
+        with mock.patch(RUNNERS + "event_loop.asyncio", None):
+            self.assertRaises(exceptions.IncompatiblePythonVersion,
+                              runner_obj._run_scenario, fakes.FakeScenario,
+                              "do_it", self.context, {})
@@ -0,0 +1,207 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import jsonschema
+import mock
+
+from rally.plugins.common.runners import open_loop
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+class OpenLoopRPSScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(OpenLoopRPSScenarioRunnerTestCase, self).setUp()
+        self.task = mock.MagicMock()
+
+    def test_validate(self):
+        config = {
+            "type": "open_loop_rps",
+            "times": 10,
+            "rps": 0.5,
+            "arrival": "poisson",
+            "seed": 42,
+            "max_concurrency": 50,
+            "max_cpu_count": 8
+        }
+        open_loop.OpenLoopRPSScenarioRunner.validate(config)
+
+    def test_validate_failed(self):
+        for config in ({"type": "open_loop_rps", "times": 1},
+                       {"type": "open_loop_rps", "times": 1, "rps": 0},
+                       {"type": "open_loop_rps", "times": 1, "rps": 1,
+                        "arrival": "foo"}):
+            self.assertRaises(jsonschema.ValidationError,
+                              open_loop.OpenLoopRPSScenarioRunner.validate,
+                              config)
+
+    def test_get_schedule_uniform(self):
+        self.assertEqual([0, 0.25, 0.5, 0.75],
+                         open_loop.get_schedule(4, 4))
+
+    def test_get_schedule_poisson(self):
+        schedule = open_loop.get_schedule(2000, 100, "poisson", seed=1)
+        self.assertEqual(schedule,
+                         open_loop.get_schedule(2000, 100, "poisson", seed=1))
+        self.assertEqual(0, schedule[0])
+        self.assertEqual(sorted(schedule), schedule)
+        # NOTE: 2000 arrivals with the rate 100/s take about 20 seconds
+        self.assertTrue(18 < schedule[-1] < 22)
+
+    @mock.patch(RUNNERS + "open_loop.time")
+    def test__sleep_until(self, mock_time):
+        mock_time.time.side_effect = [10, 10.05, 10.099, 10.1]
+        aborted = threading.Event()
+        open_loop._sleep_until(10.1, aborted)
+        self.assertEqual([mock.call(0.1 - open_loop.SPIN_INTERVAL),
+                          mock.call(0.05 - open_loop.SPIN_INTERVAL)],
+                         [mock.call(round(c[0][0], 6))
+                          for c in mock_time.sleep.call_args_list])
+
+    @mock.patch(RUNNERS + "open_loop.time")
+    def test__sleep_until_aborted(self, mock_time):
+        aborted = threading.Event()
+        aborted.set()
+        open_loop._sleep_until(10.1, aborted)
+        self.assertFalse(mock_time.time.called)
+
+    def test_schedule_origin(self):
+        origin = open_loop.ScheduleOrigin()
+        process = mock.Mock()
+        process.is_alive.return_value = True
+        started = []
+        thread = threading.Thread(
+            target=lambda: started.append(origin.wait(threading.Event())))
+
+        start = time.time()
+        thread.start()
+        origin.start([process])
+        thread.join()
+
+        self.assertEqual(1, len(started))
+        self.assertTrue(start <= started[0] <= time.time())
+
+    def test_schedule_origin_process_died(self):
+        origin = open_loop.ScheduleOrigin()
+        process = mock.Mock()
+        process.is_alive.return_value = False
+
+        origin.start([process])
+
+        self.assertTrue(origin.wait(threading.Event()))
+
+    def test_schedule_origin_aborted(self):
+        aborted = threading.Event()
+        aborted.set()
+        self.assertIsNone(open_loop.ScheduleOrigin().wait(aborted))
+
+    @mock.patch(RUNNERS + "open_loop.runner")
+    def test__worker_process(self, mock_runner):
+        start = time.time()
+        origin = mock.Mock()
+        origin.wait.return_value = start
+        schedule = [0, 0.01, 0.02]
+        running = []
+
+        def run_scenario_once(args):
+            running.append(args[0])
+            if args[0] == 0:
+                # NOTE: the first iteration is slow, the next ones have to
+                #       be started by another thread in time
+                time.sleep(0.1)
+            return {"duration": 1, "timestamp": time.time(),
+                    "scenario_output": {"data": {}, "errors": ""}}
+
+        mock_runner._run_scenario_once.side_effect = run_scenario_once
+        queue = mock.MagicMock()
+        aborted = threading.Event()
+
+        open_loop._worker_process(queue, iter(range(3)), schedule, 2,
+                                  {}, "Dummy", "dummy", (), aborted, origin,
+                                  {})
+
+        origin.wait.assert_called_once_with(aborted)
+        results = sorted((c[0][0] for c in queue.put.call_args_list),
+                         key=lambda r: r["intended_timestamp"])
+        self.assertEqual([start + offset for offset in schedule],
+                         [r["intended_timestamp"] for r in results])
+        for result in results:
+            data = result["scenario_output"]["data"]
+            self.assertEqual(
+                result["timestamp"] - result["intended_timestamp"],
+                data["schedule_lag"])
+            self.assertEqual(1 + data["schedule_lag"],
+                             data["corrected_duration"])
+        # NOTE: the second iteration is not delayed by the slow first one
+        self.assertTrue(results[1]["scenario_output"]["data"]
+                        ["schedule_lag"] < 0.05)
+        # NOTE: context is mapped once per thread
+        self.assertEqual(2, mock_runner._get_scenario_context.call_count)
+
+    @mock.patch(RUNNERS + "open_loop.runner")
+    def test__worker_process_aborted(self, mock_runner):
+        aborted = threading.Event()
+        aborted.set()
+        queue = mock.MagicMock()
+        origin = mock.Mock()
+        origin.wait.return_value = time.time()
+        open_loop._worker_process(queue, iter(range(3)), [0], 2,
+                                  {}, "Dummy", "dummy", (), aborted, origin,
+                                  {})
+        self.assertFalse(mock_runner._run_scenario_once.called)
+        self.assertFalse(queue.put.called)
+
+    @mock.patch(RUNNERS + "open_loop.runner")
+    def test__worker_process_aborted_before_start(self, mock_runner):
+        queue = mock.MagicMock()
+        origin = mock.Mock()
+        origin.wait.return_value = None
+        open_loop._worker_process(queue, iter(range(3)), [0], 2,
+                                  {}, "Dummy", "dummy", (),
+                                  threading.Event(), origin, {})
+        self.assertFalse(mock_runner._get_scenario_context.called)
+        self.assertFalse(queue.put.called)
+
+    def test__run_scenario(self):
+        config = {"times": 6, "rps": 100, "max_concurrency": 3,
+                  "max_cpu_count": 2}
+        runner_obj = open_loop.OpenLoopRPSScenarioRunner(self.task, config)
+
+        # NOTE: MagicMock task is not safe to deepcopy while it is used by
+        #       the scenario threads
+        context = fakes.FakeContext({"task": {"uuid": "foo"}}).context
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it", context, {})
+
+        self.assertEqual(config["times"], len(runner_obj.result_queue))
+        for result in runner_obj.result_queue:
+            self.assertIsNotNone(runner.ScenarioRunnerResult(result))
+            self.assertIn("schedule_lag", result["scenario_output"]["data"])
+
+    def test__run_scenario_aborted(self):
+        config = {"times": 20, "rps": 20}
+        runner_obj = open_loop.OpenLoopRPSScenarioRunner(self.task, config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 fakes.FakeUser().context, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
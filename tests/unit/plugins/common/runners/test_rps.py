@@ -30,7 +30,9 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
     def setUp(self):
         super(RPSScenarioRunnerTestCase, self).setUp()
-        self.task = mock.MagicMock()
+        # NOTE: Worker threads read the task from their contexts while new
+        #       contexts are deep copied, which is not safe with a mock
+        self.task = {"uuid": "task_uuid"}
 
     def test_validate(self):
         config = {
@@ -63,13 +65,12 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           rps.RPSScenarioRunner.validate, config)
 
+    @mock.patch(RUNNERS + "rps.threading.BoundedSemaphore")
     @mock.patch(RUNNERS + "rps.LOG")
     @mock.patch(RUNNERS + "rps.time")
-    @mock.patch(RUNNERS + "rps.threading.Thread")
-    @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time, mock_log):
+    def test__worker_process(self, mock_runner, mock_time, mock_log,
+                             mock_bounded_semaphore):
 
         def time_side():
             time_side.last += 0.03
@@ -80,12 +81,18 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         mock_time.time = time_side
 
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+        mock_pool = mock_runner.WorkerThreadPool.return_value
+        mock_pool.finished = 0
+        pool_size = [0]
+        mock_pool.__len__ = lambda self: pool_size[0]
+
+        def spawn():
+            pool_size[0] += 1
+        mock_pool.spawn.side_effect = spawn
 
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
+        mock_queue = mock.MagicMock()
 
         times = 4
         max_concurrent = 3
@@ -100,22 +107,23 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                             max_concurrent, context, "Dummy", "dummy",
                             (), mock_event, info)
 
+        mock_runner.WorkerThreadPool.assert_called_once_with(
+            mock_queue, mock.ANY, "Dummy", "dummy", context, (),
+            iteration_done=mock_bounded_semaphore.return_value.release)
+        # NOTE: every iteration waits for a free slot
+        mock_bounded_semaphore.assert_called_once_with(max_concurrent)
+        self.assertEqual(
+            times, mock_bounded_semaphore.return_value.acquire.call_count)
+        # NOTE: no iteration finished, so the pool grows up to the limit
+        self.assertEqual(max_concurrent, mock_pool.spawn.call_count)
+        mock_pool.join.assert_called_once_with()
         self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times, mock_thread.call_count)
-        self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
-        self.assertEqual(times - 1, mock_time.sleep.call_count)
-        self.assertEqual(times, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(times * 4 - 1, mock_time.time.count)
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_runner._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+        # NOTE: the first sleep is the start delay of the process
+        self.assertEqual(times, mock_time.sleep.call_count)
+
+        next_iteration = mock_runner.WorkerThreadPool.call_args[0][1]
+        self.assertEqual([0, 1, 2, 3] + [None] * max_concurrent,
+                         [next_iteration() for i in range(7)])
 
     @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
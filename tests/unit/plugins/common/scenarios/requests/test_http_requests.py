@@ -37,3 +37,53 @@ class RequestScenarioTestCase(test.TestCase):
         mock_choice.assert_called_once_with([{"url": "sample_url"}])
         mock__check_request.assert_called_once_with(
             status_code=200, url="sample_url")
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_pooled_request"
+                % SCN)
+    def test_check_pooled_request(self, mock__check_pooled_request):
+        Requests = http_requests.HttpRequests(test.get_test_context())
+        Requests.check_pooled_request("sample_url", "GET", 200,
+                                      keep_alive=False, timeout=1)
+        mock__check_pooled_request.assert_called_once_with(
+            "sample_url", "GET", 200, pool_size=10, keep_alive=False,
+            timeout=1)
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_pooled_request"
+                % SCN)
+    @mock.patch("%s.requests.utils.choose_weighted" % SCN)
+    def test_check_weighted_request(self, mock_choose_weighted,
+                                    mock__check_pooled_request):
+        mock_choose_weighted.return_value = {"url": "sample_url",
+                                             "pool_size": 2}
+        requests = [{"url": "sample_url", "weight": 2}]
+        Requests = http_requests.HttpRequests(test.get_test_context())
+        Requests.check_weighted_request(requests=requests, status_code=200)
+        mock_choose_weighted.assert_called_once_with(requests)
+        mock__check_pooled_request.assert_called_once_with(
+            url="sample_url", status_code=200, pool_size=2, keep_alive=True)
+
+
+class AsyncRequestScenarioTestCase(test.TestCase):
+
+    @mock.patch("%s.requests.utils.AsyncRequestScenario._check_async_request"
+                % SCN)
+    def test_check_request(self, mock__check_async_request):
+        Requests = http_requests.AsyncHttpRequests(test.get_test_context())
+        result = Requests.check_request("sample_url", "GET", 200,
+                                        keep_alive=False, timeout=1)
+        self.assertEqual(mock__check_async_request.return_value, result)
+        mock__check_async_request.assert_called_once_with(
+            "sample_url", "GET", 200, pool_size=10, keep_alive=False,
+            timeout=1)
+
+    @mock.patch("%s.requests.utils.AsyncRequestScenario._check_async_request"
+                % SCN)
+    @mock.patch("%s.requests.utils.choose_weighted" % SCN)
+    def test_check_weighted_request(self, mock_choose_weighted,
+                                    mock__check_async_request):
+        mock_choose_weighted.return_value = {"url": "sample_url"}
+        Requests = http_requests.AsyncHttpRequests(test.get_test_context())
+        Requests.check_weighted_request(requests=[{"url": "sample_url"}],
+                                        status_code=200, pool_size=2)
+        mock__check_async_request.assert_called_once_with(
+            url="sample_url", status_code=200, pool_size=2, keep_alive=True)
@@ -10,13 +10,44 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 
 import mock
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+import testtools
 
+from rally.plugins.common.scenarios.requests import async_client
 from rally.plugins.common.scenarios.requests import utils
 from tests.unit import test
 
 
+UTILS = "rally.plugins.common.scenarios.requests.utils"
+
+
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"2\r\nok\r\n1\r\n!\r\n0\r\n\r\n")
+            return
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                          BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
 class RequestsTestCase(test.TestCase):
 
     @mock.patch("requests.request")
@@ -36,3 +67,170 @@ class RequestsTestCase(test.TestCase):
 
         self.assertRaises(ValueError, scenario._check_request,
                           status_code=201, url="sample", method="GET")
+
+    @mock.patch("%s.get_session" % UTILS)
+    def test__check_pooled_request(self, mock_get_session):
+        session = mock_get_session.return_value
+        session.request.return_value = mock.MagicMock(status_code=200,
+                                                      content=b"foo")
+        scenario = utils.RequestScenario(test.get_test_context())
+
+        scenario._check_pooled_request("sample", "GET", 200, pool_size=3,
+                                       keep_alive=False, timeout=1)
+
+        mock_get_session.assert_called_once_with(3, False)
+        session.request.assert_called_once_with("GET", "sample",
+                                                stream=True, timeout=1)
+        session.request.return_value.close.assert_called_once_with()
+        self.assertEqual(["requests.dns", "requests.connect", "requests.tls",
+                          "requests.ttfb", "requests.body"],
+                         list(scenario.atomic_actions()))
+        self.assertEqual(0, scenario.atomic_actions()["requests.dns"])
+
+    @mock.patch("%s.get_session" % UTILS)
+    def test_check_wrong_pooled_request(self, mock_get_session):
+        mock_get_session.return_value.request.return_value = mock.MagicMock(
+            status_code=200)
+        scenario = utils.RequestScenario(test.get_test_context())
+
+        self.assertRaises(ValueError, scenario._check_pooled_request,
+                          status_code=201, url="sample", method="GET")
+
+    def test__check_pooled_request_phases(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(server.server_close)
+        url = "http://127.0.0.1:%d/" % server.server_address[1]
+
+        for keep_alive, reused in ((True, True), (False, False)):
+            atomic_actions = []
+            for i in range(2):
+                scenario = utils.RequestScenario(test.get_test_context())
+                scenario._check_pooled_request(url, "GET", 200,
+                                               keep_alive=keep_alive)
+                atomic_actions.append(scenario.atomic_actions())
+
+            self.assertGreater(atomic_actions[0]["requests.connect"], 0)
+            self.assertEqual(0, atomic_actions[0]["requests.tls"])
+            self.assertEqual(reused,
+                             atomic_actions[1]["requests.connect"] == 0)
+
+    @mock.patch("%s.os.getpid" % UTILS)
+    def test_get_session(self, mock_getpid):
+        mock_getpid.return_value = -1
+        self.addCleanup(utils._sessions.clear)
+        session = utils.get_session(2, True)
+
+        self.assertIs(session, utils.get_session(2, True))
+        self.assertIsInstance(session.get_adapter("https://sample"),
+                              utils.TimedHTTPAdapter)
+        self.assertEqual("keep-alive", session.headers["Connection"])
+
+        session = utils.get_session(2, False)
+        self.assertEqual("close", session.headers["Connection"])
+
+        sessions = []
+        thread = threading.Thread(
+            target=lambda: sessions.append(utils.get_session(2, True)))
+        thread.start()
+        thread.join()
+        self.assertIs(sessions[0], utils.get_session(2, True))
+
+        mock_getpid.return_value = -2
+        self.assertIsNot(sessions[0], utils.get_session(2, True))
+
+    @mock.patch("%s.random.random" % UTILS)
+    def test_choose_weighted(self, mock_random):
+        items = [{"url": "a", "weight": 0}, {"url": "b", "weight": 3},
+                 {"url": "c"}]
+        for value, url in ((0, "b"), (0.74, "b"), (0.75, "c"),
+                           (0.99, "c")):
+            mock_random.return_value = value
+            self.assertEqual({"url": url}, utils.choose_weighted(items))
+
+        self.assertEqual({"url": "b", "weight": 3}, items[1])
+
+    @mock.patch("%s.connection.VerifiedHTTPSConnection.connect" % UTILS)
+    def test_https_connect_not_timed(
+            self, mock_verified_https_connection_connect):
+        utils._phases.timings = None
+        conn = utils._TimedHTTPSConnection("sample", 443)
+
+        conn.connect()
+
+        mock_verified_https_connection_connect.assert_called_once_with()
+
+    def test_choose_weighted_no_weight(self):
+        self.assertRaises(ValueError, utils.choose_weighted,
+                          [{"url": "a", "weight": 0}])
+
+
+@testtools.skipIf(async_client.asyncio is None, "asyncio is not available")
+class AsyncRequestsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncRequestsTestCase, self).setUp()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(server.server_close)
+        self.port = server.server_address[1]
+        self.url = "http://127.0.0.1:%d" % self.port
+
+        self.loop = async_client.asyncio.new_event_loop()
+        async_client.asyncio.set_event_loop(self.loop)
+        self.addCleanup(async_client.asyncio.set_event_loop, None)
+        self.addCleanup(self.loop.close)
+        self.addCleanup(async_client._clients.pop, self.loop, None)
+
+    def _check_async_request(self, *args, **kwargs):
+        scenario = utils.AsyncRequestScenario(test.get_test_context())
+        self.loop.run_until_complete(
+            scenario._check_async_request(*args, **kwargs))
+        return scenario.atomic_actions()
+
+    def test__check_async_request(self):
+        atomic_actions = [self._check_async_request(self.url, "GET", 200)
+                          for i in range(2)]
+
+        self.assertEqual(["requests.dns", "requests.connect", "requests.tls",
+                          "requests.ttfb", "requests.body"],
+                         list(atomic_actions[0]))
+        self.assertGreater(atomic_actions[0]["requests.connect"], 0)
+        self.assertEqual(0, atomic_actions[0]["requests.tls"])
+        self.assertEqual(0, atomic_actions[1]["requests.connect"])
+
+    def test__check_async_request_no_keep_alive(self):
+        for i in range(2):
+            atomic_actions = self._check_async_request(
+                self.url, "GET", 200, keep_alive=False)
+            self.assertGreater(atomic_actions["requests.connect"], 0)
+
+    def test_check_wrong_async_request(self):
+        self.assertRaises(ValueError, self._check_async_request,
+                          self.url, "GET", 201)
+
+    def test_request_chunked(self):
+        client = async_client.get_client()
+        self.assertIs(client, async_client.get_client())
+
+        resp = self.loop.run_until_complete(
+            client.request("GET", self.url + "/chunked"))
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(b"ok!", resp.content)
+        self.assertEqual(1, len(client._idle[("http", "127.0.0.1",
+                                              self.port)]))
+
+    def test_request_cancelled(self):
+        client = async_client.get_client()
+        future = client.request("GET", self.url)
+        future.cancel()
+
+        self.assertRaises(async_client.asyncio.CancelledError,
+                          self.loop.run_until_complete, future)
@@ -15,11 +15,20 @@
 
 
 import jsonschema
+import testtools
 
 from rally.plugins.common.sla import failure_rate
+from rally.task.processing import columns
 from tests.unit import test
 
 
+def make_columns(iterations):
+    return columns.IterationColumns(
+        [dict({"timestamp": 0, "duration": 0, "idle_duration": 0,
+               "error": [], "atomic_actions": {}}, **itr)
+         for itr in iterations])
+
+
 class SLAPluginTestCase(test.TestCase):
 
     def test_validate(self):
@@ -107,3 +116,16 @@ class FailureRateTestCase(test.TestCase):
         self.assertTrue(sla.add_iteration({"error": []}))
         self.assertTrue(sla.add_iteration({"error": ["error"]}))   # 33%
         self.assertFalse(sla.add_iteration({"error": ["error"]}))  # 40%
+
+    @testtools.skipIf(not columns.is_available(), "NumPy is not installed")
+    def test_add_columns(self):
+        sla = failure_rate.FailureRate({"max": 35.0})
+        self.assertTrue(sla.add_columns(make_columns([])))
+        self.assertTrue(sla.add_columns(make_columns(
+            [{"error": []}, {"error": []}, {"error": []},
+             {"error": ["error"]}])))                            # 25%
+        self.assertFalse(sla.add_columns(make_columns(
+            [{"error": ["error"]}])))                            # 40%
+        self.assertEqual(5, sla.total)
+        self.assertEqual(2, sla.errors)
+        self.assertTrue(sla.add_iteration({"error": []}))        # 33%
@@ -15,11 +15,20 @@
 
 
 import jsonschema
+import testtools
 
 from rally.plugins.common.sla import iteraion_time
+from rally.task.processing import columns
 from tests.unit import test
 
 
+def make_columns(iterations):
+    return columns.IterationColumns(
+        [dict({"timestamp": 0, "duration": 0, "idle_duration": 0,
+               "error": [], "atomic_actions": {}}, **itr)
+         for itr in iterations])
+
+
 class IterationTimeTestCase(test.TestCase):
     def test_config_schema(self):
         properties = {
@@ -50,3 +59,14 @@ class IterationTimeTestCase(test.TestCase):
         self.assertTrue(sla.add_iteration({"duration": 3.99}))
         self.assertFalse(sla.add_iteration({"duration": 4.5}))
         self.assertFalse(sla.add_iteration({"duration": 3.8}))
+
+    @testtools.skipIf(not columns.is_available(), "NumPy is not installed")
+    def test_add_columns(self):
+        sla = iteraion_time.IterationTime(4.0)
+        self.assertTrue(sla.add_columns(make_columns([])))
+        self.assertTrue(sla.add_columns(make_columns(
+            [{"duration": 3.14}, {"duration": 2.0}, {"duration": 3.99}])))
+        self.assertEqual(3.99, sla.max_iteration_time)
+        self.assertFalse(sla.add_columns(make_columns(
+            [{"duration": 4.5}, {"duration": 3.8}])))
+        self.assertEqual(4.5, sla.max_iteration_time)
@@ -15,11 +15,20 @@
 
 
 import jsonschema
+import testtools
 
 from rally.plugins.common.sla import max_average_duration
+from rally.task.processing import columns
 from tests.unit import test
 
 
+def make_columns(iterations):
+    return columns.IterationColumns(
+        [dict({"timestamp": 0, "duration": 0, "idle_duration": 0,
+               "error": [], "atomic_actions": {}}, **itr)
+         for itr in iterations])
+
+
 class MaxAverageDurationTestCase(test.TestCase):
     def test_config_schema(self):
         properties = {
@@ -51,3 +60,15 @@ class MaxAverageDurationTestCase(test.TestCase):
         self.assertTrue(sla.add_iteration({"duration": 5.0}))   # avg = 3.667
         self.assertFalse(sla.add_iteration({"duration": 7.0}))  # avg = 4.5
         self.assertTrue(sla.add_iteration({"duration": 1.0}))   # avg = 3.8
+
+    @testtools.skipIf(not columns.is_available(), "NumPy is not installed")
+    def test_add_columns(self):
+        sla = max_average_duration.MaxAverageDuration(4.0)
+        self.assertTrue(sla.add_columns(make_columns([])))
+        self.assertTrue(sla.add_columns(make_columns(
+            [{"duration": 3.5}, {"duration": 2.5},
+             {"duration": 9.0, "error": ["error"]},
+             {"duration": 5.0}])))                               # avg = 3.667
+        self.assertFalse(sla.add_columns(make_columns(
+            [{"duration": 7.0}])))                               # avg = 4.5
+        self.assertTrue(sla.add_iteration({"duration": 1.0}))   # avg = 3.8
@@ -15,11 +15,20 @@
 
 
 import jsonschema
+import testtools
 
 from rally.plugins.common.sla import outliers
+from rally.task.processing import columns
 from tests.unit import test
 
 
+def make_columns(iterations):
+    return columns.IterationColumns(
+        [dict({"timestamp": 0, "duration": 0, "idle_duration": 0,
+               "error": [], "atomic_actions": {}}, **itr)
+         for itr in iterations])
+
+
 class OutliersTestCase(test.TestCase):
 
     def test_config_schema(self):
@@ -89,3 +98,34 @@ class OutliersTestCase(test.TestCase):
         # NOTE(msdubov): 12th iteration makes the SLA always failed
         self.assertFalse(sla.add_iteration({"duration": 11.2}))
         self.assertFalse(sla.add_iteration({"duration": 3.4}))
+
+    @testtools.skipIf(not columns.is_available(), "NumPy is not installed")
+    def test_add_columns(self):
+        iteration_durations = [3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 4.1, 3.8, 4.3,
+                               2.9, 10.2, 11.2, 3.4, 10.5, 3.0]
+        for split in (0, 1, 3, 11, 12, 15):
+            sla = outliers.Outliers({"max": 1})
+            expected = outliers.Outliers({"max": 1})
+            for d in iteration_durations:
+                expected.add_iteration({"duration": d})
+            sla.add_columns(make_columns(
+                [{"duration": d} for d in iteration_durations[:split]]))
+            sla.add_columns(make_columns(
+                [{"duration": d, "error": ["error"]} for d in (20.0, 30.0)]))
+            sla.add_columns(make_columns(
+                [{"duration": d} for d in iteration_durations[split:]]))
+            self.assertEqual(expected.outliers, sla.outliers)
+            self.assertEqual(expected.iterations, sla.iterations)
+            self.assertAlmostEqual(expected.threshold, sla.threshold)
+            self.assertEqual(expected.success, sla.success)
+
+    @testtools.skipIf(not columns.is_available(), "NumPy is not installed")
+    def test_add_columns_and_add_iteration(self):
+        sla = outliers.Outliers({"max": 1})
+        # NOTE(msdubov): One outlier in the first 11 iterations
+        self.assertTrue(sla.add_columns(make_columns(
+            [{"duration": d} for d in [3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 4.1,
+                                       3.8, 4.3, 2.9, 10.2]])))
+        self.assertEqual(1, sla.outliers)
+        self.assertFalse(sla.add_iteration({"duration": 11.2}))
+        self.assertFalse(sla.add_iteration({"duration": 3.4}))
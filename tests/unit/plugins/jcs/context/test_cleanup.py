@@ -0,0 +1,285 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from botocore import exceptions as botocore_exceptions
+import jsonschema
+import mock
+
+from rally.plugins.jcs.context import cleanup
+from tests.unit import test
+
+
+BASE = "rally.plugins.jcs.context.cleanup"
+TAG_FILTER = [{"Name": "tag:rally_task_uuid", "Values": ["task"]}]
+
+
+class FakeEC2Client(object):
+    """Thread-safe fake of boto3 EC2 client that records calls."""
+
+    def __init__(self, responses=None, errors=None):
+        self.responses = responses or {}
+        self.errors = errors or {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __getattr__(self, method):
+        if method.startswith("__"):
+            raise AttributeError(method)
+
+        def call(**kwargs):
+            with self.lock:
+                self.calls.append((method, kwargs))
+                responses = self.responses.get(method)
+            if method in self.errors:
+                raise self.errors[method]
+            if isinstance(responses, list):
+                with self.lock:
+                    return responses.pop(0)
+            return responses or {}
+        return call
+
+    def get_calls(self, method):
+        return [kwargs for name, kwargs in self.calls if name == method]
+
+
+class FakeClients(object):
+
+    def __init__(self, **clients):
+        self.clients = clients
+        self.credentials = []
+
+    def __getattr__(self, client_type):
+        def client(**credentials):
+            self.credentials.append(credentials)
+            return self.clients[client_type]
+        return client
+
+
+def _not_found():
+    return botocore_exceptions.ClientError(
+        {"Error": {"Code": "InvalidVolume.NotFound", "Message": "foo"}},
+        "DeleteVolume")
+
+
+class TaskResourcesTestCase(test.TestCase):
+
+    def setUp(self):
+        super(TaskResourcesTestCase, self).setUp()
+        self.ec2 = FakeEC2Client()
+        self.vpc = FakeEC2Client()
+        self.clients = FakeClients(jcs_ec2=self.ec2, jcs_vpc=self.vpc)
+        self.resources = cleanup.TaskResources(
+            self.clients, {"access_key": "a", "secret_key": "s"}, "task")
+
+    def test_discover(self):
+        self.ec2.responses["describe_volumes"] = [
+            {"Volumes": [{"VolumeId": "v1"}], "NextToken": "t"},
+            {"Volumes": [{"VolumeId": "v2"}]}]
+
+        self.assertEqual(["v1", "v2"],
+                         self.resources.discover("jcs_ec2.volumes"))
+        self.assertEqual(["v1", "v2"],
+                         self.resources.discover("jcs_ec2.volumes"))
+
+        self.assertEqual([{"Filters": TAG_FILTER},
+                          {"Filters": TAG_FILTER, "NextToken": "t"}],
+                         self.ec2.get_calls("describe_volumes"))
+        self.assertEqual([{"access_key": "a", "secret_key": "s"}],
+                         self.clients.credentials)
+
+    def test_discover_instances(self):
+        self.ec2.responses["describe_instances"] = {"Reservations": [
+            {"Instances": [
+                {"InstanceId": "i1", "State": {"Name": "running"}},
+                {"InstanceId": "i2", "State": {"Name": "terminated"}}]},
+            {"Instances": [
+                {"InstanceId": "i3", "State": {"Name": "stopped"}}]}]}
+
+        self.assertEqual(["i1", "i3"],
+                         self.resources.discover("jcs_ec2.instances"))
+
+    def test_discover_security_groups(self):
+        self.vpc.responses["describe_security_groups"] = {"SecurityGroups": [
+            {"GroupId": "g1", "GroupName": "default"},
+            {"GroupId": "g2", "GroupName": "rally"}]}
+
+        self.assertEqual(["g2"],
+                         self.resources.discover("jcs_vpc.security_groups"))
+
+    def test_discover_addresses(self):
+        self.resources.discovered["jcs_ec2.instances"] = ["i1", "i2", "i3"]
+        self.vpc.responses["describe_addresses"] = [
+            {"Addresses": [{"AllocationId": "a1"}]},
+            {"Addresses": [{"AllocationId": "a2"}]}]
+        self.set_batch_size(2)
+
+        self.assertEqual(["a1", "a2"],
+                         self.resources.discover("jcs_vpc.addresses"))
+        self.assertEqual(
+            [{"Filters": [{"Name": "instance-id", "Values": ["i1", "i2"]}]},
+             {"Filters": [{"Name": "instance-id", "Values": ["i3"]}]}],
+            self.vpc.get_calls("describe_addresses"))
+
+    def set_batch_size(self, batch_size):
+        cleanup.CONF.set_override("jcs_ec2_batch_size", batch_size,
+                                  group="benchmark")
+        self.addCleanup(cleanup.CONF.clear_override, "jcs_ec2_batch_size",
+                        group="benchmark")
+
+    @mock.patch("%s.waiters.EC2BatchWaiter" % BASE)
+    def test_delete_instances(self, mock_ec2_batch_waiter):
+        self.resources.discovered["jcs_ec2.instances"] = ["i1", "i2", "i3"]
+        self.set_batch_size(2)
+
+        self.resources.delete("jcs_ec2.instances")
+
+        self.assertEqual([{"InstanceIds": ["i1", "i2"]},
+                          {"InstanceIds": ["i3"]}],
+                         self.ec2.get_calls("terminate_instances"))
+        mock_ec2_batch_waiter.assert_called_once_with(
+            self.ec2, "instance", timeout=mock.ANY, min_interval=mock.ANY,
+            max_interval=mock.ANY, batch_size=2)
+        mock_ec2_batch_waiter.return_value.wait.assert_called_once_with(
+            ["i1", "i2", "i3"], ["terminated"], gone=True)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.waiters.EC2BatchWaiter" % BASE)
+    def test_delete_instances_fails(self, mock_ec2_batch_waiter, mock_log):
+        self.resources.discovered["jcs_ec2.instances"] = ["i1"]
+        mock_ec2_batch_waiter.return_value.wait.side_effect = Exception
+
+        self.resources.delete("jcs_ec2.instances")
+
+        self.assertTrue(mock_log.warning.called)
+
+    def test_delete(self):
+        self.resources.discovered["jcs_vpc.subnets"] = ["s1", "s2", "s3"]
+
+        self.resources.delete("jcs_vpc.subnets")
+
+        self.assertEqual([{"SubnetId": "s1"}, {"SubnetId": "s2"},
+                          {"SubnetId": "s3"}],
+                         sorted(self.vpc.get_calls("delete_subnet"),
+                                key=lambda kwargs: kwargs["SubnetId"]))
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_delete_fails(self, mock_log):
+        self.resources.discovered["jcs_ec2.volumes"] = ["v1"]
+        self.ec2.errors["delete_volume"] = botocore_exceptions.ClientError(
+            {"Error": {"Code": "VolumeInUse", "Message": "foo"}},
+            "DeleteVolume")
+
+        self.resources.delete("jcs_ec2.volumes")
+
+        self.assertTrue(mock_log.warning.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_delete_not_found(self, mock_log):
+        self.resources.discovered["jcs_ec2.volumes"] = ["v1"]
+        self.ec2.errors["delete_volume"] = _not_found()
+
+        self.resources.delete("jcs_ec2.volumes")
+
+        self.assertEqual([{"VolumeId": "v1"}],
+                         self.ec2.get_calls("delete_volume"))
+        self.assertFalse(mock_log.warning.called)
+
+    def test_delete_nothing(self):
+        self.resources.discovered["jcs_ec2.key_pairs"] = []
+
+        self.resources.delete("jcs_ec2.key_pairs")
+
+        self.assertEqual([], self.clients.credentials)
+
+
+class JCSCleanupTestCase(test.TestCase):
+
+    def _get_context(self, config):
+        return {
+            "task": {"uuid": "task"},
+            "config": {"jcs_cleanup": config, "existing_users": [
+                {"access_key": "a1", "secret_key": "s1"},
+                {"access_key": "a2", "secret_key": "s2"},
+                {"access_key": "a1", "secret_key": "s1"}]}}
+
+    def test_validate(self):
+        cleanup.JCSCleanup.validate(["jcs_ec2", "jcs_vpc.subnets"])
+        self.assertRaises(jsonschema.ValidationError,
+                          cleanup.JCSCleanup.validate, ["jcs_foo"])
+
+    def test__get_resource_names(self):
+        ctx = cleanup.JCSCleanup(self._get_context(
+            ["jcs_ec2", "jcs_vpc.subnets"]))
+
+        self.assertEqual(["jcs_ec2.instances", "jcs_ec2.volumes",
+                          "jcs_ec2.key_pairs", "jcs_vpc.subnets"],
+                         ctx._get_resource_names())
+
+    def test__get_credentials(self):
+        ctx = cleanup.JCSCleanup(self._get_context(["jcs_ec2"]))
+
+        self.assertEqual([{"access_key": "a1", "secret_key": "s1"},
+                          {"access_key": "a2", "secret_key": "s2"}],
+                         ctx._get_credentials())
+
+    @mock.patch("%s.jcsclients.Clients" % BASE)
+    def test_cleanup(self, mock_clients):
+        deleted = []
+        lock = threading.Lock()
+
+        class FakeTaskResources(object):
+
+            def __init__(self, clients, credentials, task_uuid):
+                self.credentials = credentials
+                self.discovered = {}
+
+            def discover(self, name):
+                return [name]
+
+            def delete(self, name):
+                for dependency in cleanup.RESOURCES[name].depends_on:
+                    with lock:
+                        assert (self.credentials["access_key"],
+                                dependency) in deleted
+                with lock:
+                    deleted.append((self.credentials["access_key"], name))
+
+        ctx = cleanup.JCSCleanup(self._get_context(["jcs_ec2", "jcs_vpc"]))
+        with mock.patch("%s.TaskResources" % BASE, FakeTaskResources):
+            ctx.cleanup()
+
+        self.assertEqual(
+            sorted((access_key, name) for access_key in ("a1", "a2")
+                   for name in cleanup.RESOURCES),
+            sorted(deleted))
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.TaskResources.delete" % BASE)
+    @mock.patch("%s.TaskResources.discover" % BASE)
+    @mock.patch("%s.jcsclients.Clients" % BASE)
+    def test_cleanup_discover_fails(self, mock_clients,
+                                    mock_task_resources_discover,
+                                    mock_task_resources_delete, mock_log):
+        mock_task_resources_discover.side_effect = Exception
+        ctx = cleanup.JCSCleanup(self._get_context(["jcs_ec2.key_pairs"]))
+        ctx.context["config"]["existing_users"] = [
+            {"access_key": "a1", "secret_key": "s1"}]
+
+        ctx.cleanup()
+
+        mock_task_resources_delete.assert_called_once_with(
+            "jcs_ec2.key_pairs")
+        self.assertTrue(mock_log.warning.called)
@@ -0,0 +1,135 @@
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+
+from rally.plugins.jcs.scenarios.ec2 import utils
+from tests.unit import test
+
+CONF = cfg.CONF
+UTILS = "rally.plugins.jcs.scenarios.ec2.utils."
+
+
+class JCSEC2ScenarioTestCase(test.TestCase):
+
+    def setUp(self):
+        super(JCSEC2ScenarioTestCase, self).setUp()
+        patcher = mock.patch("rally.plugins.jcs.scenario.jcsclients.Clients")
+        self.clients = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.client = self.clients.jcs_ec2.return_value
+        self.scenario = utils.JCSEC2Scenario(context={"jcs_user": {}})
+
+    @mock.patch(UTILS + "waiters.EC2BatchWaiter")
+    def test__run_instances(self, mock_ec2_batch_waiter):
+        mock_ec2_batch_waiter.return_value.polls = 3
+        self.client.run_instances.return_value = {
+            "ReservationId": "r-1",
+            "Instances": [{"InstanceId": "i-1"}, {"InstanceId": "i-2"}]}
+
+        instance_ids, response = self.scenario._run_instances("image",
+                                                              "type")
+
+        self.assertEqual(["i-1", "i-2"], instance_ids)
+        self.client.create_tags.assert_called_once_with(
+            Resources=["i-1", "i-2"],
+            Tags=[{"Key": "Name", "Value": "benchmark_test_r-1"}])
+        mock_ec2_batch_waiter.assert_called_once_with(
+            self.client, "instance",
+            timeout=CONF.benchmark.jcs_ec2_server_boot_timeout,
+            min_interval=CONF.benchmark.jcs_ec2_server_boot_poll_interval,
+            max_interval=CONF.benchmark.jcs_ec2_poll_max_interval,
+            batch_size=CONF.benchmark.jcs_ec2_batch_size)
+        mock_ec2_batch_waiter.return_value.wait.assert_called_once_with(
+            ["i-1", "i-2"], ["running"], gone=False)
+        for name in ("jcs_ec2.run_instances", "jcs_ec2.create_tags",
+                     "jcs_ec2.wait_for_instances_running"):
+            self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                           name)
+        self.assertEqual({"jcs_ec2.wait_for_instances_running.polls": 3},
+                         dict((k, v) for k, v in
+                              self.scenario.output_data().items()
+                              if k.endswith(".polls")))
+
+    def test__create_tags_batches(self):
+        CONF.set_override("jcs_ec2_batch_size", 2, "benchmark")
+        self.addCleanup(CONF.clear_override, "jcs_ec2_batch_size",
+                        "benchmark")
+
+        self.scenario._create_tags(["i-1", "i-2", "i-3"], {"Name": "foo"})
+
+        tags = [{"Key": "Name", "Value": "foo"}]
+        self.assertEqual(
+            [mock.call(Resources=["i-1", "i-2"], Tags=tags),
+             mock.call(Resources=["i-3"], Tags=tags)],
+            self.client.create_tags.call_args_list)
+
+    def test__create_tags_with_task_tag(self):
+        self.scenario.context["task"] = {"uuid": "task"}
+
+        self.scenario._create_tags(["i-1"], {"Name": "foo"})
+
+        self.client.create_tags.assert_called_once_with(
+            Resources=["i-1"],
+            Tags=[{"Key": "Name", "Value": "foo"},
+                  {"Key": "rally_task_uuid", "Value": "task"}])
+
+    @mock.patch(UTILS + "waiters.EC2BatchWaiter")
+    def test__create_volume_tags_volume(self, mock_ec2_batch_waiter):
+        mock_ec2_batch_waiter.return_value.polls = 1
+        self.scenario.context["task"] = {"uuid": "task"}
+        self.client.create_volume.return_value = {"VolumeId": "v-1"}
+
+        volume_id, response = self.scenario._create_volume(Size=1)
+
+        self.assertEqual("v-1", volume_id)
+        self.client.create_tags.assert_called_once_with(
+            Resources=["v-1"],
+            Tags=[{"Key": "rally_task_uuid", "Value": "task"}])
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "jcs_ec2.create_tags")
+
+    def test__create_key_pair_without_id(self):
+        self.scenario.context["task"] = {"uuid": "task"}
+        self.client.create_key_pair.return_value = {
+            "KeyName": "foo", "KeyFingerprint": "ff", "KeyMaterial": "km"}
+
+        self.assertEqual("km", self.scenario._create_key_pair("foo")[0])
+        self.assertFalse(self.client.create_tags.called)
+
+    @mock.patch(UTILS + "waiters.EC2BatchWaiter")
+    def test__terminate_instances(self, mock_ec2_batch_waiter):
+        mock_ec2_batch_waiter.return_value.polls = 2
+
+        self.scenario._terminate_instances(["i-1"])
+        self.scenario._terminate_instances(["i-2"])
+
+        self.client.terminate_instances.assert_has_calls([
+            mock.call(InstanceIds=["i-1"]), mock.call(InstanceIds=["i-2"])])
+        mock_ec2_batch_waiter.return_value.wait.assert_called_with(
+            ["i-2"], ["terminated"], gone=True)
+        self.assertEqual(
+            4, self.scenario.output_data()[
+                "jcs_ec2.wait_for_instances_terminated.polls"])
+
+    @mock.patch(UTILS + "waiters.EC2BatchWaiter")
+    def test__wait_for_counts_polls_on_failure(self, mock_ec2_batch_waiter):
+        mock_ec2_batch_waiter.return_value.polls = 5
+        mock_ec2_batch_waiter.return_value.wait.side_effect = ValueError
+
+        self.assertRaises(ValueError, self.scenario._wait_for, "volume",
+                          ["v-1"], ["available"], "jcs_ec2.wait_for_foo")
+        self.assertEqual(5, self.scenario.output_data()[
+            "jcs_ec2.wait_for_foo.polls"])
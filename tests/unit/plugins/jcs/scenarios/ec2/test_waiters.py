@@ -0,0 +1,135 @@
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import itertools
+
+from botocore import exceptions as botocore_exceptions
+import mock
+
+from rally import exceptions
+from rally.plugins.jcs.scenarios.ec2 import waiters
+from tests.unit import test
+
+
+WAITERS = "rally.plugins.jcs.scenarios.ec2.waiters."
+
+
+def _instances(*states):
+    return {"Reservations": [{"Instances": [
+        {"InstanceId": instance_id, "State": {"Name": state}}
+        for instance_id, state in states]}]}
+
+
+def _not_found(code="InvalidInstanceID.NotFound"):
+    return botocore_exceptions.ClientError(
+        {"Error": {"Code": code, "Message": "foo"}}, "DescribeInstances")
+
+
+class BackoffDelaysTestCase(test.TestCase):
+
+    @mock.patch(WAITERS + "random.random", return_value=0.5)
+    def test_backoff_delays(self, mock_random):
+        delays = waiters.backoff_delays(1.0, 10.0, jitter=0.5)
+        self.assertEqual([0.75, 1.5, 3.0, 6.0, 7.5, 7.5],
+                         list(itertools.islice(delays, 6)))
+
+    def test_backoff_delays_jitter(self):
+        delays = list(itertools.islice(waiters.backoff_delays(1.0, 4.0), 50))
+        self.assertTrue(all(0.5 <= d <= 4.0 for d in delays))
+        self.assertTrue(len(set(delays)) > 1)
+
+
+class EC2BatchWaiterTestCase(test.TestCase):
+
+    def setUp(self):
+        super(EC2BatchWaiterTestCase, self).setUp()
+        self.client = mock.Mock()
+        patcher = mock.patch(WAITERS + "time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _waiter(self, **kwargs):
+        return waiters.EC2BatchWaiter(self.client, "instance", **kwargs)
+
+    def test_wait(self):
+        self.client.describe_instances.side_effect = [
+            _instances(("i-1", "pending"), ("i-2", "pending")),
+            _instances(("i-2", "running")),
+            _instances(("i-1", "running"))]
+        waiter = self._waiter()
+
+        self.assertEqual({"i-1": "running", "i-2": "running"},
+                         waiter.wait(["i-1", "i-2"], ["running"]))
+        self.assertEqual(3, waiter.polls)
+        self.client.describe_instances.assert_has_calls([
+            mock.call(InstanceIds=["i-1", "i-2"]),
+            mock.call(InstanceIds=["i-1", "i-2"]),
+            mock.call(InstanceIds=["i-1"])])
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_wait_batches(self):
+        ids = ["i-%d" % i for i in range(5)]
+        self.client.describe_instances.side_effect = lambda InstanceIds: (
+            _instances(*[(i, "running") for i in InstanceIds]))
+        waiter = self._waiter(batch_size=2)
+
+        waiter.wait(ids, ["running"])
+
+        self.assertEqual(3, waiter.polls)
+        self.assertEqual([ids[:2], ids[2:4], ids[4:]],
+                         [c[1]["InstanceIds"] for c in
+                          self.client.describe_instances.call_args_list])
+
+    def test_wait_not_visible_yet(self):
+        self.client.describe_instances.side_effect = [
+            _not_found(), _instances(("i-1", "running"))]
+
+        self.assertEqual({"i-1": "running"},
+                         self._waiter().wait(["i-1"], ["running"]))
+
+    def test_wait_gone(self):
+        def describe_instances(InstanceIds):
+            if "i-2" in InstanceIds:
+                raise _not_found()
+            return _instances(("i-1", "terminated"))
+
+        self.client.describe_instances.side_effect = describe_instances
+        waiter = self._waiter()
+
+        self.assertEqual({"i-1": "terminated", "i-2": None},
+                         waiter.wait(["i-1", "i-2"], ["terminated"],
+                                     gone=True))
+        # NOTE: the batch is checked by halves after the "not found" error
+        self.assertEqual(3, waiter.polls)
+
+    def test_wait_error_state(self):
+        self.client.describe_instances.return_value = _instances(
+            ("i-1", "error"))
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          self._waiter().wait, ["i-1"], ["running"])
+
+    def test_wait_other_client_error(self):
+        self.client.describe_instances.side_effect = _not_found(
+            "RequestLimitExceeded")
+        self.assertRaises(botocore_exceptions.ClientError,
+                          self._waiter().wait, ["i-1"], ["running"])
+
+    @mock.patch(WAITERS + "time.time", side_effect=[0, 1, 2, 400])
+    def test_wait_timeout(self, mock_time):
+        self.client.describe_instances.return_value = _instances(
+            ("i-1", "pending"))
+        self.assertRaises(exceptions.TimeoutException,
+                          self._waiter(timeout=300).wait, ["i-1"],
+                          ["running"])
+        self.assertEqual(2, self.sleep.call_count)
@@ -32,6 +32,8 @@ class ResourceDecoratorTestCase(test.TestCase):
 
         self.assertEqual(Fake._service, "service")
         self.assertEqual(Fake._resource, "res")
+        self.assertIsNone(Fake._depends_on)
+        self.assertFalse(Fake._batch_polling)
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -114,3 +116,14 @@ class ResourceManagerTestCase(test.TestCase):
         base.ResourceManager().list()
         mock_resource_manager__manager.assert_has_calls(
             [mock.call(), mock.call().list()])
+
+    @mock.patch("%s.ResourceManager.list" % BASE)
+    def test_filter_deleted(self, mock_resource_manager_list):
+        mock_resource_manager_list.return_value = [
+            mock.MagicMock(id="a", status="ACTIVE"),
+            mock.MagicMock(id="b", status="DELETED")]
+        resources = [base.ResourceManager(resource=mock.MagicMock(id=i))
+                     for i in ("a", "b", "c")]
+
+        self.assertEqual(resources[1:],
+                         base.ResourceManager().filter_deleted(resources))
@@ -45,7 +45,8 @@ class AdminCleanupTestCase(test.TestCase):
                           context.AdminCleanup.validate, {})
 
     @mock.patch("%s.manager.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1, _depends_on=None),
+                              mock.MagicMock(_order=2, _depends_on=None)])
     @mock.patch("%s.manager.SeekAndDestroy" % BASE)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers):
 
@@ -65,12 +66,14 @@ class AdminCleanupTestCase(test.TestCase):
             mock.call(
                 mock_find_resource_managers.return_value[0],
                 ctx["admin"],
-                ctx["users"]),
+                ctx["users"],
+                budget=mock.ANY),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
                 ctx["admin"],
-                ctx["users"]),
+                ctx["users"],
+                budget=mock.ANY),
             mock.call().exterminate()
         ])
 
@@ -97,7 +100,8 @@ class UserCleanupTestCase(test.TestCase):
                           context.UserCleanup.validate, {})
 
     @mock.patch("%s.manager.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1, _depends_on=None),
+                              mock.MagicMock(_order=2, _depends_on=None)])
     @mock.patch("%s.manager.SeekAndDestroy" % BASE)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers):
 
@@ -116,10 +120,10 @@ class UserCleanupTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(
                 mock_find_resource_managers.return_value[0],
-                None, ctx["users"]),
+                None, ctx["users"], budget=mock.ANY),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
-                None, ctx["users"]),
+                None, ctx["users"], budget=mock.ANY),
             mock.call().exterminate()
         ])
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import mock
 import six
 
@@ -212,7 +214,7 @@ class SeekAndDestroyTestCase(test.TestCase):
     @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
     def test__gen_consumer(self, mock__delete_single_resource,
                            mock__get_cached_client):
-        mock_mgr = mock.MagicMock(__name__="Test")
+        mock_mgr = mock.MagicMock(__name__="Test", _batch_polling=False)
 
         consumer = manager.SeekAndDestroy(mock_mgr, None, None)._gen_consumer()
 
@@ -251,6 +253,122 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
+    @mock.patch("%s.SeekAndDestroy._request_deletion" % BASE)
+    def test__gen_consumer_batch_polling(self, mock__request_deletion,
+                                         mock__delete_single_resource,
+                                         mock__get_cached_client):
+        mock_mgr = mock.MagicMock(__name__="Test", _batch_polling=True)
+        mock__request_deletion.side_effect = [True, False]
+        seek_and_destroy = manager.SeekAndDestroy(mock_mgr, None, None)
+        consumer = seek_and_destroy._gen_consumer()
+
+        consumer({}, (None, None, "res1"))
+        consumer({}, (None, None, "res2"))
+
+        self.assertEqual([mock.call(mock_mgr.return_value)] * 2,
+                         mock__request_deletion.call_args_list)
+        self.assertEqual([mock_mgr.return_value],
+                         list(seek_and_destroy.deleted))
+        self.assertFalse(mock__delete_single_resource.called)
+
+    def test__request_deletion_with_budget(self):
+        budget = mock.MagicMock()
+        mock_resource = mock.MagicMock(_max_attempts=3)
+
+        self.assertTrue(manager.SeekAndDestroy(
+            None, None, None, budget=budget)._request_deletion(mock_resource))
+
+        mock_resource.delete.assert_called_once_with()
+        budget.__enter__.assert_called_once_with()
+        self.assertTrue(budget.__exit__.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test__request_deletion_fails(self, mock_log):
+        mock_resource = mock.MagicMock(_max_attempts=2)
+        mock_resource.delete.side_effect = Exception
+
+        self.assertFalse(manager.SeekAndDestroy(
+            None, None, None)._request_deletion(mock_resource))
+
+        self.assertEqual(2, mock_resource.delete.call_count)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    def _resources(self, *tenants):
+        resources = []
+        for tenant in tenants:
+            resource = mock.MagicMock(tenant_uuid=tenant)
+            resource.filter_deleted.side_effect = lambda rs: rs[:1]
+            resources.append(resource)
+        return resources
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.time.sleep" % BASE)
+    def test__wait_for_deletion(self, mock_sleep, mock_log):
+        manager_cls = mock.MagicMock(_timeout=10, _interval=1,
+                                     _max_attempts=3)
+        resources = self._resources("t1", "t1", "t2")
+        resources[0].is_deleted.side_effect = [False, True]
+
+        manager.SeekAndDestroy(manager_cls, None, None)._wait_for_deletion(
+            resources)
+
+        # NOTE: one list per tenant, missing resources are confirmed
+        self.assertEqual(2, resources[0].filter_deleted.call_count)
+        self.assertEqual(1, resources[1].filter_deleted.call_count)
+        self.assertEqual(1, resources[2].filter_deleted.call_count)
+        self.assertEqual(2, resources[0].is_deleted.call_count)
+        self.assertEqual(1, resources[1].is_deleted.call_count)
+        self.assertEqual(1, resources[2].is_deleted.call_count)
+        self.assertEqual([mock.call(1)] * 2, mock_sleep.call_args_list)
+        self.assertFalse(mock_log.warning.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.time" % BASE)
+    def test__wait_for_deletion_timeout(self, mock_time, mock_log):
+        manager_cls = mock.MagicMock(_timeout=10, _interval=1,
+                                     _max_attempts=3)
+        mock_time.time.side_effect = [0, 1, 11]
+        resources = self._resources("t1", "t2")
+        resources[0].is_deleted.return_value = False
+
+        manager.SeekAndDestroy(manager_cls, None, None)._wait_for_deletion(
+            resources)
+
+        self.assertEqual(1, resources[0].filter_deleted.call_count)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.time.sleep" % BASE)
+    def test__wait_for_deletion_exception_in_filter_deleted(self, mock_sleep,
+                                                            mock_log):
+        manager_cls = mock.MagicMock(__name__="Test", _timeout=10,
+                                     _interval=0, _max_attempts=2)
+        resources = self._resources("t1")
+        resources[0].filter_deleted.side_effect = Exception
+
+        manager.SeekAndDestroy(manager_cls, None, None)._wait_for_deletion(
+            resources)
+
+        self.assertEqual(3, resources[0].filter_deleted.call_count)
+        self.assertEqual(3, mock_log.exception.call_count)
+        self.assertEqual(4, mock_log.warning.call_count)
+
+    @mock.patch("%s.SeekAndDestroy._wait_for_deletion" % BASE)
+    @mock.patch("%s.broker.run" % BASE)
+    def test_exterminate_batch_polling(self, mock_broker_run,
+                                       mock__wait_for_deletion):
+        seek_and_destroy = manager.SeekAndDestroy(
+            mock.MagicMock(_threads=5), None, None)
+        mock_broker_run.side_effect = (
+            lambda *args, **kwargs: seek_and_destroy.deleted.append("res"))
+
+        seek_and_destroy.exterminate()
+
+        mock__wait_for_deletion.assert_called_once_with(
+            seek_and_destroy.deleted)
+
     @mock.patch("%s.SeekAndDestroy._gen_consumer" % BASE)
     @mock.patch("%s.SeekAndDestroy._gen_publisher" % BASE)
     @mock.patch("%s.broker.run" % BASE)
@@ -333,22 +451,95 @@ class ResourceManagerTestCase(test.TestCase):
                          manager.find_resource_managers(names=["fake"],
                                                         admin_required=False))
 
+    def test_get_dependencies(self):
+        mgrs = [
+            self._get_res_mock(_service="a", _resource="1", _order=1,
+                               _depends_on=[]),
+            self._get_res_mock(_service="a", _resource="2", _order=2,
+                               _depends_on=[]),
+            self._get_res_mock(_service="b", _resource="1", _order=3,
+                               _depends_on=["a.2"]),
+            self._get_res_mock(_service="c", _resource="1", _order=4,
+                               _depends_on=["a"]),
+            self._get_res_mock(_service="d", _resource="1", _order=5,
+                               _depends_on=[]),
+            self._get_res_mock(_service="e", _resource="1", _order=6,
+                               _depends_on=None)
+        ]
+
+        dependencies = manager.get_dependencies(mgrs)
+
+        self.assertEqual({mgrs[0]: [], mgrs[1]: mgrs[:1],
+                          mgrs[2]: mgrs[1:2], mgrs[3]: mgrs[:2],
+                          mgrs[4]: [], mgrs[5]: mgrs[:5]}, dependencies)
+
     @mock.patch("%s.SeekAndDestroy" % BASE)
-    @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+    @mock.patch("%s.find_resource_managers" % BASE)
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy):
+        mgrs = [
+            self._get_res_mock(_service="a", _resource="1", _order=1,
+                               _depends_on=None),
+            self._get_res_mock(_service="b", _resource="1", _order=2,
+                               _depends_on=None)
+        ]
+        mock_find_resource_managers.return_value = mgrs
+
         manager.cleanup(names=["a", "b"], admin_required=True,
                         admin="admin", users=["user"])
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
 
+        budget = mock_seek_and_destroy.call_args[1]["budget"]
         mock_seek_and_destroy.assert_has_calls([
-            mock.call(
-                mock_find_resource_managers.return_value[0], "admin", ["user"]
-            ),
+            mock.call(mgrs[0], "admin", ["user"], budget=budget),
             mock.call().exterminate(),
-            mock.call(
-                mock_find_resource_managers.return_value[1], "admin", ["user"]
-            ),
+            mock.call(mgrs[1], "admin", ["user"], budget=budget),
             mock.call().exterminate()
         ])
+
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_in_parallel(self, mock_find_resource_managers):
+        mgrs = [
+            self._get_res_mock(_service="a", _resource="1", _order=1,
+                               _depends_on=[]),
+            self._get_res_mock(_service="b", _resource="1", _order=2,
+                               _depends_on=[]),
+            self._get_res_mock(_service="c", _resource="1", _order=3,
+                               _depends_on=None)
+        ]
+        mock_find_resource_managers.return_value = mgrs
+        events = []
+        b_started = threading.Event()
+
+        class FakeSeekAndDestroy(object):
+
+            def __init__(self, manager_cls, admin, users, budget=None):
+                self.manager_cls = manager_cls
+
+            def exterminate(self):
+                if self.manager_cls is mgrs[0]:
+                    # NOTE: a would block forever if b waited for it
+                    b_started.wait(5)
+                    events.append("a")
+                elif self.manager_cls is mgrs[1]:
+                    events.append("b")
+                    b_started.set()
+                else:
+                    events.append("c")
+
+        with mock.patch("%s.SeekAndDestroy" % BASE, FakeSeekAndDestroy):
+            manager.cleanup(names=["a", "b", "c"])
+
+        self.assertEqual(["b", "a", "c"], events)
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_fails(self, mock_find_resource_managers,
+                           mock_seek_and_destroy):
+        mock_find_resource_managers.return_value = [
+            self._get_res_mock(_service="a", _resource="1", _order=1,
+                               _depends_on=None)]
+        mock_seek_and_destroy.return_value.exterminate.side_effect = (
+            ValueError)
+
+        self.assertRaises(ValueError, manager.cleanup, names=["a"])
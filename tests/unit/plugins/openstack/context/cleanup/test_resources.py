@@ -38,7 +38,8 @@ class AllResourceManagerTestCase(test.TestCase):
                 "_admin_required", "_perform_for_admin_only",
                 "_tenant_resource", "_service", "_resource", "_order",
                 "_max_attempts", "_timeout", "_interval", "_threads",
-                "_manager", "id", "is_deleted", "delete", "list",
+                "_depends_on", "_batch_polling", "_manager", "id",
+                "is_deleted", "filter_deleted", "delete", "list",
                 "supports_extension"
             ])
 
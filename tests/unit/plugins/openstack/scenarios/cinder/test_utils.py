@@ -90,16 +90,17 @@ class CinderScenarioTestCase(test.ScenarioTestCase):
 
     def test__create_volume(self):
         return_volume = self.scenario._create_volume(1)
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             self.clients("cinder").volumes.create.return_value,
-            is_ready=self.mock_resource_is.mock.return_value,
+            ready_statuses=["available"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
-        self.mock_resource_is.mock.assert_called_once_with("available")
         self.mock_get_from_manager.mock.assert_called_once_with()
-        self.assertEqual(self.mock_wait_for.mock.return_value, return_volume)
+        self.assertEqual(self.mock_wait_for_status.mock.return_value,
+                         return_volume)
         self._test_atomic_action_timer(self.scenario.atomic_actions(),
                                        "cinder.create_volume")
 
@@ -114,16 +115,17 @@ class CinderScenarioTestCase(test.ScenarioTestCase):
         self.clients("cinder").volumes.create.assert_called_once_with(
             3, display_name="TestVolume")
 
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             self.clients("cinder").volumes.create.return_value,
-            is_ready=self.mock_resource_is.mock.return_value,
+            ready_statuses=["available"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
-        self.mock_resource_is.mock.assert_called_once_with("available")
         self.mock_get_from_manager.mock.assert_called_once_with()
-        self.assertEqual(self.mock_wait_for.mock.return_value, return_volume)
+        self.assertEqual(self.mock_wait_for_status.mock.return_value,
+                         return_volume)
         self._test_atomic_action_timer(self.scenario.atomic_actions(),
                                        "cinder.create_volume")
 
@@ -166,14 +168,14 @@ class CinderScenarioTestCase(test.ScenarioTestCase):
         self.scenario._extend_volume(volume, new_size={"min": 1, "max": 5})
 
         volume.extend.assert_called_once_with(volume, 3)
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             volume,
-            is_ready=self.mock_resource_is.mock.return_value,
+            ready_statuses=["available"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
-        self.mock_resource_is.mock.assert_called_once_with("available")
         self.mock_get_from_manager.mock.assert_called_once_with()
         self._test_atomic_action_timer(self.scenario.atomic_actions(),
                                        "cinder.extend_volume")
@@ -182,14 +184,14 @@ class CinderScenarioTestCase(test.ScenarioTestCase):
         volume = mock.Mock()
         self.clients("cinder").volumes.extend.return_value = volume
         self.scenario._extend_volume(volume, 2)
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             volume,
-            is_ready=self.mock_resource_is.mock.return_value,
+            ready_statuses=["available"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
             timeout=CONF.benchmark.cinder_volume_create_timeout,
             check_interval=CONF.benchmark.cinder_volume_create_poll_interval
         )
-        self.mock_resource_is.mock.assert_called_once_with("available")
         self.mock_get_from_manager.mock.assert_called_once_with()
         self._test_atomic_action_timer(self.scenario.atomic_actions(),
                                        "cinder.extend_volume")
@@ -207,26 +209,22 @@ class CinderScenarioTestCase(test.ScenarioTestCase):
 
         volume.upload_to_image.assert_called_once_with(False, "test_vol",
                                                        "container", "disk")
-        self.mock_wait_for.mock.assert_has_calls([
-            mock.call(
-                volume,
-                is_ready=self.mock_resource_is.mock.return_value,
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                timeout=CONF.benchmark.cinder_volume_create_timeout,
-                check_interval=CONF.benchmark.
-                cinder_volume_create_poll_interval),
-            mock.call(
-                self.clients("glance").images.get.return_value,
-                is_ready=self.mock_resource_is.mock.return_value,
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                timeout=CONF.benchmark.glance_image_create_timeout,
-                check_interval=CONF.benchmark.
-                glance_image_create_poll_interval)
-        ])
+        self.mock_wait_for_status.mock.assert_called_once_with(
+            volume,
+            ready_statuses=["available"],
+            check_deletion=False,
+            update_resource=self.mock_get_from_manager.mock.return_value,
+            timeout=CONF.benchmark.cinder_volume_create_timeout,
+            check_interval=CONF.benchmark.cinder_volume_create_poll_interval)
+        self.mock_wait_for.mock.assert_called_once_with(
+            self.clients("glance").images.get.return_value,
+            is_ready=self.mock_resource_is.mock.return_value,
+            update_resource=self.mock_get_from_manager.mock.return_value,
+            timeout=CONF.benchmark.glance_image_create_timeout,
+            check_interval=CONF.benchmark.glance_image_create_poll_interval)
         self.mock_get_from_manager.mock.assert_has_calls([mock.call(),
                                                           mock.call()])
-        self.mock_resource_is.mock.assert_has_calls([mock.call("available"),
-                                                     mock.call("active")])
+        self.mock_resource_is.mock.assert_called_once_with("active")
         self.clients("glance").images.get.assert_called_once_with(1)
 
     def test__create_snapshot(self):
@@ -47,15 +47,16 @@ class GlanceScenarioTestCase(test.ScenarioTestCase):
         return_image = scenario._create_image("container_format",
                                               image_location.name,
                                               "disk_format")
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             self.image,
+            ready_statuses=["active"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
-            is_ready=self.mock_resource_is.mock.return_value,
             check_interval=CONF.benchmark.glance_image_create_poll_interval,
             timeout=CONF.benchmark.glance_image_create_timeout)
-        self.mock_resource_is.mock.assert_called_once_with("active")
         self.mock_get_from_manager.mock.assert_called_once_with()
-        self.assertEqual(self.mock_wait_for.mock.return_value, return_image)
+        self.assertEqual(self.mock_wait_for_status.mock.return_value,
+                         return_image)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "glance.create_image")
 
@@ -65,15 +66,16 @@ class GlanceScenarioTestCase(test.ScenarioTestCase):
         return_image = scenario._create_image("container_format",
                                               "image_location",
                                               "disk_format")
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             self.image,
+            ready_statuses=["active"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
-            is_ready=self.mock_resource_is.mock.return_value,
             check_interval=CONF.benchmark.glance_image_create_poll_interval,
             timeout=CONF.benchmark.glance_image_create_timeout)
-        self.mock_resource_is.mock.assert_called_once_with("active")
         self.mock_get_from_manager.mock.assert_called_once_with()
-        self.assertEqual(self.mock_wait_for.mock.return_value, return_image)
+        self.assertEqual(self.mock_wait_for_status.mock.return_value,
+                         return_image)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "glance.create_image")
 
@@ -108,15 +108,16 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         kwargs["fakearg"] = "fakearg"
         return_server = nova_scenario._boot_server("image_id", "flavor_id",
                                                    **kwargs)
-        self.mock_wait_for.mock.assert_called_once_with(
+        self.mock_wait_for_status.mock.assert_called_once_with(
             self.server,
-            is_ready=self.mock_resource_is.mock.return_value,
+            ready_statuses=["ACTIVE"],
+            check_deletion=False,
             update_resource=self.mock_get_from_manager.mock.return_value,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval,
             timeout=CONF.benchmark.nova_server_boot_timeout)
-        self.mock_resource_is.mock.assert_called_once_with("ACTIVE")
         self.mock_get_from_manager.mock.assert_called_once_with()
-        self.assertEqual(self.mock_wait_for.mock.return_value, return_server)
+        self.assertEqual(self.mock_wait_for_status.mock.return_value,
+                         return_server)
 
         expected_kwargs = {"fakearg": "fakearg"}
         if "nics" in kwargs:
@@ -475,15 +476,14 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         wait_for_calls = [
             mock.call(
                 servers[i],
-                is_ready=self.mock_resource_is.mock.return_value,
+                ready_statuses=["ACTIVE"],
+                check_deletion=False,
                 update_resource=self.mock_get_from_manager.mock.return_value,
                 check_interval=CONF.benchmark.nova_server_boot_poll_interval,
                 timeout=CONF.benchmark.nova_server_boot_timeout)
             for i in range(instances_amount)]
-        self.mock_wait_for.mock.assert_has_calls(wait_for_calls)
+        self.mock_wait_for_status.mock.assert_has_calls(wait_for_calls)
 
-        self.mock_resource_is.mock.assert_has_calls([
-            mock.call("ACTIVE") for i in range(instances_amount)])
         self.mock_get_from_manager.mock.assert_has_calls(
             [mock.call() for i in range(instances_amount)])
         self._test_atomic_action_timer(scenario.atomic_actions(),
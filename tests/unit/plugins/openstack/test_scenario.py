@@ -13,12 +13,68 @@
 #    under the License.
 
 import mock
+from oslo_config import fixture
 from oslotest import mockpatch
 
 from rally.plugins.openstack import scenario as base_scenario
 from tests.unit import test
 
 
+class FakeManager(object):
+    pass
+
+
+def fake_manager(module):
+    manager = type("FakeManager", (object,), {"__module__": module})()
+    manager.list = mock.Mock()
+    return manager
+
+
+class ListWaitedResourcesTestCase(test.TestCase):
+
+    def _resources(self, manager, *statuses):
+        return [mock.Mock(manager=manager, status=status, owner="owner")
+                for status in statuses]
+
+    def test_glance(self):
+        manager = fake_manager("glanceclient.v2.images")
+        manager.list.return_value = iter(["image"])
+        resources = self._resources(manager, "saving", "queued", "saving")
+
+        self.assertEqual(["image"],
+                         base_scenario._list_waited_resources(resources))
+        manager.list.assert_called_once_with(
+            filters={"status": "saving", "owner": "owner"})
+
+    def test_glance_v1(self):
+        manager = fake_manager("glanceclient.v1.images")
+        manager.list.return_value = iter(["image"])
+        resources = self._resources(manager, "queued")
+
+        self.assertEqual(["image"],
+                         base_scenario._list_waited_resources(resources))
+        manager.list.assert_called_once_with(filters={"status": "queued"})
+
+    def test_nova_and_cinder(self):
+        for module in ("novaclient.v2.servers", "cinderclient.v2.volumes"):
+            manager = fake_manager(module)
+            resources = self._resources(manager, "BUILD", "BUILD", "ERROR")
+
+            self.assertEqual(
+                manager.list.return_value,
+                base_scenario._list_waited_resources(resources))
+            manager.list.assert_called_once_with(
+                detailed=True, search_opts={"status": "BUILD"})
+
+    def test_other(self):
+        manager = fake_manager(__name__)
+        resources = self._resources(manager, "BUILD")
+
+        self.assertEqual(manager.list.return_value,
+                         base_scenario._list_waited_resources(resources))
+        manager.list.assert_called_once_with()
+
+
 class OpenStackScenarioTestCase(test.TestCase):
     def setUp(self):
         super(OpenStackScenarioTestCase, self).setUp()
@@ -67,3 +123,50 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context, scenario.context)
 
         self.assertEqual("foobar", scenario._clients)
+
+    @mock.patch("rally.task.utils.get_status_poll_multiplexer")
+    def test__wait_for_status(self, mock_get_status_poll_multiplexer):
+        endpoint = mock.Mock(auth_url="url", username="user",
+                             tenant_name="tenant", region_name="region")
+        scenario = base_scenario.OpenStackScenario(
+            self.context, clients=mock.Mock(endpoint=endpoint))
+        self.assertEqual({}, scenario.output_data())
+
+        resource = mock.Mock(manager=FakeManager())
+        register = mock_get_status_poll_multiplexer.return_value.register
+        waiter = register.return_value
+        waiter.polls_saved = 1.5
+
+        result = scenario._wait_for_status(resource, ["ACTIVE"], timeout=3,
+                                           check_interval=2)
+        self.assertEqual(waiter.wait.return_value, result)
+        register.assert_called_once_with(
+            resource,
+            (__name__ + ".FakeManager", "url", "user", "tenant", "region"),
+            ["ACTIVE"], failure_statuses=["ERROR"],
+            list_resources=base_scenario._list_waited_resources, timeout=3,
+            check_interval=2, check_deletion=False)
+
+        waiter.wait.side_effect = ValueError
+        self.assertRaises(ValueError, scenario._wait_for_status,
+                          resource, ["deleted"], check_deletion=True)
+        self.assertEqual({"status_polls_saved": 3.0}, scenario.output_data())
+
+    @mock.patch("rally.task.utils.wait_for_status")
+    @mock.patch("rally.task.utils.get_from_manager")
+    def test__wait_for_status_not_multiplexed(self, mock_get_from_manager,
+                                              mock_wait_for_status):
+        self.useFixture(fixture.Config()).config(
+            status_poll_multiplexing=False, group="benchmark")
+        scenario = base_scenario.OpenStackScenario(
+            self.context, clients=mock.Mock())
+        resource = mock.Mock()
+
+        result = scenario._wait_for_status(resource, ["ACTIVE"], timeout=3,
+                                           check_interval=2)
+        self.assertEqual(mock_wait_for_status.return_value, result)
+        mock_wait_for_status.assert_called_once_with(
+            resource, ready_statuses=["ACTIVE"], check_deletion=False,
+            update_resource=mock_get_from_manager.return_value,
+            timeout=3, check_interval=2)
+        self.assertEqual({}, scenario.output_data())
@@ -0,0 +1,125 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally import plugins
+from tests.unit import test
+
+
+PLUGINS = "rally.plugins"
+
+
+class LazyLoadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LazyLoadTestCase, self).setUp()
+        for name, value in (("PLUGINS_LOADED", False), ("_LOADER", None)):
+            patcher = mock.patch("%s.%s" % (PLUGINS, name), value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch("%s.plugin.set_lazy_loader" % PLUGINS)
+    @mock.patch("%s.manifest" % PLUGINS)
+    @mock.patch("%s._get_sources" % PLUGINS)
+    def test_lazy_load(self, mock__get_sources, mock_manifest,
+                       mock_set_lazy_loader):
+        plugins.lazy_load()
+
+        mock_manifest.load.assert_called_once_with(
+            plugins.MANIFEST_PATH, mock__get_sources.return_value)
+        self.assertEqual(mock_manifest.load.return_value,
+                         plugins._LOADER.manifest)
+        mock_set_lazy_loader.assert_called_once_with(plugins._LOADER)
+        self.assertFalse(plugins.PLUGINS_LOADED)
+        self.assertFalse(mock_manifest.save.called)
+
+    @mock.patch("%s.load" % PLUGINS)
+    @mock.patch("%s.manifest" % PLUGINS)
+    @mock.patch("%s._get_sources" % PLUGINS)
+    def test_lazy_load_outdated_manifest(self, mock__get_sources,
+                                         mock_manifest, mock_load):
+        mock_manifest.load.return_value = None
+
+        plugins.lazy_load()
+
+        mock_load.assert_called_once_with()
+        mock_manifest.build.assert_called_once_with(
+            mock__get_sources.return_value)
+        mock_manifest.save.assert_called_once_with(
+            plugins.MANIFEST_PATH, mock_manifest.build.return_value)
+        self.assertIsNone(plugins._LOADER)
+
+    @mock.patch("%s.manifest" % PLUGINS)
+    def test_lazy_load_loaded(self, mock_manifest):
+        plugins.PLUGINS_LOADED = True
+
+        plugins.lazy_load()
+
+        self.assertFalse(mock_manifest.load.called)
+
+    @mock.patch("%s.discover" % PLUGINS)
+    def test_load_lazy_loaded(self, mock_discover):
+        plugins._LOADER = mock.Mock()
+
+        plugins.load()
+
+        plugins._LOADER.import_all.assert_called_once_with()
+        self.assertFalse(mock_discover.import_modules_from_package.called)
+        self.assertTrue(plugins.PLUGINS_LOADED)
+
+
+class ManifestLoaderTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ManifestLoaderTestCase, self).setUp()
+        self.loader = plugins._ManifestLoader({
+            "modules": {"/a.py": {"name": "a"}, "/b.py": {"name": "b"},
+                        "/p/c.py": {"name": None}},
+            "plugins": {"x": ["/a.py"], "y": ["/a.py", "/p/c.py"]}})
+
+    @mock.patch("%s.sys" % PLUGINS)
+    @mock.patch("%s.discover.load_plugins" % PLUGINS)
+    @mock.patch("%s.importutils.import_module" % PLUGINS)
+    def test_load(self, mock_import_module, mock_load_plugins, mock_sys):
+        mock_sys.modules = {}
+        mock_sys.path = []
+
+        self.assertTrue(self.loader.load("x"))
+        mock_import_module.assert_called_once_with("a")
+        self.assertEqual({"a": mock_import_module.return_value},
+                         mock_sys.modules)
+
+        self.assertTrue(self.loader.load("y"))
+        mock_import_module.assert_called_once_with("a")
+        mock_load_plugins.assert_called_once_with("/p/c.py")
+        self.assertEqual(["/p"], mock_sys.path)
+
+        self.assertFalse(self.loader.load("y"))
+        self.assertFalse(self.loader.load("z"))
+
+    @mock.patch("%s.sys" % PLUGINS)
+    @mock.patch("%s.discover.load_plugins" % PLUGINS)
+    @mock.patch("%s.importutils.import_module" % PLUGINS)
+    def test_import_all(self, mock_import_module, mock_load_plugins,
+                        mock_sys):
+        mock_sys.modules = {}
+        mock_sys.path = []
+        self.loader.load("x")
+
+        self.loader.import_all()
+
+        self.assertEqual([mock.call("a"), mock.call("b")],
+                         mock_import_module.call_args_list)
+        mock_load_plugins.assert_called_once_with("/p/c.py")
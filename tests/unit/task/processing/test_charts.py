@@ -15,13 +15,25 @@
 
 import ddt
 import mock
+import testtools
 
 from rally.common import costilius
 from rally.task.processing import charts
+from rally.task.processing import columns
 from tests.unit import test
 
 CHARTS = "rally.task.processing.charts."
 
+skip_without_numpy = testtools.skipIf(not columns.is_available(),
+                                      "NumPy is not installed")
+
+
+def make_columns(iterations, atomic_names=None):
+    defaults = {"timestamp": 0, "duration": 0, "idle_duration": 0,
+                "error": [], "atomic_actions": {}}
+    return columns.IterationColumns(
+        [dict(defaults, **itr) for itr in iterations], atomic_names)
+
 
 class ChartTestCase(test.TestCase):
 
@@ -63,6 +75,16 @@ class ChartTestCase(test.TestCase):
         self.assertEqual([("foo_a", "a_points"), ("foo_b", "b_points")],
                          chart.render())
 
+    def test_add_columns(self):
+        chart = self.Chart(self.bench_info)
+        chart.add_iteration = mock.Mock()
+        iterations = [{"a": 1}, {"a": 2}]
+
+        chart.add_columns(mock.Mock(iterations=iterations))
+
+        self.assertEqual(list(map(mock.call, iterations)),
+                         chart.add_iteration.mock_calls)
+
     def test__fix_atomic_actions(self):
         chart = self.Chart(self.bench_info)
         self.assertEqual(
@@ -174,38 +196,65 @@ class AtomicAvgChartTestCase(test.TestCase):
         self.assertEqual([("bar", 4.0), ("foo", 2.0)], sorted(chart.render()))
 
 
+LOAD_PROFILE_DATA = [
+    {"count": 5, "load_duration": 63, "tstamp_start": 12345,
+     "kwargs": {"scale": 10}, "data": [
+         (12345, 4.2, False), (12347, 42, False), (12349, 10, True),
+         (12351, 5.5, False), (12353, 0.42, False)],
+     "expected": [("parallel iterations", [
+         [6.0, 3], [12.0, 3], [18.0, 1], [24.0, 1], [30.0, 1],
+         [36.0, 1], [42.0, 1], [48.0, 1], [54.0, 0], [63, 0]])]},
+    {"count": 5, "load_duration": 63, "tstamp_start": 12345,
+     "kwargs": {"scale": 8, "name": "Custom text"}, "data": [
+         (12345, 4.2, False), (12347, 42, False), (12349, 10, True),
+         (12351, 5.5, False), (12353, 0.42, False)],
+     "expected": [("Custom text", [
+         [8.0, 4], [16.0, 3], [24.0, 1], [32.0, 1], [40.0, 1],
+         [48.0, 1], [56.0, 0], [63, 0]])]},
+    {"count": 0, "load_duration": 0, "tstamp_start": 12345,
+     "kwargs": {"scale": 8}, "data": [],
+     "expected": [("parallel iterations", [[0, 0]])]},
+    {"count": 2, "load_duration": 4, "tstamp_start": 12349,
+     "tstamp_base": 12345, "kwargs": {"scale": 4}, "data": [
+         (12349, 1.5, False), (12351, 1.5, False)],
+     "expected": [("parallel iterations", [
+         [2.0, 0], [4.0, 0], [6.0, 1], [8, 1]])]}]
+
+
 @ddt.ddt
 class LoadProfileChartTestCase(test.TestCase):
 
-    @ddt.data({"count": 5, "load_duration": 63, "tstamp_start": 12345,
-               "kwargs": {"scale": 10}, "data": [
-                   (12345, 4.2, False), (12347, 42, False), (12349, 10, True),
-                   (12351, 5.5, False), (12353, 0.42, False)],
-               "expected": [("parallel iterations", [
-                   [6.0, 3], [12.0, 3], [18.0, 1], [24.0, 1], [30.0, 1],
-                   [36.0, 1], [42.0, 1], [48.0, 1], [54.0, 0], [63, 0]])]},
-              {"count": 5, "load_duration": 63, "tstamp_start": 12345,
-               "kwargs": {"scale": 8, "name": "Custom text"}, "data": [
-                   (12345, 4.2, False), (12347, 42, False), (12349, 10, True),
-                   (12351, 5.5, False), (12353, 0.42, False)],
-               "expected": [("Custom text", [
-                   [8.0, 4], [16.0, 3], [24.0, 1], [32.0, 1], [40.0, 1],
-                   [48.0, 1], [56.0, 0], [63, 0]])]},
-              {"count": 0, "load_duration": 0, "tstamp_start": 12345,
-               "kwargs": {"scale": 8}, "data": [],
-               "expected": [("parallel iterations", [[0, 0]])]})
+    @ddt.data(*LOAD_PROFILE_DATA)
     @ddt.unpack
     def test_add_iteration_and_render(self, count, load_duration,
-                                      tstamp_start, kwargs, data, expected):
-        chart = charts.LoadProfileChart(
-            {"iterations_count": count,
-             "load_duration": load_duration, "tstamp_start": tstamp_start},
-            **kwargs)
+                                      tstamp_start, kwargs, data, expected,
+                                      tstamp_base=None):
+        info = {"iterations_count": count, "load_duration": load_duration,
+                "tstamp_start": tstamp_start}
+        if tstamp_base:
+            info["tstamp_base"] = tstamp_base
+        chart = charts.LoadProfileChart(info, **kwargs)
         self.assertIsInstance(chart, charts.Chart)
         [chart.add_iteration({"timestamp": t, "duration": d, "error": e})
          for t, d, e in data]
         self.assertEqual(expected, chart.render())
 
+    @skip_without_numpy
+    @ddt.data(*LOAD_PROFILE_DATA)
+    @ddt.unpack
+    def test_add_columns_and_render(self, count, load_duration,
+                                    tstamp_start, kwargs, data, expected,
+                                    tstamp_base=None):
+        info = {"iterations_count": count, "load_duration": load_duration,
+                "tstamp_start": tstamp_start}
+        if tstamp_base:
+            info["tstamp_base"] = tstamp_base
+        chart = charts.LoadProfileChart(info, **kwargs)
+        chart.add_columns(make_columns(
+            [{"timestamp": t, "duration": d, "error": e}
+             for t, d, e in data]))
+        self.assertEqual(expected, chart.render())
+
 
 @ddt.ddt
 class HistogramChartTestCase(test.TestCase):
@@ -221,6 +270,9 @@ class HistogramChartTestCase(test.TestCase):
         def _map_iteration_values(self, iteration):
             return iteration["foo"].items()
 
+        def _map_columns(self, columns):
+            return columns.items()
+
     def test_add_iteration_and_render(self):
         self.assertRaises(TypeError, charts.HistogramChart,
                           {"iterations_count": 3})
@@ -291,6 +343,22 @@ class MainHistogramChartTestCase(test.TestCase):
                         {"x": 7.0, "y": 0}]}]
         self.assertEqual([expected], chart.render())
 
+    @skip_without_numpy
+    def test_add_columns_and_render(self):
+        iterations = [
+            {"duration": 1.1, "idle_duration": 2.2, "error": None},
+            {"duration": 6.9, "error": True},
+            {"duration": 1.3, "idle_duration": 3.4, "error": None},
+            {"duration": 6.5, "error": None}]
+        info = {"iterations_count": 4, "min_duration": 2, "max_duration": 7}
+        chart = charts.MainHistogramChart(info)
+        [chart.add_iteration(dict(itr, idle_duration=0))
+         for itr in iterations]
+        batch_chart = charts.MainHistogramChart(info)
+        batch_chart.add_columns(make_columns(iterations[:1]))
+        batch_chart.add_columns(make_columns(iterations[1:]))
+        self.assertEqual(chart.render(), batch_chart.render())
+
 
 class AtomicHistogramChartTestCase(test.TestCase):
 
@@ -322,6 +390,22 @@ class AtomicHistogramChartTestCase(test.TestCase):
                          {"x": 5.5, "y": 1}]}]]
         self.assertEqual(expected, chart.render())
 
+    @skip_without_numpy
+    def test_add_columns_and_render(self):
+        info = {"iterations_count": 4,
+                "atomic": costilius.OrderedDict(
+                    [("foo", {"min_duration": 1.6, "max_duration": 2.8}),
+                     ("bar", {"min_duration": 3.1, "max_duration": 5.5})])}
+        iterations = [{"atomic_actions": a}
+                      for a in ({"foo": 1.6, "bar": 3.1}, {"foo": 2.8},
+                                {"bar": 5.5}, {"foo": None, "bar": 4.0})]
+        chart = charts.AtomicHistogramChart(info)
+        [chart.add_iteration(itr) for itr in iterations]
+        batch_chart = charts.AtomicHistogramChart(info)
+        batch_chart.add_columns(make_columns(iterations[:2], info["atomic"]))
+        batch_chart.add_columns(make_columns(iterations[2:], info["atomic"]))
+        self.assertEqual(chart.render(), batch_chart.render())
+
 
 MAIN_STATS_TABLE_COLUMNS = ["Action", "Min (sec)", "Median (sec)",
                             "90%ile (sec)", "95%ile (sec)", "Max (sec)",
@@ -336,92 +420,95 @@ def generate_iteration(duration, error, *args):
     }
 
 
-@ddt.ddt
-class MainStatsTableTestCase(test.TestCase):
-
-    @ddt.data(
-        {
-            "info": {
-                "iterations_count": 1,
-                "atomic": costilius.OrderedDict([("foo", {}), ("bar", {})])
-            },
-            "data": [
-                generate_iteration(10.0, False, ("foo", 1.0), ("bar", 2.0))
-            ],
-            "expected": {
-                "cols": MAIN_STATS_TABLE_COLUMNS,
-                "rows": [
-                    ["foo", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, "100.0%", 1],
-                    ["bar", 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, "100.0%", 1],
-                    ["total", 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, "100.0%", 1],
-                ]
-            }
-        },
-        {
-            "info": {"iterations_count": 2, "atomic": {"foo": {}}},
-            "data": [
-                generate_iteration(10.0, True, ("foo", 1.0)),
-                generate_iteration(10.0, True, ("foo", 2.0))
-            ],
-            "expected": {
-                "cols": MAIN_STATS_TABLE_COLUMNS,
-                "rows": [
-                    ["foo", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a",
-                     2],
-                    ["total", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a",
-                     2],
-                ]
-            }
+MAIN_STATS_TABLE_DATA = [
+    {
+        "info": {
+            "iterations_count": 1,
+            "atomic": costilius.OrderedDict([("foo", {}), ("bar", {})])
         },
-        {
-            "info": {"iterations_count": 2, "atomic": {"foo": {}}},
-            "data": [
-                generate_iteration(10.0, False, ("foo", 1.0)),
-                generate_iteration(20.0, True, ("foo", 2.0))
-            ],
-            "expected": {
-                "cols": MAIN_STATS_TABLE_COLUMNS,
-                "rows": [
-                    ["foo", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, "50.0%", 2],
-                    ["total", 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, "50.0%", 2]
-                ]
-            }
+        "data": [
+            generate_iteration(10.0, False, ("foo", 1.0), ("bar", 2.0))
+        ],
+        "expected": {
+            "cols": MAIN_STATS_TABLE_COLUMNS,
+            "rows": [
+                ["foo", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, "100.0%", 1],
+                ["bar", 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, "100.0%", 1],
+                ["total", 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, "100.0%", 1],
+            ]
+        }
+    },
+    {
+        "info": {"iterations_count": 2, "atomic": {"foo": {}}},
+        "data": [
+            generate_iteration(10.0, True, ("foo", 1.0)),
+            generate_iteration(10.0, True, ("foo", 2.0))
+        ],
+        "expected": {
+            "cols": MAIN_STATS_TABLE_COLUMNS,
+            "rows": [
+                ["foo", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a",
+                 2],
+                ["total", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a",
+                 2],
+            ]
+        }
+    },
+    {
+        "info": {"iterations_count": 2, "atomic": {"foo": {}}},
+        "data": [
+            generate_iteration(10.0, False, ("foo", 1.0)),
+            generate_iteration(20.0, True, ("foo", 2.0))
+        ],
+        "expected": {
+            "cols": MAIN_STATS_TABLE_COLUMNS,
+            "rows": [
+                ["foo", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, "50.0%", 2],
+                ["total", 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, "50.0%", 2]
+            ]
+        }
+    },
+    {
+        "info": {
+            "iterations_count": 4,
+            "atomic": costilius.OrderedDict([("foo", {}), ("bar", {})])
         },
-        {
-            "info": {
-                "iterations_count": 4,
-                "atomic": costilius.OrderedDict([("foo", {}), ("bar", {})])
-            },
-            "data": [
-                generate_iteration(10.0, False, ("foo", 1.0), ("bar", 4.0)),
-                generate_iteration(20.0, False, ("foo", 2.0), ("bar", 4.0)),
-                generate_iteration(30.0, False, ("foo", 3.0), ("bar", 4.0)),
-                generate_iteration(40.0, True, ("foo", 4.0), ("bar", 4.0))
-            ],
-            "expected": {
-                "cols": MAIN_STATS_TABLE_COLUMNS,
-                "rows": [
-                    ["foo", 1.0, 2.0, 2.8, 2.9, 3.0, 2.0, "75.0%", 4],
-                    ["bar", 4.0, 4.0, 4.0, 4.0, 4.0, 4.0, "75.0%", 4],
-                    ["total", 10.0, 20.0, 28.0, 29.0, 30.0, 20.0, "75.0%", 4]
-                ]
-            }
+        "data": [
+            generate_iteration(10.0, False, ("foo", 1.0), ("bar", 4.0)),
+            generate_iteration(20.0, False, ("foo", 2.0), ("bar", 4.0)),
+            generate_iteration(30.0, False, ("foo", 3.0), ("bar", 4.0)),
+            generate_iteration(40.0, True, ("foo", 4.0), ("bar", 4.0))
+        ],
+        "expected": {
+            "cols": MAIN_STATS_TABLE_COLUMNS,
+            "rows": [
+                ["foo", 1.0, 2.0, 2.8, 2.9, 3.0, 2.0, "75.0%", 4],
+                ["bar", 4.0, 4.0, 4.0, 4.0, 4.0, 4.0, "75.0%", 4],
+                ["total", 10.0, 20.0, 28.0, 29.0, 30.0, 20.0, "75.0%", 4]
+            ]
+        }
+    },
+    {
+        "info": {
+            "iterations_count": 0,
+            "atomic": costilius.OrderedDict()
         },
-        {
-            "info": {
-                "iterations_count": 0,
-                "atomic": costilius.OrderedDict()
-            },
-            "data": [],
-            "expected": {
-                "cols": MAIN_STATS_TABLE_COLUMNS,
-                "rows": [
-                    ["total", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a",
-                     0]
-                ]
-            }
+        "data": [],
+        "expected": {
+            "cols": MAIN_STATS_TABLE_COLUMNS,
+            "rows": [
+                ["total", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a", "n/a",
+                 0]
+            ]
         }
-    )
+    }
+]
+
+
+@ddt.ddt
+class MainStatsTableTestCase(test.TestCase):
+
+    @ddt.data(*MAIN_STATS_TABLE_DATA)
     @ddt.unpack
     def test_add_iteration_and_render(self, info, data, expected):
 
@@ -430,3 +517,42 @@ class MainStatsTableTestCase(test.TestCase):
             table.add_iteration(el)
 
         self.assertEqual(expected, table.render())
+
+    @skip_without_numpy
+    @ddt.data(*MAIN_STATS_TABLE_DATA)
+    @ddt.unpack
+    def test_add_columns_and_render(self, info, data, expected):
+        table = charts.MainStatsTable(info)
+        table.add_columns(make_columns(data, info["atomic"]))
+        table.add_columns(make_columns([], info["atomic"]))
+
+        self.assertEqual(expected, table.render())
+
+    @skip_without_numpy
+    def test_add_columns_and_render_many(self):
+        info = {"iterations_count": 1000, "atomic": {"foo": {}}}
+        data = [generate_iteration((i * 37) % 1000 / 10.0, i % 7 == 0,
+                                   ("foo", (i * 13) % 1000 / 100.0))
+                for i in range(1000)]
+        table = charts.MainStatsTable(info)
+        for el in data:
+            table.add_iteration(el)
+        batch_table = charts.MainStatsTable(info)
+        for i in range(0, 1000, 300):
+            batch_table.add_columns(make_columns(data[i:i + 300],
+                                                 info["atomic"]))
+
+        self.assertEqual(table.render(), batch_table.render())
+
+    @skip_without_numpy
+    def test_add_iteration_and_columns_raise(self):
+        info = {"iterations_count": 2, "atomic": {"foo": {}}}
+        data = [generate_iteration(10.0, False, ("foo", 1.0))]
+        table = charts.MainStatsTable(info)
+        table.add_iteration(data[0])
+        self.assertRaises(RuntimeError, table.add_columns,
+                          make_columns(data, info["atomic"]))
+
+        table = charts.MainStatsTable(info)
+        table.add_columns(make_columns(data, info["atomic"]))
+        self.assertRaises(RuntimeError, table.add_iteration, data[0])
@@ -0,0 +1,131 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import math
+
+import ddt
+import mock
+import testtools
+
+from rally.common import streaming_algorithms
+from rally.task.processing import columns
+from tests.unit import test
+
+
+class IsAvailableTestCase(test.TestCase):
+
+    def test_is_available_no_numpy(self):
+        with mock.patch("rally.task.processing.columns.numpy", None):
+            self.assertFalse(columns.is_available())
+
+
+@ddt.ddt
+@testtools.skipIf(not columns.is_available(), "NumPy is not installed")
+class IterationColumnsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(IterationColumnsTestCase, self).setUp()
+        self.iterations = [
+            {"timestamp": 1.5, "duration": 2.0, "idle_duration": 0.5,
+             "error": [], "atomic_actions": {"foo": 1.0, "bar": 0.5}},
+            {"timestamp": 2.5, "duration": 3.0, "idle_duration": 0,
+             "error": ["KeyError", "msg", "tb"],
+             "atomic_actions": {"foo": None}},
+            {"timestamp": 3.5, "duration": 1.0, "idle_duration": 0,
+             "error": [], "atomic_actions": {"baz": 2.0}}]
+
+    def test___init__(self):
+        cols = columns.IterationColumns(self.iterations)
+
+        self.assertEqual(3, len(cols))
+        self.assertEqual(self.iterations, cols.iterations)
+        self.assertEqual([1.5, 2.5, 3.5], cols.timestamp.tolist())
+        self.assertEqual([2.0, 3.0, 1.0], cols.duration.tolist())
+        self.assertEqual([0.5, 0, 0], cols.idle_duration.tolist())
+        self.assertEqual([False, True, False], cols.error.tolist())
+        self.assertEqual(["foo", "bar", "baz"], list(cols.atomic))
+        self.assertEqual([1.0], cols.atomic["foo"][:1].tolist())
+        self.assertTrue(math.isnan(cols.atomic["foo"][1]))
+        self.assertTrue(math.isnan(cols.atomic["foo"][2]))
+        self.assertEqual([True, True, False],
+                         cols.atomic_present["foo"].tolist())
+        self.assertEqual([False, False, True],
+                         cols.atomic_present["baz"].tolist())
+
+    def test___init___atomic_names(self):
+        cols = columns.IterationColumns(self.iterations, ["baz", "spam"])
+
+        self.assertEqual(["baz", "spam"], list(cols.atomic))
+        self.assertEqual([False, False, True],
+                         cols.atomic_present["baz"].tolist())
+        self.assertEqual([False, False, False],
+                         cols.atomic_present["spam"].tolist())
+
+    def test___init___empty(self):
+        cols = columns.IterationColumns([], ["foo"])
+
+        self.assertEqual(0, len(cols))
+        self.assertEqual([], cols.duration.tolist())
+        self.assertEqual([], cols.atomic["foo"].tolist())
+
+    def test_nan_to_zero(self):
+        cols = columns.IterationColumns(self.iterations)
+        self.assertEqual([1.0, 0.0, 0.0],
+                         columns.nan_to_zero(cols.atomic["foo"]).tolist())
+
+    @ddt.data([], [0.5, 1.0, 1.2, 2.0, 2.5, 3.0, 3.5])
+    def test_histogram(self, values):
+        bounds = [1.0, 2.0, 3.0]
+        expected = [0] * len(bounds)
+        for value in values:
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    expected[i] += 1
+                    break
+
+        self.assertEqual(expected, columns.histogram(
+            columns.concatenate([[], values]), bounds))
+
+    @ddt.data([], [0.5, 1.0, 1.2, 2.0, 2.5, 3.0, 3.5])
+    def test_bisect_counts(self, values):
+        bounds = [1.0, 2.0, 3.0]
+        expected = [0] * (len(bounds) + 1)
+        for value in values:
+            expected[bisect.bisect(bounds, value)] += 1
+
+        counts = columns.bisect_counts(columns.concatenate([[], values]),
+                                       bounds)
+        self.assertEqual(expected, counts + [0] * (4 - len(counts)))
+
+    @ddt.data(0, 1, 2, 5)
+    def test_running_stats(self, split):
+        values = [3.1, 4.2, 3.6, 4.5, 2.8, 1e6 + 0.5, 3.3]
+        comp = streaming_algorithms.StdDevComputation()
+        for value in values[:split]:
+            comp.add(value)
+
+        counts, means, dev_sums, stds = columns.running_stats(
+            columns.concatenate([values[split:]]), comp.count, comp.mean,
+            comp.dev_sum)
+
+        for i, value in enumerate(values[split:]):
+            comp.add(value)
+            self.assertEqual(comp.count, counts[i])
+            self.assertAlmostEqual(comp.mean, means[i])
+            self.assertAlmostEqual(1, (dev_sums[i] + 1) / (comp.dev_sum + 1))
+            if comp.count < 2:
+                self.assertTrue(math.isnan(stds[i]))
+            else:
+                self.assertAlmostEqual(1, stds[i] / comp.result())
@@ -13,7 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import json
+import zlib
 
 import mock
 
@@ -25,8 +27,10 @@ PLOT = "rally.task.processing.plot."
 
 class PlotTestCase(test.TestCase):
 
+    @mock.patch(PLOT + "utils.simplify_graphs",
+                side_effect=lambda graphs, tolerance: "simple_" + graphs)
     @mock.patch(PLOT + "charts")
-    def test__process_scenario(self, mock_charts):
+    def test__process_scenario(self, mock_charts, mock_simplify_graphs):
         for mock_ins, ret in [
                 (mock_charts.MainStatsTable, "main_stats"),
                 (mock_charts.MainStackedAreaChart, "main_stacked"),
@@ -62,14 +66,61 @@ class PlotTestCase(test.TestCase):
                     indent=2),
                 "full_duration": 40, "load_duration": 32,
                 "atomic": {"histogram": ["atomic_histogram"],
-                           "iter": "atomic_stacked", "pie": "atomic_avg"},
+                           "iter": "simple_atomic_stacked",
+                           "pie": "atomic_avg"},
                 "iterations": {"histogram": "main_histogram",
-                               "iter": "main_stacked",
+                               "iter": "simple_main_stacked",
                                "pie": [("success", 10), ("errors", 0)]},
-                "iterations_count": 10, "errors": [],
-                "load_profile": "load_profile",
-                "output": "output_stacked", "output_errors": [],
+                "iterations_count": 10, "errors_count": 0,
+                "load_profile": "simple_load_profile",
+                "output": "simple_output_stacked",
+                "detail": {"iterations": {"iter": "main_stacked"},
+                           "atomic": {"iter": "atomic_stacked"},
+                           "output": "output_stacked",
+                           "output_errors": [], "errors": []},
                 "sla": [], "sla_success": True, "table": "main_stats"})
+        mock_simplify_graphs.assert_has_calls(
+            [mock.call("main_stacked", plot.SERIES_TOLERANCE),
+             mock.call("load_profile", plot.SERIES_TOLERANCE),
+             mock.call("atomic_stacked", plot.SERIES_TOLERANCE),
+             mock.call("output_stacked", plot.SERIES_TOLERANCE)],
+            any_order=True)
+
+    @mock.patch(PLOT + "columns")
+    @mock.patch(PLOT + "charts")
+    def test__process_scenario_columns(self, mock_charts, mock_columns):
+        iterations = [
+            {"timestamp": i + 2, "error": ["E", "msg", "tb"] if i else [],
+             "duration": i + 5, "idle_duration": i,
+             "scenario_output": {"errors": "", "data": {}},
+             "atomic_actions": {}} for i in range(2)]
+        info = {"atomic": {}, "full_duration": 40, "load_duration": 32,
+                "iterations_count": 2}
+        data = {"iterations": iter(iterations), "sla": [], "info": info,
+                "key": {"kw": {"runner": {"type": "constant"}},
+                        "name": "Foo.bar", "pos": 0}}
+
+        for is_available in (True, False):
+            mock_charts.reset_mock()
+            mock_columns.is_available.return_value = is_available
+            data["iterations"] = iter(iterations)
+            task_data = plot._process_scenario(data, 0)
+
+            self.assertEqual([{"iteration": 1, "type": "E",
+                               "message": "msg", "traceback": "tb"}],
+                             task_data["detail"]["errors"])
+            self.assertEqual(1, task_data["errors_count"])
+            chart = mock_charts.MainStatsTable.return_value
+            if is_available:
+                mock_columns.IterationColumns.assert_called_once_with(
+                    iterations, {})
+                chart.add_columns.assert_called_once_with(
+                    mock_columns.IterationColumns.return_value)
+                self.assertFalse(chart.add_iteration.called)
+            else:
+                self.assertFalse(chart.add_columns.called)
+                self.assertEqual(list(map(mock.call, iterations)),
+                                 chart.add_iteration.mock_calls)
 
     @mock.patch(PLOT + "_process_scenario")
     @mock.patch(PLOT + "json.dumps", return_value="json_data")
@@ -88,13 +139,14 @@ class PlotTestCase(test.TestCase):
             [{"cls": "a_cls", "name": "0"}, {"cls": "b_cls", "name": "0"},
              {"cls": "b_cls", "name": "1"}, {"cls": "c_cls", "name": "0"}])
 
+    @mock.patch(PLOT + "_encode_detail", side_effect=lambda d: "enc_" + d)
     @mock.patch(PLOT + "_process_tasks")
     @mock.patch(PLOT + "objects")
     @mock.patch(PLOT + "ui_utils.get_template")
-    @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_" + s)
+    @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_%s" % s)
     def test_plot(self, mock_dumps, mock_get_template, mock_objects,
-                  mock__process_tasks):
-        mock__process_tasks.return_value = "source", "scenarios"
+                  mock__process_tasks, mock__encode_detail):
+        mock__process_tasks.return_value = "source", [{"detail": "foo"}]
         mock_get_template.return_value.render.return_value = "tasks_html"
         mock_objects.Task.extend_results.return_value = ["extended_result"]
         tasks_results = [
@@ -115,4 +167,65 @@ class PlotTestCase(test.TestCase):
         mock_get_template.assert_called_once_with("task/report.mako")
         mock__process_tasks.assert_called_once_with(["extended_result"])
         mock_get_template.return_value.render.assert_called_once_with(
-            data="json_scenarios", source="json_source")
+            data="json_[{}]", source="json_source", details=["enc_foo"])
+
+    @mock.patch(PLOT + "ui_utils.get_template")
+    def test_plot_parallel_results(self, mock_get_template):
+
+        def get_result(name, timestamp):
+            return {"key": {"name": name, "pos": 0,
+                            "kw": {"runner": {"type": "constant"}}},
+                    "sla": [], "full_duration": 12, "load_duration": 11,
+                    "tstamp_base": 100,
+                    "result": [{"timestamp": timestamp, "duration": 10,
+                                "idle_duration": 0, "error": [],
+                                "atomic_actions": {},
+                                "scenario_output": {"errors": "",
+                                                    "data": {}}}]}
+
+        plot.plot([get_result("Foo.first", 100),
+                   get_result("Foo.second", 110)])
+
+        data = json.loads(
+            mock_get_template.return_value.render.call_args[1]["data"])
+        profiles = dict((s["met"], s["load_profile"][0][1]) for s in data)
+        # NOTE: both load profiles start at tstamp_base, so the second
+        #       scenario is shifted by 10 seconds
+        self.assertEqual(11, profiles["first"][-1][0])
+        self.assertEqual(21, profiles["second"][-1][0])
+        self.assertEqual(0, max(running for ts, running
+                                in profiles["second"] if ts < 10))
+        self.assertEqual(1, max(running for ts, running
+                                in profiles["second"] if ts >= 10))
+
+    @mock.patch(PLOT + "ui_utils.get_template")
+    def test_plot_details(self, mock_get_template):
+        iterations = [{"timestamp": 100 + i, "duration": 10 + i % 2,
+                       "idle_duration": 0, "atomic_actions": {},
+                       "error": ["E", "msg", "tb"] if i == 3 else [],
+                       "scenario_output": {"errors": "", "data": {}}}
+                      for i in range(2000)]
+        plot.plot([{"key": {"name": "Foo.bar", "pos": 0,
+                            "kw": {"runner": {"type": "constant"}}},
+                    "sla": [], "full_duration": 2100, "load_duration": 2011,
+                    "result": iterations}])
+
+        kwargs = mock_get_template.return_value.render.call_args[1]
+        scenario = json.loads(kwargs["data"])[0]
+        detail = json.loads(zlib.decompress(
+            base64.b64decode(kwargs["details"][0])).decode("utf-8"))
+        self.assertEqual(1, scenario["errors_count"])
+        self.assertNotIn("errors", scenario)
+        self.assertEqual([{"iteration": 3, "type": "E", "message": "msg",
+                           "traceback": "tb"}], detail["errors"])
+        self.assertEqual([], detail["output_errors"])
+
+        full = dict(detail["iterations"]["iter"])
+        simple = dict(scenario["iterations"]["iter"])
+        self.assertEqual(1000, len(full["duration"]))
+        self.assertLess(len(simple["duration"]), len(full["duration"]))
+        self.assertEqual(
+            [p[0] for p in simple["duration"]],
+            [p[0] for p in simple["failed_duration"]])
+        self.assertEqual(full["duration"][0], simple["duration"][0])
+        self.assertEqual(full["duration"][-1], simple["duration"][-1])
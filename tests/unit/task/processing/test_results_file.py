@@ -0,0 +1,163 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import json
+import os
+import tempfile
+
+import ddt
+
+from rally import exceptions
+from rally.task.processing import results_file
+from tests.unit import test
+
+
+def generate_results(iterations_count=3):
+    iterations = []
+    for i in range(iterations_count):
+        iterations.append({
+            "duration": 1.5 + i, "idle_duration": i % 2, "timestamp": 1e9 + i,
+            "error": [], "scenario_output": {"errors": "", "data": {}},
+            "atomic_actions": {"foo": 0.5 + i, "bar": 0.25}})
+    iterations[-1]["error"] = ["KeyError", "'spam'", "Traceback"]
+    iterations[-1]["atomic_actions"] = {"foo": None}
+    iterations[0]["scenario_output"] = {"errors": "err",
+                                        "data": {"a": 1.2, "b": 3}}
+    return [
+        {"key": {"name": "Dummy.dummy", "pos": 0,
+                 "kw": {"runner": {"type": "constant", "times": 3}}},
+         "sla": [{"criterion": "failure_rate", "detail": "ok",
+                  "success": True}],
+         "load_duration": 4.2, "full_duration": 6.3, "tstamp_base": 1e9,
+         "result": iterations},
+        {"key": {"name": "Dummy.dummy_exception", "pos": 1, "kw": {}},
+         "sla": [], "load_duration": 1, "full_duration": 2,
+         "result": [{"duration": 2, "idle_duration": 0,
+                     "error": ["ValueError", "", ""],
+                     "scenario_output": {"errors": "", "data": {}},
+                     "atomic_actions": {}, "custom": [u"\u2713"]}]}]
+
+
+@ddt.ddt
+class ResultsFileTestCase(test.TestCase):
+
+    def _round_trip(self, results, **kwargs):
+        fileobj = io.BytesIO()
+        results_file.dump(results, fileobj, **kwargs)
+        fileobj.seek(0)
+        return fileobj, results_file.load(fileobj)
+
+    @ddt.data({}, {"compress": False})
+    def test_dump_and_load(self, kwargs):
+        results = generate_results()
+        fileobj, loaded = self._round_trip(results, **kwargs)
+
+        self.assertEqual(json.loads(json.dumps(results)), loaded)
+        self.assertEqual(results_file.MAGIC,
+                         fileobj.getvalue()[:len(results_file.MAGIC)])
+
+    def test_dump_and_load_many_blocks(self):
+        results = generate_results(iterations_count=25)
+        fileobj = io.BytesIO()
+        writer = results_file.Writer(fileobj, block_size=4)
+        for result in results:
+            writer.write(result)
+        fileobj.seek(0)
+
+        self.assertEqual(json.loads(json.dumps(results)),
+                         results_file.load(fileobj))
+
+    def test_dump_streamed_iterations(self):
+        results = generate_results(iterations_count=10)
+        iterations = results[0]["result"]
+
+        class Iterations(object):
+
+            def __len__(self):
+                return len(iterations)
+
+            def __iter__(self):
+                return iter(iterations)
+
+        streamed = dict(results[0], result=Iterations())
+        fileobj = io.BytesIO()
+        writer = results_file.Writer(fileobj, block_size=3)
+        writer.write(streamed)
+        fileobj.seek(0)
+
+        self.assertEqual(json.loads(json.dumps(results[:1])),
+                         results_file.load(fileobj))
+
+    def test_dump_is_smaller_than_json(self):
+        results = generate_results(iterations_count=1000)
+        fileobj, loaded = self._round_trip(results)
+
+        self.assertEqual(json.loads(json.dumps(results)), loaded)
+        self.assertLess(len(fileobj.getvalue()) * 4,
+                        len(json.dumps(results, sort_keys=True, indent=4)))
+
+    def test_reader_streams_scenarios(self):
+        fileobj = io.BytesIO()
+        results_file.dump(generate_results(), fileobj)
+        size = len(fileobj.getvalue())
+        fileobj.seek(0)
+
+        scenarios = iter(results_file.Reader(fileobj))
+        self.assertEqual("Dummy.dummy", next(scenarios)["key"]["name"])
+        self.assertLess(fileobj.tell(), size)
+        self.assertEqual("Dummy.dummy_exception",
+                         next(scenarios)["key"]["name"])
+        self.assertRaises(StopIteration, next, scenarios)
+
+    def test_load_empty(self):
+        fileobj, loaded = self._round_trip([])
+        self.assertEqual([], loaded)
+
+    @ddt.data(b"", b"RALLYRES", b"NOTRALLY\x01\x01", b"RALLYRES\x09\x01")
+    def test_load_invalid_preamble(self, data):
+        self.assertRaises(exceptions.InvalidResultsFile,
+                          results_file.load, io.BytesIO(data))
+
+    def test_load_truncated(self):
+        fileobj = io.BytesIO()
+        results_file.dump(generate_results(), fileobj)
+        data = fileobj.getvalue()
+        for size in (len(data) - 1, len(data) // 2, 15):
+            self.assertRaises(exceptions.InvalidResultsFile,
+                              results_file.load, io.BytesIO(data[:size]))
+
+    def test_load_invalid_scenario(self):
+        result = generate_results()[0]
+        del result["sla"]
+        fileobj = io.BytesIO()
+        results_file.dump([result], fileobj)
+        fileobj.seek(0)
+
+        e = self.assertRaises(exceptions.InvalidResultsFile,
+                              results_file.load, fileobj)
+        self.assertIn("'sla' is a required property", "%s" % e)
+
+    def test_is_binary(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        with open(path, "w") as f:
+            json.dump(generate_results(), f)
+        self.assertFalse(results_file.is_binary(path))
+
+        with open(path, "wb") as f:
+            results_file.dump(generate_results(), f)
+        self.assertTrue(results_file.is_binary(path))
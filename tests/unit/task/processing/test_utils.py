@@ -99,3 +99,43 @@ class GraphZipperTestCase(test.TestCase):
         self.assertRaises(TypeError, merger.add_point)
         [merger.add_point(1) for value in range(10)]
         self.assertRaises(RuntimeError, merger.add_point, 1)
+
+
+@ddt.ddt
+class SimplifyGraphsTestCase(test.TestCase):
+
+    @ddt.data(
+        {"graphs": [], "expected": []},
+        {"graphs": [("foo", [[1, 2], [2, 5]])],
+         "expected": [("foo", [[1, 2], [2, 5]])]},
+        {"graphs": [("foo", [[i, 2 * i] for i in range(1, 11)])],
+         "expected": [("foo", [[1, 2], [10, 20]])]},
+        {"graphs": [("foo", [[1, 0], [2, 0], [3, 10], [4, 0], [5, 0]])],
+         "expected": [("foo", [[1, 0], [2, 0], [3, 10], [4, 0], [5, 0]])]},
+        {"graphs": [("foo", [[1, 0], [2, 0.05], [3, 10], [4, 0], [5, 0]])],
+         "tolerance": 0.01,
+         "expected": [("foo", [[1, 0], [2, 0.05], [3, 10], [4, 0],
+                               [5, 0]])]},
+        {"graphs": [("foo", [[1, 0], [2, 0.05], [3, 0], [4, 10], [5, 0]])],
+         "tolerance": 0.01,
+         "expected": [("foo", [[1, 0], [3, 0], [4, 10], [5, 0]])]},
+        {"graphs": [("foo", [[1, 1], [2, 1], [3, 1], [4, 1]]),
+                    ("bar", [[1, 0], [2, 0], [3, 4], [4, 4]])],
+         "expected": [("foo", [[1, 1], [2, 1], [3, 1], [4, 1]]),
+                      ("bar", [[1, 0], [2, 0], [3, 4], [4, 4]])]})
+    @ddt.unpack
+    def test_simplify_graphs(self, graphs, expected, tolerance=0):
+        self.assertEqual(expected, utils.simplify_graphs(graphs, tolerance))
+
+    def test_simplify_graphs_error_bound(self):
+        values = [(i * 7919) % 101 / 10.0 for i in range(500)]
+        points = [[i + 1, v] for i, v in enumerate(values)]
+        tolerance = 0.05
+        limit = tolerance * (max(values) - min(values))
+
+        simple = utils.simplify_graphs([("foo", points)], tolerance)[0][1]
+        self.assertLess(len(simple), len(points))
+        for (x0, y0), (x1, y1) in zip(simple, simple[1:]):
+            for x, y in points[x0:x1 - 1]:
+                expected = y0 + (y1 - y0) * (x - x0) / float(x1 - x0)
+                self.assertLessEqual(abs(y - expected), limit)
@@ -0,0 +1,431 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import datetime
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import ddt
+import mock
+from oslo_config import cfg
+
+from rally.common import db
+from rally.common import objects
+from rally import consts
+from rally import exceptions
+from rally.task import distributed
+from tests.unit import test
+
+
+BASE = "rally.task.distributed."
+CONF = cfg.CONF
+
+
+def set_overrides(test_case, **overrides):
+    for name, value in overrides.items():
+        CONF.set_override(name, value, "benchmark")
+        test_case.addCleanup(CONF.clear_override, name, "benchmark")
+
+
+class ContextDataTestCase(test.TestCase):
+
+    def test_dump_and_load_context(self):
+        endpoint = objects.Endpoint("http://example.com", "admin", "secret",
+                                    permission=consts.EndpointPermission.ADMIN)
+        task = mock.Mock()
+        context_obj = {"task": task, "admin": {"endpoint": endpoint},
+                       "users": [{"id": "u1", "endpoint": endpoint}],
+                       "config": {"users": {"tenants": 1}}}
+
+        data = distributed.dump_context(context_obj)
+
+        endpoint_data = {"__endpoint__": endpoint.to_dict(
+            include_permission=True)}
+        self.assertEqual({"admin": {"endpoint": endpoint_data},
+                          "users": [{"id": "u1", "endpoint": endpoint_data}],
+                          "config": {"users": {"tenants": 1}}}, data)
+
+        loaded = distributed.load_context(data, task)
+        self.assertEqual(task, loaded["task"])
+        self.assertEqual({"users": {"tenants": 1}}, loaded["config"])
+        for loaded_endpoint in (loaded["admin"]["endpoint"],
+                                loaded["users"][0]["endpoint"]):
+            self.assertIsInstance(loaded_endpoint, objects.Endpoint)
+            self.assertEqual(endpoint.to_dict(include_permission=True),
+                             loaded_endpoint.to_dict(include_permission=True))
+
+    def test_dump_context_not_serializable(self):
+        self.assertRaises(TypeError, distributed.dump_context,
+                          {"task": None, "clients": object()})
+
+
+@ddt.ddt
+class SplitRunnerConfigTestCase(test.TestCase):
+
+    @ddt.data(
+        ({"type": "constant", "times": 10, "concurrency": 4}, 3,
+         [{"type": "constant", "times": 4, "concurrency": 2},
+          {"type": "constant", "times": 3, "concurrency": 1},
+          {"type": "constant", "times": 3, "concurrency": 1}]),
+        ({"type": "constant", "times": 10, "concurrency": 2}, 5,
+         [{"type": "constant", "times": 5, "concurrency": 1},
+          {"type": "constant", "times": 5, "concurrency": 1}]),
+        ({"type": "constant"}, 3,
+         [{"type": "constant", "times": 1, "concurrency": 1}]),
+        ({"type": "rps", "times": 7, "rps": 6, "timeout": 5}, 3,
+         [{"type": "rps", "times": 3, "rps": 2.0, "timeout": 5},
+          {"type": "rps", "times": 2, "rps": 2.0, "timeout": 5},
+          {"type": "rps", "times": 2, "rps": 2.0, "timeout": 5}]),
+        ({"type": "constant_for_duration", "concurrency": 4,
+          "duration": 10}, 2,
+         [{"type": "constant_for_duration", "concurrency": 2,
+           "duration": 10},
+          {"type": "constant_for_duration", "concurrency": 2,
+           "duration": 10}]),
+        ({"type": "serial", "times": 3}, 2,
+         [{"type": "serial", "times": 2}, {"type": "serial", "times": 1}])
+    )
+    @ddt.unpack
+    def test_split_runner_config(self, config, count, expected):
+        self.assertEqual(expected,
+                         distributed.split_runner_config(config, count))
+
+
+class GetAliveWorkersTestCase(test.TestCase):
+
+    @mock.patch(BASE + "timeutils.utcnow")
+    @mock.patch(BASE + "db")
+    def test_get_alive_workers(self, mock_db, mock_utcnow):
+        set_overrides(self, worker_timeout=30)
+        mock_utcnow.return_value = datetime.datetime(2015, 1, 1, 0, 1)
+
+        self.assertEqual(mock_db.worker_list.return_value,
+                         distributed.get_alive_workers())
+        mock_db.worker_list.assert_called_once_with(
+            alive_since=datetime.datetime(2015, 1, 1, 0, 0, 30))
+
+
+class DistributedRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedRunnerTestCase, self).setUp()
+        set_overrides(self, worker_poll_interval=0)
+        self.config = {"type": "constant", "times": 4, "concurrency": 2}
+        self.runner = distributed.DistributedRunner({"uuid": "task_uuid"},
+                                                    self.config)
+        self.context = {"task": mock.MagicMock(), "config": {"users": {}}}
+
+    def _result(self, iteration):
+        return {"duration": 1, "idle_duration": 0, "error": [],
+                "scenario_output": {"data": {}, "errors": ""},
+                "atomic_actions": {}, "timestamp": iteration}
+
+    @mock.patch(BASE + "get_alive_workers")
+    @mock.patch(BASE + "db")
+    def test_run(self, mock_db, mock_get_alive_workers):
+        mock_get_alive_workers.return_value = [{"hostname": "w1"},
+                                               {"hostname": "w2"}]
+        mock_db.worker_job_create.side_effect = [{"id": 1}, {"id": 2}]
+        statuses = {1: [consts.WorkerJobStatus.RUNNING,
+                        consts.WorkerJobStatus.FINISHED],
+                    2: [consts.WorkerJobStatus.FINISHED]}
+        mock_db.worker_job_get.side_effect = lambda job_id: {
+            "status": statuses[job_id].pop(0)}
+        results = {1: [[[self._result(0)], [self._result(1)]], []],
+                   2: [[[self._result(2), self._result(3)]]]}
+        mock_db.worker_job_result_pop.side_effect = (
+            lambda job_id: results[job_id].pop(0))
+
+        self.runner.run("Dummy.dummy", self.context, {"a": 1})
+
+        self.assertEqual([0, 1, 2, 3],
+                         sorted(r["timestamp"]
+                                for r in self.runner.result_queue))
+        share = {"type": "constant", "times": 2, "concurrency": 1}
+        mock_db.worker_job_create.assert_has_calls([
+            mock.call({"task_uuid": "task_uuid", "worker": "w1",
+                       "key": {"name": "Dummy.dummy", "args": {"a": 1},
+                               "context": {"config": {"users": {}}},
+                               "runner": share}}),
+            mock.call({"task_uuid": "task_uuid", "worker": "w2",
+                       "key": {"name": "Dummy.dummy", "args": {"a": 1},
+                               "context": {"config": {"users": {}}},
+                               "runner": share}})])
+        self.assertFalse(mock_db.worker_job_update.called)
+        self.assertTrue(self.runner.run_duration >= 0)
+
+    @mock.patch(BASE + "get_alive_workers", return_value=[])
+    def test_run_no_workers(self, mock_get_alive_workers):
+        self.assertRaises(exceptions.NoWorkersAvailable,
+                          self.runner.run, "Dummy.dummy", self.context, {})
+
+    @mock.patch(BASE + "get_alive_workers")
+    @mock.patch(BASE + "db")
+    def test_run_job_failed(self, mock_db, mock_get_alive_workers):
+        mock_get_alive_workers.return_value = [{"hostname": "w1"}]
+        mock_db.worker_job_create.return_value = {"id": 1}
+        mock_db.worker_job_get.return_value = {
+            "status": consts.WorkerJobStatus.FAILED, "error": "foo"}
+        mock_db.worker_job_result_pop.return_value = []
+
+        e = self.assertRaises(exceptions.WorkerJobFailed,
+                              self.runner.run, "Dummy.dummy", self.context,
+                              {})
+        self.assertIn("foo", e.format_message())
+
+    @mock.patch(BASE + "get_alive_workers")
+    @mock.patch(BASE + "db")
+    def test_run_worker_is_dead(self, mock_db, mock_get_alive_workers):
+        mock_get_alive_workers.side_effect = [[{"hostname": "w1"}], []]
+        mock_db.worker_job_create.return_value = {"id": 1}
+        mock_db.worker_job_get.return_value = {
+            "status": consts.WorkerJobStatus.RUNNING}
+        mock_db.worker_job_result_pop.return_value = []
+
+        self.assertRaises(exceptions.WorkerJobFailed,
+                          self.runner.run, "Dummy.dummy", self.context, {})
+        mock_db.worker_job_update.assert_called_once_with(
+            1, {"status": consts.WorkerJobStatus.FAILED,
+                "error": "worker stopped sending heartbeats"})
+
+    @mock.patch(BASE + "get_alive_workers")
+    @mock.patch(BASE + "db")
+    def test_run_aborted(self, mock_db, mock_get_alive_workers):
+        mock_get_alive_workers.return_value = [{"hostname": "w1"}]
+        mock_db.worker_job_create.return_value = {"id": 1}
+        mock_db.worker_job_get.return_value = {
+            "status": consts.WorkerJobStatus.FINISHED}
+        mock_db.worker_job_result_pop.return_value = []
+
+        self.runner.abort()
+        self.runner.run("Dummy.dummy", self.context, {})
+
+        mock_db.worker_job_update.assert_called_once_with(
+            1, {"status": consts.WorkerJobStatus.ABORTING},
+            statuses=[consts.WorkerJobStatus.PENDING,
+                      consts.WorkerJobStatus.RUNNING])
+
+
+class JobResultPublisherTestCase(test.TestCase):
+
+    def setUp(self):
+        super(JobResultPublisherTestCase, self).setUp()
+        set_overrides(self, worker_poll_interval=0.001)
+        self.runner = mock.MagicMock(result_queue=collections.deque())
+
+    @mock.patch(BASE + "db")
+    def test_publish_results(self, mock_db):
+        mock_db.worker_job_get.return_value = {
+            "status": consts.WorkerJobStatus.RUNNING}
+
+        with distributed.JobResultPublisher(42, self.runner):
+            self.runner.result_queue.extend([{"a": 1}, {"b": 2}])
+
+        mock_db.worker_job_result_create.assert_called_once_with(
+            42, [{"a": 1}, {"b": 2}])
+        self.assertFalse(self.runner.abort.called)
+
+    @mock.patch(BASE + "db")
+    def test_wait_and_abort(self, mock_db):
+        mock_db.worker_job_get.return_value = {
+            "status": consts.WorkerJobStatus.ABORTING}
+        publisher = distributed.JobResultPublisher(42, self.runner)
+
+        publisher.wait_and_abort()
+
+        mock_db.worker_job_get.assert_called_once_with(42)
+        self.runner.abort.assert_called_once_with()
+
+
+class WorkerAgentTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerAgentTestCase, self).setUp()
+        set_overrides(self, worker_poll_interval=0.001,
+                      worker_heartbeat_interval=1)
+
+    @mock.patch(BASE + "os.getpid", return_value=42)
+    @mock.patch(BASE + "socket.gethostname", return_value="host")
+    def test_init_default_hostname(self, mock_gethostname, mock_getpid):
+        self.assertEqual("host-42", distributed.WorkerAgent().hostname)
+
+    @mock.patch(BASE + "db")
+    def test_serve(self, mock_db):
+        agent = distributed.WorkerAgent("agent")
+        jobs = [[{"id": 1}, {"id": 2}], []]
+
+        def worker_job_list(**kwargs):
+            if not jobs:
+                agent.stop()
+            return jobs and jobs.pop(0)
+
+        mock_db.worker_job_list.side_effect = worker_job_list
+        mock_db.worker_job_update.side_effect = [1, 0]
+
+        with mock.patch.object(agent, "run_job") as mock_run_job:
+            with agent:
+                agent.serve()
+
+        mock_db.register_worker.assert_called_once_with(
+            {"hostname": "agent"})
+        mock_db.worker_job_list.assert_called_with(
+            worker="agent", status=consts.WorkerJobStatus.PENDING)
+        mock_db.worker_job_update.assert_has_calls([
+            mock.call(1, {"status": consts.WorkerJobStatus.RUNNING},
+                      statuses=[consts.WorkerJobStatus.PENDING]),
+            mock.call(2, {"status": consts.WorkerJobStatus.RUNNING},
+                      statuses=[consts.WorkerJobStatus.PENDING])])
+        # NOTE: job 2 was aborted before it started
+        mock_run_job.assert_called_once_with({"id": 1})
+        mock_db.unregister_worker.assert_called_once_with("agent")
+
+    @mock.patch(BASE + "db")
+    def test_exit_aborts_runners_on_error(self, mock_db):
+        agent = distributed.WorkerAgent("agent")
+        runner_obj = mock.Mock()
+
+        def serve():
+            with agent:
+                agent.runners[1] = runner_obj
+                raise KeyboardInterrupt()
+
+        self.assertRaises(KeyboardInterrupt, serve)
+        runner_obj.abort.assert_called_once_with()
+        mock_db.unregister_worker.assert_called_once_with("agent")
+
+    @mock.patch(BASE + "objects.Task.get")
+    @mock.patch(BASE + "db")
+    def test_run_job(self, mock_db, mock_task_get):
+        agent = distributed.WorkerAgent("agent")
+        job = {"id": 1, "task_uuid": "task_uuid",
+               "key": {"name": "Dummy.dummy", "args": {"a": 1},
+                       "context": {"config": {"users": {}},
+                                   "admin": {"endpoint": None}},
+                       "runner": {"type": "serial", "times": 2}}}
+        runner_cls = mock.Mock()
+        runner_cls.return_value.result_queue = collections.deque()
+        runner_cls.return_value.run_duration = 5
+
+        with mock.patch(BASE + "runner.ScenarioRunner.get",
+                        return_value=runner_cls):
+            agent.run_job(job)
+
+        task = mock_task_get.return_value
+        mock_task_get.assert_called_once_with("task_uuid")
+        runner_cls.assert_called_once_with(task, {"type": "serial",
+                                                  "times": 2})
+        runner_cls.return_value.run.assert_called_once_with(
+            "Dummy.dummy", {"task": task, "admin": {"endpoint": None},
+                            "config": {"users": {}}}, {"a": 1})
+        mock_db.worker_job_update.assert_called_once_with(
+            1, {"status": consts.WorkerJobStatus.FINISHED,
+                "load_duration": 5})
+        self.assertEqual({}, agent.runners)
+
+    @mock.patch(BASE + "objects")
+    @mock.patch(BASE + "db")
+    def test_run_job_failed(self, mock_db, mock_objects):
+        mock_objects.Task.get.side_effect = ValueError("foo")
+        agent = distributed.WorkerAgent("agent")
+
+        agent.run_job({"id": 1, "task_uuid": "task_uuid", "key": {}})
+
+        mock_db.worker_job_update.assert_called_once_with(
+            1, {"status": consts.WorkerJobStatus.FAILED,
+                "error": "ValueError: foo"})
+
+
+def _serve_agent(hostname, stop):
+    # NOTE: connections of the parent process must not be used after fork
+    db.db_cleanup()
+    with distributed.WorkerAgent(hostname) as agent:
+        stopper = threading.Thread(target=lambda: (stop.wait(),
+                                                   agent.stop()))
+        stopper.start()
+        agent.serve()
+        stopper.join()
+
+
+class DistributedTaskTestCase(test.TestCase):
+    """Runs the load on agent processes that share a SQLite database."""
+
+    AGENTS = 2
+
+    def setUp(self):
+        super(DistributedTaskTestCase, self).setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        db.db_cleanup()
+        self.addCleanup(db.db_cleanup)
+        set_overrides(self, worker_poll_interval=0.05,
+                      worker_heartbeat_interval=1)
+        CONF.set_override("connection", "sqlite:///%s" % os.path.join(
+            tmp_dir, "rally.sqlite"), "database")
+        self.addCleanup(CONF.clear_override, "connection", "database")
+        db.db_create()
+
+        self.stop = multiprocessing.Event()
+        self.agents = [
+            multiprocessing.Process(target=_serve_agent,
+                                    args=("agent-%d" % i, self.stop))
+            for i in range(self.AGENTS)]
+        for agent in self.agents:
+            agent.start()
+        self.addCleanup(self._stop_agents)
+
+        deadline = time.time() + 10
+        while len(distributed.get_alive_workers()) < self.AGENTS:
+            self.assertTrue(time.time() < deadline,
+                            "Worker agents are not registered")
+            time.sleep(0.05)
+
+    def _stop_agents(self):
+        self.stop.set()
+        for agent in self.agents:
+            agent.join(10)
+            if agent.is_alive():
+                agent.terminate()
+
+    def test_run(self):
+        deployment = db.deployment_create({})
+        task = objects.Task(deployment_uuid=deployment["uuid"])
+        runner_obj = distributed.DistributedRunner(
+            task, {"type": "serial", "times": 5})
+        admin = objects.Endpoint("http://localhost", "admin", "secret",
+                                 permission=consts.EndpointPermission.ADMIN)
+        context_obj = {"task": task, "admin": {"endpoint": admin},
+                       "scenario_name": "Dummy.dummy",
+                       "config": {"dummy_context": {"foo": 1}}}
+
+        runner_obj.run("Dummy.dummy", context_obj, {"sleep": 0})
+
+        results = list(runner_obj.result_queue)
+        self.assertEqual(5, len(results))
+        self.assertEqual([[]] * 5, [r["error"] for r in results])
+        jobs = db.worker_job_list(task_uuid=task["uuid"])
+        self.assertEqual(
+            [("agent-0", consts.WorkerJobStatus.FINISHED),
+             ("agent-1", consts.WorkerJobStatus.FINISHED)],
+            sorted((job["worker"], job["status"]) for job in jobs))
+        self.assertEqual([3, 2], [job["key"]["runner"]["times"]
+                                  for job in sorted(
+                                      jobs, key=lambda j: j["worker"])])
+        for job in jobs:
+            self.assertEqual(distributed.dump_context(context_obj),
+                             job["key"]["context"])
@@ -17,6 +17,8 @@
 
 import collections
 import copy
+import threading
+import time
 
 import jsonschema
 import mock
@@ -34,6 +36,12 @@ class TestException(exceptions.RallyException):
 
 class BenchmarkEngineTestCase(test.TestCase):
 
+    def setUp(self):
+        super(BenchmarkEngineTestCase, self).setUp()
+        patcher = mock.patch("rally.task.engine.progress.ProgressServer")
+        self.mock_progress_server = patcher.start()
+        self.addCleanup(patcher.stop)
+
     @mock.patch("rally.task.engine.TaskConfig")
     def test_init(self, mock_task_config):
         config = mock.MagicMock()
@@ -55,7 +63,7 @@ class BenchmarkEngineTestCase(test.TestCase):
         eng._validate_config_syntax = mock_validate.syntax
         eng._validate_config_semantic = mock_validate.semantic
 
-        eng.validate()
+        self.assertEqual([], eng.validate())
 
         expected_calls = [
             mock.call.names(config),
@@ -107,45 +115,47 @@ class BenchmarkEngineTestCase(test.TestCase):
         self.assertTrue(task.set_failed.called)
 
     @mock.patch("rally.task.engine.TaskConfig")
-    @mock.patch("rally.task.engine.scenario.Scenario.get_all")
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
     def test__validate_config_scenarios_name(
-            self, mock_scenario_get_all, mock_task_config):
+            self, mock_scenario_get, mock_task_config):
 
         mock_task_instance = mock.MagicMock()
-        mock_subtask = mock.MagicMock()
+        mock_subtask = mock.MagicMock(run_in_parallel=False)
         mock_subtask.scenarios = [
             {"name": "a"},
             {"name": "b"}
         ]
         mock_task_instance.subtasks = [mock_subtask]
 
-        mock_scenario_get_all.return_value = [
-            mock.MagicMock(get_name=lambda: "e"),
-            mock.MagicMock(get_name=lambda: "b"),
-            mock.MagicMock(get_name=lambda: "a")
-        ]
         eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
         eng._validate_config_scenarios_name(mock_task_instance)
+        mock_scenario_get.assert_has_calls([mock.call("a"), mock.call("b")])
 
     @mock.patch("rally.task.engine.TaskConfig")
-    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
     def test__validate_config_scenarios_name_non_exsisting(
-            self, mock_scenario, mock_task_config):
+            self, mock_scenario_get, mock_task_config):
 
         mock_task_instance = mock.MagicMock()
-        mock_subtask = mock.MagicMock()
+        mock_subtask = mock.MagicMock(run_in_parallel=False)
         mock_subtask.scenarios = [
             {"name": "exist"},
             {"name": "nonexist1"},
             {"name": "nonexist2"}
         ]
         mock_task_instance.subtasks = [mock_subtask]
-        mock_scenario.list_benchmark_scenarios.return_value = ["exist", "aaa"]
+
+        def get(name):
+            if name != "exist":
+                raise exceptions.PluginNotFound(name=name, namespace="any of")
+
+        mock_scenario_get.side_effect = get
         eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
 
-        self.assertRaises(exceptions.NotFoundScenarios,
-                          eng._validate_config_scenarios_name,
-                          mock_task_instance)
+        e = self.assertRaises(exceptions.NotFoundScenarios,
+                              eng._validate_config_scenarios_name,
+                              mock_task_instance)
+        self.assertIn("nonexist1, nonexist2", str(e))
 
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.runner.ScenarioRunner.validate")
@@ -156,7 +166,7 @@ class BenchmarkEngineTestCase(test.TestCase):
             mock_task_config
     ):
         mock_task_instance = mock.MagicMock()
-        mock_subtask = mock.MagicMock()
+        mock_subtask = mock.MagicMock(run_in_parallel=False)
         mock_subtask.scenarios = [
             {"name": "sca", "context": "a"},
             {"name": "scb", "runner": "b"}
@@ -177,7 +187,7 @@ class BenchmarkEngineTestCase(test.TestCase):
             self, mock_context_manager_validate,
             mock_scenario_runner, mock_task_config):
         mock_task_instance = mock.MagicMock()
-        mock_subtask = mock.MagicMock()
+        mock_subtask = mock.MagicMock(run_in_parallel=False)
         mock_subtask.scenarios = [
             {"name": "sca", "context": "a"},
             {"name": "scb", "runner": "b"}
@@ -197,7 +207,7 @@ class BenchmarkEngineTestCase(test.TestCase):
             self, mock_context_manager, mock_scenario_runner_validate,
             mock_task_config):
         mock_task_instance = mock.MagicMock()
-        mock_subtask = mock.MagicMock()
+        mock_subtask = mock.MagicMock(run_in_parallel=False)
         mock_subtask.scenarios = [
             {"name": "sca", "context": "a"},
             {"name": "scb", "runner": "b"}
@@ -220,7 +230,7 @@ class BenchmarkEngineTestCase(test.TestCase):
                                              deployment, {"args": "args"})
         mock_scenario_validate.assert_called_once_with(
             "name", {"args": "args"}, admin="admin", users=["user"],
-            deployment=deployment)
+            deployment=deployment, validation_run=eng.validation_run)
 
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.scenario.Scenario.validate",
@@ -283,6 +293,10 @@ class BenchmarkEngineTestCase(test.TestCase):
 
         eng.admin = "admin"
 
+        engine.CONF.set_override("semantic_validation_enabled", True,
+                                 "benchmark")
+        self.addCleanup(engine.CONF.clear_override,
+                        "semantic_validation_enabled", "benchmark")
         eng._validate_config_semantic(mock_task_instance)
 
         expected_calls = [
@@ -306,6 +320,88 @@ class BenchmarkEngineTestCase(test.TestCase):
         mock__validate_config_semantic_helper.assert_has_calls(
             expected_calls, any_order=True)
 
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.osclients.Clients")
+    @mock.patch("rally.task.engine.users_ctx")
+    @mock.patch("rally.task.engine.BenchmarkEngine"
+                "._validate_config_semantic_helper")
+    @mock.patch("rally.task.engine.objects.Deployment.get")
+    def test__validate_config_semantic_disabled(
+            self, mock_deployment_get,
+            mock__validate_config_semantic_helper,
+            mock_users_ctx, mock_clients, mock_task_config):
+        mock_users_ctx.UserGenerator = fakes.FakeUserContext
+        config = mock.MagicMock()
+        config.subtasks = [mock.MagicMock(scenarios=[{"name": "a"}])]
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+
+        eng._validate_config_semantic(config)
+
+        self.assertFalse(mock_clients.called)
+        self.assertFalse(mock__validate_config_semantic_helper.called)
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_validation_jobs(self, mock_task_config):
+        engine.CONF.set_override("semantic_validation_workers", 2,
+                                 "benchmark")
+        self.addCleanup(engine.CONF.clear_override,
+                        "semantic_validation_workers", "benchmark")
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def helper(*args):
+            with lock:
+                running.append(args)
+                max_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(args)
+
+        eng._validate_config_semantic_helper = mock.Mock(side_effect=helper)
+        jobs = [("admin", "user", "a", pos, "d", {}) for pos in range(6)]
+        eng._run_validation_jobs(jobs)
+
+        self.assertEqual(6, eng._validate_config_semantic_helper.call_count)
+        eng._validate_config_semantic_helper.assert_has_calls(
+            [mock.call(*job) for job in jobs], any_order=True)
+        self.assertEqual(2, max(max_running))
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_validation_jobs_first_error_is_raised(
+            self, mock_task_config):
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
+
+        def helper(admin, user, name, pos, deployment, kwargs):
+            if pos:
+                # NOTE: the first error in order is raised even if it
+                #       happens later
+                time.sleep(0.05 if pos == 1 else 0)
+                raise exceptions.InvalidBenchmarkConfig(
+                    name=name, pos=pos, config=kwargs, reason="fail")
+
+        eng._validate_config_semantic_helper = helper
+        jobs = [("admin", "user", "a", pos, "d", {}) for pos in range(3)]
+        e = self.assertRaises(exceptions.InvalidBenchmarkConfig,
+                              eng._run_validation_jobs, jobs)
+        self.assertIn("Input task is invalid!", "%s" % e)
+        self.assertIn("Benchmark a[1]", "%s" % e)
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_validation_jobs_stops_on_error(self, mock_task_config):
+        engine.CONF.set_override("semantic_validation_workers", 1,
+                                 "benchmark")
+        self.addCleanup(engine.CONF.clear_override,
+                        "semantic_validation_workers", "benchmark")
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
+        eng._validate_config_semantic_helper = mock.Mock(
+            side_effect=exceptions.InvalidScenarioArgument)
+
+        self.assertRaises(exceptions.InvalidScenarioArgument,
+                          eng._run_validation_jobs, [("a",), ("b",)])
+        eng._validate_config_semantic_helper.assert_called_once_with("a")
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.ResultConsumer")
@@ -344,7 +440,7 @@ class BenchmarkEngineTestCase(test.TestCase):
         mock_result_consumer.is_task_in_aborting_status.return_value = False
 
         mock_task_instance = mock.MagicMock()
-        mock_subtask = mock.MagicMock()
+        mock_subtask = mock.MagicMock(run_in_parallel=False)
         mock_subtask.scenarios = [
             {"name": "a.benchmark", "context": {"context_a": {"a": 1}}},
             {"name": "b.benchmark", "context": {"context_b": {"b": 2}}}
@@ -413,6 +509,173 @@ class BenchmarkEngineTestCase(test.TestCase):
         self.assertEqual(mock.call(consts.TaskStatus.ABORTED),
                          task.update_status.mock_calls[-1])
 
+    @mock.patch("rally.task.engine.objects.Task.get_status")
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.BenchmarkEngine._run_scenario")
+    def test_run_progress_server(self, mock__run_scenario, mock_task_config,
+                                 mock_task_get_status):
+        server = self.mock_progress_server.return_value
+        mock_subtask = mock.MagicMock(run_in_parallel=False,
+                                      scenarios=["a"])
+        mock_task_config.return_value.subtasks = [mock_subtask]
+        task = mock.MagicMock()
+        task.__getitem__.side_effect = {"uuid": "task-uuid"}.__getitem__
+        eng = engine.BenchmarkEngine(mock.MagicMock(), task)
+
+        def run_scenario(pos, scenario_obj):
+            self.assertEqual(server, eng.progress_server)
+
+        mock__run_scenario.side_effect = run_scenario
+        eng.run()
+
+        self.mock_progress_server.assert_called_once_with("task-uuid")
+        server.start.assert_called_once_with()
+        server.stop.assert_called_once_with()
+        self.assertEqual(1, mock__run_scenario.call_count)
+        self.assertIsNone(eng.progress_server)
+
+    @mock.patch("rally.task.engine.objects.Task.get_status")
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.BenchmarkEngine._run_subtasks",
+                side_effect=ValueError)
+    @mock.patch("rally.task.engine.types.clear_preprocess_cache")
+    def test_run_progress_server_stops_on_error(
+            self, mock_clear_preprocess_cache, mock__run_subtasks,
+            mock_task_config, mock_task_get_status):
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(mock.MagicMock(), task)
+        self.assertRaises(ValueError, eng.run)
+        self.mock_progress_server.return_value.stop.assert_called_once_with()
+        mock_clear_preprocess_cache.assert_called_once_with(
+            task.__getitem__.return_value)
+
+    @mock.patch("rally.task.engine.objects.Task.get_status")
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.BenchmarkEngine._run_subtasks")
+    def test_run_progress_disabled(self, mock__run_subtasks,
+                                   mock_task_config, mock_task_get_status):
+        engine.CONF.set_override("progress_enabled", False, "benchmark")
+        self.addCleanup(engine.CONF.clear_override, "progress_enabled",
+                        "benchmark")
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
+        eng.run()
+
+        self.assertFalse(self.mock_progress_server.called)
+        mock__run_subtasks.assert_called_once_with()
+
+    @mock.patch("rally.task.engine.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.is_task_in_aborting_status",
+                return_value=False)
+    @mock.patch("rally.task.engine.BenchmarkEngine._run_in_parallel")
+    @mock.patch("rally.task.engine.BenchmarkEngine._run_scenario")
+    def test_run_in_parallel_groups(
+            self, mock__run_scenario, mock__run_in_parallel,
+            mock_result_consumer_is_task_in_aborting_status,
+            mock_task_get_status):
+        scenario = {"name": "a.benchmark", "runner": {"type": "serial"}}
+        config = {
+            "version": 2, "title": "foo",
+            "subtasks": [
+                {"title": "s1", "scenarios": [scenario]},
+                {"title": "s2", "run_in_parallel": True,
+                 "scenarios": [scenario]},
+                {"title": "s3", "run_in_parallel": True,
+                 "scenarios": [scenario]},
+                {"title": "s4", "scenarios": [scenario]}]}
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+        eng.run()
+
+        self.assertEqual([mock.call(0, scenario), mock.call(0, scenario)],
+                         mock__run_scenario.mock_calls)
+        mock__run_in_parallel.assert_called_once_with(mock.ANY)
+        self.assertEqual(
+            ["s2", "s3"],
+            [s.title for s in mock__run_in_parallel.call_args[0][0]])
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.BenchmarkEngine._run_scenario")
+    def test__run_in_parallel(self, mock__run_scenario, mock_task_config):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def run_scenario(pos, scenario_obj, tstamp_base):
+            if scenario_obj == "a":
+                started.set()
+                proceed.wait(5)
+            else:
+                # NOTE: "b" starts while "a" is still running
+                self.assertTrue(started.wait(5))
+                proceed.set()
+
+        mock__run_scenario.side_effect = run_scenario
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
+        eng._run_in_parallel([mock.Mock(scenarios=["a"]),
+                              mock.Mock(scenarios=["b"])])
+
+        self.assertTrue(proceed.is_set())
+        self.assertEqual(2, mock__run_scenario.call_count)
+        tstamp_bases = set(c[0][2] for c in mock__run_scenario.call_args_list)
+        self.assertEqual(1, len(tstamp_bases))
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.distributed.DistributedRunner")
+    def test__get_runner_distributed(self, mock_distributed_runner,
+                                     mock_task_config):
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(mock.MagicMock(), task,
+                                     distributed=True)
+        runner_obj = eng._get_runner({"runner": {"type": "constant"}})
+
+        self.assertEqual(mock_distributed_runner.return_value, runner_obj)
+        mock_distributed_runner.assert_called_once_with(
+            task, {"type": "constant"})
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.BenchmarkEngine._prepare_context")
+    @mock.patch("rally.task.engine.BenchmarkEngine._get_runner")
+    def test__run_scenario_distributed(
+            self, mock_benchmark_engine__get_runner,
+            mock_benchmark_engine__prepare_context, mock_context_manager,
+            mock_result_consumer, mock_task_config):
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock(),
+                                     distributed=True)
+        eng._run_scenario(0, {"name": "a.benchmark", "args": {"a": 1}})
+
+        mock_context_manager.assert_called_once_with(
+            mock_benchmark_engine__prepare_context.return_value)
+        runner_obj = mock_benchmark_engine__get_runner.return_value
+        runner_obj.run.assert_called_once_with(
+            "a.benchmark", mock_benchmark_engine__prepare_context.return_value,
+            {"a": 1})
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.types.clear_preprocess_cache")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.BenchmarkEngine._prepare_context")
+    @mock.patch("rally.task.engine.BenchmarkEngine._get_runner")
+    def test__run_scenario_clears_preprocess_cache(
+            self, mock_benchmark_engine__get_runner,
+            mock_benchmark_engine__prepare_context, mock_context_manager,
+            mock_clear_preprocess_cache, mock_result_consumer,
+            mock_task_config):
+        calls = mock.Mock()
+        calls.attach_mock(mock_context_manager.return_value, "ctx")
+        calls.attach_mock(mock_benchmark_engine__get_runner.return_value,
+                          "runner")
+        calls.attach_mock(mock_clear_preprocess_cache, "clear")
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(mock.MagicMock(), task)
+        eng._run_scenario(0, {"name": "a.benchmark", "args": {"a": 1}})
+
+        uuid = task.__getitem__.return_value
+        self.assertEqual(
+            ["ctx.__enter__", "clear", "runner.run", "ctx.__exit__", "clear"],
+            [c[0] for c in calls.mock_calls])
+        mock_clear_preprocess_cache.assert_has_calls([mock.call(uuid)] * 2)
+
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.scenario.Scenario.get")
     def test__prepare_context(self, mock_scenario_get, mock_task_config):
@@ -473,6 +736,18 @@ class BenchmarkEngineTestCase(test.TestCase):
 
 class ResultConsumerTestCase(test.TestCase):
 
+    def setUp(self):
+        super(ResultConsumerTestCase, self).setUp()
+        patcher = mock.patch("rally.task.engine.objects.task.ResultInfo")
+        self.mock_result_info = patcher.start()
+        self.addCleanup(patcher.stop)
+        # NOTE: SLA is checked for every result unless a test enables
+        #       batch checks
+        patcher = mock.patch("rally.task.engine.columns.is_available",
+                             return_value=False)
+        self.mock_columns_is_available = patcher.start()
+        self.addCleanup(patcher.stop)
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
@@ -498,8 +773,86 @@ class ResultConsumerTestCase(test.TestCase):
 
         self.assertEqual(list(map(mock.call, results)),
                          mock_sla_instance.add_iteration.mock_calls)
-        self.assertEqual(sorted(results, key=lambda x: x["timestamp"]),
-                         consumer_obj.results)
+        self.assertEqual([], consumer_obj.results)
+        task_result_id = task.append_results.return_value["id"]
+        task.append_results_chunk.assert_called_once_with(
+            task_result_id, sorted(results, key=lambda x: x["timestamp"]))
+        task.update_results.assert_called_once_with(task_result_id, {
+            "raw": [],
+            "load_duration": runner.run_duration,
+            "full_duration": mock.ANY,
+            "sla": mock_sla_instance.results.return_value,
+            "info": self.mock_result_info.return_value.to_dict.return_value})
+        self.assertEqual(
+            list(map(mock.call, results)),
+            self.mock_result_info.return_value.add.mock_calls)
+
+    @mock.patch("rally.task.engine.progress.ScenarioProgress")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_progress(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_scenario_progress):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        results = [{"duration": 1, "timestamp": 3},
+                   {"duration": 2, "timestamp": 2}]
+        runner = mock.MagicMock(result_queue=collections.deque(results))
+        server = mock.MagicMock()
+
+        with engine.ResultConsumer(key, mock.MagicMock(), runner, False,
+                                   progress_server=server) as consumer:
+            server.add_abort_listener.assert_called_once_with(
+                consumer.wakeup)
+
+        mock_scenario_progress.assert_called_once_with(key)
+        scenario_progress = mock_scenario_progress.return_value
+        server.register.assert_called_once_with(scenario_progress)
+        server.unregister.assert_called_once_with(scenario_progress)
+        server.remove_abort_listener.assert_called_once_with(consumer.wakeup)
+        self.assertEqual(list(map(mock.call, results)),
+                         scenario_progress.add.mock_calls)
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_tstamp_base(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        self.mock_result_info.return_value.to_dict.side_effect = (
+            lambda: {"tstamp_start": 42})
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = mock.MagicMock(result_queue=collections.deque())
+
+        with engine.ResultConsumer(key, task, runner, False):
+            pass
+        with engine.ResultConsumer(key, task, runner, False, tstamp_base=10):
+            pass
+
+        self.assertEqual(
+            [{"tstamp_start": 42, "tstamp_base": 42},
+             {"tstamp_start": 42, "tstamp_base": 10}],
+            [c[0][1]["info"] for c in task.update_results.call_args_list])
+
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test__consume_batch_flushes_chunks(self, mock_sla_checker):
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque(
+            [{"timestamp": 3}, {"timestamp": 1}, {"timestamp": 2}])
+
+        consumer = engine.ResultConsumer(key, task, runner, False)
+        consumer.task_result = {"id": 42}
+        consumer.chunk_size = 2
+        consumer._consume_batch()
+
+        task.append_results_chunk.assert_called_once_with(
+            42, [{"timestamp": 1}, {"timestamp": 3}])
+        self.assertEqual([{"timestamp": 2}], consumer.results)
 
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
@@ -523,6 +876,62 @@ class ResultConsumerTestCase(test.TestCase):
 
         self.assertTrue(runner.abort.called)
 
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test__consume_batch(self, mock_sla_checker):
+        mock_sla_instance = mock_sla_checker.return_value
+        mock_sla_instance.add_iteration.side_effect = [True, False, True]
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque([1, 2, 3])
+
+        consumer = engine.ResultConsumer(key, mock.MagicMock(), runner, True)
+        self.assertTrue(runner.notify_every_result)
+        consumer._consume_batch()
+
+        self.assertEqual([1, 2, 3], consumer.results)
+        self.assertEqual(0, len(runner.result_queue))
+        runner.abort.assert_called_once_with()
+        mock_sla_instance.set_aborted_on_sla.assert_called_once_with()
+
+    @mock.patch("rally.task.engine.columns.IterationColumns")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test__consume_batch_columns(self, mock_sla_checker,
+                                    mock_iteration_columns):
+        self.mock_columns_is_available.return_value = True
+        mock_sla_instance = mock_sla_checker.return_value
+        mock_sla_instance.add_columns.return_value = False
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque([1, 2, 3])
+
+        consumer = engine.ResultConsumer(key, mock.MagicMock(), runner,
+                                         False)
+        consumer._consume_batch()
+
+        self.assertEqual([1, 2, 3], consumer.results)
+        mock_iteration_columns.assert_called_once_with([1, 2, 3])
+        mock_sla_instance.add_columns.assert_called_once_with(
+            mock_iteration_columns.return_value)
+        self.assertFalse(mock_sla_instance.add_iteration.called)
+        self.assertFalse(runner.abort.called)
+
+    @mock.patch("rally.task.engine.columns.IterationColumns")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test__consume_batch_abort_on_sla_failure_no_columns(
+            self, mock_sla_checker, mock_iteration_columns):
+        self.mock_columns_is_available.return_value = True
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque([1, 2])
+
+        consumer = engine.ResultConsumer(key, mock.MagicMock(), runner, True)
+        consumer._consume_batch()
+
+        self.assertFalse(mock_iteration_columns.called)
+        self.assertEqual(
+            [mock.call(1), mock.call(2)],
+            mock_sla_checker.return_value.add_iteration.call_args_list)
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
@@ -598,11 +1007,10 @@ class ResultConsumerTestCase(test.TestCase):
     @mock.patch("rally.task.engine.threading.Event")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.BenchmarkEngine._prepare_context")
-    @mock.patch("rally.task.engine.time.sleep")
     @mock.patch("rally.task.engine.BenchmarkEngine._get_runner")
     def test_wait_and_abort_on_abort(
             self, mock_benchmark_engine__get_runner,
-            mock_sleep, mock_benchmark_engine__prepare_context,
+            mock_benchmark_engine__prepare_context,
             mock_task_get_status, mock_event, mock_thread):
         runner = mock.MagicMock()
         key = mock.MagicMock()
@@ -625,10 +1033,9 @@ class ResultConsumerTestCase(test.TestCase):
     @mock.patch("rally.task.engine.threading.Event")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.BenchmarkEngine._prepare_context")
-    @mock.patch("rally.task.engine.time.sleep")
     @mock.patch("rally.task.engine.BenchmarkEngine._get_runner")
     def test_wait_and_abort_on_no_abort(
-            self, mock_benchmark_engine__get_runner, mock_sleep,
+            self, mock_benchmark_engine__get_runner,
             mock_benchmark_engine__prepare_context, mock_task_get_status,
             mock_event, mock_thread):
         runner = mock.MagicMock()
@@ -647,6 +1054,30 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertFalse(runner.abort.called)
         # test task.get_status is checked until is_done is not set
         self.assertEqual(4, mock_task_get_status.call_count)
+        mock_is_done.wait.assert_has_calls([mock.call(2.0)] * 4)
+
+    @mock.patch("rally.common.objects.Task.get_status",
+                return_value=consts.TaskStatus.RUNNING)
+    def test_wait_and_abort_wakeup(self, mock_task_get_status):
+        engine.CONF.set_override("abort_poll_interval", 60, "benchmark")
+        self.addCleanup(engine.CONF.clear_override, "abort_poll_interval",
+                        "benchmark")
+        server = mock.Mock()
+        res = engine.ResultConsumer(mock.MagicMock(), mock.MagicMock(),
+                                    mock.MagicMock(), False,
+                                    progress_server=server)
+        res.aborting_checker.start()
+        while not mock_task_get_status.called:
+            time.sleep(0.01)
+        # NOTE: the abort is noticed without waiting for the next poll
+        mock_task_get_status.return_value = consts.TaskStatus.ABORTING
+        res.wakeup.set()
+
+        res.aborting_checker.join(5)
+        self.assertFalse(res.aborting_checker.is_alive())
+        res.runner.abort.assert_called_once_with()
+        res.task.update_status.assert_called_once_with(
+            consts.TaskStatus.ABORTED)
 
 
 class TaskTestCase(test.TestCase):
@@ -711,6 +1142,15 @@ class TaskTestCase(test.TestCase):
             })
         ])
 
+    def test_subtask_run_in_parallel(self):
+        scenarios = [{"name": "a.benchmark", "runner": {"type": "serial"}}]
+        self.assertFalse(
+            engine.SubTask({"title": "a", "scenarios": scenarios}
+                           ).run_in_parallel)
+        self.assertTrue(
+            engine.SubTask({"title": "a", "scenarios": scenarios,
+                            "run_in_parallel": True}).run_in_parallel)
+
     @mock.patch("rally.task.engine.SubTask")
     @mock.patch("rally.task.engine.TaskConfig._get_version")
     @mock.patch("rally.task.engine.TaskConfig._validate_json")
@@ -0,0 +1,155 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+from oslo_config import cfg
+
+from rally.task import progress
+from tests.unit import test
+
+
+BASE = "rally.task.progress."
+CONF = cfg.CONF
+
+
+def set_overrides(test_case, **overrides):
+    for name, value in overrides.items():
+        CONF.set_override(name, value, "benchmark")
+        test_case.addCleanup(CONF.clear_override, name, "benchmark")
+
+
+def make_result(timestamp, duration, error=False):
+    return {"timestamp": timestamp, "duration": duration,
+            "idle_duration": 0, "atomic_actions": {},
+            "error": ["E", "msg", "tb"] if error else [],
+            "scenario_output": {"errors": "", "data": {}}}
+
+
+class ScenarioProgressTestCase(test.TestCase):
+
+    def test_to_dict(self):
+        scenario = progress.ScenarioProgress({"name": "Foo.bar", "pos": 1},
+                                             window=4)
+        # NOTE: finished at 97, out of the window [100, 104)
+        scenario.add(make_result(95, 2))
+        for i in range(10):
+            scenario.add(make_result(100 + i * 0.3, 0.5 + i * 0.1))
+        scenario.add(make_result(101, 2, error=True))
+        # NOTE: finished at 104, not in a full second yet
+        scenario.add(make_result(103, 1))
+
+        self.assertEqual(
+            {"name": "Foo.bar", "pos": 1, "iterations": 13, "failures": 1,
+             "window": 4, "throughput": 2.5, "per_second": [2, 2, 3, 3],
+             "error_rate": 0.1, "in_flight": 2.525,
+             "latency": {"min": 0.5, "median": 0.9, "90%ile": 1.22,
+                         "95%ile": 1.26, "max": 1.3}},
+            self._round(scenario.to_dict(now=104.5)))
+
+    def _round(self, data):
+        if isinstance(data, dict):
+            return dict((k, self._round(v)) for k, v in data.items())
+        if isinstance(data, float):
+            return round(data, 6)
+        return data
+
+    def test_to_dict_empty(self):
+        scenario = progress.ScenarioProgress({"name": "Foo.bar", "pos": 0},
+                                             window=2)
+        scenario.add(make_result(10, 1))
+        data = scenario.to_dict(now=100)
+
+        self.assertEqual(1, data["iterations"])
+        self.assertEqual(0, data["throughput"])
+        self.assertEqual([0, 0], data["per_second"])
+        self.assertEqual(0, data["error_rate"])
+        self.assertEqual({"min": None, "median": None, "90%ile": None,
+                          "95%ile": None, "max": None}, data["latency"])
+
+    def test_window_default(self):
+        set_overrides(self, progress_window=7)
+        scenario = progress.ScenarioProgress({"name": "Foo.bar", "pos": 0})
+        self.assertEqual(7, scenario.window)
+
+
+class ProgressServerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProgressServerTestCase, self).setUp()
+        self.progress_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.progress_dir)
+        set_overrides(self, progress_port=0,
+                      progress_dir=os.path.join(self.progress_dir, "sub"))
+
+    def test_serve(self):
+        scenario = progress.ScenarioProgress({"name": "Foo.bar", "pos": 0})
+        scenario.add(make_result(1, 1))
+
+        with progress.ProgressServer("task-uuid") as server:
+            address = progress.get_address("task-uuid")
+            self.assertEqual(server.address, address)
+            self.assertEqual({"task": "task-uuid", "scenarios": []},
+                             progress.fetch(address))
+
+            server.register(scenario)
+            data = progress.fetch(address)
+            self.assertEqual("task-uuid", data["task"])
+            self.assertEqual([1], [s["iterations"]
+                                   for s in data["scenarios"]])
+
+            server.unregister(scenario)
+            self.assertEqual([], progress.fetch(address)["scenarios"])
+
+        self.assertIsNone(progress.get_address("task-uuid"))
+        self.assertRaises(IOError, progress.fetch, address)
+
+    def test_notify_abort(self):
+        event = mock.Mock()
+        with progress.ProgressServer("task-uuid") as server:
+            server.add_abort_listener(event)
+            self.assertTrue(progress.notify_abort("task-uuid"))
+            event.set.assert_called_once_with()
+
+            server.remove_abort_listener(event)
+            self.assertTrue(progress.notify_abort("task-uuid"))
+            event.set.assert_called_once_with()
+
+            self.assertRaises(IOError, progress.urllib_request.urlopen,
+                              progress.urllib_request.Request(
+                                  "http://%s/foo" % server.address, data=b""),
+                              timeout=5)
+
+        self.assertFalse(progress.notify_abort("task-uuid"))
+
+    @mock.patch(BASE + "get_address", return_value="127.0.0.1:1")
+    def test_notify_abort_not_reachable(self, mock_get_address):
+        self.assertFalse(progress.notify_abort("task-uuid"))
+
+    @mock.patch(BASE + "LOG")
+    def test_start_fails(self, mock_log):
+        with progress.ProgressServer("task-1") as server:
+            # NOTE: the port is in use by the first server
+            set_overrides(self, progress_port=int(
+                server.address.split(":")[1]))
+            failed = progress.ProgressServer("task-2")
+            failed.start()
+            failed.stop()
+
+        self.assertTrue(mock_log.warning.called)
+        self.assertIsNone(failed.address)
+        self.assertIsNone(progress.get_address("task-2"))
@@ -15,9 +15,12 @@
 
 import collections
 import multiprocessing
+import threading
+import time
 
 import jsonschema
 import mock
+from six.moves import queue as Queue
 
 from rally.plugins.common.runners import serial
 from rally.task import runner
@@ -124,6 +127,96 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
                          ["Exception", "Something went wrong"])
 
 
+class WorkerThreadPoolTestCase(test.TestCase):
+
+    def _next_iteration(self, times):
+        iterations = iter(range(times))
+        lock = threading.Lock()
+
+        def next_iteration():
+            with lock:
+                return next(iterations, None)
+        return next_iteration
+
+    @mock.patch(BASE + "_get_scenario_context")
+    @mock.patch(BASE + "_run_scenario_once")
+    def test_spawn_and_join(self, mock__run_scenario_once,
+                            mock__get_scenario_context):
+        mock__run_scenario_once.side_effect = lambda args: {
+            "duration": 0, "idle_duration": 0, "iteration": args[0]}
+        mock__get_scenario_context.return_value = {"user": "foo"}
+        # NOTE: MagicMock may lose calls made from several threads at once
+        queue = Queue.Queue()
+
+        pool = runner.WorkerThreadPool(queue, self._next_iteration(10),
+                                       "Dummy", "dummy", "ctx", {"a": 1})
+        pool.spawn(3)
+        self.assertEqual(3, len(pool))
+        self.assertTrue(pool.join() >= 0)
+
+        self.assertEqual(10, pool.finished)
+        self.assertEqual(list(range(10)),
+                         sorted(r["iteration"] for r in queue.queue))
+        # NOTE: context is mapped once per thread, not once per iteration
+        self.assertEqual([mock.call("ctx")] * 3,
+                         mock__get_scenario_context.call_args_list)
+        for call in mock__run_scenario_once.call_args_list:
+            iteration, cls, method_name, context, args = call[0][0]
+            self.assertEqual(("Dummy", "dummy", {"user": "foo"}, {"a": 1}),
+                             (cls, method_name, context, args))
+            self.assertIsNot(mock__get_scenario_context.return_value,
+                             context)
+
+    @mock.patch(BASE + "LOG")
+    def test_join_overhead_budget(self, mock_log):
+        context = {"task": {"uuid": "foo"}, "config": {}}
+        queue = mock.MagicMock()
+        pool = runner.WorkerThreadPool(queue, self._next_iteration(1000),
+                                       fakes.FakeScenario, "do_it", context,
+                                       {})
+        with mock.patch(BASE + "_get_scenario_context",
+                        side_effect=lambda ctx: dict(ctx)):
+            pool.spawn()
+            overhead = pool.join()
+
+        self.assertEqual(1000, queue.put.call_count)
+        self.assertTrue(
+            overhead < runner.WorkerThreadPool.ITERATION_OVERHEAD_BUDGET,
+            "Runner overhead %ss per iteration is over budget" % overhead)
+        self.assertFalse(mock_log.warning.called)
+
+    @mock.patch(BASE + "_get_scenario_context")
+    @mock.patch(BASE + "_run_scenario_once")
+    def test_join_overhead_excludes_waits(self, mock__run_scenario_once,
+                                          mock__get_scenario_context):
+        mock__run_scenario_once.return_value = {"duration": 0,
+                                                "idle_duration": 0}
+        iterations = self._next_iteration(3)
+        iteration_done = mock.Mock()
+
+        def next_iteration():
+            # NOTE: e.g. rps runner waits for the next iteration to start
+            time.sleep(0.01)
+            return iterations()
+
+        pool = runner.WorkerThreadPool(Queue.Queue(), next_iteration,
+                                       "Dummy", "dummy", {}, {},
+                                       iteration_done=iteration_done)
+        pool.spawn()
+
+        self.assertTrue(pool.join() < 0.01)
+        self.assertEqual(3, iteration_done.call_count)
+
+    @mock.patch(BASE + "LOG")
+    def test_join_overhead_over_budget(self, mock_log):
+        pool = runner.WorkerThreadPool(mock.Mock(), mock.Mock(), "Dummy",
+                                       "dummy", {}, {})
+        pool.finished = 2
+        pool.overhead = 1.0
+        self.assertEqual(0.5, pool.join())
+        self.assertTrue(mock_log.warning.called)
+
+
 class ScenarioRunnerResultTestCase(test.TestCase):
 
     def test_validate(self):
@@ -243,3 +336,104 @@ class ScenarioRunnerTestCase(test.TestCase):
 
         self.assertEqual(processes, process.join.call_count)
         mock_result_queue.close.assert_called_once_with()
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_batches(self, mock_scenario_runner__send_result):
+        process = mock.MagicMock()
+        process.is_alive.side_effect = [True, False]
+        # NOTE: multiprocessing.Queue.put() is asynchronous, so use a queue
+        #       with the same interface that has all the items right away
+        result_queue = Queue.Queue()
+        result_queue.close = mock.Mock()
+        for i in range(5):
+            result_queue.put(i)
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.result_batch_size = 3
+
+        runner_obj._join_processes(collections.deque([process]),
+                                   result_queue)
+
+        self.assertEqual([mock.call(i) for i in range(5)],
+                         mock_scenario_runner__send_result.mock_calls)
+        process.join.assert_called_once_with()
+        result_queue.close.assert_called_once_with()
+
+    def test_wait_for_results_batch_is_ready(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.result_batch_size = 2
+        runner_obj.result_flush_interval = 60
+        stop_event = threading.Event()
+
+        def send():
+            runner_obj.result_queue.append(1)
+            runner_obj.result_queue.append(2)
+            runner_obj.notify_results()
+
+        with mock.patch.object(runner_obj, "_result_ready") as mock_cond:
+            mock_cond.wait.side_effect = lambda timeout: send()
+            runner_obj.wait_for_results(stop_event)
+            mock_cond.wait.assert_called_once_with(60)
+
+            runner_obj.wait_for_results(stop_event)
+            mock_cond.wait.assert_called_once_with(60)
+
+    def test_wait_for_results_stopped(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.result_flush_interval = 60
+        stop_event = threading.Event()
+        stop_event.set()
+
+        with mock.patch.object(runner_obj, "_result_ready") as mock_cond:
+            runner_obj.wait_for_results(stop_event)
+            self.assertFalse(mock_cond.wait.called)
+
+    @mock.patch(BASE + "ScenarioRunner.notify_results")
+    def test__send_result_notifies_on_full_batch(
+            self, mock_scenario_runner_notify_results):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.result_batch_size = 2
+        result = {"duration": 1, "timestamp": 1, "idle_duration": 0,
+                  "error": [], "scenario_output": {}, "atomic_actions": {}}
+
+        runner_obj._send_result(result)
+        self.assertFalse(mock_scenario_runner_notify_results.called)
+        runner_obj._send_result(result)
+        mock_scenario_runner_notify_results.assert_called_once_with()
+
+    @mock.patch(BASE + "ScenarioRunner.notify_results")
+    def test__send_result_notifies_every_result(
+            self, mock_scenario_runner_notify_results):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.notify_every_result = True
+        result = {"duration": 1, "timestamp": 1, "idle_duration": 0,
+                  "error": [], "scenario_output": {}, "atomic_actions": {}}
+
+        runner_obj._send_result(result)
+        mock_scenario_runner_notify_results.assert_called_once_with()
+        runner_obj._send_result(result)
+        mock_scenario_runner_notify_results.assert_called_once_with()
+        runner_obj.result_queue.clear()
+        runner_obj._send_result(result)
+        self.assertEqual(2, mock_scenario_runner_notify_results.call_count)
+
+    def test_wait_for_results_notify_every_result(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.notify_every_result = True
+        runner_obj.result_queue.append(1)
+
+        with mock.patch.object(runner_obj, "_result_ready") as mock_cond:
+            runner_obj.wait_for_results(threading.Event())
+            self.assertFalse(mock_cond.wait.called)
@@ -81,6 +81,19 @@ class ScenarioTestCase(test.TestCase):
             validator.assert_called_with(config, clients=clients,
                                          deployment=deployment)
 
+    def test__validate_helper_validation_run(self):
+        validators = [mock.MagicMock(), mock.MagicMock()]
+        validation_run = mock.MagicMock()
+        validation_run.validate.return_value = (
+            validation.ValidationResult(True))
+        scenario.Scenario._validate_helper(validators, "cl", "config",
+                                           "deployment", validation_run)
+        validation_run.validate.assert_has_calls(
+            [mock.call(validator, "config", "cl", "deployment")
+             for validator in validators])
+        for validator in validators:
+            self.assertFalse(validator.called)
+
     def test__validate_helper_somethingwent_wrong(self):
         validator = mock.MagicMock()
         validator.side_effect = Exception()
@@ -144,7 +157,7 @@ class ScenarioTestCase(test.TestCase):
         scenario.Scenario.validate("Testing.validate_admin_validators",
                                    args, admin="admin", deployment=deployment)
         mock_scenario__validate_helper.assert_called_once_with(
-            validators, "admin", args, deployment)
+            validators, "admin", args, deployment, None)
 
         Testing.validate_admin_validators.unregister()
 
@@ -171,8 +184,8 @@ class ScenarioTestCase(test.TestCase):
             "Testing.validate_user_validators", args, users=["u1", "u2"])
 
         mock_scenario__validate_helper.assert_has_calls([
-            mock.call(validators, "u1", args, None),
-            mock.call(validators, "u2", args, None)
+            mock.call(validators, "u1", args, None, None),
+            mock.call(validators, "u2", args, None, None)
         ])
 
         Testing.validate_user_validators.unregister()
@@ -14,6 +14,8 @@
 #    under the License.
 
 
+import mock
+
 from rally.common.plugin import plugin
 from rally.task import sla
 from tests.unit import test
@@ -50,6 +52,17 @@ class SLACheckerTestCase(test.TestCase):
                             "success": False}]
         self.assertEqual(expected_result, sla_checker.results())
 
+    def test_add_columns(self):
+        sla_checker = sla.SLAChecker({"sla": {"test_criterion": 42}})
+        self.assertTrue(sla_checker.add_columns(mock.Mock(iterations=[42])))
+        self.assertFalse(sla_checker.add_columns(
+            mock.Mock(iterations=[42, 43])))
+        self.assertTrue(sla_checker.add_columns(
+            mock.Mock(iterations=[43, 42])))
+        self.assertEqual([{"criterion": "test_criterion",
+                           "detail": "detail",
+                           "success": True}], sla_checker.results())
+
     def test_set_unexpected_failure(self):
         exc = "error;("
         sla_checker = sla.SLAChecker({"sla": {}})
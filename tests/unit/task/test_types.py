@@ -14,6 +14,7 @@
 #    under the License.
 
 import mock
+from oslo_config import fixture
 
 from rally import exceptions
 from rally.task import types
@@ -262,6 +263,14 @@ class EC2ImageResourceTypeTestCase(test.TestCase):
                           types.EC2ImageResourceType.transform, self.clients,
                           resource_config)
 
+    def test_transform_by_name_filtered(self):
+        resource_config = {"name": "cirros-0.3.4-uec"}
+        ec2_image_id = types.EC2ImageResourceType.transform(
+            clients=self.clients, resource_config=resource_config)
+        self.assertEqual(ec2_image_id, "200")
+        self.clients.ec2().get_all_images.assert_called_once_with(
+            filters={"name": "cirros-0.3.4-uec"})
+
 
 class VolumeTypeResourceTypeTestCase(test.TestCase):
 
@@ -366,6 +375,98 @@ class PreprocessTestCase(test.TestCase):
         self.assertEqual({"a": 20, "b": 20}, result)
 
 
+class PreprocessCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PreprocessCacheTestCase, self).setUp()
+        self.preprocessor = mock.Mock()
+        self.preprocessor.transform.side_effect = lambda clients, \
+            resource_config: [resource_config["name"]]
+
+    @mock.patch("rally.task.types.scenario.Scenario.get")
+    @mock.patch("rally.task.types.osclients")
+    def test_preprocess(self, mock_osclients, mock_scenario_get):
+        mock_scenario_get.return_value._meta_get.return_value = {
+            "a": self.preprocessor}
+        context = {"task": {"uuid": "task-uuid"},
+                   "admin": {"endpoint": mock.Mock()}}
+        self.addCleanup(types.clear_preprocess_cache, "task-uuid")
+
+        for i in range(3):
+            self.assertEqual({"a": ["x"], "b": 1},
+                             types.preprocess("some_plugin", context,
+                                              {"a": {"name": "x"}, "b": 1}))
+        self.preprocessor.transform.assert_called_once_with(
+            clients=mock_osclients.Clients.return_value,
+            resource_config={"name": "x"})
+        mock_osclients.Clients.assert_called_once_with(
+            context["admin"]["endpoint"])
+
+        types.clear_preprocess_cache("task-uuid")
+        types.preprocess("some_plugin", context, {"a": {"name": "x"}})
+        self.assertEqual(2, self.preprocessor.transform.call_count)
+
+    @mock.patch("rally.task.types.time.time")
+    @mock.patch("rally.task.types.osclients")
+    def test_transform(self, mock_osclients, mock_time):
+        mock_time.return_value = 100
+        cache = types.PreprocessCache(mock.Mock(), ttl=10)
+
+        value = cache.transform(self.preprocessor, {"name": "x"})
+        value.append("changed")
+        self.assertEqual(["x"], cache.transform(self.preprocessor,
+                                                {"name": "x"}))
+        self.assertEqual(["y"], cache.transform(self.preprocessor,
+                                                {"name": "y"}))
+        self.assertEqual(2, self.preprocessor.transform.call_count)
+
+        mock_time.return_value = 110
+        cache.transform(self.preprocessor, {"name": "x"})
+        self.assertEqual(3, self.preprocessor.transform.call_count)
+
+    @mock.patch("rally.task.types.osclients")
+    def test_transform_no_ttl(self, mock_osclients):
+        cache = types.PreprocessCache(mock.Mock(), ttl=0)
+        cache.transform(self.preprocessor, {"name": "x"})
+        cache.transform(self.preprocessor, {"name": "x"})
+        self.assertEqual(2, self.preprocessor.transform.call_count)
+
+    @mock.patch("rally.task.types.time.time", return_value=100)
+    @mock.patch("rally.task.types.osclients")
+    def test_get_preprocess_cache(self, mock_osclients, mock_time):
+        self.addCleanup(types.clear_preprocess_cache, "task-1")
+        self.addCleanup(types.clear_preprocess_cache, "task-2")
+        cache = types.get_preprocess_cache("task-1", mock.Mock())
+        self.assertIs(cache, types.get_preprocess_cache("task-1", None))
+
+        mock_time.return_value = 100 + cache.ttl
+        types.get_preprocess_cache("task-2", None)
+        self.assertIsNot(cache, types.get_preprocess_cache("task-1", None))
+
+    def test__list_resources(self):
+        clients = mock.Mock(cache={})
+        list_resources = mock.Mock(return_value=iter([1, 2]))
+        for i in range(2):
+            self.assertEqual([1, 2], types._list_resources(
+                clients, "foo", list_resources))
+        list_resources.assert_called_once_with()
+
+    def test__list_resources_no_cache(self):
+        list_resources = mock.Mock(return_value=[1, 2])
+        types._list_resources(fakes.FakeClients(), "foo", list_resources)
+        types._list_resources(fakes.FakeClients(), "foo", list_resources)
+        self.assertEqual(2, list_resources.call_count)
+
+    def test__list_resources_no_ttl(self):
+        self.useFixture(fixture.Config()).config(preprocess_cache_ttl=0,
+                                                 group="benchmark")
+        clients = mock.Mock(cache={})
+        list_resources = mock.Mock(return_value=[1, 2])
+        types._list_resources(clients, "foo", list_resources)
+        types._list_resources(clients, "foo", list_resources)
+        self.assertEqual(2, list_resources.call_count)
+
+
 class FilePathOrUrlTypeTestCase(test.TestCase):
 
     @mock.patch("rally.task.types.os.path.isfile")
@@ -484,3 +484,153 @@ class WaitForStatusTestCase(test.TestCase):
                                     check_deletion=True,
                                     update_resource=upd)
         self.assertEqual(res, ret)
+
+
+class StatusPollMultiplexerTestCase(test.TestCase):
+
+    def _waiter(self, resource, check_deletion=False, timeout=10):
+        return utils.StatusWaiter(
+            mock.Mock(), resource, "group", set(["ACTIVE"]),
+            set(["ERROR"]), "status", timeout, 1, check_deletion)
+
+    def _resource(self, id, status):
+        return mock.Mock(id=id, status=status, spec=["id", "status",
+                                                     "manager"])
+
+    def test__poll(self):
+        waiters = [self._waiter(self._resource(i, "BUILD"))
+                   for i in range(4)]
+        listed = [self._resource(0, "ACTIVE"), self._resource(1, "ERROR"),
+                  self._resource(2, "BUILD"), self._resource(3, "BUILD")]
+        list_resources = mock.Mock(return_value=listed)
+        waited = [w.resource for w in waiters]
+
+        multiplexer = utils.StatusPollMultiplexer()
+        multiplexer._poll(list_resources, waiters)
+
+        list_resources.assert_called_once_with(waited)
+        self.assertEqual([True, True, False, False],
+                         [w.is_done() for w in waiters])
+        self.assertEqual(listed, [w.resource for w in waiters])
+        self.assertIsNone(waiters[0].error)
+        self.assertIsInstance(waiters[1].error,
+                              exceptions.GetResourceErrorStatus)
+        self.assertEqual([0.75] * 4, [w.polls_saved for w in waiters])
+
+    def test__poll_not_listed(self):
+        not_found = Exception()
+        not_found.code = 404
+        waiters = [self._waiter(self._resource(i, "BUILD"),
+                                check_deletion=i == 1)
+                   for i in range(4)]
+        waiters[0].resource.manager.get.side_effect = not_found
+        waiters[1].resource.manager.get.side_effect = not_found
+        waiters[2].resource.manager.get.return_value = self._resource(
+            2, "ACTIVE")
+        waiters[3].resource.manager.get.side_effect = ValueError("foo")
+
+        multiplexer = utils.StatusPollMultiplexer()
+        multiplexer._poll(mock.Mock(return_value=[]), waiters)
+
+        self.assertTrue(all(w.is_done() for w in waiters))
+        self.assertIsInstance(waiters[0].error,
+                              exceptions.GetResourceNotFound)
+        self.assertIsNone(waiters[1].error)
+        self.assertIsNone(waiters[1].resource)
+        self.assertIsNone(waiters[2].error)
+        self.assertEqual("ACTIVE", waiters[2].resource.status)
+        self.assertIsInstance(waiters[3].error,
+                              exceptions.GetResourceFailure)
+        self.assertEqual([-0.25] * 4, [w.polls_saved for w in waiters])
+
+    def test__poll_single_waiter(self):
+        waiter = self._waiter(self._resource(0, "BUILD"))
+        waiter.resource.manager.get.return_value = self._resource(
+            0, "ACTIVE")
+        list_resources = mock.Mock()
+
+        multiplexer = utils.StatusPollMultiplexer()
+        multiplexer._poll(list_resources, [waiter])
+
+        self.assertFalse(list_resources.called)
+        self.assertTrue(waiter.is_done())
+        self.assertEqual("ACTIVE", waiter.resource.status)
+        self.assertEqual(0, waiter.polls_saved)
+
+    def test__poll_list_failure(self):
+        waiters = [self._waiter(self._resource(i, "BUILD"))
+                   for i in range(3)]
+        waiters[0].resource.manager.get.return_value = self._resource(
+            0, "ACTIVE")
+        waiters[1].resource.manager.get.return_value = self._resource(
+            1, "BUILD")
+        waiters[2].resource.manager.get.side_effect = ValueError("bar")
+        multiplexer = utils.StatusPollMultiplexer()
+        multiplexer._poll(mock.Mock(side_effect=ValueError("foo")), waiters)
+
+        self.assertEqual([True, False, True],
+                         [w.is_done() for w in waiters])
+        self.assertIsNone(waiters[0].error)
+        self.assertEqual("ACTIVE", waiters[0].resource.status)
+        self.assertIsNone(waiters[1].error)
+        self.assertIsInstance(waiters[2].error,
+                              exceptions.GetResourceFailure)
+
+    def test_wait(self):
+        statuses = {"a": iter(["BUILD", "BUILD", "ACTIVE"]),
+                    "b": iter(["BUILD", "ACTIVE"])}
+        last = {}
+        manager = mock.Mock()
+
+        def get(id):
+            last[id] = next(statuses[id], last.get(id))
+            resource = self._resource(id, last[id])
+            resource.manager = manager
+            return resource
+
+        def list_resources(resources):
+            return [get(r.id) for r in resources]
+
+        manager.get.side_effect = get
+        resources = [self._resource(id, "BUILD") for id in ("a", "b")]
+        for resource in resources:
+            resource.manager = manager
+        multiplexer = utils.StatusPollMultiplexer()
+        waiters = [multiplexer.register(
+            resource, "group", ["active"], list_resources=list_resources,
+            check_interval=0.001) for resource in resources]
+
+        self.assertEqual(["a", "b"], [w.wait().id for w in waiters])
+        self.assertEqual({}, multiplexer._groups)
+
+    def test_wait_timeout(self):
+        resources = [self._resource(id, "BUILD") for id in ("a", "b")]
+        manager = mock.Mock()
+        manager.list.return_value = resources
+        for resource in resources:
+            resource.manager = manager
+        multiplexer = utils.StatusPollMultiplexer()
+        waiters = [multiplexer.register(resource, "group", ["ACTIVE"],
+                                        timeout=0.01, check_interval=0.001)
+                   for resource in resources]
+
+        for waiter in waiters:
+            self.assertRaises(exceptions.TimeoutException, waiter.wait)
+        self.assertTrue(manager.list.called)
+        self.assertEqual({}, multiplexer._groups)
+
+    def test_register_invalid_statuses(self):
+        multiplexer = utils.StatusPollMultiplexer()
+        self.assertRaises(ValueError, multiplexer.register,
+                          mock.Mock(), "group", [])
+        self.assertRaises(ValueError, multiplexer.register,
+                          mock.Mock(), "group", ["ERROR"],
+                          failure_statuses=["error"])
+
+    @mock.patch("rally.task.utils.os.getpid", return_value=1)
+    def test_get_status_poll_multiplexer(self, mock_getpid):
+        multiplexer = utils.get_status_poll_multiplexer()
+        self.assertIs(multiplexer, utils.get_status_poll_multiplexer())
+
+        mock_getpid.return_value = 2
+        self.assertIsNot(multiplexer, utils.get_status_poll_multiplexer())
@@ -56,6 +56,86 @@ class ValidationUtilsTestCase(test.TestCase):
             scenario._meta_get("validators")[0]("conf", "client", "deploy"))
 
 
+class ValidationRunTestCase(test.TestCase):
+
+    def _make_validator(self, *args, **kwargs):
+
+        @plugin.from_func()
+        def scenario():
+            pass
+
+        scenario._meta_init()
+
+        calls = []
+
+        def validator_func(config, clients, deployment, *args, **kwargs):
+            calls.append(config)
+            if config.get("fail"):
+                raise ValueError("fail")
+            return validation.ValidationResult(config.get("valid", True))
+
+        validation.validator(validator_func)(*args, **kwargs)(scenario)
+        return scenario._meta_get("validators")[0], calls
+
+    def _clients(self, username="user"):
+        clients = mock.Mock()
+        clients.endpoint = mock.Mock(auth_url="http://fake", username=username,
+                                     tenant_name="tenant", region_name=None)
+        return clients
+
+    def test_validate(self):
+        validator, calls = self._make_validator("image", flavor="flavor")
+        run = validation.ValidationRun()
+
+        clients = self._clients()
+        result = run.validate(validator, {"args": {"a": 1}}, clients, "d")
+        self.assertTrue(result.is_valid)
+        self.assertIs(result, run.validate(validator, {"args": {"a": 1}},
+                                           self._clients(), "d"))
+        self.assertIs(result, run.validate(
+            validator, {"args": {"a": 1}, "runner": {"type": "serial"},
+                        "sla": {"failure_rate": {"max": 0}}},
+            clients, "d"))
+        self.assertEqual(1, len(calls))
+
+        run.validate(validator, {"args": {"a": 2}}, clients, "d")
+        run.validate(validator, {"args": {"a": 1}, "context": {"users": {}}},
+                     clients, "d")
+        run.validate(validator, {"args": {"a": 1}},
+                     self._clients("another"), "d")
+        self.assertEqual(4, len(calls))
+
+        other, other_calls = self._make_validator("image", flavor="other")
+        run.validate(other, {"args": {"a": 1}}, clients, "d")
+        self.assertEqual(1, len(other_calls))
+
+        self.assertEqual(
+            [{"validator": "validator_func", "calls": 7, "cached": 2}],
+            [dict((k, v) for k, v in stats.items() if k != "duration")
+             for stats in run.profile()])
+
+    def test_validate_exception_is_not_memoized(self):
+        validator, calls = self._make_validator()
+        run = validation.ValidationRun()
+        for i in range(2):
+            self.assertRaises(ValueError, run.validate, validator,
+                              {"fail": True}, self._clients(), "d")
+        self.assertEqual(2, len(calls))
+
+    def test_validate_not_decorated(self):
+        validator = mock.Mock(__name__="validator",
+                              return_value=validation.ValidationResult(True))
+        del validator.cache_key
+        run = validation.ValidationRun()
+        for i in range(2):
+            run.validate(validator, {}, "clients", "d")
+
+        validator.assert_has_calls([mock.call({}, clients="clients",
+                                              deployment="d")] * 2)
+        self.assertEqual(2, run.profile()[0]["calls"])
+        self.assertEqual(0, run.profile()[0]["cached"])
+
+
 @ddt.ddt
 class ValidatorsTestCase(test.TestCase):
 
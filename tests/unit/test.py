@@ -17,6 +17,7 @@ import os
 import uuid
 
 import mock
+from oslo_config import cfg
 from oslo_config import fixture
 from oslotest import base
 from oslotest import mockpatch
@@ -117,6 +118,11 @@ class ScenarioTestCase(TestCase):
             self.useFixture(self.mock_wait_for)
             self.useFixture(self.mock_wait_for_delete)
             self.useFixture(self.mock_wait_for_status)
+            # NOTE: status polls are made by the mocked wait_for_status
+            cfg.CONF.set_override("status_poll_multiplexing", False,
+                                  "benchmark")
+            self.addCleanup(cfg.CONF.clear_override,
+                            "status_poll_multiplexing", "benchmark")
 
         self.mock_sleep = mockpatch.Patch("time.sleep")
         self.useFixture(self.mock_sleep)
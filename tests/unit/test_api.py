@@ -63,8 +63,11 @@ class TaskAPITestCase(test.TestCase):
     @mock.patch("rally.api.engine.BenchmarkEngine")
     def test_validate(
             self, mock_benchmark_engine, mock_deployment_get, mock_task):
-        api.Task.validate(mock_deployment_get.return_value["uuid"], "config")
+        result = api.Task.validate(mock_deployment_get.return_value["uuid"],
+                                   "config")
 
+        self.assertEqual(
+            mock_benchmark_engine.return_value.validate.return_value, result)
         mock_benchmark_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       admin=mock_deployment_get.return_value["admin"],
@@ -155,7 +158,8 @@ class TaskAPITestCase(test.TestCase):
         mock_benchmark_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       admin=mock_deployment_get.return_value["admin"],
-                      users=[], abort_on_sla_failure=False),
+                      users=[], abort_on_sla_failure=False,
+                      distributed=False),
             mock.call().run(),
         ])
 
@@ -193,7 +197,8 @@ class TaskAPITestCase(test.TestCase):
     @ddt.data(True, False)
     @mock.patch("rally.api.time")
     @mock.patch("rally.api.objects.Task")
-    def test_abort_sync(self, soft, mock_task, mock_time):
+    @mock.patch("rally.api.progress.notify_abort")
+    def test_abort_sync(self, soft, mock_notify_abort, mock_task, mock_time):
         mock_task.get_status.side_effect = (
             consts.TaskStatus.INIT,
             consts.TaskStatus.VERIFYING,
@@ -211,11 +216,13 @@ class TaskAPITestCase(test.TestCase):
         self.assertEqual([mock.call(some_uuid)] * 6,
                          mock_task.get_status.call_args_list)
         self.assertTrue(mock_time.sleep.called)
+        mock_notify_abort.assert_called_once_with(some_uuid)
 
     @ddt.data(True, False)
     @mock.patch("rally.api.time")
     @mock.patch("rally.api.objects.Task")
-    def test_abort_async(self, soft, mock_task, mock_time):
+    @mock.patch("rally.api.progress.notify_abort")
+    def test_abort_async(self, soft, mock_notify_abort, mock_task, mock_time):
         some_uuid = "133695fb-400d-4988-859c-30bfaa0488ce"
 
         api.Task.abort(some_uuid, soft=soft, async=True)
@@ -224,6 +231,7 @@ class TaskAPITestCase(test.TestCase):
         mock_task.get.return_value.abort.assert_called_once_with(soft=soft)
         self.assertFalse(mock_task.get_status.called)
         self.assertFalse(mock_time.sleep.called)
+        mock_notify_abort.assert_called_once_with(some_uuid)
 
     @mock.patch("rally.common.objects.task.db.task_delete")
     def test_delete(self, mock_task_delete):
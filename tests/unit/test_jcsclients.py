@@ -0,0 +1,145 @@
+# Copyright 2013: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from rally import jcsclients
+from tests.unit import test
+
+
+class ClientPoolTestCase(test.TestCase):
+
+    def test_get_reuses_client(self):
+        pool = jcsclients.ClientPool(max_size=2, idle_timeout=60)
+        create = mock.Mock(side_effect=["c1", "c2"])
+
+        self.assertEqual(("c1", True), pool.get("a", create))
+        self.assertEqual(("c1", False), pool.get("a", create))
+        self.assertEqual(("c2", True), pool.get("b", create))
+        self.assertEqual(2, create.call_count)
+        self.assertEqual({"size": 2, "built": 2, "reused": 1, "evicted": 0},
+                         pool.stats())
+
+    def test_get_evicts_least_recently_used(self):
+        pool = jcsclients.ClientPool(max_size=2, idle_timeout=60)
+        pool.get("a", lambda: "a")
+        pool.get("b", lambda: "b")
+        pool.get("a", lambda: "a")
+        pool.get("c", lambda: "c")
+
+        self.assertEqual(2, len(pool))
+        self.assertEqual(("b2", True), pool.get("b", lambda: "b2"))
+        self.assertEqual(2, pool.stats()["evicted"])
+
+    @mock.patch("rally.jcsclients.time.time")
+    def test_get_evicts_idle(self, mock_time):
+        pool = jcsclients.ClientPool(max_size=10, idle_timeout=5)
+        mock_time.return_value = 0
+        pool.get("a", lambda: "a")
+        mock_time.return_value = 3
+        pool.get("b", lambda: "b")
+        mock_time.return_value = 7
+        pool.get("b", lambda: "b")
+
+        self.assertEqual(1, len(pool))
+        self.assertEqual(("a2", True), pool.get("a", lambda: "a2"))
+
+    def test_get_does_not_block_other_keys(self):
+        pool = jcsclients.ClientPool(max_size=10, idle_timeout=60)
+        building = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def create_slow():
+            building.set()
+            release.wait(10)
+            return "a"
+
+        threads = [threading.Thread(
+            target=lambda: results.append(pool.get("a", create_slow)))
+            for i in range(2)]
+        threads[0].start()
+        building.wait(10)
+        threads[1].start()
+
+        self.assertEqual(("b", True), pool.get("b", lambda: "b"))
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([("a", False), ("a", True)], sorted(results))
+        self.assertEqual(2, pool.stats()["built"])
+        self.assertEqual({}, pool._key_locks)
+
+    def test_get_key_lock_held_until_client_is_pooled(self):
+        pool = jcsclients.ClientPool(max_size=10, idle_timeout=60)
+
+        def create():
+            self.assertIn("a", pool._key_locks)
+            return "a"
+
+        self.assertEqual(("a", True), pool.get("a", create))
+        self.assertEqual({}, pool._key_locks)
+        self.assertEqual(("a", False), pool.get("a", create))
+
+    def test_get_create_fails(self):
+        pool = jcsclients.ClientPool(max_size=10, idle_timeout=60)
+
+        self.assertRaises(ValueError, pool.get, "a",
+                          mock.Mock(side_effect=ValueError))
+        self.assertEqual({}, pool._key_locks)
+        self.assertEqual(("a", True), pool.get("a", lambda: "a"))
+
+    @mock.patch("rally.jcsclients.time.time")
+    def test_stats_evicts_idle(self, mock_time):
+        pool = jcsclients.ClientPool(max_size=10, idle_timeout=5)
+        mock_time.return_value = 0
+        pool.get("a", lambda: "a")
+        mock_time.return_value = 10
+
+        self.assertEqual({"size": 0, "built": 1, "reused": 0, "evicted": 1},
+                         pool.stats())
+
+    @mock.patch("rally.jcsclients.os.getpid")
+    def test_get_pool(self, mock_getpid):
+        self.addCleanup(setattr, jcsclients, "_pool", jcsclients._pool)
+        mock_getpid.return_value = 1
+        pool = jcsclients.get_pool()
+        self.assertIs(pool, jcsclients.get_pool())
+        mock_getpid.return_value = 2
+        self.assertIsNot(pool, jcsclients.get_pool())
+
+
+class JCSClientTestCase(test.TestCase):
+
+    @mock.patch("rally.jcsclients.get_pool")
+    @mock.patch("rally.jcsclients.Session")
+    def test_get_client(self, mock_session, mock_get_pool):
+        pool = jcsclients.ClientPool(max_size=10, idle_timeout=60)
+        mock_get_pool.return_value = pool
+        clients = jcsclients.Clients()
+        kwargs = {"access_key": "ak", "secret_key": "sk"}
+
+        client = clients.jcs_ec2(**kwargs)
+        clients.clear()
+        self.assertIs(client, clients.jcs_ec2(**kwargs))
+
+        mock_session.assert_called_once_with(
+            aws_access_key_id="ak", aws_secret_access_key="sk",
+            region_name="RegionOne")
+        self.assertEqual(mock_session.return_value.client.return_value,
+                         client)
+        self.assertEqual({"built": 1, "reused": 1}, clients.pool_stats)